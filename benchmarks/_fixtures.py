@@ -0,0 +1,94 @@
+"""
+ベンチマーク用の決定的な合成データ
+
+各ベンチマークスクリプトから共通で使用します。
+"""
+
+import os
+import sys
+import time
+import random
+
+import numpy as np
+
+# ベンチマークをスクリプトとして実行したときに src パッケージを解決できるようにする
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+HISTORY_WORDS = (
+    "今日 明日 会議 資料 確認 お願い します 予定 変更 連絡 プロジェクト 進捗 報告 "
+    "meeting deadline review release budget customer invoice schedule design update "
+    "トランスクリプト 音声 認識 精度 改善 テスト 結果 共有 検討 対応"
+).split()
+
+
+def synthetic_transcript(rng, min_words=8, max_words=40):
+    """日本語と英語が混在した合成の文字起こし結果を返す"""
+    words = rng.choices(HISTORY_WORDS, k=rng.randint(min_words, max_words))
+    return "".join(w if not w.isascii() else f" {w} " for w in words).strip()
+
+
+def populate_history(history, entries, seed=0, batch=10000):
+    """
+    合成履歴をまとめて書き込む
+
+    Parameters
+    ----------
+    history : TranscriptionHistory
+        書き込み先の履歴ストア
+    entries : int
+        追加する件数
+    seed : int
+        乱数シード
+    batch : int
+        1回に投入する件数
+    """
+    rng = random.Random(seed)
+    now = time.time() - entries
+    rows = []
+    for i in range(entries):
+        rows.append((now + i, synthetic_transcript(rng), "gpt-4o-transcribe", "ja", 5.0, 1.2, None))
+        if len(rows) >= batch:
+            history.add_many(rows)
+            rows = []
+    history.add_many(rows)
+    history.flush()
+
+
+def synthetic_speech(seconds, sample_rate=16000, seed=0):
+    """
+    音声に似た決定的な合成音声を返す
+
+    基本周波数が揺らぐ倍音の発声区間と無音区間を交互に並べ、弱いノイズを加えます。
+
+    Parameters
+    ----------
+    seconds : float
+        長さ（秒）
+    sample_rate : int
+        サンプルレート
+    seed : int
+        乱数シード
+
+    Returns
+    -------
+    np.ndarray
+        -1.0〜1.0 の float32 モノラル音声（形状は (サンプル数, 1)）
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    audio = rng.normal(0.0, 0.003, total)
+    position = 0
+    while position < total:
+        # 発声区間（0.15〜0.6秒）
+        length = min(total - position, int(rng.uniform(0.15, 0.6) * sample_rate))
+        t = np.arange(length) / sample_rate
+        f0 = rng.uniform(100, 220) * (1 + 0.05 * np.sin(2 * np.pi * rng.uniform(2, 6) * t))
+        phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+        voiced = sum(np.sin(phase * h) / h for h in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(length) / max(1, length)) * rng.uniform(0.1, 0.3)
+        audio[position:position + length] += voiced * envelope
+        # 無音区間（0.05〜0.3秒）
+        position += length + int(rng.uniform(0.05, 0.3) * sample_rate)
+    return np.clip(audio, -1.0, 1.0).astype(np.float32).reshape(-1, 1)
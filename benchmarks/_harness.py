@@ -0,0 +1,232 @@
+"""
+エンドツーエンドのベンチマーク用ハーネス
+
+実際のマイクとAPIを使わずにアプリケーションの処理経路を計測するための部品を提供します。
+
+- WAVファイルの音声を実時間で配信する sounddevice の代替モジュール
+- 段階ごとの所要時間の集計と JSON への書き出し、以前の結果との比較
+"""
+
+import sys
+import json
+import time
+import types
+import platform
+import threading
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import soundfile as sf
+
+from _fixtures import ROOT_DIR
+
+
+def load_wav(path, sample_rate):
+    """
+    WAVファイルを読み込み、指定のサンプルレートのモノラル float32 に変換する
+
+    Returns
+    -------
+    np.ndarray
+        形状 (サンプル数, 1) の音声
+    """
+    data, source_rate = sf.read(path, dtype="float32", always_2d=True)
+    data = data.mean(axis=1)
+    if source_rate != sample_rate:
+        positions = np.arange(int(len(data) * sample_rate / source_rate)) * source_rate / sample_rate
+        data = np.interp(positions, np.arange(len(data)), data).astype(np.float32)
+    return data.reshape(-1, 1)
+
+
+class WavInputStream:
+    """
+    音声データをブロック単位で実時間に合わせてコールバックへ渡す sounddevice.InputStream の代替
+
+    データの終わりに達したら先頭から繰り返します。開いてから最初のブロックを
+    渡すまでの時間は open_delay 秒です（デバイスを開く時間の模擬）。
+    """
+
+    samples = np.zeros((16000, 1), dtype=np.float32)
+    open_delay = 0.0
+
+    def __init__(self, samplerate=16000, channels=1, callback=None, blocksize=0, dtype="float32", **kwargs):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.blocksize = blocksize or samplerate // 100
+        self.dtype = dtype
+        self.latency = self.blocksize / samplerate
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        time.sleep(self.open_delay)
+        self._running.set()
+        self._thread = threading.Thread(target=self._deliver, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _deliver(self):
+        samples = self.samples
+        if self.channels > 1:
+            samples = np.repeat(samples, self.channels, axis=1)
+        if self.dtype == "int16":
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        position = 0
+        period = self.blocksize / self.samplerate
+        deadline = time.perf_counter()
+        while self._running.is_set():
+            block = samples[position:position + self.blocksize]
+            if len(block) < self.blocksize:
+                position = 0
+                continue
+            position += self.blocksize
+            self.callback(block, self.blocksize, None, None)
+            # 実時間に合わせる（遅れた分は詰めて取り戻す）
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def install_fake_sounddevice(samples, open_delay=0.0):
+    """
+    WavInputStream を使う sounddevice モジュールを sys.modules に登録する
+
+    src.core.audio_recorder を読み込む前に呼び出す必要があります。
+    """
+    WavInputStream.samples = samples
+    WavInputStream.open_delay = open_delay
+    module = types.ModuleType("sounddevice")
+    module.InputStream = WavInputStream
+    module.sleep = lambda msec: time.sleep(msec / 1000)
+    sys.modules["sounddevice"] = module
+    return module
+
+
+def summarize(values):
+    """所要時間（ミリ秒）のリストから count/p50/p95/p99/max を計算する"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(q):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    return {
+        "count": len(ordered),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1],
+    }
+
+
+def current_commit():
+    """計測したコミットのハッシュ（git が使えない場合はNone）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def write_results(path, name, config, stages, section="stages"):
+    """
+    計測結果を JSON で書き出す
+
+    Parameters
+    ----------
+    path : str
+        出力先のファイルパス
+    name : str
+        ベンチマーク名
+    config : dict
+        計測条件
+    stages : dict
+        段階名（計測項目名） -> 計測値の辞書
+    section : str
+        計測値を格納するキー
+    """
+    results = {
+        "benchmark": name,
+        "commit": current_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        section: stages,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def find_regressions(baseline_path, current, metrics, threshold, section="stages", min_delta=None):
+    """
+    以前の結果と比較して、しきい値を超えて悪化した計測値を返す
+
+    Parameters
+    ----------
+    baseline_path : str
+        比較元の結果（write_results で書き出した JSON）
+    current : dict
+        今回の計測項目名 -> 計測値の辞書
+    metrics : tuple of str
+        比較する計測値のキー（値が大きいほど悪いもの）
+    threshold : float
+        悪化とみなす増加率（パーセント）
+    section : str
+        計測値を格納しているキー
+    min_delta : dict, optional
+        計測値のキー -> 悪化とみなす最小の差（小さな値の揺らぎを無視するため）
+
+    Returns
+    -------
+    list of tuple
+        (計測項目名, 計測値のキー, 比較元の値, 今回の値) のリスト
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f).get(section, {})
+    min_delta = min_delta or {}
+
+    regressions = []
+    for name, values in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            old, new = base.get(metric), values.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold / 100) and new - old > min_delta.get(metric, 0):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def print_stages(stages):
+    """段階ごとの結果を表形式で表示する"""
+    print(f"{'stage':<12} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in stages.items():
+        if not stats["count"]:
+            print(f"{name:<12} {0:>6}")
+            continue
+        print(
+            f"{name:<12} {stats['count']:>6} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f}"
+            f" {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}"
+        )
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""
+録音1回ごとの CPU 処理のマイクロベンチマーク
+
+決定的な合成音声と合成データを使い、次の処理の1回あたりの時間（中央値・最小値）と
+メモリ（tracemalloc で計測したピーク、呼び出し後も残るメモリとブロック数）を計測します。
+
+  capture.accumulate   AudioRecorder のコールバックによる音声ブロック（int16）の蓄積
+  capture.concatenate  録音停止時の np.concatenate
+  encode.wav           sf.write による WAV（PCM_16）へのエンコード
+  prompt.vocabulary    WhisperTranscriber._build_prompt（大量のカスタム語彙）
+  hotkey.parse         HotkeyManager.parse_hotkey_string
+  response.*           transcribe の応答の変換（WhisperTranscriber._parse_response）
+  metrics.*            メトリクスの記録（録音・文字起こしのたびに呼び出す処理、1000回分）
+
+--output で結果を JSON に書き出し、--compare で以前の結果と比較します。
+--threshold（パーセント）を超えて遅くなった、またはメモリが増えた項目を表示し、
+終了コード 1 で終了します。
+
+使い方:
+    python benchmarks/bench_core_paths.py --output baseline.json
+    python benchmarks/bench_core_paths.py --compare baseline.json --threshold 10
+    python benchmarks/bench_core_paths.py --filter encode
+    （pynput を読み込むため、Linux では X サーバーが必要です）
+"""
+
+import io
+import gc
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import statistics
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _fixtures import synthetic_speech
+from _harness import find_regressions, install_fake_sounddevice, write_results
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 512
+DURATIONS = (5, 30, 120)
+VOCABULARY_SIZES = (10, 1000, 10000)
+
+# 実行時間が短いと揺らぎが大きいため、時間で比較する項目は 1 マイクロ秒以上の差のみ、
+# メモリは 1 KiB 以上の差のみを悪化とみなす
+MIN_DELTA = {"median_ms": 0.001, "peak_kib": 1.0, "retained_kib": 1.0}
+
+try:
+    import sounddevice  # noqa: F401
+except Exception:
+    # 入力ストリームは開かないため、PortAudio がない環境では代替モジュールを使う
+    install_fake_sounddevice(synthetic_speech(1, SAMPLE_RATE))
+
+import numpy as np
+import soundfile as sf
+from openai.types.audio import Transcription, TranscriptionVerbose
+from src.core.audio_recorder import AudioRecorder
+from src.core.hotkeys import HotkeyManager
+from src.core.metrics import AppMetrics
+from src.core.recording_store import RecordingStore
+from src.core.recent_takes import to_int16
+from src.core.whisper_api import WhisperTranscriber
+
+
+def build_cases(directory):
+    """計測項目名 -> 引数なしで呼び出せる関数 の辞書を作る"""
+    cases = {}
+    # 入力ストリームと同じ int16 のブロックで計測する
+    audio = {seconds: to_int16(synthetic_speech(seconds, SAMPLE_RATE, seed=seconds)) for seconds in DURATIONS}
+
+    # 音声ブロックの蓄積と結合
+    recorder = AudioRecorder(recording_store=RecordingStore(directory))
+    for seconds, samples in audio.items():
+        blocks = [samples[i:i + BLOCK_SIZE] for i in range(0, len(samples) - BLOCK_SIZE + 1, BLOCK_SIZE)]
+
+        def accumulate(blocks=blocks):
+            recorder.recording = True
+            recorder.audio_data = []
+            for block in blocks:
+                recorder._callback(block, BLOCK_SIZE, None, None)
+            recorder.recording = False
+
+        accumulate()
+        captured = list(recorder.audio_data)
+        cases[f"capture.accumulate_{seconds}s"] = accumulate
+        cases[f"capture.concatenate_{seconds}s"] = lambda captured=captured: np.concatenate(captured, axis=0)
+
+    # WAV へのエンコード（AudioRecorder.stop_recording と同じく int16 を既定の PCM_16 で書き込む）
+    for seconds, samples in audio.items():
+        def encode(samples=samples):
+            sf.write(io.BytesIO(), samples, SAMPLE_RATE, format="WAV")
+
+        cases[f"encode.wav_{seconds}s"] = encode
+
+    # プロンプトの構築
+    transcriber = WhisperTranscriber(api_key="benchmark", azure_endpoint="http://127.0.0.1:9")
+    transcriber.add_system_instruction([f"instruction {i}" for i in range(5)])
+    for size in VOCABULARY_SIZES:
+        vocabulary = [f"term{i}" for i in range(size)]
+        cases[f"prompt.vocabulary_{size}"] = lambda vocabulary=vocabulary: transcriber._build_prompt(vocabulary)
+
+    # ホットキー文字列の解析（50件）
+    hotkeys = [
+        f"{mods}+{key}"
+        for mods in ("ctrl", "ctrl+shift", "alt", "cmd+option", "ctrl+alt+shift")
+        for key in ("r", "space", "f5", "pageup", "9", "k, r", "esc", "enter", "up", "delete")
+    ]
+
+    def parse_hotkeys():
+        for hotkey in hotkeys:
+            HotkeyManager.parse_hotkey_string(hotkey)
+
+    cases["hotkey.parse_50"] = parse_hotkeys
+
+    # 応答の変換
+    text = " ".join(_fixtures.HISTORY_WORDS * 20)
+    segments = [
+        {"id": i, "start": i * 2.0, "end": i * 2.0 + 2.0, "text": word, "avg_logprob": -0.2,
+         "compression_ratio": 1.2, "no_speech_prob": 0.01, "seek": 0, "temperature": 0.0, "tokens": [1, 2, 3]}
+        for i, word in enumerate(_fixtures.HISTORY_WORDS * 4)
+    ]
+    verbose = TranscriptionVerbose(duration=240.0, language="japanese", text=text, segments=segments)
+    responses = {
+        "response.text": (text, "text"),
+        "response.json_model": (Transcription(text=text), "json"),
+        "response.verbose_json_model": (verbose, "verbose_json"),
+        "response.verbose_json_str": (verbose.model_dump_json(), "verbose_json"),
+    }
+    for name, (response, response_format) in responses.items():
+        cases[name] = lambda r=response, f=response_format: WhisperTranscriber._parse_response(r, f)
+
+    # メトリクスの記録（1回あたり1マイクロ秒未満が目標のため、1000回分をまとめて計測する）
+    metrics = AppMetrics()
+    counter = metrics.recorded_takes
+    histogram = metrics.transcription_seconds.labels("whisper-1")
+    values = [0.05 * (i + 1) for i in range(1000)]
+
+    def counter_inc():
+        for _ in values:
+            counter.inc()
+
+    def histogram_observe():
+        for value in values:
+            histogram.observe(value)
+
+    def record_transcription():
+        for value in values:
+            metrics.record_transcription("whisper-1", value, 160044, 5.0)
+
+    cases["metrics.counter_inc_1000"] = counter_inc
+    cases["metrics.histogram_observe_1000"] = histogram_observe
+    cases["metrics.record_take_1000"] = record_transcription
+
+    return cases
+
+
+def measure(func, repeat, min_time):
+    """
+    1回あたりの実行時間とメモリを計測する
+
+    Returns
+    -------
+    dict
+        median_ms, min_ms, iterations, peak_kib, retained_kib, retained_blocks
+    """
+    func()  # ウォームアップ
+
+    # 1サンプルが min_time 秒以上になる繰り返し回数を決める
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if time.perf_counter() - start >= min_time:
+            break
+        iterations *= 2
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter_ns() - start) / iterations / 1e6)
+
+    # 呼び出し後も残るブロック数（tracemalloc を使わずに数える）
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    func()
+    gc.collect()
+    retained_blocks = sys.getallocatedblocks() - blocks
+
+    # ピークと残るメモリ（numpy の配列も含む）
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "iterations": iterations,
+        "peak_kib": (peak - before) / 1024,
+        "retained_kib": (after - before) / 1024,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="名前にこの文字列を含む項目だけを計測する")
+    parser.add_argument("--repeat", type=int, default=7, help="計測の繰り返し回数")
+    parser.add_argument("--min-time", type=float, default=0.05, help="1回の計測の最小時間（秒）")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    parser.add_argument("--compare", help="比較元の結果（--output で書き出した JSON）")
+    parser.add_argument("--threshold", type=float, default=10.0, help="悪化とみなす増加率（パーセント）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = build_cases(directory)
+        results = {}
+        print(f"{'case':<30} {'median ms':>11} {'min ms':>11} {'peak KiB':>10} {'retained KiB':>13} {'blocks':>7}")
+        for name, func in cases.items():
+            if args.filter not in name:
+                continue
+            result = results[name] = measure(func, args.repeat, args.min_time)
+            print(
+                f"{name:<30} {result['median_ms']:>11.4f} {result['min_ms']:>11.4f} {result['peak_kib']:>10.1f}"
+                f" {result['retained_kib']:>13.1f} {result['retained_blocks']:>7}"
+            )
+
+    if args.output:
+        config = {"repeat": args.repeat, "min_time": args.min_time, "filter": args.filter}
+        write_results(args.output, "core_paths", config, results, section="cases")
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        regressions = find_regressions(
+            args.compare, results, ("median_ms", "peak_kib", "retained_kib"), args.threshold,
+            section="cases", min_delta=MIN_DELTA,
+        )
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old:.4f} -> {new:.4f} (+{(new / old - 1) * 100 if old else float('inf'):.1f} %)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+"""
+ホットキーから文字起こし結果までのエンドツーエンドのベンチマーク
+
+マイク・キーボード・ネットワークを使わずに、アプリケーションと同じ経路で録音と
+文字起こしを繰り返し、段階ごとの所要時間（p50/p95/p99）を計測します。
+
+- HotkeyManager のエンジンへ合成キーイベントを送り、押している間だけ録音する
+- AudioRecorder には WAV ファイル（指定がなければ合成音声）を実時間で配信する
+- WhisperTranscriber はローカルの代替エンドポイントへ送信する（応答の遅延を指定可能）
+- メインスレッドが GUI スレッドの代わりにホットキーを実行し、結果をクリップボードへコピーする
+
+計測する段階:
+  hotkey       キーを離してから離したときのアクションの開始まで
+  stream_open  録音開始の呼び出しから最初の音声ブロックの受信まで
+  capture      音声ブロック1つあたりのコールバック処理
+  finalize     録音停止の処理（エンコードを除く）
+  encode       WAV ファイルへの書き込み
+  upload       文字起こしスレッドの開始から代替エンドポイントが本文を受信し終えるまで
+  response     本文の受信から文字起こし結果を受け取るまで（代替エンドポイントの遅延を含む）
+  clipboard    結果を受け取ってから GUI スレッドでクリップボードへコピーし終えるまで
+  total        キーを離してからクリップボードへのコピーまで
+
+結果は --output に JSON で書き出し、コミット間で比較できます。
+
+使い方:
+    python benchmarks/bench_end_to_end.py --takes 30 --server-latency-ms 300 --output e2e.json
+    python benchmarks/bench_end_to_end.py --wav sample.wav --warm
+    （Linux で pynput を使うには X サーバーが必要です）
+"""
+
+import os
+import queue
+import argparse
+import tempfile
+import threading
+import time
+import types
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _fixtures import synthetic_speech
+from _harness import install_fake_sounddevice, load_wav, print_stages, summarize, write_results
+
+SAMPLE_RATE = 16000
+HOTKEY = "ctrl+shift+space"
+STAGES = ("hotkey", "stream_open", "capture", "finalize", "encode", "upload", "response", "clipboard", "total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", help="録音の代わりに配信する WAV ファイル（指定がなければ合成音声）")
+    parser.add_argument("--takes", type=int, default=30, help="録音の回数")
+    parser.add_argument("--hold-ms", type=float, default=1000.0, help="キーを押し続ける時間（ミリ秒）")
+    parser.add_argument("--gap-ms", type=float, default=200.0, help="録音の間隔（ミリ秒）")
+    parser.add_argument("--server-latency-ms", type=float, default=300.0, help="代替エンドポイントの応答遅延（ミリ秒）")
+    parser.add_argument("--server-jitter-ms", type=float, default=0.0, help="応答遅延に加える乱数の最大値（ミリ秒）")
+    parser.add_argument("--open-delay-ms", type=float, default=0.0, help="入力ストリームを開く時間の模擬（ミリ秒）")
+    parser.add_argument("--warm", action="store_true", help="入力ストリームを開いたままにする（プッシュトゥトークと同じ）")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    args = parser.parse_args()
+
+    samples = load_wav(args.wav, SAMPLE_RATE) if args.wav else synthetic_speech(30, SAMPLE_RATE)
+    install_fake_sounddevice(samples, open_delay=args.open_delay_ms / 1000)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # sounddevice の代替を登録してから読み込む
+    from pynput import keyboard
+    from src.core import audio_recorder as audio_recorder_module
+    from src.core.audio_recorder import AudioRecorder
+    from src.core.hotkeys import HotkeyManager
+    from src.core.recording_store import RecordingStore
+    from src.core.whisper_api import WhisperTranscriber
+    from src.core.fake_server import FakeTranscriptionServer, LatencyDistribution
+
+    try:
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication([])
+        clipboard = app.clipboard()
+    except ImportError:
+        clipboard = None
+
+    latency = args.server_latency_ms / 1000
+    server = FakeTranscriptionServer(
+        LatencyDistribution("uniform", latency, latency + args.server_jitter_ms / 1000),
+        text="synthetic transcript", seed=0,
+    ).start()
+    transcriber = WhisperTranscriber(api_key="benchmark", azure_endpoint=server.endpoint)
+    directory = tempfile.TemporaryDirectory()
+    store = RecordingStore(directory.name)
+    recorder = AudioRecorder(recording_store=store)
+
+    samples_ms = {name: [] for name in STAGES}
+    timeline = {}
+    events = queue.Queue()
+    take_done = threading.Event()
+
+    # 音声ブロックごとのコールバック処理と、録音開始後の最初のブロックの受信時刻を記録する
+    callback = recorder._callback
+
+    def timed_callback(indata, frames, time_info, status):
+        start = time.perf_counter_ns()
+        callback(indata, frames, time_info, status)
+        end = time.perf_counter_ns()
+        samples_ms["capture"].append((end - start) / 1e6)
+        if "first_block" not in timeline and "start_call" in timeline and recorder.recording:
+            timeline["first_block"] = end
+
+    recorder._callback = timed_callback
+
+    # WAV への書き込みを計測する
+    write = audio_recorder_module.sf.write
+
+    def timed_write(*write_args, **write_kwargs):
+        start = time.perf_counter_ns()
+        write(*write_args, **write_kwargs)
+        timeline["encode"] = (time.perf_counter_ns() - start) / 1e6
+
+    audio_recorder_module.sf = types.SimpleNamespace(write=timed_write)
+
+    def upload(audio_file, take):
+        take["upload_start"] = time.perf_counter_ns()
+        text = transcriber.transcribe(audio_file, raise_errors=True)
+        take["response_end"] = time.perf_counter_ns()
+        take["received"] = server.received_ns[-1]
+        events.put(("result", text, take))
+
+    def on_press():
+        timeline["start_call"] = time.perf_counter_ns()
+        recorder.start_recording()
+
+    def on_release():
+        timeline["release_callback"] = time.perf_counter_ns()
+        audio_file = recorder.stop_recording()
+        timeline["finalize"] = (time.perf_counter_ns() - timeline["release_callback"]) / 1e6
+        threading.Thread(target=upload, args=(audio_file, timeline), daemon=True).start()
+
+    manager = HotkeyManager()
+    manager.set_notifier(lambda: events.put(("drain",)))
+    manager.register_push_to_talk(HOTKEY, on_press, on_release)
+    keys = keyboard.HotKey.parse(HotkeyManager.parse_hotkey_string(HOTKEY))
+    if args.warm:
+        recorder.start_warm_stream()
+
+    def inject():
+        """キーボードリスナーの代わりにキーを押して離す"""
+        for _ in range(args.takes + 1):
+            for key in keys:
+                manager.engine.press(key)
+            time.sleep(args.hold_ms / 1000)
+            timeline["keyup"] = time.perf_counter_ns()
+            for key in reversed(keys):
+                manager.engine.release(key)
+            take_done.wait()
+            take_done.clear()
+            time.sleep(args.gap_ms / 1000)
+
+    threading.Thread(target=inject, daemon=True).start()
+
+    # メインスレッドは GUI スレッドの代わり
+    for index in range(args.takes + 1):
+        while True:
+            event = events.get()
+            if event[0] == "drain":
+                manager.drain()
+                continue
+            _, text, take = event
+            if clipboard is not None:
+                clipboard.setText(text)
+            end = time.perf_counter_ns()
+            break
+
+        # 最初の1回は接続の確立などを含むため除外する
+        if index > 0:
+            durations = {
+                "hotkey": (take["release_callback"] - take["keyup"]) / 1e6,
+                "stream_open": (take["first_block"] - take["start_call"]) / 1e6,
+                "finalize": take["finalize"] - take["encode"],
+                "encode": take["encode"],
+                "upload": (take["received"] - take["upload_start"]) / 1e6,
+                "response": (take["response_end"] - take["received"]) / 1e6,
+                "total": (end - take["keyup"]) / 1e6,
+            }
+            if clipboard is not None:
+                durations["clipboard"] = (end - take["response_end"]) / 1e6
+            for name, value in durations.items():
+                samples_ms[name].append(value)
+        else:
+            samples_ms["capture"].clear()
+        timeline.clear()
+        take_done.set()
+
+    recorder.stop_warm_stream()
+    server.stop()
+    store.stop()
+    directory.cleanup()
+
+    stages = {name: summarize(values) for name, values in samples_ms.items()}
+    print_stages(stages)
+    if args.output:
+        config = dict(vars(args), sample_rate=SAMPLE_RATE, audio_seconds=len(samples) / SAMPLE_RATE)
+        write_results(args.output, "end_to_end", config, stages)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+履歴パネルのベンチマーク
+
+指定件数（デフォルト50万件）の合成履歴に対して HistoryPanel を開き、
+初回表示・ページ送りのスクロール・任意位置へのジャンプ・1文字ずつ入力したときの
+絞り込み・多くの履歴に一致する語での検索の所要時間と、メモリに保持している行数・
+Pythonヒープのピーク使用量を計測します。
+
+一致件数は別スレッドで数えるため、検索では GUI スレッドの処理時間（先頭ページの表示まで）と、
+全件数が行数に反映されるまでの時間を分けて表示します。
+
+使い方:
+    python benchmarks/bench_history_panel.py --entries 500000
+    （画面のない環境では QT_QPA_PLATFORM=offscreen を指定してください）
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+from _fixtures import populate_history
+from src.core.history_store import TranscriptionHistory
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication
+from src.gui.components.widgets.history_panel import HistoryPanel
+
+
+def elapsed_ms(start):
+    """開始時刻からの経過ミリ秒を返す"""
+    return (time.perf_counter() - start) * 1000
+
+
+def report(name, timings, panel):
+    """計測結果を1行で表示する"""
+    print(
+        f"{name:<20} p50 {statistics.median(timings):7.2f} ms  max {max(timings):7.2f} ms"
+        f"  (rows: {panel.model.rowCount()}, cached rows: {panel.model.cached_row_count()})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=500_000, help="合成する履歴の件数")
+    parser.add_argument("--db", default=None, help="使用するデータベースファイル（既存なら再利用）")
+    parser.add_argument("--scroll-pages", type=int, default=200, help="1画面ずつ下へスクロールする回数")
+    parser.add_argument("--jumps", type=int, default=50, help="ランダムな位置へジャンプする回数")
+    parser.add_argument("--query", default="会議資料", help="1文字ずつ入力する検索文字列")
+    parser.add_argument("--common-terms", nargs="+", default=["release", "customer invoice", "会議資料"],
+                        help="多くの履歴に一致する検索文字列")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "history.sqlite3")
+    history = TranscriptionHistory(db_path, batch_size=10000)
+    existing = history.count()
+    if existing < args.entries:
+        start = time.perf_counter()
+        populate_history(history, args.entries - existing)
+        print(f"populated {args.entries - existing} entries in {elapsed_ms(start) / 1000:.1f} s ({db_path})")
+    print(f"entries: {history.count()}")
+
+    tracemalloc.start()
+
+    # 初回表示
+    start = time.perf_counter()
+    panel = HistoryPanel(history)
+    panel.resize(480, 600)
+    panel.show()
+    app.processEvents()
+    report("open + first paint", [elapsed_ms(start)], panel)
+
+    scroll_bar = panel.list_view.verticalScrollBar()
+
+    # 1画面ずつ下へスクロールする
+    timings = []
+    for _ in range(args.scroll_pages):
+        start = time.perf_counter()
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.pageStep())
+        app.processEvents()
+        timings.append(elapsed_ms(start))
+    report("page down", timings, panel)
+
+    # 任意の位置へジャンプする（スクロールバーのドラッグに相当）
+    rng = random.Random(0)
+    timings = []
+    for _ in range(args.jumps):
+        start = time.perf_counter()
+        scroll_bar.setValue(rng.randint(0, scroll_bar.maximum()))
+        app.processEvents()
+        timings.append(elapsed_ms(start))
+    report("random jump", timings, panel)
+
+    # 1文字ずつ入力したときの絞り込み（デバウンス後の処理時間のみを計測）
+    timings = []
+    for i in range(1, len(args.query) + 1):
+        panel.search_input.setText(args.query[:i])
+        start = time.perf_counter()
+        panel.apply_filter()
+        app.processEvents()
+        timings.append(elapsed_ms(start))
+    report("incremental filter", timings, panel)
+
+    # 多くの履歴に一致する語での検索（GUIスレッドの処理時間と、全件数が反映されるまでの時間）
+    # 前の検索の件数も通知されるため、行数と一致する件数が届くまで待つ
+    counted = []
+    panel.model.count_ready.connect(lambda generation, count: counted.append(count))
+    for term in args.common_terms:
+        counted.clear()
+        panel.search_input.setText(term)
+        panel.search_timer.stop()
+        start = time.perf_counter()
+        panel.apply_filter()
+        gui_time = elapsed_ms(start)
+        while panel.model.rowCount() >= panel.model.page_size and panel.model.rowCount() not in counted:
+            app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents, 100)
+        report(f"set_query {term!r}", [gui_time], panel)
+        report("  until row count", [elapsed_ms(start)], panel)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'python heap peak':<20} {peak / 1024 / 1024:7.2f} MiB")
+
+    panel.close()
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+文字起こし履歴の検索ベンチマーク
+
+指定件数（デフォルト100万件）の合成履歴を持つデータベースを作成し、
+TranscriptionHistory.search の応答時間を計測します。
+
+使い方:
+    python benchmarks/bench_history_search.py --entries 1000000
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+
+from _fixtures import populate_history
+from src.core.history_store import TranscriptionHistory
+
+QUERIES = ["会議資料", "release", "進捗報告", "customer invoice", "音声認識", "zzz_no_match", "会議", "予定"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000, help="合成する履歴の件数")
+    parser.add_argument("--db", default=None, help="使用するデータベースファイル（既存なら再利用）")
+    parser.add_argument("--repeat", type=int, default=20, help="クエリごとの計測回数")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), "history.sqlite3")
+    history = TranscriptionHistory(db_path, batch_size=10000)
+
+    existing = history.count()
+    if existing < args.entries:
+        start = time.perf_counter()
+        populate_history(history, args.entries - existing)
+        print(f"populated {args.entries - existing} entries in {time.perf_counter() - start:.1f} s ({db_path})")
+
+    print(f"entries: {history.count()}")
+    print(f"{'query':<20}{'hits':>6}{'p50 ms':>10}{'max ms':>10}")
+    for query in QUERIES:
+        timings = []
+        hits = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = len(history.search(query, limit=50))
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{query:<20}{hits:>6}{statistics.median(timings):>10.2f}{max(timings):>10.2f}")
+
+    history.close()
+
+
+if __name__ == "__main__":
+    main()
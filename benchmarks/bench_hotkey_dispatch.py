@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+ホットキー照合のベンチマーク
+
+多数のホットキー（組み合わせとシーケンス）を登録した HotkeyEngine に合成キーイベントを
+与え、1イベントあたりの照合時間と照合中のメモリ割り当てを計測します。比較として、
+pynput の GlobalHotKeys と同じく全ホットキーの HotKey を順に調べる方式も計測します。
+計測の前に、各組み合わせのキーをすべての順番で押して一致することを確認します。
+
+使い方:
+    python benchmarks/bench_hotkey_dispatch.py --bindings 200 --events 200000
+    （pynput が動作する環境、Linux では X サーバーが必要です）
+"""
+
+import time
+import random
+import argparse
+import itertools
+import tracemalloc
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from pynput import keyboard
+from src.core.hotkey_engine import HotkeyEngine, compile_hotkey, to_pynput_format
+
+MODIFIERS = ("ctrl", "alt", "shift", "cmd")
+KEYS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def synthetic_bindings(count, rng):
+    """重複しないホットキー文字列を生成する（約2割はシーケンス）"""
+    bindings = set()
+    while len(bindings) < count:
+        mods = rng.sample(MODIFIERS, rng.randint(1, 2))
+        chord = "+".join(mods + [rng.choice(KEYS)])
+        if rng.random() < 0.2:
+            # シーケンスの最初のステップは他の単独のホットキーと重ならないよう f キーを使う
+            chord = f"ctrl+f{rng.randint(1, 12)}, {rng.choice(KEYS)}"
+        bindings.add(chord)
+    return sorted(bindings)
+
+
+def key_events(hotkeys, count, rng):
+    """登録済みのホットキーを押す (押下/解放, キー) のイベント列を生成する"""
+    events = []
+    while len(events) < count:
+        for step in to_pynput_format(rng.choice(hotkeys)).split(", "):
+            keys = keyboard.HotKey.parse(step)
+            events.extend((True, key) for key in keys)
+            events.extend((False, key) for key in reversed(keys))
+    return events[:count]
+
+
+def check_key_orders(hotkeys):
+    """
+    各ホットキーの最後のステップのキーをすべての順番で押し、アクションが実行されることを確認する
+
+    GlobalHotKeys と同じく、組み合わせのキーはどの順番で押しても一致する必要があります
+    （途中で一部のキーの組み合わせが別のホットキーに一致しても、最後に押したキーで一致すればよい）。
+    一致しない順番があれば RuntimeError を送出します。
+
+    Returns
+    -------
+    int
+        確認した押し方の数
+    """
+    fired = []
+    engine = HotkeyEngine()
+    for hotkey in hotkeys:
+        engine.bind(hotkey, fired.append, hotkey)
+    checked = 0
+    for hotkey in hotkeys:
+        steps = to_pynput_format(hotkey).split(", ")
+        for order in itertools.permutations(keyboard.HotKey.parse(steps[-1])):
+            engine.reset()
+            fired.clear()
+            for step in steps[:-1]:
+                keys = keyboard.HotKey.parse(step)
+                for key in keys:
+                    engine.press(key)
+                for key in reversed(keys):
+                    engine.release(key)
+            for key in order:
+                engine.press(key)
+            for key in reversed(order):
+                engine.release(key)
+            # 修飾キーの順番だけが異なる文字列は同じホットキーとして登録される
+            if not fired or compile_hotkey(fired[-1]) != compile_hotkey(hotkey):
+                raise RuntimeError(f"'{hotkey}' did not fire when pressed in the order {order}")
+            checked += 1
+    return checked
+
+
+def measure(name, press, release, events):
+    """イベント列を処理する時間と割り当てを計測して表示する"""
+    # ウォームアップ
+    for is_press, key in events[:1000]:
+        press(key) if is_press else release(key)
+
+    sample = events[:20000]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for is_press, key in sample:
+        press(key) if is_press else release(key)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter_ns()
+    for is_press, key in events:
+        press(key) if is_press else release(key)
+    per_event = (time.perf_counter_ns() - start) / len(events)
+    print(f"{name:<12} {per_event:8.0f} ns/event  heap growth while dispatching: {after - before} B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bindings", type=int, default=200, help="登録するホットキーの数")
+    parser.add_argument("--events", type=int, default=200_000, help="処理するキーイベントの数")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    hotkeys = [h for h in synthetic_bindings(args.bindings, rng) if compile_hotkey(h)]
+    events = key_events(hotkeys, args.events, rng)
+
+    def on_activate(*_):
+        pass
+
+    # コンパイル済みエンジン
+    start = time.perf_counter()
+    engine = HotkeyEngine()
+    for hotkey in hotkeys:
+        engine.bind(hotkey, on_activate, hotkey)
+    print(f"compiled {len(hotkeys)} hotkeys in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"checked {check_key_orders(hotkeys)} key orders")
+    measure("engine", engine.press, engine.release, events)
+
+    # 全ホットキーを順に調べる方式（GlobalHotKeys と同等、シーケンスは最初のステップのみ）
+    linear = [
+        keyboard.HotKey(keyboard.HotKey.parse(to_pynput_format(h).split(", ")[0]), on_activate)
+        for h in hotkeys
+    ]
+
+    def linear_press(key):
+        for hotkey in linear:
+            hotkey.press(key)
+
+    def linear_release(key):
+        for hotkey in linear:
+            hotkey.release(key)
+
+    measure("linear scan", linear_press, linear_release, events)
+
+
+if __name__ == "__main__":
+    main()
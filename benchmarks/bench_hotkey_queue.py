@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+ホットキーのキュー経由の実行のベンチマーク
+
+時間のかかるコールバック（デフォルト20ミリ秒）を登録した HotkeyManager に合成キーイベントを
+与え、リスナースレッドがキーイベント1回の処理でブロックされる時間を、コールバックを
+その場で実行する場合とキュー経由で別スレッドが実行する場合とで比較します。
+また、キーを押し続けたときの自動リピートとデバウンスで実行回数が抑えられること、
+ホットキー検出からコールバック開始までの時間（p50/p95/max）を計測します。
+
+別スレッドは GUI スレッドの代わりに、通知を受けたら drain を呼び出します。
+
+使い方:
+    python benchmarks/bench_hotkey_queue.py --presses 200 --callback-ms 20
+    （pynput が動作する環境、Linux では X サーバーが必要です）
+"""
+
+import time
+import argparse
+import threading
+import statistics
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from pynput import keyboard
+from src.core.hotkeys import HotkeyManager
+
+HOTKEY = "ctrl+shift+r"
+
+
+class Consumer(threading.Thread):
+    """通知を受けるたびに drain を呼び出すスレッド（GUIスレッドの代わり）"""
+
+    def __init__(self, manager):
+        super().__init__(daemon=True)
+        self.manager = manager
+        self.wakeup = threading.Event()
+        self.stop_event = threading.Event()
+        manager.set_notifier(self.wakeup.set)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if self.wakeup.wait(0.1):
+                self.wakeup.clear()
+                self.manager.drain()
+
+
+def tap(engine, keys, repeats=0):
+    """
+    キーを押して離す（最後のキーは押し続けたときの自動リピートを repeats 回送る）
+
+    Returns
+    -------
+    float
+        押下イベントの処理に要した最大時間（ミリ秒）
+    """
+    blocked = 0.0
+    for key in keys + [keys[-1]] * repeats:
+        start = time.perf_counter()
+        engine.press(key)
+        blocked = max(blocked, (time.perf_counter() - start) * 1000)
+    for key in reversed(keys):
+        engine.release(key)
+    return blocked
+
+
+def run(name, manager, args, repeats=0, interval=0.05):
+    """合成キー入力を送り、リスナー側のブロック時間と実行回数を表示する"""
+    calls = [0]
+
+    def on_activate():
+        calls[0] += 1
+        time.sleep(args.callback_ms / 1000)
+
+    manager.register_hotkey(HOTKEY, on_activate)
+    keys = keyboard.HotKey.parse(HotkeyManager.parse_hotkey_string(HOTKEY))
+
+    blocked = []
+    for _ in range(args.presses):
+        blocked.append(tap(manager.engine, keys, repeats))
+        time.sleep(interval)
+
+    # キューに残っているコールバックの実行を待つ
+    deadline = time.time() + args.presses * args.callback_ms / 1000 + 1
+    while manager._queue and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(args.callback_ms / 1000 * 2)
+    manager.clear_all_hotkeys()
+
+    print(
+        f"{name:<28} listener blocked p50 {statistics.median(blocked):7.3f} ms  max {max(blocked):7.3f} ms"
+        f"  callbacks {calls[0]} / {args.presses}"
+    )
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--presses", type=int, default=200, help="ホットキーを押す回数")
+    parser.add_argument("--callback-ms", type=float, default=20.0, help="コールバックの処理時間（ミリ秒）")
+    parser.add_argument("--repeats", type=int, default=10, help="押し続けたときの自動リピート回数")
+    parser.add_argument("--debounce-ms", type=float, default=300.0, help="デバウンス間隔（ミリ秒）")
+    args = parser.parse_args()
+
+    # 従来どおりリスナースレッドでコールバックを実行する
+    run("inline", HotkeyManager(), args)
+
+    # キュー経由で別スレッドが実行する
+    manager = HotkeyManager()
+    consumer = Consumer(manager)
+    consumer.start()
+    run("queued", manager, args)
+    stats = manager.get_latency_stats()
+    print(
+        f"{'  hotkey -> callback':<28} p50 {stats['p50_ms']:7.3f} ms  p95 {stats['p95_ms']:7.3f} ms"
+        f"  max {stats['max_ms']:7.3f} ms  dropped {stats['dropped']}"
+    )
+    consumer.stop_event.set()
+
+    # 自動リピートを含む入力（抑制あり/なし）とデバウンス
+    for name, kwargs, interval in (
+        ("auto-repeat, no suppression", {"suppress_repeat": False}, 0.05),
+        ("auto-repeat, suppressed", {}, 0.05),
+        ("rapid presses, debounced", {"debounce": args.debounce_ms / 1000}, 0.1),
+    ):
+        manager = HotkeyManager(**kwargs)
+        consumer = Consumer(manager)
+        consumer.start()
+        run(name, manager, args, repeats=args.repeats, interval=interval)
+        consumer.stop_event.set()
+
+
+if __name__ == "__main__":
+    main()
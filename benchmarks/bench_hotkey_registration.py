@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+ホットキー登録のベンチマーク
+
+常駐リスナーでディスパッチテーブルを差し替える HotkeyManager と、登録のたびに
+GlobalHotKeys を作り直す従来の方式を比較します。別スレッドから監視対象のホットキー
+（ctrl+shift+r）の合成キーイベントを一定間隔で送りながら、別のホットキーの
+登録・解除を繰り返し、登録・解除と再登録の所要時間、および取りこぼした
+ホットキー入力の数を計測します。
+
+合成イベントはOSのフックを経由せず、その時点のリスナーのコールバックへ直接渡します。
+リスナーが停止中または起動途中の場合、そのイベントは取りこぼしとして数えます。
+
+使い方:
+    python benchmarks/bench_hotkey_registration.py --ops 2000
+    （pynput が動作する環境、Linux では X サーバーが必要です）
+"""
+
+import time
+import inspect
+import argparse
+import threading
+import statistics
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from pynput import keyboard
+from src.core.hotkeys import HotkeyManager
+
+# pynput 1.8 以降はコールバックに injected 引数が渡される
+PASS_INJECTED = "injected" in inspect.signature(keyboard.GlobalHotKeys._on_press).parameters
+
+TRACKED_HOTKEY = "ctrl+shift+r"
+CHURN_KEYS = "abcdefghijklmnopqstuvwxyz0123456789"
+
+
+class RestartingHotkeyManager(HotkeyManager):
+    """比較用: 登録・解除のたびにリスナーを停止して GlobalHotKeys を作り直す従来の方式"""
+
+    def register_hotkey(self, hotkey_str, callback):
+        self.stop_listener()
+        self.hotkeys[self.parse_hotkey_string(hotkey_str)] = callback
+        return self.start_listener()
+
+    def unregister_hotkey(self, hotkey_str):
+        combination = self.parse_hotkey_string(hotkey_str)
+        if combination not in self.hotkeys:
+            return False
+        self.stop_listener()
+        del self.hotkeys[combination]
+        return self.start_listener() if self.hotkeys else True
+
+    def start_listener(self):
+        self.listener = keyboard.GlobalHotKeys(self.hotkeys)
+        self.listener.start()
+        return True
+
+
+class KeyFeeder(threading.Thread):
+    """監視対象のホットキーの押下・解放を一定間隔で現在のリスナーへ送るスレッド"""
+
+    def __init__(self, manager, interval):
+        super().__init__(daemon=True)
+        self.manager = manager
+        self.interval = interval
+        self.keys = keyboard.HotKey.parse(HotkeyManager.parse_hotkey_string(TRACKED_HOTKEY))
+        self.expected = 0
+        self.dropped_events = 0
+        self.stop_event = threading.Event()
+
+    def deliver(self, handler_name, key):
+        """現在のリスナーへイベントを渡す（リスナーが動作していなければ取りこぼし）"""
+        listener = self.manager.listener
+        if listener is None or not listener.running:
+            self.dropped_events += 1
+            return
+        handler = getattr(listener, handler_name)
+        handler(key, False) if PASS_INJECTED else handler(key)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            for key in self.keys:
+                self.deliver("on_press", key)
+            for key in reversed(self.keys):
+                self.deliver("on_release", key)
+            self.expected += 1
+            time.sleep(self.interval)
+
+
+def percentile(values, q):
+    """q パーセンタイル（0〜100）を返す"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def report(name, timings):
+    """計測結果を1行で表示する"""
+    print(
+        f"  {name:<16} p50 {statistics.median(timings):8.3f} ms  p99 {percentile(timings, 99):8.3f} ms"
+        f"  max {max(timings):8.3f} ms"
+    )
+
+
+def run(manager, args):
+    """1つの方式について計測する"""
+    activations = [0]
+
+    def on_activate():
+        activations[0] += 1
+
+    manager.register_hotkey(TRACKED_HOTKEY, on_activate)
+    manager.listener.wait()
+
+    feeder = KeyFeeder(manager, args.interval / 1000)
+    feeder.start()
+
+    # 別のホットキーの登録・解除を繰り返す
+    register_timings, unregister_timings = [], []
+    for i in range(args.ops):
+        hotkey = f"ctrl+alt+{CHURN_KEYS[i % len(CHURN_KEYS)]}"
+        start = time.perf_counter()
+        manager.register_hotkey(hotkey, lambda: None)
+        register_timings.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        manager.unregister_hotkey(hotkey)
+        unregister_timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(args.churn_interval / 1000)
+
+    # 監視対象のホットキー自体の再登録（設定変更に相当）
+    reregister_timings = []
+    for _ in range(args.ops // 10 or 1):
+        start = time.perf_counter()
+        manager.unregister_hotkey(TRACKED_HOTKEY)
+        manager.register_hotkey(TRACKED_HOTKEY, on_activate)
+        reregister_timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(args.churn_interval / 1000)
+
+    # 最後の再登録のあとに送ったイベントまで処理されるのを待つ
+    time.sleep(args.interval * 5 / 1000)
+    feeder.stop_event.set()
+    feeder.join()
+    manager.clear_all_hotkeys()
+
+    report("register", register_timings)
+    report("unregister", unregister_timings)
+    report("re-register", reregister_timings)
+    missed = feeder.expected - activations[0]
+    print(
+        f"  {'missed hotkeys':<16} {missed} / {feeder.expected}"
+        f" ({missed / max(1, feeder.expected) * 100:.2f} %), dropped events: {feeder.dropped_events}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000, help="登録・解除を繰り返す回数")
+    parser.add_argument("--churn-interval", type=float, default=1.0, help="登録・解除の間隔（ミリ秒）")
+    parser.add_argument("--interval", type=float, default=0.5, help="合成ホットキー入力の間隔（ミリ秒）")
+    args = parser.parse_args()
+
+    for name, manager in (("incremental", HotkeyManager()), ("restart", RestartingHotkeyManager())):
+        print(f"{name}:")
+        run(manager, args)
+
+
+if __name__ == "__main__":
+    main()
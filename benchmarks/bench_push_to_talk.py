@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+プッシュトゥトークのベンチマーク
+
+HotkeyManager に登録したプッシュトゥトークのホットキーを合成キーイベントで押し続けて離し、
+キーを離してから送信開始（文字起こしAPIの呼び出し直前）までの時間を計測します。
+送信はネットワークに接続せず、アプリケーションと同じく録音停止後に起動する
+スレッドが開始した時刻を記録します。
+
+次の方式を比較します。
+  polling  従来どおり 100 ミリ秒ごとに停止を確認する録音スレッドの終了を待ってから保存する
+  cold     録音ごとにストリームを開き、停止はイベントで即座に通知する
+  warm     ストリームを開いたままにし、キーを押す前の音声（プリロール）も録音に含める
+
+使い方:
+    python benchmarks/bench_push_to_talk.py --takes 50 --hold-ms 500
+    （マイク入力と pynput が動作する環境が必要です）
+"""
+
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+import sounddevice as sd
+from pynput import keyboard
+from src.core.audio_recorder import AudioRecorder
+from src.core.hotkeys import HotkeyManager
+from src.core.recording_store import RecordingStore
+
+HOTKEY = "ctrl+shift+space"
+
+
+class PollingAudioRecorder(AudioRecorder):
+    """比較用: 停止を 100 ミリ秒ごとに確認し、録音スレッドの終了を待ってから保存する従来の方式"""
+
+    def _record(self):
+        with sd.InputStream(samplerate=self.sample_rate, channels=self.channels, callback=self._callback):
+            while self.recording:
+                sd.sleep(100)
+
+    def stop_recording(self):
+        if not self.recording:
+            return None
+        self.recording = False
+        if self._record_thread and self._record_thread.is_alive():
+            self._record_thread.join()
+        self.recording = True
+        return super().stop_recording()
+
+
+class Consumer(threading.Thread):
+    """通知を受けるたびに drain を呼び出すスレッド（GUIスレッドの代わり）"""
+
+    def __init__(self, manager):
+        super().__init__(daemon=True)
+        self.manager = manager
+        self.wakeup = threading.Event()
+        self.stop_event = threading.Event()
+        manager.set_notifier(self.wakeup.set)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            if self.wakeup.wait(0.1):
+                self.wakeup.clear()
+                self.manager.drain()
+
+
+def percentile(values, q):
+    """q パーセンタイル（0〜100）を返す"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def run(name, recorder, args):
+    """1つの方式について、キーを離してから送信開始までの時間と録音の長さを計測する"""
+    manager = HotkeyManager()
+    consumer = Consumer(manager)
+    consumer.start()
+
+    latencies, durations = [], []
+    uploaded = threading.Event()
+
+    def upload(audio_file, released_ns):
+        # perform_transcription で API を呼び出す直前に相当
+        latencies.append((time.perf_counter_ns() - released_ns) / 1e6)
+        uploaded.set()
+
+    def on_press():
+        recorder.start_recording()
+
+    def on_release():
+        audio_file = recorder.stop_recording()
+        take = recorder.recent_takes.get(recorder.last_take_id) if audio_file else None
+        if take:
+            durations.append(take["duration"] * 1000)
+        thread = threading.Thread(target=upload, args=(audio_file, manager.current_event_ns), daemon=True)
+        thread.start()
+
+    manager.register_push_to_talk(HOTKEY, on_press, on_release)
+    keys = keyboard.HotKey.parse(HotkeyManager.parse_hotkey_string(HOTKEY))
+    if args.warm:
+        time.sleep(args.preroll_ms / 1000)
+
+    # 押し続ける時間をずらして、離すタイミングが停止の確認周期と揃わないようにする
+    rng = random.Random(0)
+    for _ in range(args.takes):
+        uploaded.clear()
+        for key in keys:
+            manager.engine.press(key)
+        time.sleep((args.hold_ms + rng.uniform(0, args.jitter_ms)) / 1000)
+        for key in reversed(keys):
+            manager.engine.release(key)
+        uploaded.wait(5)
+        time.sleep(args.gap_ms / 1000)
+
+    consumer.stop_event.set()
+    recorder.stop_warm_stream()
+    print(
+        f"{name:<8} key-up -> upload p50 {statistics.median(latencies):7.2f} ms"
+        f"  p95 {percentile(latencies, 95):7.2f} ms  max {max(latencies):7.2f} ms"
+        f"  take {statistics.median(durations):6.0f} ms for {args.hold_ms:.0f}+ ms hold"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--takes", type=int, default=50, help="録音の回数")
+    parser.add_argument("--hold-ms", type=float, default=500.0, help="キーを押し続ける時間（ミリ秒）")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="押し続ける時間に加える乱数の最大値（ミリ秒）")
+    parser.add_argument("--gap-ms", type=float, default=200.0, help="録音の間隔（ミリ秒）")
+    parser.add_argument("--preroll-ms", type=float, default=300.0, help="warm で録音に含めるキーを押す前の音声（ミリ秒）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = RecordingStore(directory)
+        for name, recorder_class, warm in (
+            ("polling", PollingAudioRecorder, False),
+            ("cold", AudioRecorder, False),
+            ("warm", AudioRecorder, True),
+        ):
+            args.warm = warm
+            recorder = recorder_class(recording_store=store, preroll_seconds=args.preroll_ms / 1000)
+            if warm and not recorder.start_warm_stream():
+                continue
+            run(name, recorder, args)
+        store.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+クライアント側のレート制限のベンチマーク
+
+クォータ（1分あたりのリクエスト数）を設定したテスト用サーバーに、スプールの再送を模した
+バックグラウンドの送信をまとめて行いながら、一定の間隔でホットキーの録音を模した対話的な送信を
+行います。次の方式で、サーバーが返した 429 の回数と送信の所要時間を比較します。
+  none     レート制限なし（429 は SDK の再試行のみで扱う、従来の方式）
+  limiter  RateLimiter で送信を待ち合わせ、対話的な送信を優先する
+
+レート制限の容量は設定せず、応答の x-ratelimit-* ヘッダーから推定させます。
+
+計測する項目:
+  interactive  対話的な送信の開始から文字起こし結果を受け取るまで
+  background   バックグラウンドの送信の開始から文字起こし結果を受け取るまで
+
+使い方:
+    python benchmarks/bench_rate_limit.py --requests-per-minute 60 --background 60 --interactive 10
+    python benchmarks/bench_rate_limit.py --output rate_limit.json
+"""
+
+import argparse
+import queue
+import threading
+import time
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _fixtures import synthetic_speech
+from _harness import print_stages, summarize, write_results
+
+from src.core.fake_server import FakeTranscriptionServer, LatencyDistribution
+from src.core.rate_limiter import RateLimiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from src.core.whisper_api import WhisperTranscriber
+
+SAMPLE_RATE = 16000
+MODES = ("none", "limiter")
+
+
+def run(mode, samples, args):
+    """1つの方式で送信し、所要時間（ミリ秒）と回数を返す"""
+    server = FakeTranscriptionServer(
+        LatencyDistribution("constant", args.server_latency_ms / 1000),
+        requests_per_minute=args.requests_per_minute,
+        seed=0,
+    ).start()
+    limiter = RateLimiter(background_reserve=args.background_reserve, max_wait=60.0) if mode == "limiter" else None
+    transcriber = WhisperTranscriber(
+        api_key="benchmark", azure_endpoint=server.base_url, backend="openai", rate_limiter=limiter
+    )
+
+    durations_ms = {"interactive": [], "background": []}
+    failures = {"interactive": 0, "background": 0}
+    lock = threading.Lock()
+
+    def send(kind, priority):
+        started = time.perf_counter_ns()
+        try:
+            transcriber.transcribe_samples(samples, SAMPLE_RATE, raise_errors=True, priority=priority)
+        except Exception:
+            with lock:
+                failures[kind] += 1
+            return
+        with lock:
+            durations_ms[kind].append((time.perf_counter_ns() - started) / 1e6)
+
+    backlog = queue.SimpleQueue()
+    for _ in range(args.background):
+        backlog.put(None)
+
+    def background_worker():
+        while True:
+            try:
+                backlog.get_nowait()
+            except queue.Empty:
+                return
+            send("background", PRIORITY_BACKGROUND)
+
+    workers = [threading.Thread(target=background_worker) for _ in range(args.concurrency)]
+    for worker in workers:
+        worker.start()
+    interactive = []
+    for _ in range(args.interactive):
+        time.sleep(args.interval_ms / 1000)
+        thread = threading.Thread(target=send, args=("interactive", PRIORITY_INTERACTIVE))
+        thread.start()
+        interactive.append(thread)
+    for thread in workers + interactive:
+        thread.join()
+
+    transcriber.close()
+    server.stop()
+    stats = server.stats()
+    return (
+        {kind: summarize(values) for kind, values in durations_ms.items()},
+        {"rate_limited": stats["rate_limited"], "failures": failures},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests-per-minute", type=float, default=60.0, help="サーバーのクォータ")
+    parser.add_argument("--background", type=int, default=60, help="バックグラウンドの送信の数")
+    parser.add_argument("--concurrency", type=int, default=4, help="バックグラウンドの送信の同時実行数")
+    parser.add_argument("--interactive", type=int, default=10, help="対話的な送信の数")
+    parser.add_argument("--interval-ms", type=float, default=500.0, help="対話的な送信の間隔（ミリ秒）")
+    parser.add_argument("--server-latency-ms", type=float, default=100.0, help="サーバーの応答遅延（ミリ秒）")
+    parser.add_argument("--background-reserve", type=float, default=0.2,
+                        help="バックグラウンドの送信が残しておく容量の割合")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    args = parser.parse_args()
+
+    samples = synthetic_speech(2, SAMPLE_RATE)
+    results = {}
+    for mode in MODES:
+        durations, counts = run(mode, samples, args)
+        results[mode] = {"durations": durations, **counts}
+        print(f"\n[{mode}]")
+        print_stages(durations)
+        print(f"429 responses: {counts['rate_limited']}, failed: {counts['failures']}")
+
+    if args.output:
+        config = {
+            "requests_per_minute": args.requests_per_minute,
+            "background": args.background,
+            "concurrency": args.concurrency,
+            "interactive": args.interactive,
+            "interval_ms": args.interval_ms,
+            "server_latency_ms": args.server_latency_ms,
+            "background_reserve": args.background_reserve,
+        }
+        write_results(args.output, "rate_limit", config, results, section="modes")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+リアルタイム文字起こしのベンチマーク
+
+同じ録音について、停止してから文字起こし結果を受け取るまでの時間を次の方式で比較します。
+  batch     停止後に WAV ファイルを送信し、一括の文字起こしを待つ（従来の方式）
+  realtime  録音中に Realtime API（WebSocket）へ音声を送信し、停止後は確定と最終結果のみを待つ
+
+どちらも同梱のテスト用サーバー（FakeTranscriptionServer）に送信します。一括の文字起こしは受信してから
+音声全体を処理するため、遅延を「基本の遅延 + 音声 1 秒あたりの処理時間 × 録音の長さ」とします。
+リアルタイム文字起こしは音声を受け取りながら処理するため、確定後の遅延は基本の遅延のみです。
+
+計測する段階:
+  stop      録音停止の処理（WAV ファイルへの書き込みを含む）
+  final     録音停止の処理の終了から文字起こし結果を受け取るまで
+  total     録音停止の呼び出しから文字起こし結果を受け取るまで
+
+使い方:
+    python benchmarks/bench_realtime.py --takes 20 --hold-ms 3000 --output realtime.json
+    python benchmarks/bench_realtime.py --server-latency-ms 150 --per-audio-second-ms 40
+"""
+
+import argparse
+import tempfile
+import time
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _fixtures import synthetic_speech
+from _harness import install_fake_sounddevice, print_stages, summarize, write_results
+
+SAMPLE_RATE = 16000
+STAGES = ("stop", "final", "total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--takes", type=int, default=20, help="方式ごとの録音の回数")
+    parser.add_argument("--hold-ms", type=float, default=3000.0, help="録音の長さ（ミリ秒）")
+    parser.add_argument("--server-latency-ms", type=float, default=150.0, help="代替サーバーの基本の応答遅延（ミリ秒）")
+    parser.add_argument("--per-audio-second-ms", type=float, default=40.0,
+                        help="一括の文字起こしで音声 1 秒あたりに加える処理時間（ミリ秒）")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    args = parser.parse_args()
+
+    install_fake_sounddevice(synthetic_speech(30, SAMPLE_RATE))
+
+    # sounddevice の代替を登録してから読み込む
+    from src.core.audio_recorder import AudioRecorder
+    from src.core.recording_store import RecordingStore
+    from src.core.whisper_api import WhisperTranscriber
+    from src.core.fake_server import FakeTranscriptionServer, LatencyDistribution
+
+    latency = args.server_latency_ms / 1000
+    server = FakeTranscriptionServer(
+        LatencyDistribution("constant", latency, per_audio_second=args.per_audio_second_ms / 1000),
+        text="synthetic transcript", seed=0,
+    ).start()
+    transcriber = WhisperTranscriber(api_key="benchmark", azure_endpoint=server.endpoint)
+
+    directory = tempfile.TemporaryDirectory()
+    store = RecordingStore(directory.name)
+    recorder = AudioRecorder(recording_store=store)
+    recorder.start_warm_stream()
+
+    results = {}
+    for name in ("batch", "realtime"):
+        samples_ms = {stage: [] for stage in STAGES}
+        for _ in range(args.takes):
+            session = transcriber.open_realtime_session() if name == "realtime" else None
+            recorder.set_stream_sink(session)
+            recorder.start_recording()
+            if session is not None:
+                session.start(recorder.capture_rate, recorder.capture_channels)
+            time.sleep(args.hold_ms / 1000)
+
+            stop_start = time.perf_counter_ns()
+            audio_file = recorder.stop_recording()
+            recorder.set_stream_sink(None)
+            stop_end = time.perf_counter_ns()
+            if session is not None:
+                text = session.finish()
+            else:
+                text = transcriber.transcribe(audio_file, raise_errors=True)
+            end = time.perf_counter_ns()
+            if not text:
+                raise RuntimeError(f"{name}: no transcript")
+
+            samples_ms["stop"].append((stop_end - stop_start) / 1e6)
+            samples_ms["final"].append((end - stop_end) / 1e6)
+            samples_ms["total"].append((end - stop_start) / 1e6)
+        results[name] = {stage: summarize(values) for stage, values in samples_ms.items()}
+        print(f"\n[{name}]")
+        print_stages(results[name])
+
+    recorder.close()
+    store.stop()
+    transcriber.close()
+    server.stop()
+    sent = server.streamed_bytes / 2 / 24000
+    print(f"\nrealtime audio sent: {sent:.1f} s for {args.takes} takes of {args.hold_ms / 1000:.1f} s")
+
+    if args.output:
+        config = {
+            "takes": args.takes,
+            "hold_ms": args.hold_ms,
+            "server_latency_ms": args.server_latency_ms,
+            "per_audio_second_ms": args.per_audio_second_ms,
+        }
+        write_results(args.output, "realtime", config, results, section="methods")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+デバイス本来のサンプルレートでの録音（native_rate）の精度と処理量のベンチマーク
+
+精度（accuracy）
+  入力のサンプルレートごとに、正弦波を 16 kHz に変換した結果と理想の正弦波との SN 比、
+  16 kHz のナイキスト周波数を超える正弦波の漏れ（折り返し）、ブロック単位の変換と
+  1回で変換した結果の差を計測します。比較のため np.interp の線形補間の結果も表示します。
+
+処理量（throughput）
+  16 kHz モノラルで録音する既定の経路と、デバイス本来の形式（例: 48 kHz ステレオ）で録音して
+  変換する経路について、AudioRecorder のオーディオコールバック1回の時間、変換の実時間比
+  （1秒の処理で何秒分の音声を変換できるか）、実時間で録音したあとの stop_recording の時間を
+  計測します。
+
+使い方:
+    python benchmarks/bench_resample.py
+    python benchmarks/bench_resample.py --rates 44100,48000 --take-seconds 5 --output resample.json
+"""
+
+import time
+import argparse
+import tempfile
+import statistics
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _fixtures import synthetic_speech
+from _harness import install_fake_sounddevice, write_results
+
+try:
+    import sounddevice  # noqa: F401
+except Exception:
+    # 入力ストリームは開かないため、PortAudio がない環境では代替モジュールを使う
+    install_fake_sounddevice(synthetic_speech(1, 16000))
+
+import numpy as np
+from src.core.audio_recorder import AudioRecorder
+from src.core.recording_store import RecordingStore
+from src.core.recent_takes import to_int16
+from src.core.resampler import Resampler
+
+OUTPUT_RATE = 16000
+TONES = (440, 1000, 3000, 6000, 7000)
+ALIAS_TONES = (9000, 12000)
+
+
+def snr_db(output, reference):
+    """reference に対する output の SN 比（dB）"""
+    error = output - reference
+    return float(10 * np.log10(np.mean(reference ** 2) / max(np.mean(error ** 2), 1e-30)))
+
+
+def linear_resample(samples, input_rate):
+    """np.interp による線形補間（比較用）"""
+    count = int(len(samples) * OUTPUT_RATE / input_rate)
+    positions = np.arange(count) * input_rate / OUTPUT_RATE
+    return np.interp(positions, np.arange(len(samples)), samples[:, 0]).reshape(-1, 1)
+
+
+def measure_accuracy(rate, seconds=2.0, block=512):
+    """入力のサンプルレート rate から 16 kHz への変換の精度を計測する"""
+    resampler = Resampler(rate, OUTPUT_RATE)
+    t = np.arange(int(rate * seconds)) / rate
+    # フィルタの過渡応答を除くため、先頭と末尾の 50 ms は比較しない
+    edge = OUTPUT_RATE // 20
+    result = {"taps": resampler.taps}
+
+    for tone in TONES:
+        samples = np.sin(2 * np.pi * tone * t).reshape(-1, 1)
+        converted = resampler.convert(samples)
+        reference = np.sin(2 * np.pi * tone * np.arange(len(converted)) / OUTPUT_RATE).reshape(-1, 1)
+        linear = linear_resample(samples, rate)
+        result[f"snr_{tone}hz_db"] = snr_db(converted[edge:-edge], reference[edge:-edge])
+        result[f"linear_snr_{tone}hz_db"] = snr_db(linear[edge:-edge], reference[:len(linear)][edge:-edge])
+
+    for tone in ALIAS_TONES:
+        if tone >= rate / 2:
+            continue
+        samples = np.sin(2 * np.pi * tone * t).reshape(-1, 1)
+        for name, converted in (("alias", resampler.convert(samples)), ("linear_alias", linear_resample(samples, rate))):
+            level = np.mean(converted[edge:-edge] ** 2) / 0.5
+            result[f"{name}_{tone}hz_db"] = float(10 * np.log10(max(level, 1e-30)))
+
+    # ブロック単位の変換と1回の変換の差
+    samples = synthetic_speech(seconds, rate, seed=1)
+    whole = resampler.convert(samples)
+    blocks = [resampler.process(samples[i:i + block]) for i in range(0, len(samples), block)]
+    blocks.append(resampler.flush())
+    result["streaming_max_diff"] = float(np.max(np.abs(np.concatenate(blocks) - whole)))
+    return result
+
+
+def measure_throughput(rate, channels, seconds, take_seconds, directory):
+    """rate・channels で録音して 16 kHz モノラルに変換する経路の処理量を計測する"""
+    blocksize = rate // 100
+    samples = to_int16(np.repeat(synthetic_speech(seconds, rate, seed=2), channels, axis=1))
+    blocks = [samples[i:i + blocksize] for i in range(0, len(samples) - blocksize + 1, blocksize)]
+
+    recorder = AudioRecorder(recording_store=RecordingStore(directory))
+    # 入力ストリームを開かずにコールバックを直接呼ぶ（開いたままのストリームがある状態として扱う）
+    recorder.capture_rate, recorder.capture_channels = rate, channels
+    recorder._update_capture_format = lambda: None
+    recorder._stream = object()
+
+    # コールバック1回の時間（変換は別スレッドで行われる）
+    recorder.start_recording()
+    callback_us = []
+    for block in blocks:
+        start = time.perf_counter_ns()
+        recorder._callback(block, blocksize, None, None)
+        callback_us.append((time.perf_counter_ns() - start) / 1000)
+    recorder.stop_recording()
+
+    # 変換の実時間比（変換のみ）
+    resampler = Resampler(rate, OUTPUT_RATE)
+    start = time.perf_counter()
+    for block in blocks:
+        resampler.process(block.mean(axis=1, keepdims=True) if channels > 1 else block)
+    resampler.flush()
+    convert_seconds = time.perf_counter() - start
+
+    # 実時間で録音したあとの stop_recording の時間
+    stop_ms = []
+    for _ in range(3):
+        recorder.start_recording()
+        deadline = time.perf_counter()
+        for block in blocks[:int(take_seconds * 100)]:
+            recorder._callback(block, blocksize, None, None)
+            deadline += blocksize / rate
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+        start = time.perf_counter()
+        recorder.stop_recording()
+        stop_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "callback_p50_us": statistics.median(callback_us),
+        "callback_max_us": max(callback_us),
+        "realtime_factor": seconds / convert_seconds if convert_seconds > 0 else float("inf"),
+        "stop_ms": statistics.median(stop_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default="22050,44100,48000,96000", help="カンマ区切りの入力のサンプルレート")
+    parser.add_argument("--channels", type=int, default=2, help="変換する経路の入力のチャンネル数")
+    parser.add_argument("--seconds", type=float, default=30.0, help="処理量の計測に使う音声の長さ（秒）")
+    parser.add_argument("--take-seconds", type=float, default=2.0, help="stop_recording の計測で実時間で録音する長さ（秒）")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    args = parser.parse_args()
+    rates = [int(rate) for rate in args.rates.split(",")]
+
+    accuracy = {}
+    print("accuracy (SNR dB: polyphase / linear interpolation, alias level dB)")
+    for rate in rates:
+        accuracy[str(rate)] = result = measure_accuracy(rate)
+        tones = "  ".join(
+            f"{tone}Hz {result[f'snr_{tone}hz_db']:.1f}/{result[f'linear_snr_{tone}hz_db']:.1f}" for tone in TONES
+        )
+        aliases = "  ".join(
+            f"{tone}Hz {result[f'alias_{tone}hz_db']:.1f}/{result[f'linear_alias_{tone}hz_db']:.1f}"
+            for tone in ALIAS_TONES if f"alias_{tone}hz_db" in result
+        )
+        print(f"  {rate:>6}  taps {result['taps']:>3}  {tones}  alias {aliases}"
+              f"  streaming diff {result['streaming_max_diff']:.1e}")
+
+    throughput = {}
+    print(f"\n{'path':>16} {'cb p50 us':>10} {'cb max us':>10} {'x realtime':>11} {'stop ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        formats = [(OUTPUT_RATE, 1, "default")] + [(rate, args.channels, f"{rate}/{args.channels}ch") for rate in rates]
+        for rate, channels, name in formats:
+            throughput[name] = result = measure_throughput(rate, channels, args.seconds, args.take_seconds, directory)
+            factor = "-" if rate == OUTPUT_RATE else f"{result['realtime_factor']:.0f}"
+            print(f"{name:>16} {result['callback_p50_us']:>10.1f} {result['callback_max_us']:>10.1f}"
+                  f" {factor:>11} {result['stop_ms']:>9.1f}")
+
+    if args.output:
+        write_results(args.output, "resample", vars(args), {"accuracy": accuracy, "throughput": throughput},
+                      section="results")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
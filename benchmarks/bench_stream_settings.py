@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+入力ストリームのブロックサイズとレイテンシの掃引
+
+実際の入力デバイスで、ブロックサイズとレイテンシの組み合わせごとに入力ストリームを
+開き、最初の音声ブロックまでの時間、ストリームが報告する入力レイテンシ、
+コールバックの呼び出し間隔の揺らぎ（ジッター）とオーバーフローを計測します。
+アプリケーションの「自動調整」と同じ計測（src.core.audio_devices）を使い、
+同じ基準で最も良い設定を表示します。
+
+使い方:
+    python benchmarks/bench_stream_settings.py --list
+    python benchmarks/bench_stream_settings.py --device 3 --duration 2 --output sweep.json
+    python benchmarks/bench_stream_settings.py --blocksizes 0,128,256,512 --latencies low,high,0.02
+    （PortAudio と入力デバイスが必要です）
+"""
+
+import argparse
+
+import _fixtures  # noqa: F401  src パッケージを解決するため
+from _harness import write_results
+
+from src.core.audio_devices import (
+    BLOCKSIZE_CANDIDATES, LATENCY_CANDIDATES, list_input_devices, pick_best, probe_candidates, score
+)
+
+
+def parse_latency(value):
+    """"low" / "high" はそのまま、それ以外は秒数として解釈する"""
+    return value if value in ("low", "high") else float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list", action="store_true", help="入力デバイスの一覧を表示して終了する")
+    parser.add_argument("--device", type=int, help="入力デバイスの番号（指定がなければ既定のデバイス）")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="サンプルレート")
+    parser.add_argument("--channels", type=int, default=1, help="チャンネル数")
+    parser.add_argument("--blocksizes", default=",".join(map(str, BLOCKSIZE_CANDIDATES)),
+                        help="カンマ区切りのブロックサイズ（0 は PortAudio に任せる）")
+    parser.add_argument("--latencies", default=",".join(LATENCY_CANDIDATES),
+                        help="カンマ区切りのレイテンシ（low、high、または秒数）")
+    parser.add_argument("--duration", type=float, default=1.0, help="組み合わせごとに音声を受け取る時間（秒）")
+    parser.add_argument("--output", help="結果を書き出す JSON ファイル")
+    args = parser.parse_args()
+
+    if args.list:
+        for device in list_input_devices():
+            marker = "*" if device["is_default"] else " "
+            print(f"{marker}{device['index']:>3}  {device['name']}  ({device['hostapi']}, "
+                  f"low {device['low_latency'] * 1000:.1f} ms / high {device['high_latency'] * 1000:.1f} ms)")
+        return
+
+    candidates = [
+        (int(blocksize), parse_latency(latency))
+        for latency in args.latencies.split(",")
+        for blocksize in args.blocksizes.split(",")
+    ]
+
+    print(f"{'blocksize':>9} {'latency':>8} {'open ms':>9} {'input ms':>9} {'jit p50':>8} {'jit p95':>8}"
+          f" {'jit max':>8} {'overflows':>9} {'score':>8}")
+
+    def show(result):
+        if not result["ok"]:
+            print(f"{result['blocksize']:>9} {str(result['latency']):>8}  failed: {result['error']}")
+            return
+        print(
+            f"{result['blocksize']:>9} {str(result['latency']):>8} {result['open_ms']:>9.1f}"
+            f" {result['stream_latency_ms']:>9.1f} {result['jitter_p50_ms']:>8.2f} {result['jitter_p95_ms']:>8.2f}"
+            f" {result['jitter_max_ms']:>8.2f} {result['overflows']:>9} {score(result):>8.1f}"
+        )
+
+    results = probe_candidates(
+        args.device, args.sample_rate, args.channels, candidates, duration=args.duration, on_result=show
+    )
+
+    best = pick_best(results)
+    if best is None:
+        print("no setting could open the input stream")
+    else:
+        print(f"best: blocksize={best['blocksize']} latency={best['latency']} (score {score(best):.1f})")
+
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key not in ("list", "output")}
+        cases = {f"{r['blocksize']}/{r['latency']}": r for r in results}
+        write_results(args.output, "stream_settings", config, cases, section="cases")
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
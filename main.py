@@ -5,7 +5,12 @@ Open Super Whisper - メインエントリポイント
 アプリケーションを起動するためのメインエントリポイントです。
 """
 
-from src.gui.main import main
+import multiprocessing
 
 if __name__ == "__main__":
+    # 別プロセスでの録音（spawn）をパッケージ化したアプリケーションでも動かすため
+    multiprocessing.freeze_support()
+    # 録音の子プロセス（spawn）はこのファイルを __mp_main__ として読み込むため、
+    # GUI は起動するときにだけ読み込む
+    from src.gui.main import main
     main()
@@ -2,10 +2,56 @@
 コアモジュール
 
 アプリケーションの中核となる機能を提供します。
+
+各クラスは初めて参照したときに読み込みます。録音の子プロセス（capture_child）は spawn で
+src.core パッケージを読み込むため、openai・pynput・テスト用サーバーなどを読み込ませないよう、
+ここでは各モジュールを import しません。
 """
 
-from src.core.whisper_api import WhisperTranscriber
-from src.core.audio_recorder import AudioRecorder
-from src.core.hotkeys import HotkeyManager
+import importlib
+
+_EXPORTS = {
+    "WhisperTranscriber": "src.core.whisper_api",
+    "AudioRecorder": "src.core.audio_recorder",
+    "HotkeyManager": "src.core.hotkeys",
+    "HotkeyEngine": "src.core.hotkey_engine",
+    "TranscriptionSpool": "src.core.transcription_spool",
+    "RecordingStore": "src.core.recording_store",
+    "TranscriptionHistory": "src.core.history_store",
+    "RecentTakes": "src.core.recent_takes",
+    "Tracer": "src.core.tracing",
+    "TakeTrace": "src.core.tracing",
+    "AppMetrics": "src.core.metrics",
+    "MetricsRegistry": "src.core.metrics",
+    "MetricsExporter": "src.core.metrics",
+    "StreamHealth": "src.core.stream_health",
+    "CaptureProcess": "src.core.capture_process",
+    "LevelBuffer": "src.core.levels",
+    "EnergyVAD": "src.core.vad",
+    "Endpointer": "src.core.vad",
+    "SpeculativeUpload": "src.core.speculation",
+    "RealtimeSession": "src.core.realtime",
+    "WebSocket": "src.core.websocket",
+    "TranscriptionBackend": "src.core.backends",
+    "AzureBackend": "src.core.backends",
+    "OpenAICompatibleBackend": "src.core.backends",
+    "LocalBackend": "src.core.backends",
+    "FakeTranscriptionServer": "src.core.fake_server",
+    "LatencyDistribution": "src.core.fake_server",
+    "RateLimiter": "src.core.rate_limiter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["WhisperTranscriber", "AudioRecorder", "HotkeyManager"]
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,213 @@
+"""
+音声入力デバイスの一覧と入力ストリームの設定の計測モジュール
+
+入力デバイスの一覧を取得し、ブロックサイズとレイテンシの候補ごとに入力ストリームを
+短時間開いて、最初の音声ブロックが届くまでの時間とコールバックの呼び出し間隔の揺らぎ
+（ジッター）を計測します。計測結果から最も良い設定を選びます。
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import sounddevice as sd
+
+# 計測するブロックサイズ（0 は PortAudio に任せる）とレイテンシの候補
+BLOCKSIZE_CANDIDATES = (0, 256, 512, 1024)
+LATENCY_CANDIDATES = ("low", "high")
+
+
+def list_input_devices() -> List[Dict]:
+    """
+    入力デバイスの一覧を返す
+
+    Returns
+    -------
+    list of dict
+        index, name, hostapi, default_samplerate, max_input_channels, low_latency, high_latency, is_default
+        （取得できない場合は空のリスト）
+    """
+    try:
+        devices = sd.query_devices()
+        hostapis = sd.query_hostapis()
+        default_input = sd.default.device[0]
+    except Exception as e:
+        print(f"Failed to query audio devices: {e}")
+        return []
+
+    results = []
+    for index, device in enumerate(devices):
+        if device["max_input_channels"] <= 0:
+            continue
+        results.append({
+            "index": device.get("index", index),
+            "name": device["name"],
+            "hostapi": hostapis[device["hostapi"]]["name"],
+            "default_samplerate": device["default_samplerate"],
+            "max_input_channels": device["max_input_channels"],
+            "low_latency": device["default_low_input_latency"],
+            "high_latency": device["default_high_input_latency"],
+            "is_default": device.get("index", index) == default_input,
+        })
+    return results
+
+
+def find_input_device(name: Optional[str]) -> Optional[int]:
+    """
+    名前から入力デバイスの番号を探す（番号は接続状況で変わるため、設定には名前を保存する）
+
+    Parameters
+    ----------
+    name : str or None
+        デバイス名
+
+    Returns
+    -------
+    int or None
+        デバイスの番号（見つからない場合や名前が空の場合は None = 既定のデバイス）
+    """
+    if not name:
+        return None
+    for device in list_input_devices():
+        if device["name"] == name:
+            return device["index"]
+    return None
+
+
+def probe_stream(device=None, sample_rate=16000, channels=1, blocksize=0, latency=None,
+                 duration=0.5) -> Dict:
+    """
+    入力ストリームを指定の設定で短時間開き、開く時間とジッターを計測する
+
+    Parameters
+    ----------
+    device : int, optional
+        デバイスの番号（Noneは既定のデバイス）
+    sample_rate : int
+        サンプルレート
+    channels : int
+        チャンネル数
+    blocksize : int
+        ブロックサイズ（0 は PortAudio に任せる）
+    latency : str or float, optional
+        "low"、"high"、または秒数
+    duration : float
+        音声を受け取る時間（秒）
+
+    Returns
+    -------
+    dict
+        blocksize, latency, ok, error, open_ms（開き始めてから最初のブロックまで）,
+        stream_latency_ms（ストリームが報告する入力レイテンシ）, callbacks, overflows,
+        jitter_p50_ms, jitter_p95_ms, jitter_max_ms
+    """
+    result = {"blocksize": blocksize, "latency": latency, "ok": False, "error": None}
+    arrivals = []
+    overflows = [0]
+    first_block = threading.Event()
+
+    def callback(indata, frames, time_info, status):
+        arrivals.append((time.perf_counter(), frames))
+        if status and status.input_overflow:
+            overflows[0] += 1
+        first_block.set()
+
+    started = time.perf_counter()
+    try:
+        with sd.InputStream(samplerate=sample_rate, channels=channels, callback=callback,
+                            device=device, blocksize=blocksize, latency=latency) as stream:
+            if not first_block.wait(max(1.0, duration * 4)):
+                result["error"] = "no audio received"
+                return result
+            result["open_ms"] = (arrivals[0][0] - started) * 1000
+            stream_latency = stream.latency
+            time.sleep(duration)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+    # ジッターは呼び出し間隔とブロックの長さの差
+    jitter = sorted(
+        abs((now - previous) - frames / sample_rate) * 1000
+        for (previous, _), (now, frames) in zip(arrivals, arrivals[1:])
+    )
+    result.update({
+        "ok": True,
+        "stream_latency_ms": (stream_latency[0] if isinstance(stream_latency, tuple) else stream_latency) * 1000,
+        "callbacks": len(arrivals),
+        "overflows": overflows[0],
+        "jitter_p50_ms": jitter[len(jitter) // 2] if jitter else 0.0,
+        "jitter_p95_ms": jitter[min(len(jitter) - 1, int(len(jitter) * 0.95))] if jitter else 0.0,
+        "jitter_max_ms": jitter[-1] if jitter else 0.0,
+    })
+    return result
+
+
+def probe_candidates(device=None, sample_rate=16000, channels=1,
+                     candidates: Optional[Sequence[Tuple[int, object]]] = None,
+                     duration=0.5, on_result=None) -> List[Dict]:
+    """
+    ブロックサイズとレイテンシの候補を順に計測する
+
+    Parameters
+    ----------
+    device : int, optional
+        デバイスの番号（Noneは既定のデバイス）
+    sample_rate : int
+        サンプルレート
+    channels : int
+        チャンネル数
+    candidates : list of tuple, optional
+        (ブロックサイズ, レイテンシ) のリスト。指定がなければ BLOCKSIZE_CANDIDATES と
+        LATENCY_CANDIDATES のすべての組み合わせ。
+    duration : float
+        候補ごとに音声を受け取る時間（秒）
+    on_result : Callable[[dict], None], optional
+        候補を1つ計測するたびに呼ばれる関数
+
+    Returns
+    -------
+    list of dict
+        候補ごとの probe_stream の結果
+    """
+    if candidates is None:
+        candidates = [(b, l) for l in LATENCY_CANDIDATES for b in BLOCKSIZE_CANDIDATES]
+    results = []
+    for blocksize, latency in candidates:
+        result = probe_stream(device, sample_rate, channels, blocksize, latency, duration)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def score(result: Dict) -> float:
+    """
+    計測結果の評価値（小さいほど良い）
+
+    録音開始までの遅れ（開く時間 + 入力レイテンシ）と、ジッターの p95 の2倍の合計です。
+    ジッターはブロックの到着が遅れる分だけ、送信の開始や音声の欠落に影響するため重く数えます。
+    """
+    return result["open_ms"] + result["stream_latency_ms"] + 2 * result["jitter_p95_ms"]
+
+
+def pick_best(results: Sequence[Dict]) -> Optional[Dict]:
+    """
+    計測結果から最も良い設定を選ぶ
+
+    開けなかった設定を除き、オーバーフローのない設定を優先して、評価値が最小のものを選びます。
+
+    Parameters
+    ----------
+    results : list of dict
+        probe_stream の結果
+
+    Returns
+    -------
+    dict or None
+        選んだ結果（すべて失敗した場合はNone）
+    """
+    usable = [r for r in results if r["ok"]]
+    if not usable:
+        return None
+    return min(usable, key=lambda r: (r["overflows"] > 0, score(r)))
@@ -3,10 +3,25 @@ import time
 import wave
 import threading
 import tempfile
+from collections import deque
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
-from datetime import datetime
+
+from src.core.recording_store import RecordingStore
+from src.core.recent_takes import RecentTakes
+from src.core.tracing import NULL_TRACE
+from src.core.stream_health import StreamHealth
+from src.core.resampler import ResampleWorker
+from src.core.capture_process import CaptureProcess
+from src.core.levels import LevelBuffer, block_levels
+from src.core.vad import ENDPOINT_PAUSE
+
+# native_rate で録音するチャンネル数の上限（多チャンネルのデバイスでも先頭の2チャンネルまで）
+MAX_NATIVE_CHANNELS = 2
+
+# 子プロセスで入力する場合に、リングバッファの新しい音声で停止の判定と送信を行う間隔（秒）
+CAPTURE_POLL_INTERVAL = 0.05
 
 
 class AudioRecorder:
@@ -14,9 +29,36 @@ class AudioRecorder:
     音声録音機能を処理するクラス
     
     オーディオの録音、保存、状態管理の機能を提供します。
+    
+    ``start_warm_stream`` で入力ストリームを開いたままにしておくと、録音の開始・停止で
+    デバイスを開閉せずに済み、録音開始直前の音声（プリロール）も録音に含めます。
+    
+    オーディオコールバックのオーバーフロー・アンダーフロー、呼び出し間隔のジッターと
+    処理時間を、録音ごと（last_take_health）と起動してから（get_health）で集計します。
+    
+    音声はオーディオコールバックのブロックからプリロール、録音、ファイルへの書き込みまで
+    int16 のまま扱います（float32 の半分のメモリで、書き込み時の変換も不要です）。
+    
+    ``native_rate`` を有効にすると、デバイス本来のサンプルレート・チャンネル数で録音し、
+    録音中に別スレッド（ResampleWorker）で sample_rate のモノラルに変換します。
+    
+    ``capture_process`` を有効にすると、入力ストリームを子プロセス（CaptureProcess）で開き、
+    共有メモリのリングバッファに書き込まれた音声を停止時にコピーせずに読み出します。
+    子プロセスは close を呼ぶまで入力ストリームを開いたままにします。
+    子プロセスの起動は入力ストリームを開くまで待つため、``start_warm_stream`` を別スレッドから
+    呼び出せます。起動中に録音を開始した場合は、その録音だけこのプロセスの入力ストリームで録音します。
+    
+    ``set_endpointing`` で Endpointer を設定すると、録音中の音声で発話の終わりと最大の長さを
+    判定し、停止する場合は on_endpoint を呼びます（オーディオスレッドから呼ばれるため、
+    録音の停止は呼び出し側でGUIスレッドに移してください）。
+    
+    ``set_stream_sink`` で送信先（RealtimeSession など put を持つオブジェクト）を設定すると、
+    録音中の音声ブロックを受け取り次第 capture_rate・capture_channels のまま渡します。
     """
     
-    def __init__(self, sample_rate=16000, channels=1):
+    def __init__(self, sample_rate=16000, channels=1, recording_store=None, recent_takes=None, preroll_seconds=0.0,
+                 metrics=None, device=None, blocksize=0, latency=None, native_rate=False,
+                 capture_process=False):
         """
         AudioRecorderの初期化
         
@@ -26,13 +68,289 @@ class AudioRecorder:
             録音するサンプルレート (デフォルト: 16000)
         channels : int
             オーディオチャンネル数 (デフォルト: 1 モノラル)
+        recording_store : RecordingStore, optional
+            録音ファイルの保存先と保持ポリシー。指定がなければ一時ディレクトリ配下に保存します。
+        recent_takes : RecentTakes, optional
+            直近の録音をメモリ上に保持するバッファ。指定がなければ既定の上限で作成します。
+        preroll_seconds : float
+            ストリームを開いたままにしている間、録音開始前の音声を保持する秒数（0で無効）
+        metrics : AppMetrics, optional
+            保存した録音の件数と長さを記録するメトリクス
+        device : int, optional
+            入力デバイスの番号（Noneは既定のデバイス）
+        blocksize : int
+            コールバック1回あたりのフレーム数（0 は PortAudio に任せる）
+        latency : str or float, optional
+            入力レイテンシ（"low"、"high"、または秒数。Noneは sounddevice の既定値）
+        native_rate : bool
+            デバイス本来のサンプルレート・チャンネル数で録音し、sample_rate・channels に変換するかどうか
+        capture_process : bool
+            入力ストリームを子プロセスで開き、共有メモリを介して音声を受け取るかどうか
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.recording = False
         self.audio_data = []
-        self.temp_dir = tempfile.gettempdir()
+        self.recording_store = recording_store or RecordingStore(
+            os.path.join(tempfile.gettempdir(), "open_super_whisper")
+        )
+        self.temp_dir = self.recording_store.directory
+        self.recent_takes = recent_takes or RecentTakes()
+        self.last_take_id = None
+        self.preroll_seconds = preroll_seconds
+        self.metrics = metrics
+        self.device = device
+        self.blocksize = blocksize
+        self.latency = latency
+        self.native_rate = native_rate
+        self.capture_process = capture_process
         self._record_thread = None
+        self._stop_event = threading.Event()
+
+        # 開いたままの入力ストリームと、録音開始前の音声（ブロック単位）
+        # 録音状態・audio_data・プリロールはオーディオコールバックと共有するためロックで保護する
+        self._stream = None
+        self._lock = threading.Lock()
+        self._preroll = deque()
+        self._preroll_frames = 0
+        
+        # 入力ストリームのサンプルレート・チャンネル数と、録音中の変換スレッド
+        self.capture_rate = sample_rate
+        self.capture_channels = channels
+        self._converter = None
+        
+        # 子プロセスでの入力と、録音の開始位置・開始時点のコールバックの集計
+        # 子プロセスの起動・終了は別スレッドから呼ばれる場合があるためロックで直列化する
+        self._capture = None
+        self._capture_lock = threading.Lock()
+        # 録音中の音声を読み出す子プロセス（このプロセスの入力ストリームで録音している場合はNone）
+        self._take_capture = None
+        self._take_start = 0
+        self._take_baseline = StreamHealth()
+        
+        # コールバックの状態の集計（録音中は録音ごと、それ以外は録音の間の分を _health に記録する）
+        self.last_take_health = StreamHealth()
+        self._health = StreamHealth()
+        self._health_total = StreamHealth()
+        self._last_callback = None
+        
+        # 表示用の入力レベル（表示している間だけコールバックで計算する）
+        self.levels = LevelBuffer()
+        
+        # 録音の自動停止の判定と通知先（子プロセスで入力する場合は監視スレッドで判定する）
+        self.endpointer = None
+        self.on_endpoint = None
+        self._endpoint_stop = threading.Event()
+        
+        # 録音中の音声ブロックの送信先（リアルタイム文字起こし）と、子プロセスで入力する場合の監視スレッド
+        self._sink = None
+        self._watcher = None
+
+    def start_warm_stream(self):
+        """
+        入力ストリームを開いたままにする
+        
+        以降の録音はこのストリームの音声を使い、録音開始前の preroll_seconds 秒分の
+        音声も録音に含めます。
+        
+        Returns
+        -------
+        bool
+            ストリームを開始できた場合（すでに開いている場合を含む）True
+        """
+        if self.capture_process:
+            return self._start_capture()
+        if self._stream is not None:
+            return True
+        self._last_callback = None
+        self._update_capture_format()
+        try:
+            stream = self._open_stream()
+            stream.start()
+        except Exception as e:
+            print(f"Failed to open warm input stream: {e}")
+            return False
+        self._stream = stream
+        return True
+
+    def stop_warm_stream(self):
+        """
+        開いたままの入力ストリームを閉じる（録音中の場合、以降の音声は記録されません）
+        
+        子プロセスの入力ストリームは閉じません（close で終了します）。
+        """
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            print(f"Failed to close warm input stream: {e}")
+        with self._lock:
+            self._preroll.clear()
+            self._preroll_frames = 0
+
+    def configure_stream(self, device=None, blocksize=0, latency=None, native_rate=None, capture_process=None):
+        """
+        入力デバイス・ブロックサイズ・レイテンシを変更する
+        
+        開いたままの入力ストリームがある場合は新しい設定で開き直します。
+        録音中の場合、変更は次の録音から反映されます。
+        
+        Parameters
+        ----------
+        device : int, optional
+            入力デバイスの番号（Noneは既定のデバイス）
+        blocksize : int
+            コールバック1回あたりのフレーム数（0 は PortAudio に任せる）
+        latency : str or float, optional
+            入力レイテンシ（"low"、"high"、または秒数）
+        native_rate : bool, optional
+            デバイス本来のサンプルレート・チャンネル数で録音するかどうか（Noneは変更しない）
+        capture_process : bool, optional
+            入力ストリームを子プロセスで開くかどうか（Noneは変更しない）
+        
+        Returns
+        -------
+        bool
+            開いたままの入力ストリームを開き直せなかった場合False
+        """
+        self.device = device
+        self.blocksize = blocksize
+        self.latency = latency
+        if native_rate is not None:
+            self.native_rate = native_rate
+        if capture_process is not None:
+            self.capture_process = capture_process
+        if self.recording:
+            return True
+        warm = self._stream is not None or self._capture is not None
+        self._stop_capture()
+        self.stop_warm_stream()
+        if not warm and not self.capture_process:
+            return True
+        return self.start_warm_stream()
+    
+    def close(self):
+        """
+        入力ストリームと子プロセスを終了する（アプリケーションの終了時に呼び出す）
+        """
+        self.stop_warm_stream()
+        self._stop_capture()
+    
+    def set_endpointing(self, endpointer, on_endpoint=None):
+        """
+        録音の自動停止の判定を設定する
+        
+        Parameters
+        ----------
+        endpointer : Endpointer or None
+            録音中の音声で停止を判定する Endpointer（None で自動停止しない）
+        on_endpoint : Callable[[str], None], optional
+            停止すると判定したときに理由（ENDPOINT_SILENCE など）を渡して呼ぶ関数
+        """
+        self.endpointer = endpointer
+        self.on_endpoint = on_endpoint
+    
+    def set_stream_sink(self, sink):
+        """
+        録音中の音声ブロックの送信先を設定する（録音の開始前に設定するとプリロールも渡します）
+        
+        Parameters
+        ----------
+        sink : object or None
+            put(block) を持つ送信先（オーディオスレッドから呼ばれます）。None で送信しない
+        """
+        self._sink = sink
+    
+    def _start_capture(self, wait=True):
+        """
+        子プロセスの入力ストリームを開始する
+        
+        Parameters
+        ----------
+        wait : bool
+            別スレッドが起動している最中の場合に、その完了を待つかどうか
+        
+        Returns
+        -------
+        bool
+            開始できた場合（すでに開始している場合を含む）True。
+            wait が False で別スレッドが起動している最中の場合は False
+        """
+        if not self._capture_lock.acquire(blocking=wait):
+            return False
+        try:
+            if self._capture is not None:
+                return True
+            self._update_capture_format()
+            capture = CaptureProcess(
+                self.capture_rate, self.capture_channels, self.device, self.blocksize, self.latency,
+                metrics=self.metrics,
+            )
+            if not capture.start():
+                return False
+            self._capture = capture
+            return True
+        finally:
+            self._capture_lock.release()
+    
+    def _stop_capture(self):
+        """
+        子プロセスの入力ストリームを終了する
+        """
+        with self._capture_lock:
+            capture, self._capture = self._capture, None
+        if capture is not None:
+            capture.stop()
+    
+    def _open_stream(self):
+        """
+        現在の設定で入力ストリームを作成する（開始はしない）
+        
+        Returns
+        -------
+        sd.InputStream
+            作成した入力ストリーム
+        """
+        return sd.InputStream(
+            samplerate=self.capture_rate,
+            channels=self.capture_channels,
+            callback=self._callback,
+            device=self.device,
+            blocksize=self.blocksize,
+            latency=self.latency,
+            dtype="int16",
+        )
+    
+    def _update_capture_format(self):
+        """
+        入力ストリームのサンプルレートとチャンネル数を決める
+        
+        native_rate の場合はデバイスの既定のサンプルレートと入力チャンネル数（MAX_NATIVE_CHANNELS まで）、
+        取得できない場合や native_rate でない場合は sample_rate と channels です。
+        """
+        rate, channels = self.sample_rate, self.channels
+        if self.native_rate:
+            try:
+                info = sd.query_devices(self.device, "input")
+                rate = int(info["default_samplerate"])
+                channels = max(1, min(int(info["max_input_channels"]), MAX_NATIVE_CHANNELS))
+            except Exception as e:
+                print(f"Failed to query input device format: {e}")
+        self.capture_rate, self.capture_channels = rate, channels
+    
+    def is_warm(self):
+        """
+        入力ストリームを開いたままにしているかどうか
+        
+        Returns
+        -------
+        bool
+            開いたままの入力ストリームがある場合True
+        """
+        return self._stream is not None
 
     def start_recording(self):
         """
@@ -43,65 +361,346 @@ class AudioRecorder:
         bool
             録音開始成功時にTrue
         """
-        self.recording = True
-        self.audio_data = []
+        # 子プロセスを別スレッドで起動している最中は待たず、このプロセスの入力ストリームで録音する
+        if self.capture_process and self._start_capture(wait=False):
+            # 子プロセスが書き込み続けているリングバッファの位置を録音の開始とする（プリロールを含む）
+            capture = self._capture
+            with self._lock:
+                preroll = int(self.preroll_seconds * self.capture_rate)
+                self._take_start = max(0, capture.position() - preroll)
+                self._take_baseline = capture.health()
+                capture.reset_max()
+                self._take_capture = capture
+                self.recording = True
+            if self.endpointer is not None:
+                self.endpointer.reset(self.capture_rate)
+            if self.endpointer is not None or self._sink is not None:
+                self._endpoint_stop = threading.Event()
+                self._watcher = threading.Thread(
+                    target=self._watch_capture,
+                    args=(capture, self._take_start, self._endpoint_stop, self.endpointer, self._sink), daemon=True,
+                )
+                self._watcher.start()
+            return True
+        
+        if self._stream is None:
+            self._update_capture_format()
+        
+        # 録音の形式が送信の形式と異なる場合は、録音中に別スレッドで変換する
+        converter = None
+        if self.capture_rate != self.sample_rate or self.capture_channels != self.channels:
+            converter = ResampleWorker(self.capture_rate, self.sample_rate, self.channels)
+        if self.endpointer is not None:
+            self.endpointer.reset(self.capture_rate)
+        
+        with self._lock:
+            # プリロールを録音の先頭にする
+            if converter is not None:
+                for block in self._preroll:
+                    converter.put(block)
+                self.audio_data = []
+            else:
+                self.audio_data = list(self._preroll)
+            if self._sink is not None:
+                for block in self._preroll:
+                    self._sink.put(block)
+            stale, self._converter = self._converter, converter
+            self._preroll.clear()
+            self._preroll_frames = 0
+            self._take_capture = None
+            self.recording = True
+            
+            # 録音の間の集計を合計に加え、この録音の集計を始める
+            self._health_total.merge(self._health)
+            self._health = StreamHealth()
+            if self._stream is None:
+                self._last_callback = None
         
+        # 録音スレッドのエラーで停止されなかった録音の変換スレッドを終了する
+        if stale is not None:
+            stale.finish()
+
+        if self._stream is not None:
+            return True
+
+        # 前回の録音スレッドがストリームを閉じ終えるのを待つ
+        if self._record_thread and self._record_thread.is_alive():
+            self._record_thread.join()
+
         # 別スレッドで録音を開始
+        self._stop_event.clear()
         self._record_thread = threading.Thread(target=self._record)
         self._record_thread.daemon = True
         self._record_thread.start()
         
         return True
     
-    def stop_recording(self):
+    def stop_recording(self, trace=NULL_TRACE):
         """
         音声録音を停止し、保存したファイル名を返す
         
+        Parameters
+        ----------
+        trace : TakeTrace, optional
+            ファイルへの書き込み時間（file_write）を記録するトレース
+        
         Returns
         -------
         str or None
             保存された音声ファイルパス、失敗時はNone
         """
-        if not self.recording:
-            return None
-            
-        self.recording = False
+        with self._lock:
+            if not self.recording:
+                return None
+            self.recording = False
+            blocks, self.audio_data = self.audio_data, []
+            converter, self._converter = self._converter, None
+            health, self._health = self._health, StreamHealth()
+            self._health_total.merge(health)
+            capture = self._take_capture
+            if capture is not None:
+                take_start, take_end = self._take_start, capture.position()
+        if capture is not None:
+            health = capture.health().since(self._take_baseline)
+        self.last_take_health = health
+        if self.metrics is not None:
+            self.metrics.record_stream_health(health)
         
-        # 録音スレッドの終了を待機
-        if self._record_thread and self._record_thread.is_alive():
-            self._record_thread.join()
+        # 録音スレッドにストリームを閉じさせる（以降のブロックは記録されないため終了は待たない）
+        self._stop_event.set()
+        self._endpoint_stop.set()
         
-        # 現在のタイムスタンプに基づいたファイル名を生成
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(self.temp_dir, f"recording_{timestamp}.wav")
+        # 監視スレッドに最後の音声を送信先へ渡させる
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.join()
         
-        # 録音した音声を保存
-        if len(self.audio_data) > 0:
-            audio_data = np.concatenate(self.audio_data, axis=0)
-            sf.write(filename, audio_data, self.sample_rate)
+        # 子プロセスのリングバッファの録音範囲（変換が不要な場合はコピーしないビュー）
+        if capture is not None:
+            samples = capture.read(take_start, take_end)
+            blocks = [samples] if samples is not None else []
+            if blocks and (self.capture_rate != self.sample_rate or self.capture_channels != self.channels):
+                converter = ResampleWorker(self.capture_rate, self.sample_rate, self.channels)
+                converter.put(samples)
+        
+        # 変換スレッドに残りのブロックを変換させる
+        if converter is not None:
+            with trace.span("resample"):
+                blocks = converter.finish()
+        
+        # 録音した音声を衝突しないファイル名で保存
+        self.last_take_id = None
+        if len(blocks) > 0:
+            audio_data = blocks[0] if len(blocks) == 1 else np.concatenate(blocks, axis=0)
+            filename = self.recording_store.new_path()
+            with trace.span("file_write"):
+                try:
+                    sf.write(filename, audio_data, self.sample_rate)
+                except Exception:
+                    self.recording_store.discard(filename)
+                    raise
+                self.recording_store.commit(filename)
+            
+            # リングバッファのビューは上書きされるため、保持する分は複製する
+            if capture is not None and converter is None:
+                if not capture.is_intact(take_start):
+                    print("Capture ring buffer was overwritten while reading the take")
+                audio_data = audio_data.copy()
+
+            # 再文字起こし用にメモリ上にも保持
+            self.last_take_id = self.recent_takes.add(audio_data, self.sample_rate, path=filename)
+            if self.metrics is not None:
+                self.metrics.recorded_takes.inc()
+                self.metrics.recorded_audio_seconds.inc(len(audio_data) / self.sample_rate)
             return filename
         
         return None
     
+    def snapshot(self):
+        """
+        録音中の、ここまでの音声の複製を返す（録音は続けます）
+        
+        Returns
+        -------
+        np.ndarray or None
+            形状 (フレーム数, channels) の sample_rate の int16 の音声。録音中でない場合はNone
+        """
+        with self._lock:
+            if not self.recording:
+                return None
+            blocks = list(self.audio_data)
+            converter, capture = self._converter, self._take_capture
+            take_start = self._take_start
+        
+        if capture is not None:
+            samples = capture.read(take_start, capture.position())
+            if samples is None:
+                return None
+            if self.capture_rate == self.sample_rate and self.capture_channels == self.channels:
+                return samples.copy()
+            converter = ResampleWorker(self.capture_rate, self.sample_rate, self.channels)
+            converter.put(samples)
+            blocks = converter.finish()
+        elif converter is not None:
+            blocks = converter.snapshot()
+        
+        if not blocks:
+            return None
+        return np.concatenate(blocks, axis=0)
+    
+    def _callback(self, indata, frames, time_info, status):
+        """
+        入力ストリームのコールバック（オーディオスレッドから呼ばれる）
+        
+        録音中は audio_data（変換する場合は変換スレッド）に、開いたままのストリームで
+        録音していない間はプリロールに追加します。
+        状態フラグ、前回の呼び出しからの間隔とコールバック内の処理時間を集計します。
+        """
+        entered = time.perf_counter()
+        self.levels.push(indata)
+        with self._lock:
+            recording = self.recording
+            if recording:
+                block = indata.copy()
+                if self._converter is not None:
+                    self._converter.put(block)
+                else:
+                    self.audio_data.append(block)
+                if self._sink is not None:
+                    self._sink.put(block)
+            elif self.preroll_seconds > 0 and self._stream is not None:
+                self._preroll.append(indata.copy())
+                self._preroll_frames += frames
+                # 保持する秒数を超えた古いブロックを捨てる
+                limit = int(self.preroll_seconds * self.capture_rate)
+                while self._preroll_frames - len(self._preroll[0]) >= limit:
+                    self._preroll_frames -= len(self._preroll.popleft())
+            
+            # ジッターは呼び出し間隔とブロックの長さの差
+            last, self._last_callback = self._last_callback, entered
+            jitter = entered - last - frames / self.capture_rate if last is not None else None
+            self._health.record(frames, status, time.perf_counter() - entered, jitter)
+        
+        # 停止の通知はロックの外で行う（通知先が録音の状態を参照できるように）
+        endpointer = self.endpointer
+        if recording and endpointer is not None:
+            reason = endpointer.process(indata)
+            if reason is not None and self.on_endpoint is not None:
+                self.on_endpoint(reason)
+
+    def _watch_capture(self, capture, position, stop, endpointer=None, sink=None):
+        """
+        子プロセスで入力している間、リングバッファに書き込まれた音声で録音の停止を判定し、送信先に渡す
+        
+        Parameters
+        ----------
+        capture : CaptureProcess
+            録音中の子プロセス
+        position : int
+            録音の開始のリングバッファの位置
+        stop : threading.Event
+            録音の停止時にセットされるイベント
+        endpointer : Endpointer, optional
+            停止の判定
+        sink : object, optional
+            音声ブロックの送信先
+        """
+        while True:
+            stopped = stop.wait(CAPTURE_POLL_INTERVAL)
+            end = capture.position()
+            samples = capture.read(position, end)
+            position = end
+            if samples is not None and sink is not None:
+                # リングバッファのビューは上書きされるため複製して渡す
+                sink.put(samples.copy())
+            if stopped:
+                return
+            if samples is None:
+                continue
+            reason = endpointer.process(samples) if endpointer is not None else None
+            if reason is not None:
+                if self.on_endpoint is not None and not stop.is_set():
+                    self.on_endpoint(reason)
+                if reason != ENDPOINT_PAUSE:
+                    endpointer = None
+            if endpointer is None and sink is None:
+                return
+    
     def _record(self):
         """
         音声データを録音する内部メソッド
+        
+        停止が要求されるまでストリームを開いたまま待機します（ポーリングはしません）。
         """
         try:
-            def callback(indata, frames, time, status):
-                if status:
-                    print(f"Status: {status}")
-                if self.recording:
-                    self.audio_data.append(indata.copy())
-            
-            with sd.InputStream(samplerate=self.sample_rate, channels=self.channels, callback=callback):
-                while self.recording:
-                    sd.sleep(100)  # CPUの過剰消費を避けるためのスリープ
+            with self._open_stream():
+                self._stop_event.wait()
                     
         except Exception as e:
             print(f"Recording error: {e}")
-            self.recording = False
+            with self._lock:
+                self.recording = False
 
+    def set_level_metering(self, enabled):
+        """
+        表示用の入力レベルの計算を有効・無効にする
+        
+        Parameters
+        ----------
+        enabled : bool
+            レベルを計算するかどうか（レベルメーターを表示している間だけ True にします）
+        """
+        if enabled and not self.levels.enabled:
+            self.levels.clear()
+        self.levels.enabled = enabled
+    
+    def get_levels(self, count):
+        """
+        直近 count ブロック（1ブロックは 10 ms）分の入力レベルを返す
+        
+        子プロセスで入力している場合は、共有メモリのリングバッファから直近の音声を読んで
+        その場で計算します（コールバックでは計算しません）。
+        
+        Parameters
+        ----------
+        count : int
+            ブロック数
+        
+        Returns
+        -------
+        tuple of np.ndarray
+            (RMS, ピーク)。古い順で、フルスケールが 1.0
+        """
+        capture = self._capture
+        if capture is not None:
+            block = max(1, self.capture_rate // 100)
+            end = capture.position()
+            samples = capture.read(max(0, end - count * block), end)
+            count = 0 if samples is None else min(count, len(samples) // block)
+            if count == 0:
+                empty = np.zeros(0, dtype=np.float32)
+                return empty, empty
+            return block_levels(samples[len(samples) - count * block:], count)
+        return self.levels.latest(count)
+    
+    def get_health(self):
+        """
+        起動してからのコールバックの状態の集計を返す
+        
+        Returns
+        -------
+        StreamHealth
+            集計値の複製（録音中の分を含む）
+        """
+        health = StreamHealth()
+        with self._lock:
+            health.merge(self._health_total)
+            health.merge(self._health)
+        capture = self._capture
+        if capture is not None:
+            health.merge(capture.health())
+        return health
+    
     def is_recording(self):
         """
         録音中かどうかをチェック
@@ -0,0 +1,301 @@
+"""
+文字起こしバックエンドモジュール
+
+WhisperTranscriber が音声を送信する先を切り替えるためのインターフェース（TranscriptionBackend）と、
+その実装を提供します。
+
+- AzureBackend: Azure OpenAI（従来の送信先）
+- OpenAICompatibleBackend: OpenAI 互換の HTTP API（LAN 上の自前の Whisper サーバーなど）
+- LocalBackend: 同梱のテスト用サーバー（FakeTranscriptionServer）をアプリ内で起動して送信する
+
+WhisperTranscriber はパラメータの組み立て・メトリクス・応答の変換を行い、バックエンドは
+クライアントの作成、モデル名の解決、利用可能なモデルの一覧のみを担当します。
+"""
+
+from typing import Dict, List, Mapping, Optional, Protocol, Tuple
+
+import openai
+
+try:
+    from openai import AzureOpenAI, OpenAI
+except Exception:  # pragma: no cover
+    AzureOpenAI = OpenAI = None
+
+from src.core.realtime import realtime_url
+
+BACKEND_AZURE = "azure"
+BACKEND_OPENAI = "openai"
+BACKEND_LOCAL = "local"
+BACKEND_TYPES = (BACKEND_AZURE, BACKEND_OPENAI, BACKEND_LOCAL)
+
+# バックエンドがモデルの一覧を返せない場合に使うモデルのリスト
+DEFAULT_MODELS = [
+    {"id": "whisper-1", "name": "Whisper", "description": "OpenAI's open-source Whisper model"},
+    {"id": "gpt-4o-transcribe", "name": "GPT-4o Transcribe", "description": "High-performance transcription model"},
+    {"id": "gpt-4o-mini-transcribe", "name": "GPT-4o Mini Transcribe", "description": "Lightweight and fast transcription model"}
+]
+
+# モデルの一覧を取得するときのタイムアウト（秒、GUI の表示を待たせないため短くする）
+LIST_MODELS_TIMEOUT = 3.0
+
+
+class TranscriptionBackend(Protocol):
+    """
+    文字起こしの送信先のインターフェース
+
+    Attributes
+    ----------
+    name : str
+        バックエンドの種類（BACKEND_AZURE など）
+    endpoint : str
+        送信先の URL（トレースと診断情報に表示します）
+    deployment : str or None
+        モデルの代わりに使う Azure の deployment 名（ない場合はNone）
+    """
+
+    name: str
+    endpoint: str
+    deployment: Optional[str]
+
+    def model_name(self, model: str) -> str:
+        """API に渡すモデル名（Azure では deployment 名）を返す"""
+
+    def create_transcription(self, audio, params: Dict) -> Tuple[object, Mapping[str, str]]:
+        """文字起こしAPIを呼び出し、(SDK の戻り値, 応答のヘッダー) を返す（失敗時は例外を送出する）"""
+
+    def list_models(self) -> List[Dict[str, str]]:
+        """利用可能なモデルの一覧（id, name, description の辞書のリスト）を返す"""
+
+    def realtime_connection(self, api_version: str, model: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """リアルタイム文字起こしの (WebSocket の URL, ヘッダー) を返す（非対応の場合はNone）"""
+
+    def close(self) -> None:
+        """バックエンドが使うリソースを解放する"""
+
+
+def describe_models(model_ids: List[str]) -> List[Dict[str, str]]:
+    """
+    モデルIDのリストを、表示名と説明を付けたモデルの一覧に変換する
+
+    既知のモデルは DEFAULT_MODELS の表示名と説明を使い、それ以外は ID をそのまま表示名にします。
+
+    Parameters
+    ----------
+    model_ids : list of str
+        モデルIDのリスト
+
+    Returns
+    -------
+    list of dict
+        id, name, description の辞書のリスト
+    """
+    known = {model["id"]: model for model in DEFAULT_MODELS}
+    return [known.get(model_id, {"id": model_id, "name": model_id, "description": ""}) for model_id in model_ids]
+
+
+class AzureBackend:
+    """
+    Azure OpenAI への送信
+
+    Azure ではモデル名の代わりに deployment 名を指定します。deployment の一覧は API キーでは
+    取得できないため、モデルの一覧は DEFAULT_MODELS を返します。
+    """
+
+    name = BACKEND_AZURE
+
+    def __init__(self, api_key: str, endpoint: str, api_version: str, deployment: Optional[str] = None,
+                 http_client=None):
+        """
+        AzureBackendの初期化
+
+        Parameters
+        ----------
+        api_key : str
+            Azure OpenAI APIキー
+        endpoint : str
+            Azure OpenAI Endpoint
+        api_version : str
+            Azure OpenAI API Version
+        deployment : str, optional
+            Deployment 名。指定がなければモデルIDを deployment 名として使用します。
+        http_client : httpx.Client, optional
+            SDK が使う HTTP クライアント（トレースとメトリクスのフックを設定したもの）
+        """
+        if not api_key or not endpoint:
+            raise ValueError(
+                "Azure OpenAI settings are required. Provide api_key + azure_endpoint, "
+                "or set AZURE_OPENAI_API_KEY / AZURE_OPENAI_ENDPOINT environment variables."
+            )
+        if AzureOpenAI is None:
+            raise ValueError("openai package does not support AzureOpenAI client in this environment.")
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.api_version = api_version
+        self.deployment = deployment
+        self.client = AzureOpenAI(
+            api_key=api_key,
+            azure_endpoint=endpoint,
+            api_version=api_version,
+            http_client=http_client,
+        )
+
+    def model_name(self, model: str) -> str:
+        """Azure OpenAI では model は deployment 名"""
+        return self.deployment or model
+
+    def create_transcription(self, audio, params: Dict):
+        """文字起こしAPIを呼び出し、(SDK の戻り値, 応答のヘッダー) を返す"""
+        raw = self.client.audio.transcriptions.with_raw_response.create(file=audio, **params)
+        return raw.parse(), raw.headers
+
+    def list_models(self) -> List[Dict[str, str]]:
+        """deployment の一覧は取得できないため、既定のモデルの一覧を返す"""
+        return list(DEFAULT_MODELS)
+
+    def realtime_connection(self, api_version: str, model: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Realtime API の文字起こしセッションの URL と認証ヘッダー"""
+        return realtime_url(self.endpoint, api_version, self.model_name(model)), {"api-key": self.api_key}
+
+    def close(self) -> None:
+        """HTTP クライアントを閉じる"""
+        self.client.close()
+
+
+class OpenAICompatibleBackend:
+    """
+    OpenAI 互換の HTTP API への送信
+
+    base URL の /audio/transcriptions に送信し、/models からモデルの一覧を取得します。
+    LAN 上の自前の Whisper サーバーは API キーを必要としない場合があるため、キーは任意です。
+    """
+
+    name = BACKEND_OPENAI
+    deployment = None
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, http_client=None):
+        """
+        OpenAICompatibleBackendの初期化
+
+        Parameters
+        ----------
+        base_url : str
+            API の base URL（例: http://whisper.lan:8000/v1）
+        api_key : str, optional
+            API キー（不要なサーバーでは空で構いません）
+        http_client : httpx.Client, optional
+            SDK が使う HTTP クライアント（トレースとメトリクスのフックを設定したもの）
+        """
+        if not base_url:
+            raise ValueError("An OpenAI-compatible backend requires a base URL.")
+        if OpenAI is None:
+            raise ValueError("openai package does not support OpenAI client in this environment.")
+        self.endpoint = base_url
+        # SDK はキーが空だと例外を送出するため、不要なサーバー向けにダミーの値を渡す
+        self.client = OpenAI(api_key=api_key or "unused", base_url=base_url, http_client=http_client)
+
+    def model_name(self, model: str) -> str:
+        """モデルIDをそのまま使う"""
+        return model
+
+    def create_transcription(self, audio, params: Dict):
+        """文字起こしAPIを呼び出し、(SDK の戻り値, 応答のヘッダー) を返す"""
+        raw = self.client.audio.transcriptions.with_raw_response.create(file=audio, **params)
+        return raw.parse(), raw.headers
+
+    def list_models(self) -> List[Dict[str, str]]:
+        """
+        サーバーからモデルの一覧を取得する
+
+        文字起こし以外のモデルも返すサーバー（api.openai.com など）では、whisper または transcribe を
+        含むモデルのみを返します。取得できない場合は既定のモデルの一覧を返します。
+        """
+        try:
+            page = self.client.with_options(timeout=LIST_MODELS_TIMEOUT, max_retries=0).models.list()
+            model_ids = [model.id for model in page.data]
+        except openai.OpenAIError as e:
+            print(f"Failed to list models from {self.endpoint}: {e}")
+            return list(DEFAULT_MODELS)
+        transcription_ids = [m for m in model_ids if "whisper" in m.lower() or "transcribe" in m.lower()]
+        return describe_models(transcription_ids or model_ids) or list(DEFAULT_MODELS)
+
+    def realtime_connection(self, api_version: str, model: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """自前のサーバーは Realtime API に対応していないものとする"""
+        return None
+
+    def close(self) -> None:
+        """HTTP クライアントを閉じる"""
+        self.client.close()
+
+
+class LocalBackend(OpenAICompatibleBackend):
+    """
+    同梱のテスト用サーバーへの送信
+
+    FakeTranscriptionServer をアプリ内で起動し、OpenAI 互換の API として送信します。
+    ネットワークや API キーなしで、録音から文字起こし結果までの処理を確認できます。
+    リアルタイム文字起こしも同じサーバーの WebSocket に接続します。
+    """
+
+    name = BACKEND_LOCAL
+
+    def __init__(self, server=None, http_client=None):
+        """
+        LocalBackendの初期化
+
+        Parameters
+        ----------
+        server : FakeTranscriptionServer, optional
+            送信先のテスト用サーバー。指定がなければ既定の設定で起動します（close で停止します）。
+        http_client : httpx.Client, optional
+            SDK が使う HTTP クライアント
+        """
+        from src.core.fake_server import FakeTranscriptionServer
+
+        self._owns_server = server is None
+        self.server = server or FakeTranscriptionServer().start()
+        super().__init__(self.server.base_url, http_client=http_client)
+
+    def realtime_connection(self, api_version: str, model: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """テスト用サーバーの文字起こしセッションの URL（認証は不要）"""
+        return realtime_url(self.server.endpoint, api_version, model), {}
+
+    def close(self) -> None:
+        """HTTP クライアントを閉じ、起動したテスト用サーバーを停止する"""
+        super().close()
+        if self._owns_server:
+            self.server.stop()
+
+
+def create_backend(kind: str, api_key: Optional[str] = None, endpoint: Optional[str] = None,
+                   api_version: Optional[str] = None, deployment: Optional[str] = None,
+                   http_client=None) -> TranscriptionBackend:
+    """
+    設定に応じたバックエンドを作成する
+
+    Parameters
+    ----------
+    kind : str
+        BACKEND_AZURE、BACKEND_OPENAI、または BACKEND_LOCAL
+    api_key : str, optional
+        API キー
+    endpoint : str, optional
+        Azure OpenAI Endpoint、または OpenAI 互換の API の base URL
+    api_version : str, optional
+        Azure OpenAI API Version
+    deployment : str, optional
+        Azure OpenAI の Deployment 名
+    http_client : httpx.Client, optional
+        SDK が使う HTTP クライアント
+
+    Returns
+    -------
+    TranscriptionBackend
+        作成したバックエンド（設定が不足している場合は ValueError を送出します）
+    """
+    if kind == BACKEND_OPENAI:
+        return OpenAICompatibleBackend(endpoint, api_key, http_client=http_client)
+    if kind == BACKEND_LOCAL:
+        return LocalBackend(http_client=http_client)
+    if kind == BACKEND_AZURE:
+        return AzureBackend(api_key, endpoint, api_version, deployment, http_client=http_client)
+    raise ValueError(f"Unknown transcription backend: {kind}")
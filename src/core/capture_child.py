@@ -0,0 +1,117 @@
+"""
+別プロセスでの音声入力の子プロセス側のモジュール
+
+CaptureProcess が spawn で起動する子プロセスのエントリポイントと、共有メモリのヘッダーの
+レイアウトを定義します。子プロセスはこのモジュールを読み込むため、起動し直すたびの時間と
+メモリを抑えるよう、標準ライブラリと numpy（入力ストリームを開くときに sounddevice）以外は
+読み込みません。
+"""
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 共有メモリの先頭の int64 のヘッダー
+HEADER_SIZE = 16
+WRITTEN = 0  # 書き込んだフレーム数の合計（リングバッファの位置はこの値 % capacity）
+HEARTBEAT = 1  # 子プロセスのメインループが更新するカウンター
+STATE = 2  # 0: 起動中、1: 録音中、-1: 入力ストリームを開けなかった
+CALLBACKS = 3
+OVERFLOWS = 4
+UNDERFLOWS = 5
+CALLBACK_NS_TOTAL = 6
+CALLBACK_NS_MAX = 7
+INTERVALS = 8
+JITTER_NS_TOTAL = 9
+JITTER_NS_MAX = 10
+STOP = 11  # メインプロセスが 1 にすると子プロセスは終了する
+
+STATE_STARTING = 0
+STATE_RUNNING = 1
+STATE_FAILED = -1
+
+# ハートビートの間隔（秒）
+HEARTBEAT_INTERVAL = 0.1
+
+# コールバックが届かなくなってから子プロセスを終了するまでの時間（秒、デバイスの取り外しなど）
+STALL_TIMEOUT = 2.0
+
+
+def capture_main(name, capacity, sample_rate, channels, device, blocksize, latency):
+    """
+    子プロセスのエントリポイント
+
+    入力ストリームを開き、停止が要求されるまでリングバッファに書き込みます。
+    コールバックが STALL_TIMEOUT 秒届かない場合は終了コード 2 で終了します。
+    """
+    import sounddevice as sd
+
+    memory = shared_memory.SharedMemory(name=name)
+    header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=memory.buf)
+    ring = np.ndarray((capacity, channels), dtype=np.int16, buffer=memory.buf, offset=HEADER_SIZE * 8)
+    last = [None]
+
+    def callback(indata, frames, time_info, status):
+        entered = time.perf_counter_ns()
+        written = int(header[WRITTEN])
+        position = written % capacity
+        first = min(frames, capacity - position)
+        ring[position:position + first] = indata[:first]
+        if first < frames:
+            ring[:frames - first] = indata[first:]
+        # 音声を書き込んでから位置を進める（メインプロセスは位置までの音声だけを読む）
+        header[WRITTEN] = written + frames
+
+        header[CALLBACKS] += 1
+        if status:
+            if status.input_overflow:
+                header[OVERFLOWS] += 1
+            if status.input_underflow:
+                header[UNDERFLOWS] += 1
+        if last[0] is not None:
+            jitter = abs(entered - last[0] - frames * 1_000_000_000 // sample_rate)
+            header[INTERVALS] += 1
+            header[JITTER_NS_TOTAL] += jitter
+            if jitter > header[JITTER_NS_MAX]:
+                header[JITTER_NS_MAX] = jitter
+        last[0] = entered
+        duration = time.perf_counter_ns() - entered
+        header[CALLBACK_NS_TOTAL] += duration
+        if duration > header[CALLBACK_NS_MAX]:
+            header[CALLBACK_NS_MAX] = duration
+
+    try:
+        stream = sd.InputStream(samplerate=sample_rate, channels=channels, callback=callback, device=device,
+                                blocksize=blocksize, latency=latency, dtype="int16")
+        stream.start()
+    except Exception as e:
+        print(f"Capture process failed to open input stream: {e}")
+        header[STATE] = STATE_FAILED
+        del header, ring
+        memory.close()
+        raise SystemExit(1)
+
+    header[STATE] = STATE_RUNNING
+    exit_code = 0
+    callbacks, stalled_since = -1, time.monotonic()
+    try:
+        while not header[STOP]:
+            time.sleep(HEARTBEAT_INTERVAL)
+            header[HEARTBEAT] += 1
+            # コールバックが止まった場合は終了し、メインプロセスに開き直させる
+            if header[CALLBACKS] != callbacks:
+                callbacks, stalled_since = int(header[CALLBACKS]), time.monotonic()
+            elif time.monotonic() - stalled_since > STALL_TIMEOUT:
+                print("Capture process: no audio callbacks, exiting")
+                exit_code = 2
+                break
+    finally:
+        try:
+            stream.stop()
+            stream.close()
+        except Exception:
+            pass
+        del header, ring
+        memory.close()
+    raise SystemExit(exit_code)
@@ -0,0 +1,315 @@
+"""
+別プロセスでの音声入力モジュール
+
+入力ストリーム（sd.InputStream）を子プロセスで開き、受け取った int16 の音声を
+共有メモリ（multiprocessing.shared_memory）のリングバッファに書き込みます。
+オーディオコールバックはGUI・ホットキー・文字起こしのスレッドとGILを共有しないため、
+メインプロセスの負荷でコールバックが遅れて音声が欠落することがありません。
+
+メインプロセスは書き込み位置を読むだけで録音の範囲を決め、停止時にはリングバッファの
+ビュー（コピーなし）として音声を読み出します。子プロセスはハートビートを更新し続け、
+メインプロセスの監視スレッドは子プロセスの終了やハートビートの停止を検出すると
+子プロセスを起動し直します。終了の要求もヘッダーで行い、強制終了された子プロセスが
+ロックを持ったままになる同期オブジェクト（multiprocessing.Event など）は使いません。
+子プロセス側の処理は capture_child モジュールにあります。
+"""
+
+import time
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 子プロセスが読み込むのは capture_child のみ（src.core の他のモジュールを読み込ませないため）
+from src.core.capture_child import (
+    HEADER_SIZE, WRITTEN, HEARTBEAT, STATE, CALLBACKS, OVERFLOWS, UNDERFLOWS,
+    CALLBACK_NS_TOTAL, CALLBACK_NS_MAX, INTERVALS, JITTER_NS_TOTAL, JITTER_NS_MAX, STOP,
+    STATE_STARTING, STATE_RUNNING, STATE_FAILED, HEARTBEAT_INTERVAL, capture_main,
+)
+from src.core.stream_health import StreamHealth
+
+# ハートビートが止まったとみなすまでの時間（秒）
+HEARTBEAT_TIMEOUT = 1.0
+
+# 子プロセスの起動を待つ時間と、起動し直す間隔の上限（秒）
+START_TIMEOUT = 10.0
+MAX_RESTART_BACKOFF = 5.0
+
+
+class CaptureProcess:
+    """
+    入力ストリームを持つ子プロセスと共有メモリのリングバッファ
+
+    書き込みは子プロセスのみ、読み込みはメインプロセスのみが行い、ロックは使いません。
+    位置（position）は起動し直しても連続して増え続けます。
+
+    Attributes
+    ----------
+    sample_rate : int
+        入力ストリームのサンプルレート
+    channels : int
+        入力ストリームのチャンネル数
+    capacity : int
+        リングバッファのフレーム数
+    restarts : int
+        子プロセスを起動し直した回数
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, device=None, blocksize=0, latency=None,
+                 ring_seconds=300.0, metrics=None):
+        """
+        CaptureProcessの初期化
+
+        Parameters
+        ----------
+        sample_rate : int
+            入力ストリームのサンプルレート
+        channels : int
+            入力ストリームのチャンネル数
+        device : int, optional
+            入力デバイスの番号（Noneは既定のデバイス）
+        blocksize : int
+            コールバック1回あたりのフレーム数（0 は PortAudio に任せる）
+        latency : str or float, optional
+            入力レイテンシ（"low"、"high"、または秒数）
+        ring_seconds : float
+            リングバッファに保持する秒数（これより長い録音は末尾の分だけになります）
+        metrics : AppMetrics, optional
+            子プロセスを起動し直した回数を記録するメトリクス
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.device = device
+        self.blocksize = blocksize
+        self.latency = latency
+        self.capacity = int(ring_seconds * sample_rate)
+        self.metrics = metrics
+        self.restarts = 0
+
+        self._context = multiprocessing.get_context("spawn")
+        self._memory = None
+        self._header = None
+        self._ring = None
+        self._process = None
+        self._watchdog = None
+        self._closing = threading.Event()
+
+    def start(self):
+        """
+        共有メモリを作成して子プロセスを起動し、監視を始める
+
+        Returns
+        -------
+        bool
+            入力ストリームを開けた場合True
+        """
+        if self._process is not None:
+            return True
+        try:
+            self._memory = shared_memory.SharedMemory(
+                create=True, size=HEADER_SIZE * 8 + self.capacity * self.channels * 2
+            )
+        except Exception as e:
+            print(f"Failed to create capture ring buffer: {e}")
+            return False
+        self._header = np.ndarray((HEADER_SIZE,), dtype=np.int64, buffer=self._memory.buf)
+        self._header[:] = 0
+        self._ring = np.ndarray((self.capacity, self.channels), dtype=np.int16, buffer=self._memory.buf,
+                                offset=HEADER_SIZE * 8)
+        self._closing.clear()
+
+        if not self._spawn():
+            self.stop()
+            return False
+        self._watchdog = threading.Thread(target=self._watch, name="capture-watchdog")
+        self._watchdog.daemon = True
+        self._watchdog.start()
+        return True
+
+    def stop(self):
+        """
+        子プロセスを終了し、共有メモリを削除する
+        """
+        self._closing.set()
+        if self._watchdog is not None and self._watchdog is not threading.current_thread():
+            self._watchdog.join()
+        self._watchdog = None
+        self._terminate()
+        if self._memory is not None:
+            self._header = self._ring = None
+            try:
+                self._memory.unlink()
+                self._memory.close()
+            except Exception as e:
+                # read のビューが残っている場合、close は参照がなくなるまで失敗する
+                print(f"Failed to release capture ring buffer: {e}")
+            self._memory = None
+
+    def is_alive(self):
+        """
+        子プロセスが動いているかどうか
+
+        Returns
+        -------
+        bool
+            子プロセスが動いている場合True
+        """
+        return self._process is not None and self._process.is_alive()
+
+    def position(self):
+        """
+        これまでに書き込まれたフレーム数を返す
+
+        Returns
+        -------
+        int
+            書き込まれたフレーム数の合計（共有メモリがない場合は0）
+        """
+        header = self._header
+        return int(header[WRITTEN]) if header is not None else 0
+
+    def read(self, start, end):
+        """
+        リングバッファから start から end の手前までのフレームを読み出す
+
+        範囲がリングバッファの終端をまたがない場合は共有メモリのビュー（コピーなし）を返します。
+        ビューの内容は capacity フレーム分書き込まれると上書きされるため、保持する場合は
+        複製し、読み終えたら is_intact で上書きされていないことを確認してください。
+
+        Parameters
+        ----------
+        start : int
+            最初のフレームの位置
+        end : int
+            最後のフレームの次の位置
+
+        Returns
+        -------
+        np.ndarray or None
+            形状 (フレーム数, channels) の int16 の音声（すでに上書きされた分は含みません）
+        """
+        if self._ring is None or end <= start:
+            return None
+        start = max(start, self.position() - self.capacity)
+        begin, finish = start % self.capacity, end % self.capacity
+        if end - start == self.capacity or begin >= finish:
+            return np.concatenate((self._ring[begin:], self._ring[:finish]))
+        return self._ring[begin:finish]
+
+    def is_intact(self, start):
+        """
+        start 以降のフレームがまだ上書きされていないかどうか
+
+        Parameters
+        ----------
+        start : int
+            確認するフレームの位置
+
+        Returns
+        -------
+        bool
+            上書きされていない場合True
+        """
+        return self.position() - start <= self.capacity
+
+    def health(self):
+        """
+        子プロセスのコールバックの集計を返す（起動し直しても累計）
+
+        Returns
+        -------
+        StreamHealth
+            集計値
+        """
+        health = StreamHealth()
+        header = self._header
+        if header is None:
+            return health
+        values = header.copy()
+        health.callbacks = int(values[CALLBACKS])
+        health.frames = int(values[WRITTEN])
+        health.input_overflows = int(values[OVERFLOWS])
+        health.input_underflows = int(values[UNDERFLOWS])
+        health.callback_seconds_total = values[CALLBACK_NS_TOTAL] / 1e9
+        health.callback_seconds_max = values[CALLBACK_NS_MAX] / 1e9
+        health.intervals = int(values[INTERVALS])
+        health.jitter_seconds_total = values[JITTER_NS_TOTAL] / 1e9
+        health.jitter_seconds_max = values[JITTER_NS_MAX] / 1e9
+        return health
+
+    def reset_max(self):
+        """
+        コールバックの処理時間とジッターの最大値を0に戻す（録音ごとの最大値を求めるため）
+        """
+        header = self._header
+        if header is not None:
+            header[CALLBACK_NS_MAX] = 0
+            header[JITTER_NS_MAX] = 0
+
+    def _spawn(self):
+        """子プロセスを起動し、入力ストリームを開くまで待つ"""
+        self._header[STATE] = STATE_STARTING
+        self._header[STOP] = 0
+        self._process = self._context.Process(
+            target=capture_main,
+            args=(self._memory.name, self.capacity, self.sample_rate, self.channels, self.device,
+                  self.blocksize, self.latency),
+            name="osw-capture",
+            daemon=True,
+        )
+        try:
+            self._process.start()
+        except Exception as e:
+            print(f"Failed to start capture process: {e}")
+            self._process = None
+            return False
+
+        deadline = time.monotonic() + START_TIMEOUT
+        while self._header[STATE] == STATE_STARTING and self._process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if self._header[STATE] != STATE_RUNNING:
+            print("Capture process failed to start")
+            self._terminate()
+            return False
+        return True
+
+    def _terminate(self):
+        """子プロセスに終了を要求し、終わらない場合は強制終了する"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        self._header[STOP] = 1
+        process.join(HEARTBEAT_TIMEOUT)
+        if process.is_alive():
+            # 停止している（SIGSTOP など）プロセスにも届くよう kill を使う
+            process.kill()
+            process.join()
+
+    def _watch(self):
+        """子プロセスの終了とハートビートの停止を監視し、起動し直す"""
+        heartbeat, updated = -1, time.monotonic()
+        backoff = HEARTBEAT_INTERVAL
+        while not self._closing.wait(HEARTBEAT_INTERVAL * 2):
+            process = self._process
+            if process is not None and process.is_alive():
+                if self._header[HEARTBEAT] != heartbeat:
+                    heartbeat, updated = int(self._header[HEARTBEAT]), time.monotonic()
+                    backoff = HEARTBEAT_INTERVAL
+                    continue
+                if time.monotonic() - updated < HEARTBEAT_TIMEOUT:
+                    continue
+                print("Capture process heartbeat stopped, restarting")
+            elif process is not None:
+                print(f"Capture process exited (code {process.exitcode}), restarting")
+
+            # 起動し直す（失敗が続く場合は間隔を広げる）
+            self._terminate()
+            if self._closing.wait(backoff):
+                return
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF)
+            self.restarts += 1
+            if self.metrics is not None:
+                self.metrics.capture_restarts.inc()
+            self._spawn()
+            heartbeat, updated = -1, time.monotonic()
@@ -0,0 +1,515 @@
+"""
+テスト用の文字起こしサーバーモジュール
+
+OpenAI 互換の文字起こしAPI（/audio/transcriptions と /models）を模擬するローカルの HTTP サーバーを
+提供します。ネットワークや API キーなしで録音から文字起こし結果までの処理を確認したり、
+応答の遅延やエラーを再現して負荷試験を行ったりするために使用します。
+
+- 応答の遅延は分布（一定、一様、正規、対数正規）と音声 1 秒あたりの処理時間で指定します
+- エラーは確率（error_rate）または回数（inject_errors）で返し、接続を切ることもできます
+- クォータ（1分あたりのリクエスト数と音声の秒数）を指定すると、x-ratelimit-* ヘッダーを返し、
+  超えたリクエストには Retry-After 付きの 429 を返します
+- 文字起こし結果は固定の文字列（複数指定した場合は順番に使う）を返します
+
+Azure OpenAI のパス（/openai/deployments/{deployment}/audio/transcriptions）も受け付けます。
+同じポートで Realtime API の文字起こしセッション（/openai/realtime への WebSocket）も模擬し、
+受け取った音声に応じて途中の結果を返し、確定（commit）後に基本の遅延だけ待って最終結果を返します。
+
+使い方:
+    python -m src.core.fake_server --port 8000 --latency lognormal:0.3,0.4 --error-rate 0.05
+    python -m src.core.fake_server --requests-per-minute 60 --audio-seconds-per-minute 600
+    （接続先を「OpenAI 互換」にして base URL に http://127.0.0.1:8000/v1 を指定します）
+"""
+
+import io
+import json
+import base64
+import math
+import time
+import random
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Union
+
+import soundfile as sf
+
+from src.core.backends import DEFAULT_MODELS
+from src.core.rate_limiter import TokenBucket
+from src.core.realtime import REALTIME_SAMPLE_RATE
+from src.core.websocket import WebSocket, accept_key
+
+
+class LatencyDistribution:
+    """
+    応答の遅延の分布
+
+    kind ごとの a, b の意味:
+      constant   a 秒
+      uniform    a 秒から b 秒の一様分布
+      normal     平均 a 秒、標準偏差 b 秒の正規分布（負の値は 0）
+      lognormal  中央値 a 秒、対数の標準偏差 b の対数正規分布（裾の長い遅延）
+    いずれも音声 1 秒あたり per_audio_second 秒を加えます。
+    """
+
+    KINDS = ("constant", "uniform", "normal", "lognormal")
+
+    def __init__(self, kind: str = "constant", a: float = 0.3, b: float = 0.0, per_audio_second: float = 0.0):
+        """
+        LatencyDistributionの初期化
+
+        Parameters
+        ----------
+        kind : str
+            分布の種類（KINDS のいずれか）
+        a : float
+            分布の1つ目のパラメータ（秒）
+        b : float
+            分布の2つ目のパラメータ
+        per_audio_second : float
+            音声 1 秒あたりに加える処理時間（秒）
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self.per_audio_second = per_audio_second
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        "kind:a,b[,per_audio_second]" 形式の文字列から分布を作る
+
+        Parameters
+        ----------
+        spec : str
+            例: "0.3"、"uniform:0.1,0.5"、"lognormal:0.3,0.5,0.04"
+
+        Returns
+        -------
+        LatencyDistribution
+            分布（不正な形式の場合は ValueError を送出します）
+        """
+        kind, _, values = spec.partition(":")
+        if not values:
+            return cls("constant", float(kind))
+        return cls(kind, *(float(value) for value in values.split(",")))
+
+    def sample(self, rng: random.Random, audio_seconds: float = 0.0) -> float:
+        """
+        遅延を1つ取り出す
+
+        Parameters
+        ----------
+        rng : random.Random
+            乱数生成器
+        audio_seconds : float
+            リクエストの音声の長さ（秒）
+
+        Returns
+        -------
+        float
+            遅延（秒）
+        """
+        if self.kind == "uniform":
+            seconds = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            seconds = max(0.0, rng.gauss(self.a, self.b))
+        elif self.kind == "lognormal":
+            seconds = rng.lognormvariate(math.log(max(self.a, 1e-6)), self.b)
+        else:
+            seconds = self.a
+        return seconds + self.per_audio_second * audio_seconds
+
+    def __str__(self):
+        return f"{self.kind}:{self.a:g},{self.b:g},{self.per_audio_second:g}"
+
+
+def _parse_multipart(content_type: str, body: bytes) -> Dict[str, bytes]:
+    """multipart/form-data の本文をフィールド名 -> 値の辞書に変換する"""
+    message = BytesParser(policy=default_policy).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields = {}
+    if message.is_multipart():
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = part.get_payload(decode=True) or b""
+    return fields
+
+
+class FakeTranscriptionServer:
+    """
+    OpenAI 互換の文字起こしAPIを模擬するローカルの HTTP サーバー
+
+    start で別スレッドで待ち受けを開始し、stop で停止します。リクエストごとに遅延の分布から
+    待ち時間を取り出し、エラーを返すかどうかを決めてから応答します。
+
+    Attributes
+    ----------
+    latency : LatencyDistribution
+        応答の遅延の分布
+    error_rate : float
+        エラーを返す確率（0〜1）
+    error_statuses : tuple of int
+        error_rate で返すステータスコード（この中から選びます）
+    drop_rate : float
+        応答せずに接続を切る確率（0〜1）
+    requests : TokenBucket
+        1分あたりのリクエスト数のクォータ（容量 0 で無制限）
+    audio : TokenBucket
+        1分あたりの音声の秒数のクォータ（容量 0 で無制限）
+    streamed_bytes : int
+        リアルタイム文字起こしのセッションで受け取った音声のバイト数（24 kHz の int16）
+    """
+
+    # リアルタイム文字起こしで途中の結果（1語）を返す音声の間隔（秒）
+    REALTIME_DELTA_SECONDS = 0.5
+
+    def __init__(self, latency: Optional[LatencyDistribution] = None,
+                 text: Union[str, Sequence[str]] = "これはテスト用サーバーの文字起こし結果です。",
+                 error_rate: float = 0.0, error_statuses: Sequence[int] = (429, 500, 503), drop_rate: float = 0.0,
+                 models: Optional[List[str]] = None, host: str = "127.0.0.1", port: int = 0,
+                 seed: Optional[int] = None, requests_per_minute: float = 0.0, audio_seconds_per_minute: float = 0.0):
+        """
+        FakeTranscriptionServerの初期化
+
+        Parameters
+        ----------
+        latency : LatencyDistribution, optional
+            応答の遅延の分布。指定がなければ 0.3 秒の一定の遅延です。
+        text : str or list of str
+            返す文字起こし結果（リストの場合は順番に使います）
+        error_rate : float
+            エラーを返す確率（0〜1）
+        error_statuses : sequence of int
+            error_rate で返すステータスコード
+        drop_rate : float
+            応答せずに接続を切る確率（0〜1）
+        models : list of str, optional
+            /models で返すモデルID。指定がなければ既定のモデルの一覧です。
+        host : str
+            待ち受けるアドレス
+        port : int
+            待ち受けるポート（0 の場合は空いているポート）
+        seed : int, optional
+            遅延とエラーの乱数のシード（再現性のため）
+        requests_per_minute : float
+            1分あたりのリクエスト数のクォータ（0 で無制限）
+        audio_seconds_per_minute : float
+            1分あたりの音声の秒数のクォータ（0 で無制限）
+        """
+        self.latency = latency or LatencyDistribution()
+        self.texts = [text] if isinstance(text, str) else list(text)
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.drop_rate = drop_rate
+        self.models = models or [model["id"] for model in DEFAULT_MODELS]
+        self.requests = TokenBucket(requests_per_minute)
+        self.audio = TokenBucket(audio_seconds_per_minute)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._injected: List[int] = []
+        self._next_text = 0
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "dropped": 0, "rate_limited": 0}
+        self.received_ns: List[int] = []
+        self.streamed_bytes = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI 互換のクライアントに設定する base URL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def endpoint(self) -> str:
+        """Azure OpenAI のクライアントに設定する Endpoint"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeTranscriptionServer":
+        """
+        別スレッドで待ち受けを開始する
+
+        Returns
+        -------
+        FakeTranscriptionServer
+            自身（生成と同時に開始できるように）
+        """
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        待ち受けを停止する
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def inject_errors(self, count: int, status: int = 500) -> None:
+        """
+        次の count 回のリクエストに、確率によらず status のエラーを返す
+
+        Parameters
+        ----------
+        count : int
+            エラーを返すリクエストの数
+        status : int
+            返すステータスコード（0 の場合は接続を切る）
+        """
+        with self._lock:
+            self._injected.extend([status] * count)
+
+    def stats(self) -> Dict:
+        """
+        リクエストの集計を返す
+
+        Returns
+        -------
+        dict
+            requests, ok, errors, dropped, rate_limited（クォータによる 429）の回数
+        """
+        with self._lock:
+            return dict(self.counts)
+
+    def _decide(self, audio_seconds: float, streamed: bool = False):
+        """
+        リクエストへの (遅延, ステータスコード, 文字起こし結果, 追加のヘッダー) を決める
+        （ステータス 0 は接続を切る）
+
+        streamed はリアルタイム文字起こしの確定で、音声は受け取りながら処理済みとみなすため、
+        音声の長さに比例する処理時間を遅延に加えません。
+        """
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = self.latency.sample(self._rng, 0.0 if streamed else audio_seconds)
+            headers = {}
+            if self._injected:
+                status = self._injected.pop(0)
+            elif self.drop_rate and self._rng.random() < self.drop_rate:
+                status = 0
+            elif self.error_rate and self._rng.random() < self.error_rate:
+                status = self._rng.choice(self.error_statuses)
+            else:
+                status = 200
+            if status == 200 and (self.requests.capacity or self.audio.capacity):
+                wait = max(self.requests.time_until(1), self.audio.time_until(audio_seconds))
+                if wait > 0:
+                    status = 429
+                    self.counts["rate_limited"] += 1
+                    headers["Retry-After"] = str(max(1, math.ceil(wait)))
+                    headers["retry-after-ms"] = str(int(wait * 1000))
+                else:
+                    self.requests.take(1)
+                    self.audio.take(audio_seconds)
+                headers.update(self._quota_headers())
+            text = self.texts[self._next_text % len(self.texts)]
+            if status == 200:
+                self._next_text += 1
+                self.counts["ok"] += 1
+            elif status == 0:
+                self.counts["dropped"] += 1
+            elif "Retry-After" not in headers:
+                self.counts["errors"] += 1
+        return delay, status, text, headers
+
+    def _transcribe_stream(self, ws: WebSocket) -> None:
+        """
+        Realtime API の文字起こしセッションを模擬する（WebSocket の接続ごとに呼ばれる）
+
+        input_audio_buffer.append の音声 REALTIME_DELTA_SECONDS 秒ごとに次の結果の1語を途中の結果として
+        返し、input_audio_buffer.commit で通常のリクエストと同じくエラーと遅延を決めて最終結果を返します。
+        """
+        bytes_per_delta = int(self.REALTIME_DELTA_SECONDS * REALTIME_SAMPLE_RATE * 2)
+        received = pending = sent = 0
+        with self._lock:
+            words = self.texts[self._next_text % len(self.texts)].split()
+        while True:
+            message = ws.recv()
+            if message is None:
+                return
+            try:
+                event = json.loads(message)
+            except ValueError:
+                continue
+            kind = event.get("type")
+            if kind == "input_audio_buffer.append":
+                size = len(base64.b64decode(event.get("audio", "")))
+                with self._lock:
+                    self.streamed_bytes += size
+                received += size
+                pending += size
+                while pending >= bytes_per_delta and sent < len(words):
+                    pending -= bytes_per_delta
+                    delta = (" " if sent else "") + words[sent]
+                    sent += 1
+                    ws.send_text(json.dumps({"type": "conversation.item.input_audio_transcription.delta",
+                                             "delta": delta}))
+            elif kind == "input_audio_buffer.commit":
+                self.received_ns.append(time.perf_counter_ns())
+                delay, status, text, _ = self._decide(received / 2 / REALTIME_SAMPLE_RATE, streamed=True)
+                time.sleep(delay)
+                if status == 0:
+                    ws.close()
+                    return
+                if status != 200:
+                    reply = {"type": "error", "error": {"message": f"Injected error {status}", "code": str(status)}}
+                else:
+                    reply = {"type": "conversation.item.input_audio_transcription.completed", "transcript": text}
+                ws.send_text(json.dumps(reply, ensure_ascii=False))
+
+    def _quota_headers(self) -> Dict[str, str]:
+        """クォータの上限と残量の x-ratelimit-* ヘッダー"""
+        headers = {}
+        for kind, bucket in (("requests", self.requests), ("audio-seconds", self.audio)):
+            if bucket.capacity:
+                headers[f"x-ratelimit-limit-{kind}"] = f"{bucket.capacity:g}"
+                headers[f"x-ratelimit-remaining-{kind}"] = f"{max(0, math.floor(bucket.tokens)):d}"
+        return headers
+
+    def _handler_class(self):
+        """このサーバーの設定で応答するリクエストハンドラーのクラスを作る"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.headers.get("Upgrade", "").lower() == "websocket":
+                    self._accept_realtime()
+                    return
+                if self.path.split("?")[0].rstrip("/").endswith("/models"):
+                    data = [{"id": model_id, "object": "model", "owned_by": "local"} for model_id in server.models]
+                    self._send_json(200, {"object": "list", "data": data})
+                else:
+                    self._send_json(404, {"error": {"message": f"Not found: {self.path}"}})
+
+            def _accept_realtime(self):
+                key = self.headers.get("Sec-WebSocket-Key")
+                if not self.path.split("?")[0].rstrip("/").endswith("/realtime") or not key:
+                    self._send_json(404, {"error": {"message": f"Not found: {self.path}"}})
+                    return
+                self.send_response(101)
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header("Sec-WebSocket-Accept", accept_key(key))
+                self.end_headers()
+                self.close_connection = True
+                ws = WebSocket(self.connection, self.rfile, client=False)
+                try:
+                    server._transcribe_stream(ws)
+                except OSError:
+                    pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.received_ns.append(time.perf_counter_ns())
+                if not self.path.split("?")[0].endswith("/audio/transcriptions"):
+                    self._send_json(404, {"error": {"message": f"Not found: {self.path}"}})
+                    return
+                fields = _parse_multipart(self.headers.get("Content-Type", ""), body)
+                audio = fields.get("file", b"")
+                try:
+                    audio_seconds = sf.info(io.BytesIO(audio)).duration
+                except Exception:
+                    audio_seconds = 0.0
+
+                delay, status, text, headers = server._decide(audio_seconds)
+                quota_exceeded = status == 429 and "retry-after-ms" in headers
+                # クォータ超過はすぐに返す
+                time.sleep(0.0 if quota_exceeded else delay)
+                if status == 0:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if status != 200:
+                    if status == 429:
+                        headers.setdefault("Retry-After", "1")
+                    message = "Rate limit exceeded" if quota_exceeded else f"Injected error {status}"
+                    self._send_json(status, {"error": {"message": message, "code": str(status)}}, headers)
+                    return
+                response_format = fields.get("response_format", b"json").decode("utf-8")
+                language = fields.get("language", b"").decode("utf-8") or None
+                self._send_transcript(response_format, text, language, audio_seconds, headers)
+
+            def _send_transcript(self, response_format, text, language, audio_seconds, headers):
+                if response_format == "json":
+                    self._send_json(200, {"text": text}, headers)
+                elif response_format == "verbose_json":
+                    self._send_json(200, {
+                        "task": "transcribe", "language": language or "ja", "duration": audio_seconds, "text": text,
+                        "segments": [{"id": 0, "start": 0.0, "end": audio_seconds, "text": text}],
+                    }, headers)
+                else:
+                    self._send(200, text.encode("utf-8"), "text/plain; charset=utf-8", headers)
+
+            def _send_json(self, status, payload, headers=None):
+                self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json",
+                           headers)
+
+            def _send(self, status, body, content_type, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OpenAI 互換の文字起こしAPIを模擬するテスト用サーバー",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="待ち受けるアドレス")
+    parser.add_argument("--port", type=int, default=8000, help="待ち受けるポート")
+    parser.add_argument("--latency", default="0.3",
+                        help="応答の遅延（例: 0.3、uniform:0.1,0.5、lognormal:0.3,0.5,0.04）")
+    parser.add_argument("--text", action="append", help="返す文字起こし結果（複数指定で順番に使う）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="エラーを返す確率（0〜1）")
+    parser.add_argument("--error-status", type=int, action="append", help="返すエラーのステータスコード")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="応答せずに接続を切る確率（0〜1）")
+    parser.add_argument("--seed", type=int, help="乱数のシード")
+    parser.add_argument("--requests-per-minute", type=float, default=0.0, help="1分あたりのリクエスト数のクォータ")
+    parser.add_argument("--audio-seconds-per-minute", type=float, default=0.0, help="1分あたりの音声の秒数のクォータ")
+    args = parser.parse_args()
+
+    kwargs = {"text": args.text} if args.text else {}
+    server = FakeTranscriptionServer(
+        LatencyDistribution.parse(args.latency),
+        error_rate=args.error_rate,
+        error_statuses=args.error_status or (429, 500, 503),
+        drop_rate=args.drop_rate,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        requests_per_minute=args.requests_per_minute,
+        audio_seconds_per_minute=args.audio_seconds_per_minute,
+        **kwargs,
+    ).start()
+    print(f"Fake transcription server: {server.base_url} (latency {server.latency})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Requests: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
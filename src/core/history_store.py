@@ -0,0 +1,431 @@
+"""
+文字起こし履歴モジュール
+
+文字起こし結果をSQLite（WALモード）に保存し、FTS5による全文検索を提供します。
+書き込みは専用スレッドでまとめて行うため、呼び出し元をブロックしません。
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class TranscriptionHistory:
+    """
+    文字起こし履歴を永続化・検索するクラス
+
+    書き込みはキューを介してライタースレッドがトランザクション単位でまとめて反映し、
+    読み込みはスレッドごとの読み取り専用接続で行います。全文検索には
+    日本語でも部分一致できるよう trigram トークナイザーのFTS5インデックスを使用します。
+
+    Attributes
+    ----------
+    db_path : str
+        データベースファイルのパス
+    """
+
+    # trigram トークナイザーでインデックスを使用できる最小文字数
+    MIN_INDEXED_QUERY_LENGTH = 3
+
+    # 索引を使えない短い検索語で走査する直近の履歴件数
+    SHORT_QUERY_SCAN_ROWS = 20000
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transcriptions (
+            id INTEGER PRIMARY KEY,
+            created_at REAL NOT NULL,
+            text TEXT NOT NULL,
+            model TEXT,
+            language TEXT,
+            duration REAL,
+            latency REAL,
+            audio_path TEXT
+        );
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS transcriptions_fts USING fts5(
+            text,
+            content='transcriptions',
+            content_rowid='id',
+            tokenize='trigram'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS transcriptions_ai AFTER INSERT ON transcriptions BEGIN
+            INSERT INTO transcriptions_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS transcriptions_ad AFTER DELETE ON transcriptions BEGIN
+            INSERT INTO transcriptions_fts(transcriptions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS transcriptions_au AFTER UPDATE OF text ON transcriptions BEGIN
+            INSERT INTO transcriptions_fts(transcriptions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO transcriptions_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+    """
+
+    COLUMNS = ("id", "created_at", "text", "model", "language", "duration", "latency", "audio_path")
+
+    def __init__(self, db_path: str, batch_size: int = 256, batch_interval: float = 0.05):
+        """
+        TranscriptionHistoryの初期化
+
+        Parameters
+        ----------
+        db_path : str
+            データベースファイルのパス（親ディレクトリが存在しない場合は作成されます）
+        batch_size : int
+            1回のトランザクションで書き込む最大件数
+        batch_interval : float
+            最初の書き込み要求から、まとめて書き込むまでに待つ最大秒数
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # スキーマの作成とWALモードの設定（WALはデータベースファイルに永続化される）
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self.SCHEMA)
+            connection.commit()
+        finally:
+            connection.close()
+
+        self._local = threading.local()
+        self._count_lock = threading.Lock()
+        self._total_count = None
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="history-writer")
+        self._writer.daemon = True
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """設定済みのSQLite接続を作成する"""
+        connection = sqlite3.connect(self.db_path, timeout=10.0)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """呼び出し元スレッド用の読み取り接続を返す"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            connection.execute("PRAGMA query_only=ON")
+            self._local.connection = connection
+        return connection
+
+    def add(self, text: str, model: Optional[str] = None, language: Optional[str] = None,
+            duration: Optional[float] = None, latency: Optional[float] = None,
+            audio_path: Optional[str] = None, created_at: Optional[float] = None) -> None:
+        """
+        文字起こし結果を履歴に追加する
+
+        書き込みはライタースレッドで行われるため、すぐに戻ります。
+
+        Parameters
+        ----------
+        text : str
+            文字起こし結果のテキスト
+        model : str, optional
+            使用したモデルID
+        language : str, optional
+            文字起こしの言語コード
+        duration : float, optional
+            録音の長さ（秒）
+        latency : float, optional
+            文字起こしに要した時間（秒）
+        audio_path : str, optional
+            録音ファイルのパス
+        created_at : float, optional
+            録音日時（UNIX時間）。指定がなければ現在時刻を使用します。
+        """
+        row = (
+            created_at if created_at is not None else time.time(),
+            text,
+            model or None,
+            language or None,
+            duration,
+            latency,
+            audio_path,
+        )
+        self._queue.put(row)
+
+    def add_many(self, rows: List[tuple]) -> None:
+        """
+        複数の履歴をまとめて追加する
+
+        Parameters
+        ----------
+        rows : list
+            (created_at, text, model, language, duration, latency, audio_path) のタプルのリスト
+        """
+        for row in rows:
+            self._queue.put(tuple(row))
+
+    def flush(self) -> None:
+        """
+        キューに溜まっている書き込みがすべて反映されるまで待機する
+        """
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        未反映の書き込みを反映してライタースレッドを終了する
+        """
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _writer_loop(self) -> None:
+        """
+        キューから書き込み要求を取り出し、トランザクション単位でまとめて反映するループ
+        """
+        connection = self._connect()
+        insert_sql = (
+            "INSERT INTO transcriptions (created_at, text, model, language, duration, latency, audio_path) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+        running = True
+        while running:
+            item = self._queue.get()
+            batch = []
+            if item is None:
+                running = False
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.batch_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        running = False
+                        break
+                    batch.append(item)
+
+            try:
+                if batch:
+                    with connection:
+                        connection.executemany(insert_sql, batch)
+                    with self._count_lock:
+                        if self._total_count is not None:
+                            self._total_count += len(batch)
+            except sqlite3.Error as e:
+                print(f"Failed to write transcription history: {e}")
+            finally:
+                # 取り出した要求（終了要求を含む）をすべて完了扱いにする
+                for _ in range(len(batch) + (0 if running else 1)):
+                    self._queue.task_done()
+
+        connection.close()
+
+    def _rows_to_dicts(self, rows) -> List[Dict]:
+        """行タプルを辞書のリストに変換する"""
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    @staticmethod
+    def _build_match_query(query: str) -> Optional[str]:
+        """
+        ユーザー入力をFTS5のMATCH式に変換する
+
+        空白区切りの各語をフレーズとしてクォートし、AND検索にします。
+        trigram で索引できない短い語が含まれる場合はNoneを返します。
+        """
+        terms = query.split()
+        if not terms or any(len(term) < TranscriptionHistory.MIN_INDEXED_QUERY_LENGTH for term in terms):
+            return None
+        return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    def _select_columns(self, preview_chars: Optional[int]) -> str:
+        """取得する列のSQLを返す（preview_chars 指定時は本文の先頭のみ）"""
+        if preview_chars is None:
+            return ", ".join(self.COLUMNS)
+        return ", ".join(
+            f"substr(text, 1, {int(preview_chars)})" if column == "text" else column
+            for column in self.COLUMNS
+        )
+
+    def search(self, query: str, limit: int = 50, offset: int = 0,
+               before_id: Optional[int] = None, preview_chars: Optional[int] = None) -> List[Dict]:
+        """
+        履歴を全文検索する（新しい順）
+
+        Parameters
+        ----------
+        query : str
+            検索文字列（空白区切りの各語をすべて含むものを検索）。
+            3文字未満の語を含む場合は直近 ``SHORT_QUERY_SCAN_ROWS`` 件のみを検索します。
+        limit : int
+            取得する最大件数
+        offset : int
+            スキップする件数
+        before_id : int, optional
+            指定した場合はこのIDより古い履歴のみを対象にする（キーセットによるページング用）
+        preview_chars : int, optional
+            指定した場合は本文の先頭から指定文字数のみを取得する
+
+        Returns
+        -------
+        list
+            履歴の辞書のリスト
+        """
+        query = (query or "").strip()
+        if not query:
+            return self.recent(limit, offset, before_id, preview_chars)
+
+        columns = self._select_columns(preview_chars)
+        upper_bound = before_id if before_id is not None else -1
+        match_query = self._build_match_query(query)
+        connection = self._reader()
+
+        if match_query is not None:
+            # FTS5 は rowid の降順走査を直接サポートするため、LIMIT 件で打ち切れる
+            rows = connection.execute(
+                f"SELECT {columns} FROM transcriptions WHERE id IN ("
+                "  SELECT rowid FROM transcriptions_fts WHERE transcriptions_fts MATCH ?"
+                "  AND (? < 0 OR rowid < ?)"
+                "  ORDER BY rowid DESC LIMIT ? OFFSET ?"
+                ") ORDER BY id DESC",
+                (match_query, upper_bound, upper_bound, limit, offset),
+            ).fetchall()
+        else:
+            # 3文字未満の語は索引を使えないため、直近の履歴だけを新しい順に走査する
+            terms = query.split()
+            conditions = " AND ".join("instr(text, ?) > 0" for _ in terms)
+            rows = connection.execute(
+                f"SELECT {columns} FROM transcriptions "
+                "WHERE id > (SELECT ifnull(max(id), 0) FROM transcriptions) - ? "
+                f"AND (? < 0 OR id < ?) AND {conditions} "
+                "ORDER BY id DESC LIMIT ? OFFSET ?",
+                (self.SHORT_QUERY_SCAN_ROWS, upper_bound, upper_bound, *terms, limit, offset),
+            ).fetchall()
+
+        return self._rows_to_dicts(rows)
+
+    def recent(self, limit: int = 50, offset: int = 0,
+               before_id: Optional[int] = None, preview_chars: Optional[int] = None) -> List[Dict]:
+        """
+        新しい順に履歴を取得する
+
+        Parameters
+        ----------
+        limit : int
+            取得する最大件数
+        offset : int
+            スキップする件数
+        before_id : int, optional
+            指定した場合はこのIDより古い履歴のみを取得する（キーセットによるページング用）
+        preview_chars : int, optional
+            指定した場合は本文の先頭から指定文字数のみを取得する
+
+        Returns
+        -------
+        list
+            履歴の辞書のリスト
+        """
+        columns = self._select_columns(preview_chars)
+        connection = self._reader()
+        if before_id is None:
+            rows = connection.execute(
+                f"SELECT {columns} FROM transcriptions ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        else:
+            rows = connection.execute(
+                f"SELECT {columns} FROM transcriptions WHERE id < ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                (before_id, limit, offset),
+            ).fetchall()
+        return self._rows_to_dicts(rows)
+
+    def get(self, entry_id: int) -> Optional[Dict]:
+        """
+        IDを指定して履歴を1件取得する
+
+        Parameters
+        ----------
+        entry_id : int
+            履歴のID
+
+        Returns
+        -------
+        dict or None
+            履歴の辞書、存在しない場合はNone
+        """
+        columns = ", ".join(self.COLUMNS)
+        rows = self._reader().execute(
+            f"SELECT {columns} FROM transcriptions WHERE id = ?", (entry_id,)
+        ).fetchall()
+        result = self._rows_to_dicts(rows)
+        return result[0] if result else None
+
+    def is_search_limited(self, query: Optional[str]) -> bool:
+        """
+        検索が直近 ``SHORT_QUERY_SCAN_ROWS`` 件の履歴に限られるかどうかを返す
+
+        Parameters
+        ----------
+        query : str
+            検索文字列
+
+        Returns
+        -------
+        bool
+            3文字未満の語を含み、走査する範囲より古い履歴がある場合True
+        """
+        query = (query or "").strip()
+        if not query or self._build_match_query(query) is not None:
+            return False
+        newest = self._reader().execute("SELECT ifnull(max(id), 0) FROM transcriptions").fetchone()[0]
+        return newest > self.SHORT_QUERY_SCAN_ROWS
+
+    def count(self, query: Optional[str] = None) -> int:
+        """
+        履歴の件数を返す
+
+        Parameters
+        ----------
+        query : str, optional
+            指定した場合は ``search`` と同じ条件に一致する件数を返す
+
+        Returns
+        -------
+        int
+            履歴の件数
+        """
+        query = (query or "").strip()
+        connection = self._reader()
+
+        if not query:
+            # 全件数は初回のみ数え、以降はライタースレッドが書き込み件数を加算する
+            with self._count_lock:
+                if self._total_count is None:
+                    self._total_count = connection.execute("SELECT count(*) FROM transcriptions").fetchone()[0]
+                return self._total_count
+
+        match_query = self._build_match_query(query)
+        if match_query is not None:
+            return connection.execute(
+                "SELECT count(*) FROM transcriptions_fts WHERE transcriptions_fts MATCH ?", (match_query,)
+            ).fetchone()[0]
+
+        terms = query.split()
+        conditions = " AND ".join("instr(text, ?) > 0" for _ in terms)
+        return connection.execute(
+            "SELECT count(*) FROM transcriptions "
+            f"WHERE id > (SELECT ifnull(max(id), 0) FROM transcriptions) - ? AND {conditions}",
+            (self.SHORT_QUERY_SCAN_ROWS, *terms),
+        ).fetchone()[0]
@@ -0,0 +1,484 @@
+"""
+ホットキーエンジンモジュール
+
+ホットキー文字列を登録時に一度だけ解析して正規化し、キーイベントごとの照合を
+事前に構築した索引への参照だけで行うエンジンを提供します。
+"ctrl+k, r" のように複数の組み合わせを順に押すシーケンスにも対応します。
+"""
+
+import time
+import threading
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from pynput import keyboard
+
+# 修飾キーのマッピング
+MODIFIER_MAPPING = {
+    'ctrl': '<ctrl>',
+    'control': '<ctrl>',
+    'alt': '<alt>',
+    'option': '<alt>',  # macOS用
+    'shift': '<shift>',
+    'cmd': '<cmd>',
+    'command': '<cmd>',
+    'win': '<cmd>',
+    'windows': '<cmd>',
+    'meta': '<cmd>'
+}
+
+# 特殊キーのマッピング
+SPECIAL_KEY_MAPPING = {
+    'f1': '<f1>', 'f2': '<f2>', 'f3': '<f3>', 'f4': '<f4>',
+    'f5': '<f5>', 'f6': '<f6>', 'f7': '<f7>', 'f8': '<f8>',
+    'f9': '<f9>', 'f10': '<f10>', 'f11': '<f11>', 'f12': '<f12>',
+    'esc': '<esc>', 'escape': '<esc>',
+    'tab': '<tab>',
+    'space': '<space>',
+    'backspace': '<backspace>', 'bs': '<backspace>',
+    'enter': '<enter>', 'return': '<enter>',
+    'ins': '<insert>', 'insert': '<insert>',
+    'del': '<delete>', 'delete': '<delete>',
+    'home': '<home>',
+    'end': '<end>',
+    'pageup': '<page_up>', 'pgup': '<page_up>',
+    'pagedown': '<page_down>', 'pgdn': '<page_down>',
+    'up': '<up>', 'down': '<down>', 'left': '<left>', 'right': '<right>',
+    'capslock': '<caps_lock>', 'caps': '<caps_lock>',
+    'numlock': '<num_lock>', 'num': '<num_lock>',
+    'scrolllock': '<scroll_lock>', 'scrl': '<scroll_lock>',
+    'prtsc': '<print_screen>', 'printscreen': '<print_screen>'
+}
+
+# 修飾キー（正規化後）のビット
+MODIFIER_BITS = {
+    keyboard.Key.ctrl: 1,
+    keyboard.Key.shift: 2,
+    keyboard.Key.alt: 4,
+    keyboard.Key.cmd: 8,
+    keyboard.Key.alt_gr: 16,
+}
+
+# シーケンスの各ステップの区切り文字
+SEQUENCE_SEPARATOR = ','
+
+# 正規化した組み合わせ: (修飾キーのビットマスク, 修飾キー以外のキーの集合)
+Chord = Tuple[int, FrozenSet]
+
+
+def to_pynput_format(hotkey_str: str) -> Optional[str]:
+    """
+    ホットキー文字列をpynput形式に変換する
+
+    Parameters
+    ----------
+    hotkey_str : str
+        'ctrl+shift+r' や 'ctrl+k, r' のような形式のホットキー文字列
+
+    Returns
+    -------
+    Optional[str]
+        pynput形式のホットキー文字列（例: '<ctrl>+<shift>+r'、'<ctrl>+k, r'）
+        無効な入力の場合はNone
+    """
+    if not hotkey_str:
+        return None
+
+    steps = []
+    for step in hotkey_str.lower().split(SEQUENCE_SEPARATOR):
+        processed_parts = []
+        for part in step.split('+'):
+            part = part.strip()
+            if not part:
+                continue
+            if part in MODIFIER_MAPPING:
+                processed_parts.append(MODIFIER_MAPPING[part])
+            elif part in SPECIAL_KEY_MAPPING:
+                processed_parts.append(SPECIAL_KEY_MAPPING[part])
+            elif len(part) == 1:  # 単一文字（a-z, 0-9など）
+                processed_parts.append(part)
+            else:
+                print(f"Warning: Unknown key '{part}' in hotkey. Using as is.")
+                processed_parts.append(part)
+
+        # 各ステップに最低1つのキーが存在することを確認
+        if not processed_parts:
+            return None
+        steps.append('+'.join(processed_parts))
+
+    return ', '.join(steps)
+
+
+def compile_hotkey(hotkey_str: str) -> Optional[Tuple[Chord, ...]]:
+    """
+    ホットキー文字列を正規化した組み合わせの列に変換する
+
+    Parameters
+    ----------
+    hotkey_str : str
+        'ctrl+shift+r' や 'ctrl+k, r' のような形式のホットキー文字列
+
+    Returns
+    -------
+    Optional[Tuple[Chord, ...]]
+        各ステップの (修飾キーのビットマスク, 修飾キー以外のキーの集合) のタプル
+        無効な入力の場合はNone
+    """
+    pynput_str = to_pynput_format(hotkey_str)
+    if not pynput_str:
+        return None
+
+    chords = []
+    for step in pynput_str.split(', '):
+        try:
+            keys = keyboard.HotKey.parse(step)
+        except ValueError:
+            return None
+        mask = 0
+        others = set()
+        for key in keys:
+            if key in MODIFIER_BITS:
+                mask |= MODIFIER_BITS[key]
+            else:
+                others.add(key)
+        chords.append((mask, frozenset(others)))
+    return tuple(chords)
+
+
+class _Binding:
+    """
+    ホットキーに割り当てたアクション
+
+    呼び出し時の引数は登録時に作成したタプルをそのまま使います。
+    キーを離したときのアクション（on_release）がある場合は、最後のステップの
+    いずれかのキーが離された時点で呼び出します。
+    """
+
+    __slots__ = ("hotkey", "callback", "args", "on_release", "release_keys", "last_fired")
+
+    def __init__(
+        self,
+        hotkey: str,
+        callback: Callable,
+        args: tuple,
+        on_release: Optional[Callable] = None,
+        release_keys: FrozenSet = frozenset(),
+    ):
+        self.hotkey = hotkey
+        self.callback = callback
+        self.args = args
+        self.on_release = on_release
+        self.release_keys = release_keys
+        self.last_fired = float("-inf")
+
+
+class HotkeyEngine:
+    """
+    コンパイル済みのホットキー照合エンジン
+
+    登録されたホットキーから「押されたキー -> 修飾キーのビットマスク -> 候補」の
+    索引を事前に構築し、キーが押されるたびに現在の状態（シーケンスの途中であれば
+    そのステップの索引）を辞書参照するだけで照合します。照合処理ではオブジェクトを
+    生成しません。
+
+    索引の更新は新しい索引を作って参照を差し替えるため、キーイベントを処理する
+    スレッドはロックを取得せずに照合できます。
+    """
+
+    def __init__(
+        self,
+        sequence_timeout: float = 1.5,
+        debounce: float = 0.0,
+        suppress_repeat: bool = True,
+        dispatch: Optional[Callable[[Callable, tuple], None]] = None,
+    ):
+        """
+        HotkeyEngineの初期化
+
+        Parameters
+        ----------
+        sequence_timeout : float
+            シーケンスの次のステップを待つ最大秒数
+        debounce : float
+            同じホットキーを再び実行するまでの最小間隔（秒、0で無効）
+        suppress_repeat : bool
+            キーを押し続けたときの自動リピートを無視するかどうか
+        dispatch : Callable[[Callable, tuple], None], optional
+            一致したホットキーの (コールバック, 引数) を受け取る関数。
+            指定がなければコールバックをその場で実行します。
+        """
+        self.sequence_timeout = sequence_timeout
+        self.debounce = debounce
+        self.suppress_repeat = suppress_repeat
+        self.dispatch = dispatch
+
+        # 正規化した組み合わせの列 -> _Binding
+        self._bindings: Dict[Tuple[Chord, ...], _Binding] = {}
+        self._lock = threading.Lock()
+
+        # 索引: キー -> {修飾キーのビットマスク -> ((他に押されている必要があるキー, 次の索引 or _Binding), ...)}
+        self._root: Dict = {}
+        self._node: Optional[Dict] = None
+        self._node_deadline = 0.0
+
+        # 現在押されている修飾キーのビットマスクと、修飾キー以外のキー
+        self._mask = 0
+        self._held = set()
+
+        # 押し続けている間だけ有効なホットキー（キーを離すと on_release を実行する）
+        self._holding: Optional[_Binding] = None
+
+    def bind(self, hotkey_str: str, callback: Callable, *args, on_release: Optional[Callable] = None) -> bool:
+        """
+        ホットキーにアクションを割り当てる
+
+        Parameters
+        ----------
+        hotkey_str : str
+            'ctrl+shift+r' や 'ctrl+k, r' のような形式のホットキー文字列
+        callback : Callable
+            ホットキーが押されたときに実行する関数
+        *args
+            実行時に関数へ渡す引数（例: 使用するプロファイル）
+        on_release : Callable, optional
+            押したホットキー（シーケンスの場合は最後のステップ）のいずれかのキーが
+            離されたときに実行する関数（プッシュトゥトーク用）。引数は callback と同じです。
+
+        Returns
+        -------
+        bool
+            登録の成功・失敗（他のシーケンスの途中のステップと重なる場合は失敗）
+        """
+        chords = compile_hotkey(hotkey_str)
+        if not chords:
+            print(f"Invalid hotkey format: {hotkey_str}")
+            return False
+
+        # 離されたら on_release を実行するキー（最後のステップの修飾キーとそれ以外のキー）
+        mask, others = chords[-1]
+        release_keys = others | {key for key, bit in MODIFIER_BITS.items() if mask & bit}
+
+        with self._lock:
+            bindings = dict(self._bindings)
+            bindings[chords] = _Binding(hotkey_str, callback, args, on_release, frozenset(release_keys))
+            try:
+                root = self._build_index(bindings)
+            except ValueError as e:
+                print(f"Failed to bind hotkey: {e}")
+                return False
+            self._bindings = bindings
+            self._root = root
+            self._node = None
+        return True
+
+    def unbind(self, hotkey_str: str) -> bool:
+        """
+        ホットキーの割り当てを解除する
+
+        Parameters
+        ----------
+        hotkey_str : str
+            解除するホットキー文字列
+
+        Returns
+        -------
+        bool
+            解除の成功・失敗
+        """
+        chords = compile_hotkey(hotkey_str)
+        with self._lock:
+            if not chords or chords not in self._bindings:
+                return False
+            bindings = dict(self._bindings)
+            removed = bindings.pop(chords)
+            self._root = self._build_index(bindings)
+            self._bindings = bindings
+            self._node = None
+            if self._holding is removed:
+                self._holding = None
+        return True
+
+    def clear(self) -> None:
+        """すべての割り当てを解除する"""
+        with self._lock:
+            self._bindings = {}
+            self._root = {}
+            self._node = None
+            self._holding = None
+
+    def is_bound(self, hotkey_str: str) -> bool:
+        """
+        ホットキーが登録されているかどうかを返す
+
+        Parameters
+        ----------
+        hotkey_str : str
+            確認するホットキー文字列
+
+        Returns
+        -------
+        bool
+            登録されている場合True
+        """
+        return compile_hotkey(hotkey_str) in self._bindings
+
+    def reset(self) -> None:
+        """押下中のキーとシーケンスの途中状態を破棄する（リスナーの再起動時など）"""
+        self._node = None
+        self._mask = 0
+        self._held.clear()
+        self._holding = None
+
+    def press(self, key) -> bool:
+        """
+        キーが押されたときに呼び出す
+
+        Parameters
+        ----------
+        key : keyboard.Key or keyboard.KeyCode
+            正規化済みの押されたキー（``Listener.canonical`` の戻り値）
+
+        Returns
+        -------
+        bool
+            アクションを実行した、またはシーケンスが次のステップに進んだ場合True
+        """
+        bit = MODIFIER_BITS.get(key, 0)
+        if bit:
+            # 修飾キーのリピートは照合に影響しないため常に無視する
+            if self._mask & bit:
+                return False
+            mask = self._mask
+            self._mask = mask | bit
+        elif key in self._held:
+            # キーリピート
+            if self.suppress_repeat:
+                return False
+            mask = self._mask
+        else:
+            self._held.add(key)
+            mask = self._mask
+
+        node = self._node
+        if node is not None and time.monotonic() > self._node_deadline:
+            node = self._node = None
+
+        target = self._match(node if node is not None else self._root, key, mask)
+        if target is None and node is not None:
+            if bit:
+                # シーケンスの途中で押された修飾キーは次のステップの一部として扱う
+                return False
+            # 一致しないキーでシーケンスを中断し、最初のステップとして照合し直す
+            self._node = None
+            target = self._match(self._root, key, mask)
+
+        if target is None:
+            return False
+
+        if target.__class__ is dict:
+            self._node = target
+            self._node_deadline = time.monotonic() + self.sequence_timeout
+            return True
+
+        self._node = None
+        if self.debounce:
+            now = time.monotonic()
+            if now - target.last_fired < self.debounce:
+                return False
+            target.last_fired = now
+
+        if target.on_release is not None:
+            self._holding = target
+        self._run(target.callback, target.args)
+        return True
+
+    def release(self, key) -> None:
+        """
+        キーが離されたときに呼び出す
+
+        Parameters
+        ----------
+        key : keyboard.Key or keyboard.KeyCode
+            正規化済みの離されたキー
+        """
+        bit = MODIFIER_BITS.get(key, 0)
+        if bit:
+            self._mask &= ~bit
+        else:
+            self._held.discard(key)
+
+        holding = self._holding
+        if holding is not None and key in holding.release_keys:
+            self._holding = None
+            self._run(holding.on_release, holding.args)
+
+    def _run(self, callback: Callable, args: tuple) -> None:
+        """アクションを dispatch に渡す（指定がなければその場で実行する）"""
+        if self.dispatch is not None:
+            self.dispatch(callback, args)
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Hotkey action error: {e}")
+
+    def _match(self, node: Dict, key, mask: int):
+        """索引から押されたキーと修飾キーの状態に一致する候補を返す"""
+        by_mask = node.get(key)
+        if by_mask is None:
+            return None
+        candidates = by_mask.get(mask)
+        if candidates is None:
+            return None
+        for required, target in candidates:
+            if required <= self._held:
+                return target
+        return None
+
+    @staticmethod
+    def _build_index(bindings: Dict[Tuple[Chord, ...], _Binding]) -> Dict:
+        """
+        登録されたホットキーから索引を構築する
+
+        組み合わせのどのキーが最後に押されても一致するよう、構成キーごとに
+        「そのキー以外が押されている状態」のエントリを作成します。
+
+        Raises
+        ------
+        ValueError
+            あるホットキーが別のシーケンスの途中のステップと重なる場合
+        """
+        root = {}
+        for chords, binding in bindings.items():
+            node = root
+            for index, chord in enumerate(chords):
+                is_last = index == len(chords) - 1
+                next_node = None if is_last else {}
+                for key, mask, required in HotkeyEngine._triggers(chord):
+                    candidates = node.setdefault(key, {}).setdefault(mask, ())
+                    for existing_required, existing in candidates:
+                        if existing_required != required:
+                            continue
+                        if is_last or existing.__class__ is not dict:
+                            raise ValueError(f"'{binding.hotkey}' conflicts with another hotkey")
+                        next_node = existing
+                        break
+                    else:
+                        target = binding if is_last else next_node
+                        node[key][mask] = candidates + ((required, target),)
+                node = next_node
+        return root
+
+    @staticmethod
+    def _triggers(chord: Chord):
+        """
+        組み合わせを (最後に押されるキー, その時点の修飾キー, 押されている必要があるキー) に展開する
+
+        修飾キー以外のキーが最後に押される場合に加えて、各修飾キーが最後に押される場合
+        （ctrl、r、shift の順に押した ctrl+shift+r など）のエントリも作成します。
+        """
+        mask, others = chord
+        for key in others:
+            yield key, mask, others - {key}
+        for key, bit in MODIFIER_BITS.items():
+            if mask & bit:
+                yield key, mask & ~bit, others
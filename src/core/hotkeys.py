@@ -7,9 +7,13 @@
 
 import os
 import sys
+import time
+from collections import deque
 from typing import Dict, Callable, Optional, Union, List, Tuple
 from pynput import keyboard
 
+from src.core.hotkey_engine import HotkeyEngine, MODIFIER_MAPPING, compile_hotkey, to_pynput_format
+
 class HotkeyManager:
     """
     グローバルホットキーの登録と管理を行うクラス
@@ -17,29 +21,170 @@ class HotkeyManager:
     このクラスは、アプリケーションでグローバルホットキーを設定し管理するための
     中心的な機能を提供します。pynputライブラリを使用してOS全体でのホットキー検出を実現します。
     
+    キーボードリスナーは1つだけを常駐させ、キーイベントの照合は HotkeyEngine の
+    コンパイル済みの索引で行います。登録の変更でリスナーを再起動しないため、
+    変更中のキー入力を取りこぼしません。"ctrl+k, r" のようなシーケンスも登録できます。
+    
+    通知関数を設定すると、一致したホットキーはリスナースレッドで実行せずに
+    上限付きのキューへ積まれ、利用側のスレッド（GUIスレッドなど）が ``drain`` で
+    実行します。時間のかかるコールバックがOSへのキー入力の配送を遅らせることはありません。
+    
+    ``register_push_to_talk`` で登録したホットキーは、押したときと離したときの
+    両方でアクションを実行します（押している間だけ録音するプッシュトゥトーク用）。
+    
     Attributes
     ----------
     hotkeys : dict
-        登録されたホットキーとそのコールバック関数のマッピング
-    listener : keyboard.GlobalHotKeys
+        登録されたホットキー（pynput形式）とそのコールバック関数のマッピング
+    listener : keyboard.Listener
         キーボードイベントをリッスンするリスナーオブジェクト
+    engine : HotkeyEngine
+        キーイベントを照合してアクションを実行するエンジン
+    current_event_ns : int
+        実行中（直前に実行した）アクションのキーイベントを検出した時刻（time.perf_counter_ns）
     """
     
-    def __init__(self):
-        """HotkeyManagerの初期化"""
+    def __init__(self, debounce: float = 0.0, suppress_repeat: bool = True, queue_size: int = 64):
+        """
+        HotkeyManagerの初期化
+        
+        Parameters
+        ----------
+        debounce : float
+            同じホットキーを再び実行するまでの最小間隔（秒、0で無効）
+        suppress_repeat : bool
+            キーを押し続けたときの自動リピートを無視するかどうか
+        queue_size : int
+            実行待ちのホットキーを保持する数の上限（超えた分は破棄されます）
+        """
         self.hotkeys = {}
         self.listener = None
+        self.engine = HotkeyEngine(debounce=debounce, suppress_repeat=suppress_repeat, dispatch=self._dispatch)
+        
+        # 実行待ちの (コールバック, 引数, 検出時刻[ns])
+        # 生産者はリスナースレッド、消費者は利用側のスレッドのみのため、deque の
+        # append/popleft（アトミック）だけでロックなしに受け渡す
+        self.queue_size = queue_size
+        self.dropped_events = 0
+        self._queue = deque()
+        self._notifier = None
+        self._notify_pending = False
+        
+        # ホットキー検出からコールバック開始までの時間（ミリ秒、直近のみ保持）
+        self._latencies = deque(maxlen=1000)
+        self.current_event_ns = 0
+    
+    def set_notifier(self, notifier: Optional[Callable[[], None]]) -> None:
+        """
+        実行待ちのホットキーがあることを利用側に知らせる関数を設定する
+        
+        通知関数はリスナースレッドから呼ばれるため、スレッドセーフである必要があります
+        （Qt ではシグナルの emit を指定し、接続先のスロットで ``drain`` を呼び出します）。
+        Noneを指定すると、コールバックをリスナースレッドで直接実行します。
+        
+        Parameters
+        ----------
+        notifier : Callable[[], None] or None
+            通知関数
+        """
+        self._notifier = notifier
+    
+    def drain(self) -> int:
+        """
+        実行待ちのホットキーのコールバックを呼び出し元のスレッドで実行する
+        
+        Returns
+        -------
+        int
+            実行したコールバックの数
+        """
+        # 先にフラグを下ろすことで、取り出し中に積まれたイベントの通知を取りこぼさない
+        self._notify_pending = False
+        count = 0
+        while self._queue:
+            callback, args, detected_ns = self._queue.popleft()
+            self._latencies.append((time.perf_counter_ns() - detected_ns) / 1e6)
+            self.current_event_ns = detected_ns
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Hotkey action error: {e}")
+            count += 1
+        return count
+    
+    def pending_count(self) -> int:
+        """
+        実行待ちのホットキーの数を返す
+        
+        Returns
+        -------
+        int
+            キューに積まれているホットキーの数
+        """
+        return len(self._queue)
+    
+    def get_latency_stats(self) -> Dict[str, float]:
+        """
+        ホットキー検出からコールバック開始までの時間の統計を返す
+        
+        Returns
+        -------
+        dict
+            count, p50_ms, p95_ms, max_ms, dropped（計測値がない場合は count と dropped のみ）
+        """
+        latencies = sorted(self._latencies)
+        stats = {"count": len(latencies), "dropped": self.dropped_events}
+        if latencies:
+            stats["p50_ms"] = latencies[len(latencies) // 2]
+            stats["p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            stats["max_ms"] = latencies[-1]
+        return stats
+    
+    def _dispatch(self, callback: Callable[..., None], args: tuple) -> None:
+        """
+        一致したホットキーを実行する（リスナースレッドから呼ばれる）
+        
+        通知関数が設定されていればキューに積んで通知し、なければその場で実行します。
+        """
+        notifier = self._notifier
+        if notifier is None:
+            self.current_event_ns = time.perf_counter_ns()
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Hotkey action error: {e}")
+            return
+        
+        if len(self._queue) >= self.queue_size:
+            self.dropped_events += 1
+            return
+        self._queue.append((callback, args, time.perf_counter_ns()))
+        
+        # 利用側がまだ取り出していなければ通知は1回で十分
+        if not self._notify_pending:
+            self._notify_pending = True
+            notifier()
     
-    def register_hotkey(self, hotkey_str: str, callback: Callable[[], None]) -> bool:
+    def register_hotkey(
+        self,
+        hotkey_str: str,
+        callback: Callable[..., None],
+        *args,
+        on_release: Optional[Callable[..., None]] = None,
+    ) -> bool:
         """
         新しいホットキーを登録する
         
         Parameters
         ----------
         hotkey_str : str
-            'ctrl+shift+r'のような形式のホットキー文字列
-        callback : Callable[[], None]
+            'ctrl+shift+r' や 'ctrl+k, r' のような形式のホットキー文字列
+        callback : Callable[..., None]
             ホットキーが押されたときに実行する関数
+        *args
+            実行時に関数へ渡す引数（ホットキーごとに異なる設定で同じ処理を実行する場合など）
+        on_release : Callable[..., None], optional
+            押したホットキーのいずれかのキーが離されたときに実行する関数
             
         Returns
         -------
@@ -47,23 +192,54 @@ class HotkeyManager:
             登録の成功・失敗
         """
         try:
-            # 以前のリスナーがあれば停止
-            self.stop_listener()
-            
             # ホットキーの組み合わせを解析
             hotkey_combination = self.parse_hotkey_string(hotkey_str)
             if not hotkey_combination:
                 raise ValueError(f"Invalid hotkey format: {hotkey_str}")
             
-            # 既存のホットキーマップに新しいホットキーを追加または更新
+            # エンジンに登録（索引の差し替えのみでリスナーは止めない）
+            if not self.engine.bind(hotkey_str, callback, *args, on_release=on_release):
+                raise ValueError(f"Invalid hotkey format: {hotkey_str}")
             self.hotkeys[hotkey_combination] = callback
             
-            # 新しいリスナーを開始
+            # リスナーが動いていなければ開始（動いている場合はそのまま使う）
             return self.start_listener()
         except Exception as e:
             print(f"Failed to register hotkey: {e}")
             return False
     
+    def register_push_to_talk(
+        self,
+        hotkey_str: str,
+        on_press: Callable[..., None],
+        on_release: Callable[..., None],
+        *args,
+    ) -> bool:
+        """
+        押している間だけ有効なホットキー（プッシュトゥトーク）を登録する
+        
+        押したときに on_press、いずれかのキーを離したときに on_release を実行します。
+        キーを押し続けたときの自動リピートでは on_press を繰り返し実行しません。
+        解除は ``unregister_hotkey`` で行います。
+        
+        Parameters
+        ----------
+        hotkey_str : str
+            'ctrl+shift+space' のような形式のホットキー文字列
+        on_press : Callable[..., None]
+            ホットキーが押されたときに実行する関数（録音開始など）
+        on_release : Callable[..., None]
+            ホットキーが離されたときに実行する関数（録音停止と送信など）
+        *args
+            実行時に両方の関数へ渡す引数
+            
+        Returns
+        -------
+        bool
+            登録の成功・失敗
+        """
+        return self.register_hotkey(hotkey_str, on_press, *args, on_release=on_release)
+    
     def unregister_hotkey(self, hotkey_str: str) -> bool:
         """
         既存のホットキー登録を解除する
@@ -86,16 +262,9 @@ class HotkeyManager:
             if not hotkey_combination or hotkey_combination not in self.hotkeys:
                 return False
             
-            # リスナーを停止
-            self.stop_listener()
-            
-            # ホットキーをマップから削除
+            # ホットキーをエンジンとマップから削除（リスナーは停止しない）
+            self.engine.unbind(hotkey_str)
             del self.hotkeys[hotkey_combination]
-            
-            # 他のホットキーがまだ残っていれば、リスナーを再開
-            if self.hotkeys:
-                return self.start_listener()
-            
             return True
         except Exception as e:
             print(f"Failed to unregister hotkey: {e}")
@@ -105,6 +274,8 @@ class HotkeyManager:
         """
         ホットキーリスナーを開始する
         
+        すでにリスナーが動作している場合は何もしません。
+        
         Returns
         -------
         bool
@@ -113,8 +284,12 @@ class HotkeyManager:
         try:
             if not self.hotkeys:
                 return False
-                
-            self.listener = keyboard.GlobalHotKeys(self.hotkeys)
+            
+            if self.listener and self.listener.is_alive():
+                return True
+            
+            self.engine.reset()
+            self.listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
             self.listener.start()
             return True
         except Exception as e:
@@ -134,6 +309,7 @@ class HotkeyManager:
             try:
                 self.listener.stop()
                 self.listener = None
+                self.engine.reset()
                 return True
             except Exception as e:
                 print(f"Failed to stop hotkey listener: {e}")
@@ -150,9 +326,42 @@ class HotkeyManager:
             解除の成功・失敗
         """
         self.stop_listener()
+        self.engine.clear()
         self.hotkeys.clear()
         return True
     
+    def _on_press(self, key, injected=False) -> None:
+        """
+        キーが押されたときの処理（リスナースレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        key : keyboard.Key or keyboard.KeyCode
+            押されたキー
+        injected : bool
+            プログラムから送出されたイベントかどうか
+        """
+        listener = self.listener
+        if injected or listener is None:
+            return
+        self.engine.press(listener.canonical(key))
+    
+    def _on_release(self, key, injected=False) -> None:
+        """
+        キーが離されたときの処理（リスナースレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        key : keyboard.Key or keyboard.KeyCode
+            離されたキー
+        injected : bool
+            プログラムから送出されたイベントかどうか
+        """
+        listener = self.listener
+        if injected or listener is None:
+            return
+        self.engine.release(listener.canonical(key))
+    
     @staticmethod
     def parse_hotkey_string(hotkey_str: str) -> Optional[str]:
         """
@@ -161,7 +370,7 @@ class HotkeyManager:
         Parameters
         ----------
         hotkey_str : str
-            'ctrl+shift+r'のような形式のホットキー文字列
+            'ctrl+shift+r' や 'ctrl+k, r' のような形式のホットキー文字列
             
         Returns
         -------
@@ -169,73 +378,7 @@ class HotkeyManager:
             pynput形式のホットキー文字列（例: '<ctrl>+<shift>+r'）
             無効な入力の場合はNone
         """
-        if not hotkey_str:
-            return None
-            
-        # 大文字小文字を正規化
-        hotkey_str = hotkey_str.lower()
-        
-        # 修飾キーのマッピング
-        modifier_mapping = {
-            'ctrl': '<ctrl>',
-            'control': '<ctrl>',
-            'alt': '<alt>',
-            'option': '<alt>',  # macOS用
-            'shift': '<shift>',
-            'cmd': '<cmd>',
-            'command': '<cmd>',
-            'win': '<cmd>',
-            'windows': '<cmd>',
-            'meta': '<cmd>'
-        }
-        
-        # 特殊キーのマッピング
-        special_key_mapping = {
-            'f1': '<f1>', 'f2': '<f2>', 'f3': '<f3>', 'f4': '<f4>',
-            'f5': '<f5>', 'f6': '<f6>', 'f7': '<f7>', 'f8': '<f8>',
-            'f9': '<f9>', 'f10': '<f10>', 'f11': '<f11>', 'f12': '<f12>',
-            'esc': '<esc>', 'escape': '<esc>',
-            'tab': '<tab>',
-            'space': '<space>',
-            'backspace': '<backspace>', 'bs': '<backspace>',
-            'enter': '<enter>', 'return': '<enter>',
-            'ins': '<insert>', 'insert': '<insert>',
-            'del': '<delete>', 'delete': '<delete>',
-            'home': '<home>',
-            'end': '<end>',
-            'pageup': '<page_up>', 'pgup': '<page_up>',
-            'pagedown': '<page_down>', 'pgdn': '<page_down>',
-            'up': '<up>', 'down': '<down>', 'left': '<left>', 'right': '<right>',
-            'capslock': '<caps_lock>', 'caps': '<caps_lock>',
-            'numlock': '<num_lock>', 'num': '<num_lock>',
-            'scrolllock': '<scroll_lock>', 'scrl': '<scroll_lock>',
-            'prtsc': '<print_screen>', 'printscreen': '<print_screen>'
-        }
-        
-        parts = hotkey_str.split('+')
-        processed_parts = []
-        
-        # 少なくとも1つのキーが必要
-        if not parts:
-            return None
-            
-        for part in parts:
-            part = part.strip()
-            if part in modifier_mapping:
-                processed_parts.append(modifier_mapping[part])
-            elif part in special_key_mapping:
-                processed_parts.append(special_key_mapping[part])
-            elif len(part) == 1:  # 単一文字（a-z, 0-9など）
-                processed_parts.append(part)
-            else:
-                print(f"Warning: Unknown key '{part}' in hotkey. Using as is.")
-                processed_parts.append(part)
-        
-        # 最低1つのキーが存在することを確認
-        if not processed_parts:
-            return None
-            
-        return '+'.join(processed_parts)
+        return to_pynput_format(hotkey_str)
     
     @staticmethod
     def is_valid_hotkey(hotkey_str: str) -> bool:
@@ -252,7 +395,7 @@ class HotkeyManager:
         bool
             ホットキーが有効かどうか
         """
-        return HotkeyManager.parse_hotkey_string(hotkey_str) is not None
+        return compile_hotkey(hotkey_str) is not None
     
     @staticmethod
     def contains_modifier(hotkey_str: str) -> bool:
@@ -273,7 +416,6 @@ class HotkeyManager:
             return False
             
         hotkey_str = hotkey_str.lower()
-        parts = hotkey_str.split('+')
+        parts = hotkey_str.replace(',', '+').split('+')
         
-        modifiers = ['ctrl', 'control', 'alt', 'shift', 'cmd', 'command', 'win', 'windows', 'meta']
-        return any(part in modifiers for part in parts) 
\ No newline at end of file
+        return any(part.strip() in MODIFIER_MAPPING for part in parts) 
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+入力レベルの計測モジュール
+
+音声ブロックごとの RMS とピーク（int16 のフルスケールを 1.0 とする値）を NumPy で計算し、
+表示用のリングバッファに書き込みます。書き込みはオーディオコールバック、読み込みは
+GUIスレッドの1対1で、ロックは使いません。
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+FULL_SCALE = 32768.0
+
+
+def block_levels(samples: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    音声を count 個の区間に分け、区間ごとの RMS とピークを計算する
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        形状 (フレーム数, チャンネル数) の int16 の音声（フレーム数は count の倍数）
+    count : int
+        区間の数
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (RMS, ピーク)。どちらも長さ count の float32（フルスケールが 1.0）
+    """
+    if count <= 0 or len(samples) < count:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty
+    rows = samples[:len(samples) // count * count].reshape(count, -1).astype(np.float32)
+    rms = np.sqrt(np.einsum("ij,ij->i", rows, rows) / rows.shape[1]) / FULL_SCALE
+    peak = np.abs(rows).max(axis=1) / FULL_SCALE
+    return rms.astype(np.float32), peak.astype(np.float32)
+
+
+class LevelBuffer:
+    """
+    直近のブロックの RMS とピークを保持するリングバッファ
+
+    push はオーディオコールバックから、latest はGUIスレッドから呼ばれます。
+    値を書き込んでから書き込み数（written）を進めるため、読み込み側は written までの
+    値だけを読みます。enabled が False の間は push は何も計算しません。
+
+    Attributes
+    ----------
+    enabled : bool
+        レベルを計算するかどうか（表示している間だけ True にします）
+    written : int
+        書き込んだブロック数の合計
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        LevelBufferの初期化
+
+        Parameters
+        ----------
+        capacity : int
+            保持するブロック数
+        """
+        self.capacity = capacity
+        self.enabled = False
+        self.written = 0
+        self._rms = np.zeros(capacity, dtype=np.float32)
+        self._peak = np.zeros(capacity, dtype=np.float32)
+
+    def push(self, block: np.ndarray) -> None:
+        """
+        音声ブロックの RMS とピークを書き込む
+
+        Parameters
+        ----------
+        block : np.ndarray
+            形状 (フレーム数, チャンネル数) の int16 の音声
+        """
+        if not self.enabled or not len(block):
+            return
+        flat = block.reshape(-1)
+        peak = max(int(flat.max()), -int(flat.min()))
+        values = flat.astype(np.float32)
+        index = self.written % self.capacity
+        self._rms[index] = math.sqrt(float(values.dot(values)) / len(values)) / FULL_SCALE
+        self._peak[index] = peak / FULL_SCALE
+        self.written += 1
+
+    def latest(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        直近 count ブロック分の RMS とピークを古い順に返す
+
+        Parameters
+        ----------
+        count : int
+            ブロック数（capacity まで）
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (RMS, ピーク)。書き込まれたブロックが count より少ない場合は短くなります
+        """
+        written = self.written
+        count = min(count, self.capacity, written)
+        indices = np.arange(written - count, written) % self.capacity
+        return self._rms[indices], self._peak[indices]
+
+    def clear(self) -> None:
+        """
+        保持している値を消去する
+        """
+        self.written = 0
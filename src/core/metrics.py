@@ -0,0 +1,642 @@
+"""
+メトリクス収集モジュール
+
+録音・文字起こしの件数や処理時間をカウンターとヒストグラムで集計し、
+Prometheus のテキスト形式と JSON で出力します。
+
+ヒストグラムは HDR Histogram と同様に、2倍ごとの区間をさらに8等分した
+対数線形のバケットで記録します。値の記録はバケット番号の計算とカウントの加算のみで、
+録音・文字起こしの処理中に呼び出しても1マイクロ秒未満で完了します。
+
+MetricsExporter を開始すると、ローカルホストの HTTP エンドポイント（/metrics）と
+定期的な JSON スナップショットファイルで集計結果を公開します。
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# 2倍ごとの区間を分割する数（2のべき乗）
+SUB_BUCKETS = 8
+
+
+class Counter:
+    """単調増加するカウンター"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        カウンターを加算する
+
+        Parameters
+        ----------
+        amount : float
+            加算する値（0以上）
+        """
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """
+    対数線形バケットのヒストグラム
+
+    lowest 未満の値は最初のバケットに、highest 以上の値は最後のバケットに数えます。
+    分位点の相対誤差は 1 / SUB_BUCKETS 以下です。
+    """
+
+    __slots__ = ("lowest", "highest", "counts", "sum", "max", "_scale", "_last", "_lock")
+
+    def __init__(self, lowest: float = 1e-4, highest: float = 3600.0):
+        """
+        Histogramの初期化
+
+        Parameters
+        ----------
+        lowest : float
+            区別する最小の値
+        highest : float
+            区別する最大の値
+        """
+        self.lowest = lowest
+        self.highest = highest
+        octaves = max(1, math.ceil(math.log2(highest / lowest)))
+        self.counts = [0] * (octaves * SUB_BUCKETS + 1)
+        self.sum = 0.0
+        self.max = 0.0
+        self._scale = 1.0 / lowest
+        self._last = len(self.counts) - 1
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """
+        値を記録する
+
+        Parameters
+        ----------
+        value : float
+            記録する値
+        """
+        scaled = value * self._scale
+        if scaled < 1.0:
+            index = 0
+        else:
+            mantissa, exponent = math.frexp(scaled)
+            # 仮数部 [0.5, 1) を SUB_BUCKETS 等分した位置
+            index = (exponent - 1) * SUB_BUCKETS + int(mantissa * 2 * SUB_BUCKETS) - SUB_BUCKETS + 1
+            if index > self._last:
+                index = self._last
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def count(self) -> int:
+        """記録した値の件数"""
+        return sum(self.counts)
+
+    def upper_bound(self, index: int) -> float:
+        """
+        バケットの上限値を返す
+
+        Parameters
+        ----------
+        index : int
+            バケット番号
+
+        Returns
+        -------
+        float
+            そのバケットに数える値の上限
+        """
+        if index == 0:
+            return self.lowest
+        octave, step = divmod(index - 1, SUB_BUCKETS)
+        return self.lowest * (2 ** octave) * (1 + (step + 1) / SUB_BUCKETS)
+
+    def snapshot(self) -> Tuple[List[int], int, float, float]:
+        """
+        現在の集計値の複製を返す
+
+        Returns
+        -------
+        tuple
+            (バケットごとの件数, 件数, 合計, 最大値)
+        """
+        with self._lock:
+            counts = list(self.counts)
+            return counts, sum(counts), self.sum, self.max
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99)) -> List[Optional[float]]:
+        """
+        分位点を返す（該当するバケットの上限値）
+
+        Parameters
+        ----------
+        qs : tuple of float
+            求める分位（0〜1）
+
+        Returns
+        -------
+        list
+            分位点（記録がない場合はNone）
+        """
+        counts, count, _, maximum = self.snapshot()
+        if not count:
+            return [None] * len(qs)
+        results = []
+        for q in qs:
+            rank = max(1, math.ceil(q * count))
+            seen = 0
+            for index, bucket in enumerate(counts):
+                seen += bucket
+                if seen >= rank:
+                    # 最後のバケットには highest 以上の値も含まれる
+                    bound = maximum if index == len(counts) - 1 else self.upper_bound(index)
+                    results.append(min(bound, maximum))
+                    break
+        return results
+
+    def cumulative_buckets(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        """
+        2倍ごとの境界での累積件数を返す（Prometheus の le ラベル用）
+
+        Returns
+        -------
+        tuple
+            ([(境界値, 境界値以下の件数), ...], 件数, 合計)
+        """
+        counts, count, total, _ = self.snapshot()
+        buckets = [(self.lowest, counts[0])]
+        cumulative = counts[0]
+        for octave in range((len(counts) - 1) // SUB_BUCKETS):
+            start = 1 + octave * SUB_BUCKETS
+            cumulative += sum(counts[start:start + SUB_BUCKETS])
+            buckets.append((self.lowest * 2 ** (octave + 1), cumulative))
+        return buckets, count, total
+
+
+class _Family:
+    """同じ名前でラベルの値が異なるメトリクスの集まり"""
+
+    def __init__(self, name: str, help_text: str, kind: str, label_names: Tuple[str, ...], factory):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = label_names
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """
+        ラベルの値に対応するメトリクスを返す（初回のみ作成する）
+
+        Parameters
+        ----------
+        *values
+            label_names の順に並べたラベルの値
+
+        Returns
+        -------
+        Counter or Histogram
+            ラベルの値に対応するメトリクス
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in values), self._factory())
+                self._children.setdefault(values, child)
+        return child
+
+    def children(self) -> List[Tuple[Dict[str, str], object]]:
+        """(ラベルの辞書, メトリクス) のリストを返す（重複を除く）"""
+        with self._lock:
+            items = list(self._children.items())
+        seen = set()
+        results = []
+        for values, child in items:
+            if id(child) in seen:
+                continue
+            seen.add(id(child))
+            results.append((dict(zip(self.label_names, (str(v) for v in values))), child))
+        return results
+
+
+def _escape(value: str) -> str:
+    """Prometheus のラベル値をエスケープする"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    メトリクスの登録と出力
+
+    counter / histogram で作成したメトリクスを、Prometheus のテキスト形式と
+    JSON 用の辞書に変換します。
+    """
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> _Family:
+        """
+        カウンターを登録する
+
+        Parameters
+        ----------
+        name : str
+            メトリクス名
+        help_text : str
+            説明
+        labels : tuple of str
+            ラベル名
+
+        Returns
+        -------
+        _Family
+            labels(...) でラベルの値ごとのカウンターを取得できるオブジェクト
+        """
+        return self._register(_Family(name, help_text, "counter", tuple(labels), Counter))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  lowest: float = 1e-4, highest: float = 3600.0) -> _Family:
+        """
+        ヒストグラムを登録する
+
+        Parameters
+        ----------
+        name : str
+            メトリクス名
+        help_text : str
+            説明
+        labels : tuple of str
+            ラベル名
+        lowest : float
+            区別する最小の値
+        highest : float
+            区別する最大の値
+
+        Returns
+        -------
+        _Family
+            labels(...) でラベルの値ごとのヒストグラムを取得できるオブジェクト
+        """
+        return self._register(
+            _Family(name, help_text, "histogram", tuple(labels), lambda: Histogram(lowest, highest))
+        )
+
+    def _register(self, family: _Family) -> _Family:
+        with self._lock:
+            if family.name in self._families:
+                raise ValueError(f"metric {family.name} is already registered")
+            self._families[family.name] = family
+        return family
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus のテキスト形式（バージョン 0.0.4）に変換する
+
+        Returns
+        -------
+        str
+            エクスポジション形式のテキスト
+        """
+        lines = []
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for labels, child in family.children():
+                if family.kind == "counter":
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+                    continue
+                buckets, count, total = child.cumulative_buckets()
+                for bound, cumulative in buckets:
+                    bucket_labels = dict(labels, le=_format_value(bound))
+                    lines.append(f"{family.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{family.name}_bucket{_format_labels(dict(labels, le='+Inf'))} {count}")
+                lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{family.name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict:
+        """
+        JSON に変換できる辞書に変換する
+
+        Returns
+        -------
+        dict
+            created_at と、メトリクス名ごとのラベルと値
+            （ヒストグラムは count, sum, p50, p95, p99, max）
+        """
+        metrics = {}
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            series = []
+            for labels, child in family.children():
+                if family.kind == "counter":
+                    series.append({"labels": labels, "value": child.value})
+                    continue
+                p50, p95, p99 = child.quantiles()
+                series.append({
+                    "labels": labels, "count": child.count, "sum": child.sum,
+                    "p50": p50, "p95": p95, "p99": p99, "max": child.max,
+                })
+            metrics[family.name] = {"type": family.kind, "help": family.help, "series": series}
+        return {"created_at": datetime.now().isoformat(timespec="seconds"), "metrics": metrics}
+
+
+class AppMetrics:
+    """
+    アプリケーションのメトリクス
+
+    録音（AudioRecorder）とその入力ストリームの状態、直近の録音（RecentTakes）、
+    文字起こし（WhisperTranscriber）と完了したトレースから値を記録します。
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        AppMetricsの初期化
+
+        Parameters
+        ----------
+        registry : MetricsRegistry, optional
+            メトリクスを登録するレジストリ。指定がなければ新しく作成します。
+        """
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.recorded_takes = r.counter("osw_recorded_takes_total", "Recordings saved").labels()
+        self.recorded_audio_seconds = r.counter(
+            "osw_recorded_audio_seconds_total", "Seconds of audio recorded").labels()
+        self.takes = r.counter("osw_takes_total", "Transcribed takes", ("model",))
+        self.audio_seconds = r.counter("osw_audio_seconds_total", "Seconds of audio transcribed", ("model",))
+        self.upload_bytes = r.counter("osw_upload_bytes_total", "Audio bytes uploaded", ("model",))
+        self.retries = r.counter("osw_http_retries_total", "HTTP requests retried by the API client").labels()
+        self.errors = r.counter("osw_errors_total", "Transcription errors by exception class", ("model", "error"))
+        self.cache = r.counter("osw_cache_requests_total", "In-memory cache lookups", ("cache", "result"))
+        self.transcription_seconds = r.histogram(
+            "osw_transcription_seconds", "Time spent in the transcription API call", ("model",))
+        self.real_time_factor = r.histogram(
+            "osw_real_time_factor", "Transcription time divided by audio duration", ("model",),
+            lowest=1e-3, highest=1000.0)
+        self.stage_seconds = r.histogram("osw_stage_seconds", "Per-take pipeline stage duration", ("stage",))
+        self.audio_callbacks = r.counter("osw_audio_callbacks_total", "Audio input callbacks during takes").labels()
+        self.audio_overflows = r.counter(
+            "osw_audio_input_overflows_total", "Audio input overflows (dropped audio) during takes").labels()
+        self.audio_underflows = r.counter(
+            "osw_audio_input_underflows_total", "Audio input underflows during takes").labels()
+        self.audio_callback_max_seconds = r.histogram(
+            "osw_audio_callback_max_seconds", "Longest audio callback per take", lowest=1e-6, highest=1.0).labels()
+        self.audio_jitter_max_seconds = r.histogram(
+            "osw_audio_jitter_max_seconds", "Largest audio callback interval jitter per take",
+            lowest=1e-6, highest=10.0).labels()
+        self.capture_restarts = r.counter(
+            "osw_capture_process_restarts_total", "Capture subprocess restarts after an exit or missed heartbeat"
+        ).labels()
+        self.auto_stops = r.counter("osw_auto_stops_total", "Takes stopped automatically", ("reason",))
+        self.speculative_uploads = r.counter(
+            "osw_speculative_uploads_total", "Speculative uploads on speech pauses by outcome", ("outcome",))
+        self.speculative_audio_seconds = r.counter(
+            "osw_speculative_audio_seconds_total", "Seconds of audio uploaded speculatively by outcome", ("outcome",))
+        self.realtime_sessions = r.counter(
+            "osw_realtime_sessions_total", "Realtime transcription sessions by outcome (final or fallback)",
+            ("outcome",))
+        self.rate_limit_wait_seconds = r.histogram(
+            "osw_rate_limit_wait_seconds", "Time requests waited for the client-side rate limiter", ("priority",),
+            lowest=1e-4, highest=600.0)
+        self.rate_limit_reroutes = r.counter(
+            "osw_rate_limit_reroutes_total", "Requests rerouted to a fallback deployment by the rate limiter").labels()
+        self.rate_limit_rejections = r.counter(
+            "osw_rate_limit_rejections_total", "Requests rejected by the server with 429").labels()
+
+    def record_transcription(self, model: str, seconds: float, upload_bytes: int,
+                             audio_seconds: Optional[float] = None) -> None:
+        """
+        成功した文字起こしを記録する
+
+        Parameters
+        ----------
+        model : str
+            使用したモデル（deployment）
+        seconds : float
+            API呼び出しの所要時間（秒）
+        upload_bytes : int
+            送信した音声のバイト数
+        audio_seconds : float, optional
+            音声の長さ（秒）
+        """
+        self.takes.labels(model).inc()
+        self.upload_bytes.labels(model).inc(upload_bytes)
+        self.transcription_seconds.labels(model).observe(seconds)
+        if audio_seconds:
+            self.audio_seconds.labels(model).inc(audio_seconds)
+            self.real_time_factor.labels(model).observe(seconds / audio_seconds)
+
+    def record_error(self, model: str, error: BaseException) -> None:
+        """
+        文字起こしのエラーを記録する
+
+        Parameters
+        ----------
+        model : str
+            使用したモデル（deployment）
+        error : BaseException
+            発生した例外
+        """
+        self.errors.labels(model, type(error).__name__).inc()
+
+    def record_stream_health(self, health) -> None:
+        """
+        録音1回分のオーディオコールバックの集計を記録する
+
+        Parameters
+        ----------
+        health : StreamHealth
+            録音1回分の集計
+        """
+        self.audio_callbacks.inc(health.callbacks)
+        self.audio_overflows.inc(health.input_overflows)
+        self.audio_underflows.inc(health.input_underflows)
+        if health.callbacks:
+            self.audio_callback_max_seconds.observe(health.callback_seconds_max)
+        if health.intervals:
+            self.audio_jitter_max_seconds.observe(health.jitter_seconds_max)
+
+    def record_trace(self, trace) -> None:
+        """
+        完了したトレースの各段階の時間を記録する
+
+        Parameters
+        ----------
+        trace : TakeTrace or NullTrace
+            完了したトレース
+        """
+        for name, milliseconds in trace.durations().items():
+            self.stage_seconds.labels(name).observe(milliseconds / 1000)
+
+    def httpx_event_hooks(self) -> Dict[str, list]:
+        """
+        API クライアントの再試行を数える httpx のイベントフックを返す
+
+        Returns
+        -------
+        dict
+            httpx.Client の event_hooks に指定する辞書
+        """
+        retries = self.retries
+
+        def on_request(request):
+            # OpenAI SDK は再試行のたびに再試行回数をヘッダーで送る
+            if request.headers.get("x-stainless-retry-count", "0") != "0":
+                retries.inc()
+
+        return {"request": [on_request]}
+
+
+class MetricsExporter:
+    """
+    メトリクスをローカルホストの HTTP エンドポイントと JSON スナップショットで公開する
+
+    GET /metrics で Prometheus のテキスト形式、GET /metrics.json で JSON を返します。
+    スナップショットは interval 秒ごとに一時ファイルへ書き込んでから置き換えます。
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int = 0, host: str = "127.0.0.1",
+                 snapshot_path: Optional[str] = None, interval: float = 60.0):
+        """
+        MetricsExporterの初期化
+
+        Parameters
+        ----------
+        registry : MetricsRegistry
+            公開するレジストリ
+        port : int
+            待ち受けるポート（0の場合は HTTP エンドポイントを開始しない）
+        host : str
+            待ち受けるアドレス（既定はローカルホストのみ）
+        snapshot_path : str, optional
+            JSON スナップショットの書き込み先（Noneの場合は書き込まない）
+        interval : float
+            スナップショットを書き込む間隔（秒）
+        """
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self._httpd = None
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self) -> bool:
+        """
+        HTTP エンドポイントとスナップショットの書き込みを開始する
+
+        Returns
+        -------
+        bool
+            開始の成功・失敗（ポートが使用中の場合など）
+        """
+        if self.port:
+            try:
+                self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+            except OSError as e:
+                print(f"Failed to start metrics endpoint: {e}")
+                return False
+            self._httpd.daemon_threads = True
+            self._threads.append(threading.Thread(target=self._httpd.serve_forever, daemon=True))
+
+        if self.snapshot_path:
+            self._threads.append(threading.Thread(target=self._snapshot_loop, daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def stop(self) -> None:
+        """公開を停止し、最後のスナップショットを書き込む"""
+        self._stop_event.set()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self.snapshot_path:
+            self.write_snapshot()
+
+    def write_snapshot(self) -> bool:
+        """
+        JSON スナップショットを書き込む
+
+        Returns
+        -------
+        bool
+            書き込みの成功・失敗
+        """
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.registry.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.snapshot_path)
+            return True
+        except OSError as e:
+            print(f"Failed to write metrics snapshot: {e}")
+            return False
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.write_snapshot()
+
+    def _handler_class(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = registry.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(registry.to_dict(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
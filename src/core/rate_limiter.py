@@ -0,0 +1,393 @@
+"""
+クライアント側のレート制限モジュール
+
+複数の録音や再送を同時に送信したときに、deployment のクォータ（1分あたりのリクエスト数と
+音声の秒数）を超えて 429 が連続しないよう、送信前に deployment ごとのトークンバケットで
+待ち合わせます。バケットの容量と残量は応答の x-ratelimit-limit-* / x-ratelimit-remaining-*
+ヘッダーで補正し、429 の Retry-After の間は送信しません。
+
+ホットキーによる録音（PRIORITY_INTERACTIVE）は、再送や先行文字起こしなどのバックグラウンドの
+送信（PRIORITY_BACKGROUND）より優先します。バックグラウンドの送信は、対話的な送信が待っている
+間と、残量が容量の background_reserve 未満の間は待ちます。予備の deployment を指定した場合は、
+最も早く送信できる deployment に振り替えます。
+"""
+
+import re
+import time
+import threading
+from typing import Dict, Mapping, Optional, Sequence
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+
+# x-ratelimit-* ヘッダーの種類とバケットの対応（tokens はテキストのモデル用のため使わない）
+_REQUEST_HEADERS = ("requests",)
+_AUDIO_HEADERS = {"audio-seconds": 1.0, "audio-minutes": 60.0}
+
+# x-ratelimit-reset-* の "1m30s"、"250ms" などの期間
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RateLimitTimeout(TimeoutError):
+    """クライアント側のレート制限が時間内に解除されなかった（再送の対象になります）"""
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Retry-After や x-ratelimit-reset-* の値を秒に変換する
+
+    Parameters
+    ----------
+    value : str
+        "2"（秒）、"1m30s"、"250ms" などの値
+
+    Returns
+    -------
+    float or None
+        秒数。解釈できない場合はNone
+    """
+    value = (value or "").strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class TokenBucket:
+    """
+    一定の速さで補充されるトークンバケット
+
+    容量 capacity のトークンが per_seconds 秒で満タンまで補充されます。容量が 0 の場合は
+    制限しません（ヘッダーで上限がわかるまでの状態）。
+
+    Attributes
+    ----------
+    capacity : float
+        容量（0 で無制限）
+    tokens : float
+        現在の残量
+    """
+
+    def __init__(self, capacity: float = 0.0, per_seconds: float = 60.0):
+        """
+        TokenBucketの初期化
+
+        Parameters
+        ----------
+        capacity : float
+            容量（0 で無制限）
+        per_seconds : float
+            空から満タンまで補充する秒数
+        """
+        self.capacity = capacity
+        self.per_seconds = per_seconds
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: Optional[float] = None) -> None:
+        """経過時間分のトークンを補充する"""
+        now = time.monotonic() if now is None else now
+        if self.capacity:
+            elapsed = max(0.0, now - self._updated)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / self.per_seconds)
+        self._updated = now
+
+    def time_until(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        amount のトークンがたまるまでの秒数を返す
+
+        Parameters
+        ----------
+        amount : float
+            必要なトークン（容量を超える場合は満タンまで待ちます）
+        now : float, optional
+            現在時刻（time.monotonic）
+
+        Returns
+        -------
+        float
+            待つ秒数（すぐに使える場合は 0）
+        """
+        if not self.capacity:
+            return 0.0
+        self.refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing * self.per_seconds / self.capacity)
+
+    def take(self, amount: float) -> None:
+        """トークンを使う（残量は負になり得ます）"""
+        if self.capacity:
+            self.tokens -= amount
+
+    def set_limit(self, limit: float) -> None:
+        """
+        容量を変更する（x-ratelimit-limit-* ヘッダーから）
+
+        Parameters
+        ----------
+        limit : float
+            新しい容量
+        """
+        if limit <= 0 or limit == self.capacity:
+            return
+        if not self.capacity:
+            self.tokens = limit
+        self.capacity = limit
+        self.tokens = min(self.tokens, limit)
+
+    def observe_remaining(self, remaining: float) -> None:
+        """
+        サーバーが報告した残量で補正する（x-ratelimit-remaining-* ヘッダーから）
+
+        応答の時点より後に送信したリクエストの分を二重に数えないよう、残量は減らす方向にのみ
+        補正します。上限がわかっていない場合は、観測した残量の最大値から容量を推定します。
+
+        Parameters
+        ----------
+        remaining : float
+            サーバーが報告した残量
+        """
+        if not self.capacity:
+            self.capacity = remaining + 1
+            self.tokens = remaining
+            return
+        if remaining >= self.capacity:
+            self.capacity = remaining + 1
+        self.tokens = min(self.tokens, remaining)
+
+
+class DeploymentLimit:
+    """
+    1つの deployment のリクエスト数と音声の秒数のバケット、および 429 による停止期間
+    """
+
+    def __init__(self, requests_per_minute: float, audio_seconds_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.audio = TokenBucket(audio_seconds_per_minute)
+        self.blocked_until = 0.0
+        self.sent = 0
+        self.rejected = 0
+
+    def wait_time(self, audio_seconds: float, reserve: float, now: float) -> float:
+        """送信できるまでの秒数（reserve は残しておく容量の割合）"""
+        return max(
+            self.blocked_until - now,
+            self.requests.time_until(1 + reserve * self.requests.capacity, now),
+            self.audio.time_until(audio_seconds + reserve * self.audio.capacity, now),
+        )
+
+    def to_dict(self) -> Dict:
+        """診断情報用の状態"""
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.audio.refill(now)
+        return {
+            "requests_per_minute": self.requests.capacity,
+            "requests_remaining": round(self.requests.tokens, 2),
+            "audio_seconds_per_minute": self.audio.capacity,
+            "audio_seconds_remaining": round(self.audio.tokens, 2),
+            "blocked_seconds": round(max(0.0, self.blocked_until - now), 2),
+            "sent": self.sent,
+            "rejected": self.rejected,
+        }
+
+
+class RateLimiter:
+    """
+    deployment ごとのクライアント側のレート制限
+
+    送信の前に acquire でトークンを確保し、応答のヘッダーを update に、429 を reject に渡します。
+    複数のスレッドから呼び出せます。
+
+    Attributes
+    ----------
+    background_reserve : float
+        バックグラウンドの送信が残しておく容量の割合（対話的な送信のため）
+    max_wait : float or None
+        acquire で待つ最大秒数の既定値（None で送信できるまで待つ）
+    """
+
+    def __init__(self, requests_per_minute: float = 0.0, audio_seconds_per_minute: float = 0.0,
+                 background_reserve: float = 0.2, max_wait: Optional[float] = None, metrics=None):
+        """
+        RateLimiterの初期化
+
+        Parameters
+        ----------
+        requests_per_minute : float
+            1分あたりのリクエスト数の上限（0 の場合はヘッダーでわかるまで制限しない）
+        audio_seconds_per_minute : float
+            1分あたりの音声の秒数の上限（0 の場合はヘッダーでわかるまで制限しない）
+        background_reserve : float
+            バックグラウンドの送信が残しておく容量の割合
+        max_wait : float, optional
+            acquire で待つ最大秒数の既定値（指定がなければ送信できるまで待つ）
+        metrics : AppMetrics, optional
+            待ち時間・振り替え・429 の回数を記録するメトリクス
+        """
+        self.requests_per_minute = requests_per_minute
+        self.audio_seconds_per_minute = audio_seconds_per_minute
+        self.background_reserve = background_reserve
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self._limits: Dict[str, DeploymentLimit] = {}
+        self._interactive_waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, deployments: Sequence[str], audio_seconds: float = 0.0,
+                priority: str = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        送信できるまで待ち、トークンを確保した deployment を返す
+
+        Parameters
+        ----------
+        deployments : sequence of str
+            送信先の候補（先頭が本来の送信先、以降は振り替え先）
+        audio_seconds : float
+            送信する音声の長さ（秒）
+        priority : str
+            PRIORITY_INTERACTIVE または PRIORITY_BACKGROUND
+        timeout : float, optional
+            待つ最大秒数（指定がなければ max_wait）
+
+        Returns
+        -------
+        str or None
+            トークンを確保した deployment。時間内に送信できない場合はNone
+        """
+        started = time.monotonic()
+        timeout = self.max_wait if timeout is None else timeout
+        deadline = None if timeout is None else started + timeout
+        interactive = priority != PRIORITY_BACKGROUND
+        reserve = 0.0 if interactive else self.background_reserve
+        with self._condition:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    waits = [
+                        (self._limit(name).wait_time(audio_seconds, reserve, now), index, name)
+                        for index, name in enumerate(deployments)
+                    ]
+                    wait, index, name = min(waits)
+                    # 対話的な送信が待っている間、バックグラウンドの送信は待つ
+                    if not interactive and self._interactive_waiting:
+                        wait = max(wait, 0.05)
+                    if wait <= 0:
+                        limit = self._limit(name)
+                        limit.requests.take(1)
+                        limit.audio.take(audio_seconds)
+                        limit.sent += 1
+                        self._record_wait(priority, now - started, rerouted=index > 0)
+                        return name
+                    if deadline is not None:
+                        if now >= deadline:
+                            self._record_wait(priority, now - started, rerouted=False)
+                            return None
+                        wait = min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()
+
+    def update(self, deployment: str, headers: Mapping[str, str]) -> None:
+        """
+        応答の x-ratelimit-* ヘッダーで deployment のバケットを補正する
+
+        Parameters
+        ----------
+        deployment : str
+            応答を返した deployment
+        headers : Mapping[str, str]
+            応答のヘッダー（名前の大文字・小文字は区別しない）
+        """
+        values = {name.lower(): value for name, value in headers.items() if name.lower().startswith("x-ratelimit-")}
+        if not values:
+            return
+        with self._condition:
+            limit = self._limit(deployment)
+            for kind, bucket, scale in (
+                [(kind, limit.requests, 1.0) for kind in _REQUEST_HEADERS]
+                + [(kind, limit.audio, scale) for kind, scale in _AUDIO_HEADERS.items()]
+            ):
+                maximum = _number(values.get(f"x-ratelimit-limit-{kind}"))
+                if maximum is not None:
+                    bucket.set_limit(maximum * scale)
+                remaining = _number(values.get(f"x-ratelimit-remaining-{kind}"))
+                if remaining is not None:
+                    bucket.observe_remaining(remaining * scale)
+            self._condition.notify_all()
+
+    def reject(self, deployment: str, retry_after: Optional[float] = None,
+               headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        429 を受け取った deployment への送信を、Retry-After（なければ1秒）の間止める
+
+        Parameters
+        ----------
+        deployment : str
+            429 を返した deployment
+        retry_after : float, optional
+            送信を止める秒数
+        headers : Mapping[str, str], optional
+            429 の応答のヘッダー（Retry-After と x-ratelimit-* を読みます）
+        """
+        if headers is not None:
+            self.update(deployment, headers)
+            if retry_after is None:
+                milliseconds = _number(headers.get("retry-after-ms"))
+                if milliseconds is not None:
+                    retry_after = milliseconds / 1000
+                else:
+                    retry_after = parse_duration(headers.get("retry-after", ""))
+        with self._condition:
+            limit = self._limit(deployment)
+            limit.rejected += 1
+            limit.blocked_until = max(limit.blocked_until, time.monotonic() + (retry_after or 1.0))
+            limit.requests.tokens = min(limit.requests.tokens, 0.0)
+        if self.metrics is not None:
+            self.metrics.rate_limit_rejections.inc()
+
+    def stats(self) -> Dict:
+        """
+        deployment ごとの容量・残量・停止中の秒数・送信数・429 の回数を返す
+
+        Returns
+        -------
+        dict
+            deployment 名 -> 状態の辞書
+        """
+        with self._condition:
+            return {name: limit.to_dict() for name, limit in self._limits.items()}
+
+    def _limit(self, deployment: str) -> DeploymentLimit:
+        """deployment のバケットを返す（なければ作成する）"""
+        limit = self._limits.get(deployment)
+        if limit is None:
+            limit = self._limits[deployment] = DeploymentLimit(
+                self.requests_per_minute, self.audio_seconds_per_minute
+            )
+        return limit
+
+    def _record_wait(self, priority: str, seconds: float, rerouted: bool) -> None:
+        """待ち時間と振り替えを記録する"""
+        if self.metrics is None:
+            return
+        self.metrics.rate_limit_wait_seconds.labels(priority).observe(seconds)
+        if rerouted:
+            self.metrics.rate_limit_reroutes.inc()
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    """ヘッダーの値を数値に変換する（解釈できない場合はNone）"""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,251 @@
+"""
+リアルタイム文字起こしモジュール
+
+録音の開始時に Realtime API の文字起こしセッションを WebSocket で開き、オーディオコールバックの
+ブロックを受け取り次第送信します。途中の文字起こし結果（delta）を受け取りながら、停止時に
+音声を確定（commit）して最終結果を受け取るため、停止から結果までの時間が音声のアップロードと
+一括の文字起こしを待つ場合より短くなります。接続や応答に失敗した場合は finish が None を返すため、
+呼び出し側は通常の一括送信に切り替えます。
+"""
+
+import json
+import base64
+import queue
+import threading
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+from src.core.resampler import Resampler, downmix
+from src.core.websocket import WebSocket
+
+# Realtime API が受け付ける音声の形式（24 kHz モノラル、リトルエンディアンの int16）
+REALTIME_SAMPLE_RATE = 24000
+
+
+def realtime_url(endpoint: str, api_version: str, deployment: str) -> str:
+    """
+    Azure OpenAI のエンドポイントから文字起こしセッションの WebSocket の URL を作る
+
+    Parameters
+    ----------
+    endpoint : str
+        Azure OpenAI のエンドポイント（https://... または http://...）
+    api_version : str
+        Realtime API のバージョン
+    deployment : str
+        文字起こしモデルの deployment 名
+
+    Returns
+    -------
+    str
+        wss://（http の場合は ws://）の URL
+    """
+    parts = urlsplit(endpoint)
+    scheme = "ws" if parts.scheme == "http" else "wss"
+    query = urlencode({"api-version": api_version, "intent": "transcription", "deployment": deployment})
+    return f"{scheme}://{parts.netloc}/openai/realtime?{query}"
+
+
+class RealtimeSession:
+    """
+    1回の録音のリアルタイム文字起こしセッション
+
+    put はオーディオコールバックから呼ばれるため、キューへの追加のみを行います。
+    start で送信スレッドが接続し、キューの音声を 24 kHz モノラルに変換して送信します。
+    受信スレッドは途中の結果を on_interim に渡し、最終結果を finish に返します。
+
+    Attributes
+    ----------
+    interim : str
+        ここまでに受け取った途中の文字起こし結果
+    error : str or None
+        失敗した場合の理由
+    """
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, model: Optional[str] = None,
+                 language: Optional[str] = None, prompt: Optional[str] = None, connect_timeout: float = 5.0,
+                 on_interim: Optional[Callable[[str], None]] = None):
+        """
+        RealtimeSessionの初期化
+
+        Parameters
+        ----------
+        url : str
+            文字起こしセッションの WebSocket の URL
+        headers : dict, optional
+            ハンドシェイクに追加するヘッダー（api-key など）
+        model : str, optional
+            文字起こしモデル
+        language : str, optional
+            文字起こしの言語コード
+        prompt : str, optional
+            文字起こしのプロンプト（カスタム語彙など）
+        connect_timeout : float
+            接続のタイムアウト（秒）
+        on_interim : Callable[[str], None], optional
+            途中の文字起こし結果を受け取るたびに呼ばれる関数（受信スレッドから呼ばれます）
+        """
+        self.url = url
+        self.headers = headers or {}
+        self.model = model
+        self.language = language
+        self.prompt = prompt
+        self.connect_timeout = connect_timeout
+        self.on_interim = on_interim
+        self.interim = ""
+        self.error = None
+        self._final = None
+        self._done = threading.Event()
+        self._queue = queue.SimpleQueue()
+        self._socket = None
+        self._sender = None
+
+    def start(self, input_rate: int, channels: int = 1) -> None:
+        """
+        接続と送信を別スレッドで開始する
+
+        Parameters
+        ----------
+        input_rate : int
+            put に渡す音声のサンプルレート
+        channels : int
+            put に渡す音声のチャンネル数
+        """
+        self._sender = threading.Thread(
+            target=self._send_loop, args=(input_rate, channels), name="realtime-sender", daemon=True
+        )
+        self._sender.start()
+
+    def put(self, block: np.ndarray) -> None:
+        """
+        送信する音声ブロックを追加する（呼び出し側で複製したブロックを渡す）
+
+        Parameters
+        ----------
+        block : np.ndarray
+            形状 (フレーム数, チャンネル数) の int16 の音声
+        """
+        if self.error is None:
+            self._queue.put(block)
+
+    def finish(self, timeout: float = 3.0) -> Optional[str]:
+        """
+        音声を確定し、最終結果を待って返す
+
+        Parameters
+        ----------
+        timeout : float
+            最終結果を待つ最大秒数
+
+        Returns
+        -------
+        str or None
+            最終結果。失敗した場合（時間切れを含む）はNone
+        """
+        self._queue.put(None)
+        received = self._done.wait(timeout)
+        self.close()
+        if not received and self.error is None:
+            self.error = f"No final transcript within {timeout:.1f} s"
+        if self.error is not None:
+            print(f"Realtime transcription failed: {self.error}")
+            return None
+        return self._final
+
+    def close(self) -> None:
+        """
+        接続を閉じる（送信していない音声は捨てます）
+        """
+        self._queue.put(None)
+        socket = self._socket
+        if socket is not None:
+            socket.close()
+
+    def _fail(self, message: str) -> None:
+        """失敗を記録し、finish の待機を終える"""
+        if self.error is None and not self._done.is_set():
+            self.error = message
+        self._done.set()
+
+    def _send_loop(self, input_rate: int, channels: int) -> None:
+        """接続し、キューの音声を変換して送信する（None で確定する）"""
+        try:
+            self._socket = WebSocket.connect(self.url, self.headers, timeout=self.connect_timeout)
+        except Exception as e:
+            self._fail(f"connect: {e}")
+            return
+        threading.Thread(target=self._receive_loop, name="realtime-receiver", daemon=True).start()
+
+        transcription = {"model": self.model}
+        if self.language:
+            transcription["language"] = self.language
+        if self.prompt:
+            transcription["prompt"] = self.prompt
+        resampler = Resampler(input_rate, REALTIME_SAMPLE_RATE)
+        try:
+            self._send({
+                "type": "transcription_session.update",
+                "session": {
+                    "input_audio_format": "pcm16",
+                    "input_audio_transcription": transcription,
+                    "turn_detection": None,
+                },
+            })
+            while True:
+                # 送信が遅れている間に溜まったブロックはまとめて1回で送る
+                blocks = [self._queue.get()]
+                while blocks[-1] is not None:
+                    try:
+                        blocks.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                finished = blocks[-1] is None
+                samples = [downmix(block, 1) for block in blocks if block is not None]
+                converted = [resampler.process(np.concatenate(samples))] if samples else []
+                if finished:
+                    converted.append(resampler.flush())
+                self._send_audio(converted)
+                if finished:
+                    self._send({"type": "input_audio_buffer.commit"})
+                    return
+        except Exception as e:
+            self._fail(f"send: {e}")
+
+    def _send_audio(self, blocks) -> None:
+        """変換した音声を int16 にして送信する"""
+        blocks = [block for block in blocks if len(block)]
+        if not blocks:
+            return
+        samples = np.clip(np.rint(np.concatenate(blocks)), -32768, 32767).astype("<i2")
+        self._send({"type": "input_audio_buffer.append", "audio": base64.b64encode(samples.tobytes()).decode("ascii")})
+
+    def _send(self, event: Dict) -> None:
+        """クライアントイベントを送信する"""
+        self._socket.send_text(json.dumps(event))
+
+    def _receive_loop(self) -> None:
+        """サーバーイベントを受信し、途中の結果と最終結果を記録する"""
+        while True:
+            message = self._socket.recv()
+            if message is None:
+                self._fail("connection closed before the final transcript")
+                return
+            try:
+                event = json.loads(message)
+            except ValueError:
+                continue
+            kind = event.get("type", "")
+            if kind == "conversation.item.input_audio_transcription.delta":
+                self.interim += event.get("delta", "")
+                if self.on_interim is not None:
+                    self.on_interim(self.interim)
+            elif kind == "conversation.item.input_audio_transcription.completed":
+                self._final = event.get("transcript", self.interim)
+                self._done.set()
+                return
+            elif kind in ("error", "conversation.item.input_audio_transcription.failed"):
+                error = event.get("error") or {}
+                self._fail(error.get("message", kind) if isinstance(error, dict) else str(error))
+                return
@@ -0,0 +1,201 @@
+"""
+直近の録音保持モジュール
+
+直近の録音をint16のままメモリ上に保持し、ディスクを経由せずに
+別のモデルや言語で再度文字起こしできるようにします。
+"""
+
+import time
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """
+    音声サンプルをint16に変換する
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        int16 または -1.0〜1.0 の浮動小数点の音声サンプル
+
+    Returns
+    -------
+    np.ndarray
+        int16の音声サンプル（入力がint16の場合はそのまま）
+    """
+    if samples.dtype == np.int16:
+        return samples
+    scaled = np.clip(samples, -1.0, 1.0) * 32767.0
+    return np.rint(scaled, out=scaled).astype(np.int16)
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """
+    音声サンプルを -1.0〜1.0 の float32 に変換する
+
+    録音は int16 のまま扱うため、浮動小数点が必要な処理でのみ呼び出します。
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        int16 または浮動小数点の音声サンプル
+
+    Returns
+    -------
+    np.ndarray
+        float32の音声サンプル（入力がfloat32の場合はそのまま）
+    """
+    if samples.dtype == np.int16:
+        scaled = samples.astype(np.float32)
+        scaled *= 1.0 / 32768.0
+        return scaled
+    return samples.astype(np.float32, copy=False)
+
+
+class RecentTakes:
+    """
+    直近の録音をメモリ上に保持するリングバッファ
+
+    件数と合計バイト数の上限を超えると古い録音から破棄します。
+    スレッドセーフで、録音スレッドとGUIスレッドから同時に利用できます。
+    """
+
+    def __init__(self, max_takes: int = 10, max_bytes: int = 64 * 1024 * 1024, metrics=None):
+        """
+        RecentTakesの初期化
+
+        Parameters
+        ----------
+        max_takes : int
+            保持する録音数の上限
+        max_bytes : int
+            保持する音声データの合計バイト数の上限
+        metrics : AppMetrics, optional
+            取得の成功（hit）・破棄済み（miss）の件数を記録するメトリクス
+        """
+        self.max_takes = max(1, max_takes)
+        self.max_bytes = max_bytes
+        self._takes = OrderedDict()
+        self._total_bytes = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        if metrics is not None:
+            self._hits = metrics.cache.labels("recent_takes", "hit")
+            self._misses = metrics.cache.labels("recent_takes", "miss")
+        else:
+            self._hits = self._misses = None
+
+    def add(self, samples: np.ndarray, sample_rate: int, path: Optional[str] = None) -> Optional[int]:
+        """
+        録音を追加する
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            録音した音声サンプル（浮動小数点の場合はint16に変換して保持します）
+        sample_rate : int
+            サンプルレート
+        path : str, optional
+            保存した録音ファイルのパス
+
+        Returns
+        -------
+        int or None
+            追加した録音のID、上限を超えるため保持しなかった場合はNone
+        """
+        data = np.ascontiguousarray(to_int16(samples))
+        if data.nbytes > self.max_bytes:
+            return None
+
+        take = {
+            "id": next(self._ids),
+            "created_at": time.time(),
+            "sample_rate": sample_rate,
+            "duration": len(data) / float(sample_rate),
+            "path": path,
+            "text": None,
+            "samples": data,
+        }
+
+        with self._lock:
+            self._takes[take["id"]] = take
+            self._total_bytes += data.nbytes
+            while len(self._takes) > self.max_takes or self._total_bytes > self.max_bytes:
+                _, evicted = self._takes.popitem(last=False)
+                self._total_bytes -= evicted["samples"].nbytes
+        return take["id"]
+
+    def annotate(self, take_id: int, **fields) -> None:
+        """
+        録音に情報（文字起こし結果など）を付加する
+
+        Parameters
+        ----------
+        take_id : int
+            録音のID
+        **fields
+            付加する情報
+        """
+        with self._lock:
+            take = self._takes.get(take_id)
+            if take is not None:
+                take.update((k, v) for k, v in fields.items() if k != "samples")
+
+    def get(self, take_id: int) -> Optional[Dict]:
+        """
+        録音を取得する
+
+        Parameters
+        ----------
+        take_id : int
+            録音のID
+
+        Returns
+        -------
+        dict or None
+            録音の情報（``samples`` に int16 の音声データを含む）、破棄済みの場合はNone
+        """
+        with self._lock:
+            take = self._takes.get(take_id)
+            take = dict(take) if take is not None else None
+        if self._hits is not None:
+            (self._hits if take is not None else self._misses).inc()
+        return take
+
+    def list(self) -> List[Dict]:
+        """
+        保持している録音の一覧を新しい順に返す（音声データは含みません）
+
+        Returns
+        -------
+        list
+            録音の情報の辞書のリスト
+        """
+        with self._lock:
+            return [
+                {k: v for k, v in take.items() if k != "samples"}
+                for take in reversed(self._takes.values())
+            ]
+
+    def total_bytes(self) -> int:
+        """
+        保持している音声データの合計バイト数を返す
+
+        Returns
+        -------
+        int
+            合計バイト数
+        """
+        with self._lock:
+            return self._total_bytes
+
+    def clear(self) -> None:
+        """保持している録音をすべて破棄する"""
+        with self._lock:
+            self._takes.clear()
+            self._total_bytes = 0
@@ -0,0 +1,313 @@
+"""
+録音ファイル管理モジュール
+
+録音ファイルの命名・保存先の管理と、件数・容量・保持期間に基づく
+古い録音の削除（およびFLACへの再エンコード）を提供します。
+"""
+
+import os
+import time
+import uuid
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import soundfile as sf
+
+
+class RecordingStore:
+    """
+    録音ファイルの保存先と保持ポリシーを管理するクラス
+
+    ファイル名はタイムスタンプとランダムなサフィックスから生成し、
+    排他的に作成することで同じ秒に録音しても上書きされないようにします。
+    削除や再エンコードはバックグラウンドのワーカーが行うため、
+    録音停止処理の中で実行されることはありません。
+
+    Attributes
+    ----------
+    directory : str
+        録音ファイルを保存するディレクトリ
+    """
+
+    FILE_PREFIX = "recording_"
+    SUPPORTED_EXTENSIONS = (".wav", ".flac")
+
+    def __init__(
+        self,
+        directory: str,
+        max_files: Optional[int] = 100,
+        max_bytes: Optional[int] = 500 * 1024 * 1024,
+        max_age_seconds: Optional[float] = 7 * 24 * 60 * 60,
+        flac_after_seconds: Optional[float] = None,
+        rescan_interval: float = 60 * 60.0,
+    ):
+        """
+        RecordingStoreの初期化
+
+        Parameters
+        ----------
+        directory : str
+            録音ファイルを保存するディレクトリ（存在しない場合は作成されます）
+        max_files : int, optional
+            保持する録音ファイル数の上限（Noneで無制限）
+        max_bytes : int, optional
+            保持する録音ファイルの合計サイズの上限（Noneで無制限）
+        max_age_seconds : float, optional
+            録音ファイルを保持する最大期間（秒、Noneで無制限）
+        flac_after_seconds : float, optional
+            この秒数より古いWAVをバックグラウンドでFLACに再エンコードする（Noneで無効）
+        rescan_interval : float
+            外部での変更を取り込むためにディレクトリを再走査する間隔（秒）
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.flac_after_seconds = flac_after_seconds
+        self.rescan_interval = rescan_interval
+
+        # 古い順の録音ファイル情報（path, size, mtime）
+        self._files: List[Dict] = []
+        self._total_bytes = 0
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._worker = None
+        self._last_scan = 0.0
+
+    def new_path(self, extension: str = ".wav") -> str:
+        """
+        新しい録音ファイルのパスを確保する
+
+        ファイルを排他的に作成してからパスを返すため、同時刻の録音でも衝突しません。
+
+        Parameters
+        ----------
+        extension : str
+            ファイルの拡張子
+
+        Returns
+        -------
+        str
+            確保した録音ファイルのパス
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+
+        while True:
+            filename = f"{self.FILE_PREFIX}{timestamp}_{uuid.uuid4().hex[:6]}{extension}"
+            path = os.path.join(self.directory, filename)
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return path
+
+    def commit(self, path: str) -> None:
+        """
+        書き込みが完了した録音ファイルを登録する
+
+        保持ポリシーの適用はバックグラウンドのワーカーに任せ、ここではO(1)で戻ります。
+
+        Parameters
+        ----------
+        path : str
+            登録する録音ファイルのパス
+        """
+        with self._lock:
+            self._pending.append(path)
+        self._ensure_worker()
+        self._wake_event.set()
+
+    def discard(self, path: str) -> None:
+        """
+        確保したが使用しなかった録音ファイルを削除する
+
+        Parameters
+        ----------
+        path : str
+            削除する録音ファイルのパス
+        """
+        self._remove_file(path)
+
+    def resolve(self, path: str) -> Optional[str]:
+        """
+        録音ファイルの現在のパスを返す
+
+        バックグラウンドでFLACに再エンコードされた場合は新しいパスを返します。
+
+        Parameters
+        ----------
+        path : str
+            録音時に返されたファイルパス
+
+        Returns
+        -------
+        str or None
+            現在のファイルパス、削除済みの場合はNone
+        """
+        if path and os.path.exists(path):
+            return path
+        if path:
+            flac_path = os.path.splitext(path)[0] + ".flac"
+            if os.path.exists(flac_path):
+                return flac_path
+        return None
+
+    def get_usage(self):
+        """
+        現在の録音ファイル数と合計サイズを返す
+
+        Returns
+        -------
+        tuple
+            (ファイル数, 合計バイト数)
+        """
+        with self._lock:
+            return len(self._files), self._total_bytes
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        バックグラウンドのワーカーを停止する
+
+        Parameters
+        ----------
+        timeout : float, optional
+            ワーカーの終了を待つ最大秒数
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._worker and self._worker.is_alive():
+            self._worker.join(timeout)
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        """ワーカースレッドが起動していなければ起動する"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._worker_loop, name="recording-store")
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _worker_loop(self) -> None:
+        """
+        登録された録音を取り込み、保持ポリシーを適用するループ
+        """
+        while not self._stop_event.is_set():
+            try:
+                if time.time() - self._last_scan >= self.rescan_interval:
+                    self._scan()
+                self._absorb_pending()
+                self._enforce_policy()
+                self._compress_old_files()
+            except Exception as e:
+                print(f"Recording store maintenance error: {e}")
+
+            self._wake_event.wait(min(self.rescan_interval, 60.0))
+            self._wake_event.clear()
+
+    def _scan(self) -> None:
+        """
+        ディレクトリを走査して録音ファイルの一覧を作り直す
+        """
+        files = []
+        if os.path.isdir(self.directory):
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.is_file() or not entry.name.startswith(self.FILE_PREFIX):
+                        continue
+                    if not entry.name.endswith(self.SUPPORTED_EXTENSIONS):
+                        continue
+                    stat = entry.stat()
+                    files.append({"path": entry.path, "size": stat.st_size, "mtime": stat.st_mtime})
+        files.sort(key=lambda f: f["mtime"])
+
+        with self._lock:
+            # 走査結果に含まれる登録待ちファイルは二重登録しない
+            scanned = {f["path"] for f in files}
+            self._pending = [p for p in self._pending if p not in scanned]
+            self._files = files
+            self._total_bytes = sum(f["size"] for f in files)
+        self._last_scan = time.time()
+
+    def _absorb_pending(self) -> None:
+        """登録待ちの録音ファイルを一覧の末尾に追加する"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            for path in pending:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self._files.append({"path": path, "size": stat.st_size, "mtime": stat.st_mtime})
+                self._total_bytes += stat.st_size
+
+    def _enforce_policy(self) -> None:
+        """
+        件数・容量・保持期間の上限を超えた録音を古い順に削除する
+        """
+        now = time.time()
+        victims = []
+        with self._lock:
+            while self._files:
+                oldest = self._files[0]
+                too_many = self.max_files is not None and len(self._files) > self.max_files
+                too_large = self.max_bytes is not None and self._total_bytes > self.max_bytes
+                too_old = self.max_age_seconds is not None and now - oldest["mtime"] > self.max_age_seconds
+                if not (too_many or too_large or too_old):
+                    break
+                self._files.pop(0)
+                self._total_bytes -= oldest["size"]
+                victims.append(oldest["path"])
+
+        for path in victims:
+            self._remove_file(path)
+
+    def _compress_old_files(self) -> None:
+        """
+        一定時間より古いWAVファイルをFLACに再エンコードする
+        """
+        if self.flac_after_seconds is None:
+            return
+
+        cutoff = time.time() - self.flac_after_seconds
+        with self._lock:
+            candidates = [f for f in self._files if f["mtime"] < cutoff and f["path"].endswith(".wav")]
+
+        for info in candidates:
+            if self._stop_event.is_set():
+                return
+            wav_path = info["path"]
+            flac_path = os.path.splitext(wav_path)[0] + ".flac"
+            tmp_path = flac_path + ".tmp"
+            try:
+                data, sample_rate = sf.read(wav_path, dtype="int16")
+                sf.write(tmp_path, data, sample_rate, format="FLAC", subtype="PCM_16")
+                os.replace(tmp_path, flac_path)
+                os.utime(flac_path, (info["mtime"], info["mtime"]))
+                self._remove_file(wav_path)
+            except Exception as e:
+                print(f"Failed to compress recording: {e}")
+                self._remove_file(tmp_path)
+                continue
+
+            new_size = os.path.getsize(flac_path)
+            with self._lock:
+                if info in self._files:
+                    self._total_bytes += new_size - info["size"]
+                    info["path"] = flac_path
+                    info["size"] = new_size
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """ファイルを削除する（存在しない場合は無視）"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to remove recording: {e}")
@@ -0,0 +1,303 @@
+"""
+サンプルレート変換とダウンミックスのモジュール
+
+デバイス本来のサンプルレート・チャンネル数で録音した音声を、送信するサンプルレートの
+モノラルに変換します。変換はポリフェーズ FIR フィルタ（カイザー窓の sinc）で行い、
+ブロック単位で入力しても1回で変換した場合と同じ結果になります。
+
+ResampleWorker は録音中のブロックを別スレッドで変換し、オーディオコールバックでは
+キューへの追加のみを行います。int16 のブロックは int16 の値の範囲のまま計算し、
+int16 に戻して返します。
+"""
+
+import queue
+import threading
+from math import gcd
+from typing import List
+
+import numpy as np
+
+# 1回の計算で出力するサンプル数の上限（(出力数, タップ数) の作業配列の大きさを抑える）
+_CHUNK = 4096
+
+
+def downmix(block: np.ndarray, channels: int = 1) -> np.ndarray:
+    """
+    音声ブロックのチャンネル数を変換する
+
+    Parameters
+    ----------
+    block : np.ndarray
+        形状 (フレーム数, チャンネル数) の音声
+    channels : int
+        変換後のチャンネル数（1 の場合はすべてのチャンネルの平均）
+
+    Returns
+    -------
+    np.ndarray
+        形状 (フレーム数, channels) の音声（変換が不要な場合は入力そのもの）
+    """
+    if block.shape[1] == channels:
+        return block
+    if channels == 1:
+        return block.mean(axis=1, keepdims=True, dtype=np.float32)
+    if block.shape[1] == 1:
+        return np.repeat(block, channels, axis=1)
+    return block[:, :channels]
+
+
+class Resampler:
+    """
+    ブロック単位のポリフェーズ・リサンプラー
+
+    サンプルレートの比を既約分数 up/down にし、up 倍にアップサンプルしてローパスフィルタを
+    かけ、down 分の1に間引く処理を、必要な出力サンプルだけ計算する形で行います。
+    フィルタの遅延は補正し、出力の先頭は入力の先頭と揃います。
+
+    Attributes
+    ----------
+    input_rate : int
+        入力のサンプルレート
+    output_rate : int
+        出力のサンプルレート
+    up : int
+        アップサンプルの倍率
+    down : int
+        間引きの倍率
+    taps : int
+        出力1サンプルあたりのフィルタのタップ数
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, zero_crossings: int = 24,
+                 rolloff: float = 0.95, beta: float = 8.6):
+        """
+        Resamplerの初期化
+
+        Parameters
+        ----------
+        input_rate : int
+            入力のサンプルレート
+        output_rate : int
+            出力のサンプルレート
+        zero_crossings : int
+            sinc の片側のゼロ交差の数（多いほど遷移帯域が狭く、計算量が増えます）
+        rolloff : float
+            低い方のナイキスト周波数に対する通過帯域の端の比
+        beta : float
+            カイザー窓のパラメータ（大きいほど阻止帯域の減衰が大きくなります）
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+
+        if self.up == self.down:
+            self.taps = 1
+            self._phases = None
+        else:
+            # アップサンプル後のサンプルレートで設計したローパスフィルタ
+            factor = max(self.up, self.down)
+            length = 2 * zero_crossings * factor + 1
+            t = (np.arange(length) - (length - 1) / 2) / factor
+            h = rolloff * np.sinc(rolloff * t) * np.kaiser(length, beta)
+
+            # 位相ごとの係数 phases[p, k] = h[p + k * up]（各位相の和を1にして直流の利得を揃える）
+            self.taps = -(-length // self.up)
+            padded = np.zeros(self.taps * self.up)
+            padded[:length] = h
+            phases = padded.reshape(self.taps, self.up).T
+            self._phases = (phases / phases.sum(axis=1, keepdims=True)).astype(np.float32)
+            self._delay = (length - 1) // 2
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        入力の履歴を消去し、新しい音声の変換を始める
+        """
+        # 入力の履歴（先頭は入力全体の中の _start 番目のサンプル。負の位置は無音）
+        self._history = None
+        self._start = 1 - self.taps
+        self._received = 0
+        self._produced = 0
+        self._channels = 1
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        音声ブロックを変換する
+
+        Parameters
+        ----------
+        block : np.ndarray
+            形状 (フレーム数, チャンネル数) の音声
+
+        Returns
+        -------
+        np.ndarray
+            形状 (出力フレーム数, チャンネル数) の float32 の音声。フィルタの遅延の分、
+            入力の末尾に対応する出力は次のブロックまたは flush で返します。
+        """
+        block = np.asarray(block, dtype=np.float32)
+        self._channels = block.shape[1]
+        if self._phases is None:
+            self._received += len(block)
+            self._produced += len(block)
+            return block
+
+        if self._history is None:
+            self._history = np.zeros((self.taps - 1, block.shape[1]), dtype=np.float32)
+        self._history = np.concatenate((self._history, block))
+        self._received += len(block)
+
+        # 入力が揃っている出力（必要な最後の入力の位置 < 受け取ったサンプル数）
+        end = max(self._produced, -(-(self._received * self.up - self._delay) // self.down))
+        return self._emit(end)
+
+    def flush(self) -> np.ndarray:
+        """
+        入力の終わりまでの残りの出力を返し、履歴を消去する
+
+        Returns
+        -------
+        np.ndarray
+            形状 (出力フレーム数, チャンネル数) の float32 の音声
+        """
+        if self._phases is None or self._history is None:
+            channels = self._channels
+            self.reset()
+            return np.zeros((0, channels), dtype=np.float32)
+
+        # 入力全体に対応する出力数になるまで、末尾を無音で補って計算する
+        end = -(-self._received * self.up // self.down)
+        needed = ((end - 1) * self.down + self._delay) // self.up + 1 - self._start
+        if needed > len(self._history):
+            padding = np.zeros((needed - len(self._history), self._history.shape[1]), dtype=np.float32)
+            self._history = np.concatenate((self._history, padding))
+        output = self._emit(end)
+        self.reset()
+        return output
+
+    def convert(self, samples: np.ndarray) -> np.ndarray:
+        """
+        音声全体を1回で変換する
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            形状 (フレーム数, チャンネル数) の音声
+
+        Returns
+        -------
+        np.ndarray
+            形状 (出力フレーム数, チャンネル数) の float32 の音声
+        """
+        self.reset()
+        head = self.process(samples)
+        tail = self.flush()
+        return np.concatenate((head, tail)) if len(tail) else head
+
+    def _emit(self, end: int) -> np.ndarray:
+        """出力の _produced 番目から end 番目の手前までを計算し、不要になった履歴を捨てる"""
+        offsets = np.arange(self.taps)
+        outputs = []
+        for first in range(self._produced, end, _CHUNK):
+            positions = np.arange(first, min(end, first + _CHUNK), dtype=np.int64) * self.down + self._delay
+            bases = positions // self.up - self._start
+            # (出力数, タップ数, チャンネル数) の入力と (出力数, タップ数) の係数の積和
+            window = self._history[bases[:, None] - offsets]
+            outputs.append(np.einsum("nk,nkc->nc", self._phases[positions % self.up], window))
+        self._produced = max(self._produced, end)
+
+        # 次の出力に必要な位置より前の履歴を捨てる
+        keep_from = (self._produced * self.down + self._delay) // self.up - self.taps + 1
+        if keep_from > self._start:
+            self._history = self._history[keep_from - self._start:]
+            self._start = keep_from
+
+        if not outputs:
+            return np.zeros((0, self._history.shape[1]), dtype=np.float32)
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs)
+
+
+class ResampleWorker:
+    """
+    録音中の音声ブロックを別スレッドでダウンミックス・リサンプルする
+
+    put はオーディオコールバックから呼ばれるため、キューへの追加のみを行います。
+    finish で残りのブロックを変換し、変換した音声ブロックのリストを返します。
+    変換した音声は入力と同じ dtype（int16 または float32）です。
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, channels: int = 1):
+        """
+        ResampleWorkerの初期化
+
+        Parameters
+        ----------
+        input_rate : int
+            録音のサンプルレート
+        output_rate : int
+            変換後のサンプルレート
+        channels : int
+            変換後のチャンネル数
+        """
+        self.channels = channels
+        self._resampler = Resampler(input_rate, output_rate)
+        self._queue = queue.SimpleQueue()
+        self._blocks = []
+        self._dtype = np.float32
+        self._thread = threading.Thread(target=self._run, name="resample-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, block: np.ndarray) -> None:
+        """
+        変換する音声ブロックを追加する（呼び出し側で複製したブロックを渡す）
+
+        Parameters
+        ----------
+        block : np.ndarray
+            形状 (フレーム数, チャンネル数) の音声
+        """
+        self._queue.put(block)
+
+    def snapshot(self) -> List[np.ndarray]:
+        """
+        これまでに変換した音声ブロックを返す（変換は続けます）
+
+        Returns
+        -------
+        list of np.ndarray
+            変換済みの音声ブロックのリストの複製（キューに残っているブロックは含みません）
+        """
+        return list(self._blocks)
+
+    def finish(self) -> List[np.ndarray]:
+        """
+        追加済みのブロックをすべて変換し、スレッドを終了する
+
+        Returns
+        -------
+        list of np.ndarray
+            変換した音声ブロック（形状 (フレーム数, channels)、入力と同じ dtype）
+        """
+        self._queue.put(None)
+        self._thread.join()
+        return self._blocks
+
+    def _run(self):
+        """キューのブロックを順に変換する（None で終了）"""
+        while True:
+            block = self._queue.get()
+            if block is None:
+                converted = self._resampler.flush()
+            else:
+                self._dtype = block.dtype
+                converted = self._resampler.process(downmix(block, self.channels))
+            if len(converted):
+                if self._dtype == np.int16:
+                    np.rint(converted, out=converted)
+                    converted = np.clip(converted, -32768, 32767, out=converted).astype(np.int16)
+                self._blocks.append(converted)
+            if block is None:
+                return
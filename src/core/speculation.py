@@ -0,0 +1,255 @@
+"""
+先行文字起こしモジュール
+
+録音中に発話が途切れたとき、それまでの音声をバックグラウンドで文字起こししておき、
+そのまま録音が停止された場合はその結果を使うことで、停止から結果までの時間を短くします。
+発話が続いた場合は結果を捨てる（または前半として使う）ため、的中率と余分に送信した
+音声の長さを記録し、区切りとみなす無音の長さの調整に使います。
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# 先行文字起こしの結果の分類
+OUTCOME_HIT = "hit"  # そのまま録音が停止され、結果を使った
+OUTCOME_PREFIX = "prefix"  # 発話が続いたため、結果を録音の前半として使った
+OUTCOME_MISS = "miss"  # 発話が続いたため、結果を捨てた
+OUTCOME_FAILED = "failed"  # 文字起こしに失敗した（通常の送信に切り替えた）
+OUTCOMES = (OUTCOME_HIT, OUTCOME_PREFIX, OUTCOME_MISS, OUTCOME_FAILED)
+
+
+def join_transcripts(prefix: str, rest: str) -> str:
+    """
+    録音の前半と後半の文字起こし結果をつなげる
+
+    どちらの境界も ASCII の文字の場合（英語など）は空白を挟み、それ以外（日本語など）は
+    そのままつなげます。
+
+    Parameters
+    ----------
+    prefix : str
+        前半の文字起こし結果
+    rest : str
+        後半の文字起こし結果
+
+    Returns
+    -------
+    str
+        つなげた文字起こし結果
+    """
+    prefix, rest = prefix.rstrip(), rest.lstrip()
+    if not prefix or not rest:
+        return prefix or rest
+    if prefix[-1].isascii() and rest[0].isascii():
+        return f"{prefix} {rest}"
+    return prefix + rest
+
+
+class Speculation:
+    """
+    先行して送信した1回分の文字起こし
+
+    Attributes
+    ----------
+    frames : int
+        送信した音声のフレーム数（録音の先頭から）
+    sample_rate : int
+        送信した音声のサンプルレート
+    prefix : bool
+        録音の前半として使うかどうか（False の場合は録音全体の結果として使う）
+    """
+
+    def __init__(self, future, frames: int, sample_rate: int, owner: "SpeculativeUpload"):
+        self.future = future
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self.prefix = False
+        self._owner = owner
+
+    @property
+    def seconds(self) -> float:
+        """送信した音声の長さ（秒）"""
+        return self.frames / self.sample_rate
+
+    def result(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        文字起こしの結果を待って返し、結果の分類を記録する
+
+        Parameters
+        ----------
+        timeout : float, optional
+            結果を待つ最大秒数
+
+        Returns
+        -------
+        str or None
+            文字起こしの結果。失敗した場合（時間切れを含む）はNone
+        """
+        try:
+            text = self.future.result(timeout)
+        except Exception as e:
+            print(f"Speculative transcription failed: {e}")
+            self._owner._record(OUTCOME_FAILED, self.seconds)
+            return None
+        self._owner._record(OUTCOME_PREFIX if self.prefix else OUTCOME_HIT, self.seconds)
+        return text
+
+
+class SpeculativeUpload:
+    """
+    録音中の発話の区切りで、それまでの音声を先行して文字起こしする
+
+    submit は区切りのたびに呼ばれ、直前の先行文字起こしを新しいものに置き換えます
+    （置き換えたものは捨てた扱いです）。録音の停止時に finish を呼び、発話が再開して
+    いなければ先行文字起こしを返します。返した先行文字起こしの result で結果を待ちます。
+
+    Attributes
+    ----------
+    reuse_prefix : bool
+        発話が続いた場合に、完了している先行文字起こしを録音の前半として使うかどうか
+    counts : dict
+        結果の分類ごとの回数
+    seconds : dict
+        結果の分類ごとの送信した音声の長さ（秒）
+    """
+
+    def __init__(self, transcribe_func: Callable[[np.ndarray, int, Optional[str], Optional[str]], str],
+                 metrics=None, reuse_prefix: bool = False, max_workers: int = 2):
+        """
+        SpeculativeUploadの初期化
+
+        Parameters
+        ----------
+        transcribe_func : Callable[[np.ndarray, int, Optional[str], Optional[str]], str]
+            (音声, サンプルレート, 言語, モデル) を受け取り文字起こし結果を返す関数。
+            失敗時は例外を送出する必要があります。
+        metrics : AppMetrics, optional
+            結果の分類ごとの回数と音声の長さを記録するメトリクス
+        reuse_prefix : bool
+            発話が続いた場合に、完了している先行文字起こしを録音の前半として使うかどうか
+        max_workers : int
+            同時に送信する先行文字起こしの数の上限
+        """
+        self.transcribe_func = transcribe_func
+        self.metrics = metrics
+        self.reuse_prefix = reuse_prefix
+        self.counts: Dict[str, int] = {outcome: 0 for outcome in OUTCOMES}
+        self.seconds: Dict[str, float] = {outcome: 0.0 for outcome in OUTCOMES}
+        self._lock = threading.Lock()
+        self._current: Optional[Speculation] = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="speculative")
+
+    def submit(self, samples: np.ndarray, sample_rate: int, language: Optional[str] = None,
+               model: Optional[str] = None) -> None:
+        """
+        ここまでの録音の文字起こしをバックグラウンドで開始する
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            録音の先頭からの音声
+        sample_rate : int
+            サンプルレート
+        language : str, optional
+            文字起こしの言語コード
+        model : str, optional
+            文字起こしに使用するモデルID
+        """
+        future = self._executor.submit(self.transcribe_func, samples, sample_rate, language, model)
+        speculation = Speculation(future, len(samples), sample_rate, self)
+        with self._lock:
+            stale, self._current = self._current, speculation
+        if stale is not None:
+            self._discard(stale)
+
+    def cancel(self) -> None:
+        """
+        実行中の先行文字起こしを捨てる（録音の開始時などに呼び出す）
+        """
+        with self._lock:
+            stale, self._current = self._current, None
+        if stale is not None:
+            self._discard(stale)
+
+    def finish(self, resumed: bool) -> Optional[Speculation]:
+        """
+        録音の停止時に、使う先行文字起こしを取り出す
+
+        Parameters
+        ----------
+        resumed : bool
+            最後の先行文字起こしのあとに発話が再開したかどうか
+
+        Returns
+        -------
+        Speculation or None
+            使う先行文字起こし。発話が再開した場合は、reuse_prefix が有効で結果が出ている
+            場合のみ prefix を True にして返します。使わない場合はNone
+        """
+        with self._lock:
+            speculation, self._current = self._current, None
+        if speculation is None:
+            return None
+        if not resumed:
+            return speculation
+        future = speculation.future
+        if self.reuse_prefix and future.done() and not future.cancelled() and future.exception() is None:
+            speculation.prefix = True
+            return speculation
+        self._discard(speculation)
+        return None
+
+    def hit_rate(self) -> Optional[float]:
+        """
+        先行文字起こしのうち、結果を使った割合（前半として使った場合を含む）
+
+        Returns
+        -------
+        float or None
+            的中率。まだ先行文字起こしがない場合はNone
+        """
+        used = self.counts[OUTCOME_HIT] + self.counts[OUTCOME_PREFIX]
+        total = used + self.counts[OUTCOME_MISS]
+        return used / total if total else None
+
+    def stats(self) -> Dict:
+        """
+        結果の分類ごとの回数・音声の長さと的中率を返す
+
+        Returns
+        -------
+        dict
+            counts, seconds, hit_rate, wasted_seconds（捨てた先行文字起こしで送信した音声の長さ）
+        """
+        with self._lock:
+            return {
+                "counts": dict(self.counts),
+                "seconds": dict(self.seconds),
+                "hit_rate": self.hit_rate(),
+                "wasted_seconds": self.seconds[OUTCOME_MISS],
+            }
+
+    def shutdown(self) -> None:
+        """
+        先行文字起こしを捨て、送信用のスレッドを終了する（アプリケーションの終了時に呼び出す）
+        """
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _discard(self, speculation: Speculation) -> None:
+        """先行文字起こしを捨てる（送信前であれば取り消し、送信した分は余分な送信として記録する）"""
+        if speculation.future.cancel():
+            return
+        self._record(OUTCOME_MISS, speculation.seconds)
+
+    def _record(self, outcome: str, seconds: float) -> None:
+        """結果の分類を記録する"""
+        with self._lock:
+            self.counts[outcome] += 1
+            self.seconds[outcome] += seconds
+        if self.metrics is not None:
+            self.metrics.speculative_uploads.labels(outcome).inc()
+            self.metrics.speculative_audio_seconds.labels(outcome).inc(seconds)
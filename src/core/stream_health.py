@@ -0,0 +1,159 @@
+"""
+入力ストリームの状態の集計モジュール
+
+オーディオコールバックの呼び出しごとに、入力のオーバーフロー・アンダーフローの
+フラグ、呼び出し間隔の揺らぎ（ジッター）とコールバック内の処理時間を集計します。
+オーバーフローは音声の欠落を意味します。
+"""
+
+from typing import Dict
+
+
+class StreamHealth:
+    """
+    オーディオコールバックの集計値
+
+    record はオーディオスレッドから呼ばれるため、加算と比較のみを行います。
+    スレッド間の保護は呼び出し側（AudioRecorder のロック）で行います。
+
+    Attributes
+    ----------
+    callbacks : int
+        コールバックの呼び出し回数
+    frames : int
+        受け取ったフレーム数
+    input_overflows : int
+        入力のオーバーフロー（音声の欠落）が報告された回数
+    input_underflows : int
+        入力のアンダーフローが報告された回数
+    callback_seconds_total : float
+        コールバック内の処理時間の合計（秒）
+    callback_seconds_max : float
+        コールバック内の処理時間の最大値（秒）
+    intervals : int
+        ジッターを計測した呼び出し間隔の数
+    jitter_seconds_total : float
+        呼び出し間隔とブロックの長さの差（絶対値）の合計（秒）
+    jitter_seconds_max : float
+        呼び出し間隔とブロックの長さの差（絶対値）の最大値（秒）
+    """
+
+    __slots__ = (
+        "callbacks", "frames", "input_overflows", "input_underflows",
+        "callback_seconds_total", "callback_seconds_max",
+        "intervals", "jitter_seconds_total", "jitter_seconds_max",
+    )
+
+    def __init__(self):
+        self.callbacks = 0
+        self.frames = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.callback_seconds_total = 0.0
+        self.callback_seconds_max = 0.0
+        self.intervals = 0
+        self.jitter_seconds_total = 0.0
+        self.jitter_seconds_max = 0.0
+
+    def record(self, frames: int, status, duration: float, jitter=None) -> None:
+        """
+        コールバック1回分を記録する
+
+        Parameters
+        ----------
+        frames : int
+            ブロックのフレーム数
+        status : sounddevice.CallbackFlags or None
+            コールバックに渡された状態フラグ
+        duration : float
+            コールバック内の処理時間（秒）
+        jitter : float, optional
+            前回の呼び出しからの間隔とブロックの長さの差（秒、最初の呼び出しではNone）
+        """
+        self.callbacks += 1
+        self.frames += frames
+        if status:
+            if status.input_overflow:
+                self.input_overflows += 1
+            if status.input_underflow:
+                self.input_underflows += 1
+        self.callback_seconds_total += duration
+        if duration > self.callback_seconds_max:
+            self.callback_seconds_max = duration
+        if jitter is not None:
+            jitter = abs(jitter)
+            self.intervals += 1
+            self.jitter_seconds_total += jitter
+            if jitter > self.jitter_seconds_max:
+                self.jitter_seconds_max = jitter
+
+    def merge(self, other: "StreamHealth") -> None:
+        """
+        別の集計値を加える
+
+        Parameters
+        ----------
+        other : StreamHealth
+            加える集計値
+        """
+        self.callbacks += other.callbacks
+        self.frames += other.frames
+        self.input_overflows += other.input_overflows
+        self.input_underflows += other.input_underflows
+        self.callback_seconds_total += other.callback_seconds_total
+        self.callback_seconds_max = max(self.callback_seconds_max, other.callback_seconds_max)
+        self.intervals += other.intervals
+        self.jitter_seconds_total += other.jitter_seconds_total
+        self.jitter_seconds_max = max(self.jitter_seconds_max, other.jitter_seconds_max)
+
+    def since(self, earlier: "StreamHealth") -> "StreamHealth":
+        """
+        以前の集計値からの増加分を返す
+
+        Parameters
+        ----------
+        earlier : StreamHealth
+            以前の時点の同じ集計の値
+
+        Returns
+        -------
+        StreamHealth
+            回数と合計は差分、最大値はこの集計値の値
+        """
+        delta = StreamHealth()
+        delta.callbacks = self.callbacks - earlier.callbacks
+        delta.frames = self.frames - earlier.frames
+        delta.input_overflows = self.input_overflows - earlier.input_overflows
+        delta.input_underflows = self.input_underflows - earlier.input_underflows
+        delta.callback_seconds_total = self.callback_seconds_total - earlier.callback_seconds_total
+        delta.callback_seconds_max = self.callback_seconds_max
+        delta.intervals = self.intervals - earlier.intervals
+        delta.jitter_seconds_total = self.jitter_seconds_total - earlier.jitter_seconds_total
+        delta.jitter_seconds_max = self.jitter_seconds_max
+        return delta
+
+    @property
+    def dropped_audio(self) -> bool:
+        """音声の欠落（入力のオーバーフロー）があったかどうか"""
+        return self.input_overflows > 0
+
+    def to_dict(self) -> Dict:
+        """
+        集計値を辞書に変換する
+
+        Returns
+        -------
+        dict
+            callbacks, frames, input_overflows, input_underflows,
+            callback_mean_ms, callback_max_ms, jitter_mean_ms, jitter_max_ms
+        """
+        return {
+            "callbacks": self.callbacks,
+            "frames": self.frames,
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+            "callback_mean_ms": self.callback_seconds_total / self.callbacks * 1000 if self.callbacks else 0.0,
+            "callback_max_ms": self.callback_seconds_max * 1000,
+            "jitter_mean_ms": self.jitter_seconds_total / self.intervals * 1000 if self.intervals else 0.0,
+            "jitter_max_ms": self.jitter_seconds_max * 1000,
+        }
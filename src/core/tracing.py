@@ -0,0 +1,381 @@
+"""
+処理時間の計測（トレース）モジュール
+
+録音1回ごとに TakeTrace を作成し、録音開始から文字起こし結果のコピーまでの
+各段階の所要時間（スパン）を time.perf_counter_ns で記録します。
+完了したトレースは Tracer のリングバッファに直近の分だけ保持します。
+
+計測が無効の場合は NULL_TRACE を使います。NULL_TRACE のメソッドは何もせず、
+時刻の取得もオブジェクトの生成も行いません。
+"""
+
+import time
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import httpx
+except Exception:  # pragma: no cover
+    httpx = None
+
+
+class _NullSpan:
+    """何もしないスパン（NULL_TRACE.span の戻り値）"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTrace:
+    """
+    計測が無効なときに使う何もしないトレース
+
+    TakeTrace と同じメソッドを持ち、偽と評価されます。
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def span(self, name: str):
+        return _NULL_SPAN
+
+    def start(self, name: str) -> None:
+        pass
+
+    def end(self, name: str) -> None:
+        pass
+
+    def annotate(self, **attrs) -> None:
+        pass
+
+    def durations(self) -> Dict[str, float]:
+        return {}
+
+    def to_dict(self) -> Optional[Dict]:
+        return None
+
+
+NULL_TRACE = NullTrace()
+
+
+class _Span:
+    """with 文で囲んだ区間を記録するスパン"""
+
+    __slots__ = ("trace", "name", "start_ns")
+
+    def __init__(self, trace: "TakeTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.spans.append((self.name, self.start_ns, time.perf_counter_ns()))
+        return False
+
+
+class TakeTrace:
+    """
+    録音1回分のトレース
+
+    スパンは (名前, 開始時刻[ns], 終了時刻[ns]) のタプルで記録します。
+    異なるスレッドから記録できます（リストへの追加と辞書の更新のみを行います）。
+
+    Attributes
+    ----------
+    id : int
+        トレースの通し番号
+    started_at : float
+        トレースを作成した時刻（UNIX時間）
+    origin_ns : int
+        スパンの時刻の基準（time.perf_counter_ns）
+    attrs : dict
+        録音IDやモデルなどの付加情報
+    spans : list
+        記録したスパン
+    """
+
+    def __init__(self, trace_id: int, **attrs):
+        self.id = trace_id
+        self.started_at = time.time()
+        self.origin_ns = time.perf_counter_ns()
+        self.attrs = dict(attrs)
+        self.spans = []
+        self._open = {}
+
+    def __bool__(self):
+        return True
+
+    def span(self, name: str) -> _Span:
+        """
+        with 文で囲んだ区間をスパンとして記録する
+
+        Parameters
+        ----------
+        name : str
+            スパンの名前
+        """
+        return _Span(self, name)
+
+    def start(self, name: str) -> None:
+        """
+        関数やスレッドをまたぐスパンを開始する（end で終了する）
+
+        Parameters
+        ----------
+        name : str
+            スパンの名前
+        """
+        self._open[name] = time.perf_counter_ns()
+
+    def end(self, name: str) -> None:
+        """
+        start で開始したスパンを終了する（開始していなければ何もしない）
+
+        Parameters
+        ----------
+        name : str
+            スパンの名前
+        """
+        start_ns = self._open.pop(name, None)
+        if start_ns is not None:
+            self.spans.append((name, start_ns, time.perf_counter_ns()))
+
+    def annotate(self, **attrs) -> None:
+        """付加情報を追加する"""
+        self.attrs.update(attrs)
+
+    def durations(self) -> Dict[str, float]:
+        """
+        スパン名ごとの合計時間を返す
+
+        Returns
+        -------
+        dict
+            スパン名 -> ミリ秒（同じ名前のスパンが複数ある場合は合計）
+        """
+        totals = {}
+        for name, start_ns, end_ns in self.spans:
+            totals[name] = totals.get(name, 0.0) + (end_ns - start_ns) / 1e6
+        return totals
+
+    def elapsed_ms(self, since: str) -> Optional[float]:
+        """
+        指定したスパンの開始から最後に終了したスパンの終了までの時間を返す
+
+        Parameters
+        ----------
+        since : str
+            起点とするスパンの名前
+
+        Returns
+        -------
+        float or None
+            ミリ秒（起点のスパンがない場合はNone）
+        """
+        starts = [start_ns for name, start_ns, _ in self.spans if name == since]
+        if not starts:
+            return None
+        return (max(end_ns for _, _, end_ns in self.spans) - min(starts)) / 1e6
+
+    def to_dict(self) -> Dict:
+        """
+        トレースを辞書に変換する
+
+        Returns
+        -------
+        dict
+            id, started_at, attrs と、開始順に並べたスパン
+            （name, start_ms: トレース作成からの時間, duration_ms）
+        """
+        spans = sorted(self.spans, key=lambda span: span[1])
+        return {
+            "id": self.id,
+            "started_at": self.started_at,
+            "attrs": dict(self.attrs),
+            "spans": [
+                {
+                    "name": name,
+                    "start_ms": (start_ns - self.origin_ns) / 1e6,
+                    "duration_ms": (end_ns - start_ns) / 1e6,
+                }
+                for name, start_ns, end_ns in spans
+            ],
+        }
+
+
+class Tracer:
+    """
+    トレースの作成と、完了したトレースのリングバッファ
+
+    無効の場合、begin は NULL_TRACE を返し、finish は何もしません。
+    """
+
+    def __init__(self, enabled: bool = True, capacity: int = 50):
+        """
+        Tracerの初期化
+
+        Parameters
+        ----------
+        enabled : bool
+            計測を行うかどうか
+        capacity : int
+            保持する完了したトレースの数
+        """
+        self.enabled = enabled
+        self._ids = itertools.count(1)
+        self._finished = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+
+    def begin(self, **attrs):
+        """
+        新しいトレースを作成する
+
+        Parameters
+        ----------
+        **attrs
+            付加情報
+
+        Returns
+        -------
+        TakeTrace or NullTrace
+            無効の場合は NULL_TRACE
+        """
+        if not self.enabled:
+            return NULL_TRACE
+        return TakeTrace(next(self._ids), **attrs)
+
+    def finish(self, trace) -> None:
+        """
+        完了したトレースをリングバッファに追加する
+
+        Parameters
+        ----------
+        trace : TakeTrace or NullTrace
+            完了したトレース
+        """
+        if not trace:
+            return
+        with self._lock:
+            self._finished.append(trace)
+
+    def recent(self) -> List[TakeTrace]:
+        """
+        完了したトレースを新しい順に返す
+
+        Returns
+        -------
+        list of TakeTrace
+            完了したトレース
+        """
+        with self._lock:
+            return list(reversed(self._finished))
+
+    def clear(self) -> None:
+        """保持しているトレースを破棄する"""
+        with self._lock:
+            self._finished.clear()
+
+
+# スレッドごとの現在のトレース（HTTP通信のフックから参照する）
+_current = threading.local()
+
+
+@contextmanager
+def activate(trace):
+    """
+    with 文の間、呼び出し元のスレッドの現在のトレースを設定する
+
+    Parameters
+    ----------
+    trace : TakeTrace or NullTrace
+        設定するトレース
+    """
+    previous = getattr(_current, "trace", NULL_TRACE)
+    _current.trace = trace
+    try:
+        yield trace
+    finally:
+        _current.trace = previous
+
+
+def current():
+    """
+    呼び出し元のスレッドの現在のトレースを返す
+
+    Returns
+    -------
+    TakeTrace or NullTrace
+        activate で設定されたトレース（なければ NULL_TRACE）
+    """
+    return getattr(_current, "trace", NULL_TRACE)
+
+
+if httpx is not None:
+    class _TracedStream(httpx.SyncByteStream):
+        """送信し終えた時点で upload を終了し server_wait を開始するリクエスト本文"""
+
+        def __init__(self, stream, trace):
+            self._stream = stream
+            self._trace = trace
+
+        def __iter__(self):
+            for chunk in self._stream:
+                yield chunk
+            self._trace.end("upload")
+            self._trace.start("server_wait")
+
+        def close(self):
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+
+
+def _on_request(request) -> None:
+    """リクエストの送信開始（upload の開始）を記録する"""
+    trace = current()
+    if not trace:
+        return
+    trace.start("upload")
+    if isinstance(request.stream, httpx.SyncByteStream):
+        request.stream = _TracedStream(request.stream, trace)
+
+
+def _on_response(response) -> None:
+    """応答ヘッダーの受信（server_wait の終了と parse の開始）を記録する"""
+    trace = current()
+    if not trace:
+        return
+    # 本文を送信し終えたことを検出できなかった場合は upload に含める
+    trace.end("upload")
+    trace.end("server_wait")
+    trace.start("parse")
+
+
+def httpx_event_hooks() -> Dict[str, list]:
+    """
+    現在のトレースに upload / server_wait を記録する httpx のイベントフックを返す
+
+    Returns
+    -------
+    dict
+        httpx.Client の event_hooks に指定する辞書（httpx がない場合は空）
+    """
+    if httpx is None:
+        return {}
+    return {"request": [_on_request], "response": [_on_response]}
@@ -0,0 +1,438 @@
+"""
+文字起こしスプールモジュール
+
+ネットワーク障害などで文字起こしに失敗した録音を永続化し、
+接続回復後にバックグラウンドで再送する機能を提供します。
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class TranscriptionSpool:
+    """
+    文字起こし待ちの録音を保持する永続スプール
+
+    録音ファイルとインデックスファイルをスプールディレクトリに保存し、
+    バックグラウンドのドレイナーが同時実行数を制限しながら再送します。
+    インデックスは一時ファイルへの書き込み、fsync、``os.replace`` によって
+    アトミックに更新されるため、途中でプロセスが終了しても破損しません。
+
+    Attributes
+    ----------
+    spool_dir : str
+        スプールディレクトリのパス
+    entries : list
+        スプールされているエントリ（古い順）
+    """
+
+    INDEX_FILENAME = "index.json"
+    INDEX_VERSION = 1
+
+    def __init__(
+        self,
+        spool_dir: str,
+        transcribe_func: Callable[[str, Optional[str], Optional[str]], str],
+        on_result: Optional[Callable[[Dict, str], None]] = None,
+        is_retryable: Optional[Callable[[Exception], bool]] = None,
+        max_entries: int = 200,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age_seconds: float = 7 * 24 * 60 * 60,
+        max_workers: int = 2,
+        retry_interval: float = 30.0,
+        max_retry_interval: float = 15 * 60.0,
+    ):
+        """
+        TranscriptionSpoolの初期化
+
+        Parameters
+        ----------
+        spool_dir : str
+            スプールディレクトリのパス（存在しない場合は作成されます）
+        transcribe_func : Callable[[str, Optional[str], Optional[str]], str]
+            (音声ファイルパス, 言語, モデル) を受け取り文字起こし結果を返す関数。
+            失敗時は例外を送出する必要があります。
+        on_result : Callable[[dict, str], None], optional
+            再送に成功したときに (エントリ, 文字起こし結果) で呼ばれるコールバック。
+            スプール内の音声ファイルは呼び出し後に削除されるため、録音を参照する場合はエントリの
+            ``source_path``（スプールに追加した元のファイル）を使用します。
+        is_retryable : Callable[[Exception], bool], optional
+            再送で成功が見込めるエラーかどうかを判定する関数。False のエラー（不正な音声や認証の失敗など）は
+            再送せずにエントリを破棄します。指定がなければすべてのエラーを再送します。
+        max_entries : int
+            保持するエントリ数の上限
+        max_bytes : int
+            保持する音声ファイルの合計サイズの上限（バイト）
+        max_age_seconds : float
+            エントリを保持する最大期間（秒）
+        max_workers : int
+            同時に再送するエントリ数の上限
+        retry_interval : float
+            再送を試みる基本間隔（秒）。失敗が続くと指数的に延長されます。
+        max_retry_interval : float
+            再送間隔の上限（秒）
+        """
+        self.spool_dir = spool_dir
+        self.transcribe_func = transcribe_func
+        self.on_result = on_result
+        self.is_retryable = is_retryable
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.max_workers = max(1, max_workers)
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._loaded_event = threading.Event()
+        self._in_flight = set()
+        self._drain_thread = None
+        self._executor = None
+
+    def start(self) -> bool:
+        """
+        スプールの読み込みとドレイナーをバックグラウンドで開始する
+
+        起動時のディレクトリ走査もバックグラウンドスレッドで行うため、
+        呼び出し元（ウィンドウ生成など）をブロックしません。
+
+        Returns
+        -------
+        bool
+            開始の成功・失敗
+        """
+        if self._drain_thread and self._drain_thread.is_alive():
+            return False
+
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="spool")
+        self._drain_thread = threading.Thread(target=self._drain_loop, name="spool-drainer")
+        self._drain_thread.daemon = True
+        self._drain_thread.start()
+        return True
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        ドレイナーを停止する
+
+        Parameters
+        ----------
+        timeout : float, optional
+            ドレイナースレッドの終了を待つ最大秒数
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._drain_thread and self._drain_thread.is_alive():
+            self._drain_thread.join(timeout)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def wake(self) -> None:
+        """
+        待機中の再送を即座に試みるようドレイナーを起こす
+
+        通常の文字起こしが成功したときなど、接続の回復が分かった時点で呼び出します。
+        """
+        with self._lock:
+            for entry in self.entries:
+                entry["next_attempt"] = 0.0
+        self._wake_event.set()
+
+    def enqueue(self, audio_file: str, language: Optional[str] = None,
+                model: Optional[str] = None, error: Optional[str] = None) -> Optional[str]:
+        """
+        録音ファイルをスプールに追加する
+
+        音声ファイルはスプールディレクトリにコピーされ、fsync 後にインデックスへ登録されます。
+
+        Parameters
+        ----------
+        audio_file : str
+            スプールする音声ファイルのパス
+        language : str, optional
+            文字起こしの言語コード
+        model : str, optional
+            文字起こしに使用するモデルID
+        error : str, optional
+            スプールの原因となったエラーメッセージ
+
+        Returns
+        -------
+        str or None
+            追加したエントリのID、失敗時はNone
+        """
+        if self._drain_thread is None:
+            # start() 前に呼ばれた場合はここで既存のインデックスを読み込む
+            if not self._loaded_event.is_set():
+                self._load()
+        else:
+            self._loaded_event.wait()
+
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            entry_id = uuid.uuid4().hex
+            extension = os.path.splitext(audio_file)[1] or ".wav"
+            filename = f"{entry_id}{extension}"
+            dest_path = os.path.join(self.spool_dir, filename)
+
+            # 音声ファイルを書き込み、ディスクへ確実に反映させる
+            with open(audio_file, "rb") as src, open(dest_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            now = time.time()
+            entry = {
+                "id": entry_id,
+                "filename": filename,
+                "source_path": audio_file,
+                "language": language or None,
+                "model": model or None,
+                "created_at": now,
+                "size": os.path.getsize(dest_path),
+                "attempts": 0,
+                "next_attempt": now + self.retry_interval,
+                "last_error": error,
+            }
+
+            with self._lock:
+                self.entries.append(entry)
+                self._enforce_limits_locked(now)
+                self._write_index_locked()
+                accepted = entry in self.entries
+
+            if not accepted:
+                return None
+            self._wake_event.set()
+            return entry_id
+        except Exception as e:
+            print(f"Failed to spool recording: {e}")
+            return None
+
+    def pending_count(self) -> int:
+        """
+        再送待ちのエントリ数を返す
+
+        Returns
+        -------
+        int
+            スプールされているエントリ数
+        """
+        with self._lock:
+            return len(self.entries)
+
+    def get_entries(self) -> List[Dict]:
+        """
+        スプールされているエントリのコピーを返す
+
+        Returns
+        -------
+        list
+            エントリ辞書のリスト（古い順）
+        """
+        with self._lock:
+            return [dict(entry) for entry in self.entries]
+
+    def _entry_path(self, entry: Dict) -> str:
+        """エントリの音声ファイルパスを返す"""
+        return os.path.join(self.spool_dir, entry["filename"])
+
+    def _load(self) -> None:
+        """
+        インデックスを読み込み、ディレクトリの実体と整合させる
+
+        インデックスにあるが音声ファイルが存在しないエントリと、
+        インデックスにない孤立ファイルはここで取り除きます。
+        """
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            index_path = os.path.join(self.spool_dir, self.INDEX_FILENAME)
+
+            entries = []
+            if os.path.exists(index_path):
+                try:
+                    with open(index_path, "r", encoding="utf-8") as f:
+                        entries = json.load(f).get("entries", [])
+                except (OSError, ValueError) as e:
+                    print(f"Failed to read spool index: {e}")
+
+            # 1回の走査でディレクトリ内のファイルを把握する
+            with os.scandir(self.spool_dir) as it:
+                files = {e.name for e in it if e.is_file() and not e.name.startswith(self.INDEX_FILENAME)}
+
+            valid_entries = [e for e in entries if e.get("filename") in files]
+            known = {e["filename"] for e in valid_entries}
+            for orphan in files - known:
+                self._remove_file(os.path.join(self.spool_dir, orphan))
+
+            with self._lock:
+                # 起動時は接続状態が不明なため、すぐに再送を試みる
+                for entry in valid_entries:
+                    entry["next_attempt"] = 0.0
+                self.entries = valid_entries + self.entries
+                self._enforce_limits_locked(time.time())
+                if len(valid_entries) != len(entries) or len(self.entries) != len(valid_entries):
+                    self._write_index_locked()
+        except Exception as e:
+            print(f"Failed to load transcription spool: {e}")
+        finally:
+            self._loaded_event.set()
+
+    def _enforce_limits_locked(self, now: float) -> None:
+        """
+        件数・サイズ・保持期間の上限を超えたエントリを古い順に削除する
+
+        呼び出し元で ``self._lock`` を保持している必要があります。
+        """
+        kept = []
+        for entry in self.entries:
+            if now - entry.get("created_at", now) > self.max_age_seconds and entry["id"] not in self._in_flight:
+                self._remove_file(self._entry_path(entry))
+            else:
+                kept.append(entry)
+
+        total_bytes = sum(entry.get("size", 0) for entry in kept)
+        while kept and (len(kept) > self.max_entries or total_bytes > self.max_bytes):
+            victim = next((e for e in kept if e["id"] not in self._in_flight), None)
+            if victim is None:
+                break
+            kept.remove(victim)
+            total_bytes -= victim.get("size", 0)
+            self._remove_file(self._entry_path(victim))
+
+        self.entries = kept
+
+    def _write_index_locked(self) -> None:
+        """
+        インデックスファイルをアトミックに書き換える
+
+        呼び出し元で ``self._lock`` を保持している必要があります。
+        """
+        index_path = os.path.join(self.spool_dir, self.INDEX_FILENAME)
+        tmp_path = index_path + ".tmp"
+        data = {"version": self.INDEX_VERSION, "entries": self.entries}
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index_path)
+
+        # リネーム自体を永続化するためディレクトリもfsyncする（対応OSのみ）
+        if hasattr(os, "O_DIRECTORY"):
+            try:
+                dir_fd = os.open(self.spool_dir, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """ファイルを削除する（存在しない場合は無視）"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to remove spooled file: {e}")
+
+    def _drain_loop(self) -> None:
+        """
+        スプールを監視し、期限の来たエントリを再送するループ
+        """
+        # start() 前の enqueue で読み込み済みの場合は、エントリを重複させないよう読み込まない
+        if not self._loaded_event.is_set():
+            self._load()
+
+        while not self._stop_event.is_set():
+            executor = self._executor
+            if executor is None:
+                break
+
+            now = time.time()
+            with self._lock:
+                self._enforce_limits_locked(now)
+                free_slots = self.max_workers - len(self._in_flight)
+                due = [
+                    e for e in self.entries
+                    if e["id"] not in self._in_flight and e.get("next_attempt", 0.0) <= now
+                ][:max(0, free_slots)]
+                for entry in due:
+                    self._in_flight.add(entry["id"])
+                next_due = min(
+                    (e.get("next_attempt", 0.0) for e in self.entries if e["id"] not in self._in_flight),
+                    default=None,
+                )
+
+            for entry in due:
+                executor.submit(self._process_entry, entry)
+
+            timeout = self.retry_interval if next_due is None else max(0.05, next_due - now)
+            self._wake_event.wait(timeout)
+            self._wake_event.clear()
+
+    def _process_entry(self, entry: Dict) -> None:
+        """
+        1件のエントリを再送する
+
+        Parameters
+        ----------
+        entry : dict
+            再送するエントリ
+        """
+        try:
+            text = self.transcribe_func(self._entry_path(entry), entry.get("language"), entry.get("model"))
+        except Exception as e:
+            if self.is_retryable is not None and not self.is_retryable(e):
+                # 再送しても成功しないエラーはクォータを使い続けないよう破棄する
+                print(f"Dropping spooled recording {entry['id']} after a permanent error: {e}")
+                self._discard_entry(entry)
+                return
+            with self._lock:
+                self._in_flight.discard(entry["id"])
+                entry["attempts"] = entry.get("attempts", 0) + 1
+                entry["last_error"] = str(e)
+                delay = min(self.max_retry_interval, self.retry_interval * (2 ** (entry["attempts"] - 1)))
+                entry["next_attempt"] = time.time() + delay
+                if entry in self.entries:
+                    self._write_index_locked()
+            self._wake_event.set()
+            return
+
+        if self.on_result:
+            try:
+                self.on_result(dict(entry), text)
+            except Exception as e:
+                print(f"Spool result callback error: {e}")
+
+        self._discard_entry(entry)
+
+    def _discard_entry(self, entry: Dict) -> None:
+        """
+        エントリをインデックスから取り除き、音声ファイルを削除する
+
+        Parameters
+        ----------
+        entry : dict
+            取り除くエントリ
+        """
+        with self._lock:
+            self._in_flight.discard(entry["id"])
+            if entry in self.entries:
+                self.entries.remove(entry)
+                self._write_index_locked()
+        self._remove_file(self._entry_path(entry))
+        self._wake_event.set()
@@ -0,0 +1,212 @@
+"""
+発話の終わりの検出モジュール
+
+音声ブロックのエネルギーで発話かどうかを判定し（EnergyVAD）、発話のあとに無音が
+一定時間続いたとき、または録音が最大の長さに達したときに録音の停止を知らせます（Endpointer）。
+どちらもオーディオコールバックから呼ばれるため、ブロックごとの処理は NumPy の内積1回です。
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+from src.core.levels import FULL_SCALE
+
+# Endpointer.process が返す停止の理由
+ENDPOINT_SILENCE = "silence"
+ENDPOINT_MAX_LENGTH = "max_length"
+# Endpointer.process が返す発話の区切り（録音は停止しない）
+ENDPOINT_PAUSE = "pause"
+
+
+class EnergyVAD:
+    """
+    エネルギーによる発話区間の検出
+
+    ブロックの RMS（dBFS）が背景雑音の推定値より threshold_db 以上大きく、かつ min_speech_db
+    以上の場合を発話とします。背景雑音は、発話でないブロックでは小さい値にすぐに追従し、
+    大きい値にはゆっくり追従します。発話が onset_ms 続いたら発話の開始とし、
+    発話でないブロックが hangover_ms 続くまでは発話中とみなします（語の間の短い無音で切らないため）。
+
+    Attributes
+    ----------
+    speaking : bool
+        発話中かどうか（ハングオーバーを含む）
+    noise_db : float
+        背景雑音の推定値（dBFS）
+    unvoiced_seconds : float
+        発話でないブロックが続いている秒数
+    """
+
+    def __init__(self, threshold_db: float = 12.0, min_speech_db: float = -45.0, onset_ms: float = 30.0,
+                 hangover_ms: float = 300.0, noise_rise_db_per_second: float = 3.0):
+        """
+        EnergyVADの初期化
+
+        Parameters
+        ----------
+        threshold_db : float
+            発話とみなす背景雑音からの差（dB）
+        min_speech_db : float
+            発話とみなす最小の RMS（dBFS）
+        onset_ms : float
+            発話の開始とみなすまでに発話が続く時間（ミリ秒）
+        hangover_ms : float
+            発話の終わりとみなすまでに発話でないブロックが続く時間（ミリ秒）
+        noise_rise_db_per_second : float
+            背景雑音の推定値が大きくなる速さ（dB/秒）
+        """
+        self.threshold_db = threshold_db
+        self.min_speech_db = min_speech_db
+        self.onset = onset_ms / 1000
+        self.hangover = hangover_ms / 1000
+        self.noise_rise = noise_rise_db_per_second
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        状態を初期化する
+        """
+        self.speaking = False
+        self.noise_db = self.min_speech_db - self.threshold_db
+        self._voiced = 0.0
+        self.unvoiced_seconds = 0.0
+
+    def process(self, block: np.ndarray, seconds: float) -> bool:
+        """
+        音声ブロックを判定する
+
+        Parameters
+        ----------
+        block : np.ndarray
+            int16 の音声ブロック
+        seconds : float
+            ブロックの長さ（秒）
+
+        Returns
+        -------
+        bool
+            発話中かどうか（ハングオーバーを含む）
+        """
+        values = block.reshape(-1).astype(np.float32)
+        energy = float(values.dot(values)) / max(1, len(values))
+        level_db = 10 * math.log10(max(energy, 1e-10) / (FULL_SCALE * FULL_SCALE))
+
+        voiced = level_db >= max(self.noise_db + self.threshold_db, self.min_speech_db)
+        if voiced:
+            self._voiced += seconds
+            self.unvoiced_seconds = 0.0
+            if self._voiced >= self.onset:
+                self.speaking = True
+        else:
+            self._voiced = 0.0
+            self.unvoiced_seconds += seconds
+            if self.unvoiced_seconds >= self.hangover:
+                self.speaking = False
+            # 背景雑音は発話でないブロックだけで推定する
+            if level_db < self.noise_db:
+                self.noise_db = level_db
+            else:
+                self.noise_db = min(level_db, self.noise_db + self.noise_rise * seconds)
+        return self.speaking
+
+
+class Endpointer:
+    """
+    録音の自動停止の判定
+
+    録音中の音声ブロックを process に渡すと、発話の最後のブロックから無音が silence_timeout 秒続いたとき
+    ENDPOINT_SILENCE を、録音が max_seconds 秒に達したとき ENDPOINT_MAX_LENGTH を1回だけ返します。
+    発話が始まる前の無音では停止しません。
+    pause_seconds を指定すると、発話のあとの無音が pause_seconds 秒続くたびに ENDPOINT_PAUSE を
+    返します（無音1回につき1回。録音は続けます）。
+
+    Attributes
+    ----------
+    silence_timeout : float
+        発話のあと停止するまでの無音の秒数（0 で無音では停止しない）
+    max_seconds : float
+        録音の最大の長さ（秒、0 で無制限）
+    pause_seconds : float
+        発話の区切りとみなす無音の秒数（0 で区切りを知らせない）
+    paused : bool
+        最後の ENDPOINT_PAUSE のあと、発話が再開していないかどうか
+    """
+
+    def __init__(self, silence_timeout: float = 1.5, max_seconds: float = 0.0, vad: Optional[EnergyVAD] = None,
+                 pause_seconds: float = 0.0):
+        """
+        Endpointerの初期化
+
+        Parameters
+        ----------
+        silence_timeout : float
+            発話のあと停止するまでの無音の秒数（0 で無音では停止しない）
+        max_seconds : float
+            録音の最大の長さ（秒、0 で無制限）
+        vad : EnergyVAD, optional
+            発話区間の検出。指定がなければ既定の設定で作成します。
+        pause_seconds : float
+            発話の区切りとみなす無音の秒数（0 で区切りを知らせない）
+        """
+        self.silence_timeout = silence_timeout
+        self.max_seconds = max_seconds
+        self.pause_seconds = pause_seconds
+        self.vad = vad or EnergyVAD()
+        self.sample_rate = 16000
+        self.reset()
+
+    def reset(self, sample_rate: Optional[int] = None) -> None:
+        """
+        録音の開始時に状態を初期化する
+
+        Parameters
+        ----------
+        sample_rate : int, optional
+            これから渡す音声のサンプルレート
+        """
+        if sample_rate:
+            self.sample_rate = sample_rate
+        self.vad.reset()
+        self.elapsed = 0.0
+        self.heard_speech = False
+        self.paused = False
+        self._fired = False
+
+    def process(self, block: np.ndarray) -> Optional[str]:
+        """
+        録音中の音声ブロックを渡し、停止するかどうかを判定する
+
+        Parameters
+        ----------
+        block : np.ndarray
+            形状 (フレーム数, チャンネル数) の int16 の音声
+
+        Returns
+        -------
+        str or None
+            停止する場合は ENDPOINT_SILENCE または ENDPOINT_MAX_LENGTH（1回だけ返します）、
+            発話の区切りの場合は ENDPOINT_PAUSE
+        """
+        if self._fired or not len(block):
+            return None
+        seconds = len(block) / self.sample_rate
+        self.elapsed += seconds
+
+        if self.vad.process(block, seconds):
+            self.heard_speech = True
+            self.paused = False
+
+        reason = None
+        if self.max_seconds and self.elapsed >= self.max_seconds:
+            reason = ENDPOINT_MAX_LENGTH
+        elif (self.silence_timeout and self.heard_speech and not self.vad.speaking
+              and self.vad.unvoiced_seconds >= self.silence_timeout):
+            reason = ENDPOINT_SILENCE
+        elif (self.pause_seconds and self.heard_speech and not self.paused and not self.vad.speaking
+              and self.vad.unvoiced_seconds >= self.pause_seconds):
+            self.paused = True
+            return ENDPOINT_PAUSE
+        self._fired = reason is not None
+        return reason
@@ -0,0 +1,275 @@
+"""
+WebSocket 通信モジュール
+
+リアルタイム文字起こしで使う、標準ライブラリだけで実装した最小限の WebSocket（RFC 6455）の
+クライアントを提供します。テスト用のローカルサーバーのために、サーバー側のハンドシェイクも
+提供します。テキストメッセージの送受信、ping への応答、close のみに対応します。
+"""
+
+import os
+import ssl
+import base64
+import socket
+import struct
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class WebSocketError(Exception):
+    """ハンドシェイクの失敗や不正なフレームなど、WebSocket の通信の異常"""
+
+
+def accept_key(key: str) -> str:
+    """Sec-WebSocket-Key に対する Sec-WebSocket-Accept の値"""
+    return base64.b64encode(hashlib.sha1((key + _GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    """ペイロードにマスクをかける（外す）"""
+    length = len(payload)
+    repeated = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "little") ^ int.from_bytes(repeated, "little")).to_bytes(length, "little")
+
+
+def _read_exact(reader, count: int) -> bytes:
+    """count バイトを読む（途中で切断された場合は WebSocketError）"""
+    data = reader.read(count)
+    if data is None or len(data) < count:
+        raise WebSocketError("Connection closed")
+    return data
+
+
+def _read_headers(reader) -> Tuple[str, Dict[str, str]]:
+    """HTTP の開始行とヘッダー（名前は小文字）を読む"""
+    start_line = reader.readline().decode("latin-1").strip()
+    headers = {}
+    while True:
+        line = reader.readline().decode("latin-1")
+        if not line:
+            raise WebSocketError("Connection closed during handshake")
+        line = line.strip()
+        if not line:
+            return start_line, headers
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+class WebSocket:
+    """
+    WebSocket の接続
+
+    connect でクライアントとして接続し、accept でサーバーとして受け入れます。
+    send_text は複数のスレッドから呼べます。recv は1つのスレッドから呼んでください。
+    """
+
+    def __init__(self, sock: socket.socket, reader, client: bool):
+        """
+        WebSocketの初期化（connect または accept を使用してください）
+
+        Parameters
+        ----------
+        sock : socket.socket
+            ハンドシェイク済みのソケット
+        reader : file object
+            ソケットの読み込み用のバッファ付きファイル
+        client : bool
+            クライアント側かどうか（クライアントは送信するフレームにマスクをかけます）
+        """
+        self.sock = sock
+        self._reader = reader
+        self._client = client
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    @classmethod
+    def connect(cls, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10.0) -> "WebSocket":
+        """
+        WebSocket サーバーに接続する
+
+        Parameters
+        ----------
+        url : str
+            ws:// または wss:// の URL
+        headers : dict, optional
+            ハンドシェイクに追加するヘッダー（認証など）
+        timeout : float
+            接続とハンドシェイクのタイムアウト（秒）
+
+        Returns
+        -------
+        WebSocket
+            接続（以降の受信はタイムアウトしません）
+        """
+        parts = urlsplit(url)
+        secure = parts.scheme in ("wss", "https")
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((parts.hostname, port), timeout=timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parts.hostname)
+
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            lines = [
+                f"GET {path} HTTP/1.1",
+                f"Host: {parts.netloc}",
+                "Upgrade: websocket",
+                "Connection: Upgrade",
+                f"Sec-WebSocket-Key: {key}",
+                "Sec-WebSocket-Version: 13",
+            ]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+            reader = sock.makefile("rb")
+            status, response_headers = _read_headers(reader)
+            if " 101 " not in f"{status} ":
+                raise WebSocketError(f"Handshake failed: {status}")
+            if response_headers.get("sec-websocket-accept") != accept_key(key):
+                raise WebSocketError("Handshake failed: invalid Sec-WebSocket-Accept")
+        except Exception:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return cls(sock, reader, client=True)
+
+    @classmethod
+    def accept(cls, sock: socket.socket) -> Tuple["WebSocket", str, Dict[str, str]]:
+        """
+        クライアントの接続を WebSocket として受け入れる（テスト用のサーバーで使用）
+
+        Parameters
+        ----------
+        sock : socket.socket
+            受け入れたソケット
+
+        Returns
+        -------
+        tuple
+            (接続, リクエストのパス, ヘッダー)
+        """
+        reader = sock.makefile("rb")
+        request, headers = _read_headers(reader)
+        key = headers.get("sec-websocket-key")
+        if not request.startswith("GET ") or not key:
+            sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            raise WebSocketError(f"Not a WebSocket request: {request}")
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n"
+        ).encode("latin-1"))
+        return cls(sock, reader, client=False), request.split(" ")[1], headers
+
+    def send_text(self, text: str) -> None:
+        """
+        テキストメッセージを送信する
+
+        Parameters
+        ----------
+        text : str
+            送信するテキスト
+        """
+        self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    def recv(self) -> Optional[str]:
+        """
+        次のテキストメッセージを受信する（ping には自動で応答します）
+
+        Returns
+        -------
+        str or None
+            受信したテキスト。相手が接続を閉じた場合はNone
+        """
+        message = []
+        opcode = None
+        while True:
+            try:
+                fin, frame_opcode, payload = self._read_frame()
+            except (OSError, WebSocketError):
+                self.closed = True
+                return None
+            if frame_opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if frame_opcode == OP_PONG:
+                continue
+            if frame_opcode == OP_CLOSE:
+                if not self.closed:
+                    self.close()
+                return None
+            if frame_opcode != OP_CONTINUATION:
+                opcode = frame_opcode
+            message.append(payload)
+            if fin:
+                data = b"".join(message)
+                return data.decode("utf-8") if opcode == OP_TEXT else data.decode("latin-1")
+
+    def close(self, code: int = 1000) -> None:
+        """
+        接続を閉じる
+
+        Parameters
+        ----------
+        code : int
+            close フレームのステータスコード
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._send_frame(OP_CLOSE, struct.pack("!H", code))
+        except OSError:
+            pass
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        """フレームを1つ送信する（分割はしない）"""
+        length = len(payload)
+        header = bytearray([0x80 | opcode])
+        mask_bit = 0x80 if self._client else 0
+        if length < 126:
+            header.append(mask_bit | length)
+        elif length < 1 << 16:
+            header.append(mask_bit | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(mask_bit | 127)
+            header += struct.pack("!Q", length)
+        if self._client:
+            key = os.urandom(4)
+            header += key
+            payload = _apply_mask(payload, key)
+        with self._send_lock:
+            self.sock.sendall(bytes(header) + payload)
+
+    def _read_frame(self) -> Tuple[bool, int, bytes]:
+        """フレームを1つ受信する"""
+        first, second = _read_exact(self._reader, 2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", _read_exact(self._reader, 2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", _read_exact(self._reader, 8))[0]
+        key = _read_exact(self._reader, 4) if second & 0x80 else None
+        payload = _read_exact(self._reader, length) if length else b""
+        if key is not None:
+            payload = _apply_mask(payload, key)
+        return bool(first & 0x80), first & 0x0F, payload
@@ -1,12 +1,15 @@
+import io
 import os
 import json
+import time
 from pathlib import Path
 import openai
+import soundfile as sf
 
-try:
-    from openai import AzureOpenAI
-except Exception:  # pragma: no cover
-    AzureOpenAI = None
+from src.core import tracing
+from src.core.backends import BACKEND_AZURE, DEFAULT_MODELS, create_backend
+from src.core.rate_limiter import PRIORITY_INTERACTIVE, RateLimitTimeout
+from src.core.realtime import RealtimeSession
 
 
 class WhisperTranscriber:
@@ -14,17 +17,15 @@ class WhisperTranscriber:
     OpenAI Whisper APIを使用した文字起こし処理を行うクラス
     
     APIを使って音声ファイルのテキスト変換を行い、カスタム語彙やシステム指示を
-    活用して精度を向上させる機能を提供します。
+    活用して精度を向上させる機能を提供します。送信先はバックエンド（Azure OpenAI、
+    OpenAI 互換の API、同梱のテスト用サーバー）で切り替えます。
     """
     
-    # 利用可能なモデルのリスト
-    AVAILABLE_MODELS = [
-        {"id": "whisper-1", "name": "Whisper", "description": "OpenAI's open-source Whisper model"},
-        {"id": "gpt-4o-transcribe", "name": "GPT-4o Transcribe", "description": "High-performance transcription model"},
-        {"id": "gpt-4o-mini-transcribe", "name": "GPT-4o Mini Transcribe", "description": "Lightweight and fast transcription model"}
-    ]
+    # バックエンドがモデルの一覧を返せない場合に使うモデルのリスト
+    AVAILABLE_MODELS = DEFAULT_MODELS
     
-    def __init__(self, api_key=None, azure_endpoint=None, api_version=None, azure_deployment=None):
+    def __init__(self, api_key=None, azure_endpoint=None, api_version=None, azure_deployment=None, metrics=None,
+                 backend=BACKEND_AZURE, rate_limiter=None, fallback_deployments=None):
         """
         Whisper文字起こしクラスの初期化
         
@@ -38,6 +39,16 @@ class WhisperTranscriber:
             Azure OpenAI API Version。提供されない場合はAZURE_OPENAI_API_VERSION環境変数から取得を試みます。
         azure_deployment : str, optional
             Azure OpenAI の Deployment 名（任意）。指定がなければ `model` 設定値を deployment 名として使用します。
+        metrics : AppMetrics, optional
+            文字起こしの件数・所要時間・エラーを記録するメトリクス
+        backend : str, optional
+            送信先のバックエンド（"azure"、"openai"、"local"）。"openai" の場合は azure_endpoint に
+            OpenAI 互換の API の base URL を指定します。"local" の場合は同梱のテスト用サーバーを起動します。
+        rate_limiter : RateLimiter, optional
+            送信前に deployment のクォータを待ち合わせるクライアント側のレート制限
+            （複数のトランスクライバーで共有できます）
+        fallback_deployments : list of str, optional
+            レート制限で待つ場合に振り替える予備の deployment 名（Azure OpenAI）
         """
         # 提供された API キーを使用するか、環境から取得
         # 互換性のため OPENAI_API_KEY もフォールバックとして許可
@@ -45,22 +56,28 @@ class WhisperTranscriber:
         self.azure_endpoint = azure_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
         self.api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION") or "2024-02-15-preview"
         self.azure_deployment = azure_deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT")
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.fallback_deployments = list(fallback_deployments or [])
 
-        if not self.api_key or not self.azure_endpoint:
-            raise ValueError(
-                "Azure OpenAI settings are required. Provide api_key + azure_endpoint, "
-                "or set AZURE_OPENAI_API_KEY / AZURE_OPENAI_ENDPOINT environment variables."
-            )
-
-        if AzureOpenAI is None:
-            raise ValueError("openai package does not support AzureOpenAI client in this environment.")
-
-        # Azure OpenAI クライアントの初期化
-        self.client = AzureOpenAI(
-            api_key=self.api_key,
-            azure_endpoint=self.azure_endpoint,
-            api_version=self.api_version,
+        # バックエンドのクライアントの初期化（設定が不足していれば ValueError）
+        # 送信・応答待ちの時間を現在のトレースに記録するため、HTTPクライアントにフックを設定する
+        # （メトリクスがあれば再試行の回数も数える）
+        http_client = None
+        hooks = tracing.httpx_event_hooks()
+        if metrics is not None:
+            for name, callbacks in metrics.httpx_event_hooks().items():
+                hooks[name] = hooks.get(name, []) + callbacks
+        if hooks and hasattr(openai, "DefaultHttpxClient"):
+            http_client = openai.DefaultHttpxClient(event_hooks=hooks)
+        self.backend = create_backend(
+            backend, self.api_key, self.azure_endpoint, self.api_version, self.azure_deployment, http_client
         )
+        self.client = self.backend.client
+        
+        # トレースに記録する送信先（テスト用サーバーは起動したアドレス）
+        self.azure_endpoint = self.backend.endpoint
+        self.azure_deployment = self.backend.deployment
         
         # デフォルトパラメータの設定
         self.model = "whisper-1"  # 使用するWhisperモデル
@@ -74,7 +91,7 @@ class WhisperTranscriber:
     @classmethod
     def get_available_models(cls):
         """
-        利用可能なモデルのリストを返す
+        既定のモデルのリストを返す（バックエンドに問い合わせる前の表示に使用）
         
         Returns
         -------
@@ -82,6 +99,23 @@ class WhisperTranscriber:
             利用可能なモデルの情報を含む辞書のリスト
         """
         return cls.AVAILABLE_MODELS
+    
+    def list_models(self):
+        """
+        バックエンドから利用可能なモデルのリストを取得する（通信を伴う場合があります）
+        
+        Returns
+        -------
+        list
+            利用可能なモデルの情報（id, name, description）を含む辞書のリスト
+        """
+        return self.backend.list_models()
+    
+    def close(self):
+        """
+        バックエンドのクライアント（と起動したテスト用サーバー）を閉じる
+        """
+        self.backend.close()
         
     def set_model(self, model):
         """
@@ -154,10 +188,15 @@ class WhisperTranscriber:
         """
         return self.system_instructions
     
-    def _build_prompt(self):
+    def _build_prompt(self, vocabulary=None):
         """
         語彙とシステム指示を含むプロンプトを構築する
         
+        Parameters
+        ----------
+        vocabulary : list, optional
+            今回の呼び出しに限り使用するカスタム語彙。指定がなければ現在の語彙を使用します。
+        
         Returns
         -------
         str or None
@@ -166,8 +205,9 @@ class WhisperTranscriber:
         prompt_parts = []
         
         # カスタム語彙を追加
-        if self.custom_vocabulary:
-            prompt_parts.append("Vocabulary: " + ", ".join(self.custom_vocabulary))
+        terms = self.custom_vocabulary if vocabulary is None else vocabulary
+        if terms:
+            prompt_parts.append("Vocabulary: " + ", ".join(terms))
         
         # システム指示を追加
         if self.system_instructions:
@@ -177,8 +217,33 @@ class WhisperTranscriber:
             return None
             
         return " ".join(prompt_parts)
+    
+    @staticmethod
+    def is_retryable_error(error):
+        """
+        接続回復後の再送で成功が見込めるエラーかどうかを判定する
+        
+        Parameters
+        ----------
+        error : Exception
+            判定する例外
+            
+        Returns
+        -------
+        bool
+            ネットワーク障害・タイムアウト・レート制限・サーバーエラーの場合True
+        """
+        retryable_types = tuple(
+            t for t in (
+                getattr(openai, "APIConnectionError", None),
+                getattr(openai, "RateLimitError", None),
+                getattr(openai, "InternalServerError", None),
+            ) if t is not None
+        )
+        return isinstance(error, retryable_types + (ConnectionError, TimeoutError))
         
-    def transcribe(self, audio_file, language=None, response_format="text"):
+    def transcribe(self, audio_file, language=None, response_format="text", model=None, raise_errors=False,
+                   priority=PRIORITY_INTERACTIVE):
         """
         OpenAI Whisper APIを使用して音声を文字起こしする
         
@@ -190,6 +255,12 @@ class WhisperTranscriber:
             文字起こしの言語コード（例："en"、"ja"、"zh"）
         response_format : str, optional
             応答フォーマット："text"、"json"、"verbose_json"、または"vtt"
+        model : str, optional
+            今回の呼び出しに限り使用するモデルID。指定がなければ現在のモデルを使用します。
+        raise_errors : bool, optional
+            Trueの場合、エラー時に文字列を返す代わりに例外を送出します
+        priority : str, optional
+            レート制限での優先度（ホットキーの録音は PRIORITY_INTERACTIVE、再送などは PRIORITY_BACKGROUND）
             
         Returns
         -------
@@ -202,45 +273,213 @@ class WhisperTranscriber:
             if not audio_path.exists():
                 raise FileNotFoundError(f"音声ファイルが見つかりません: {audio_file}")
             
-            # API呼び出し用のパラメータを構築
-            params = {
-                # Azure OpenAI では model は deployment 名
-                "model": (self.azure_deployment or self.model),
-                "response_format": response_format,
-            }
-            
-            # 言語が指定されている場合は追加
-            if language:
-                params["language"] = language
-                
-            # カスタム語彙がある場合はプロンプトを追加
-            prompt = self._build_prompt()
-            if prompt:
-                params["prompt"] = prompt
+            # メトリクスの実時間比とレート制限のため、音声の長さを取得する
+            audio_seconds = None
+            if self.metrics is not None or self.rate_limiter is not None:
+                audio_seconds = sf.info(str(audio_path)).duration
             
             # API呼び出し用に音声ファイルを開く
             with open(audio_path, "rb") as audio:
-                # OpenAI APIを呼び出す
-                response = self.client.audio.transcriptions.create(
-                    file=audio,
-                    **params
+                return self._request(
+                    audio, language, response_format, model, audio_seconds=audio_seconds, priority=priority
                 )
                 
-            # 要求されたフォーマットに基づいてレスポンスを処理
-            if response_format == "json" or response_format == "verbose_json":
-                # SDK の戻り値はモデルオブジェクトの場合があるため安全に dict 化
-                if hasattr(response, "model_dump"):
-                    return response.model_dump()
-                if isinstance(response, (dict, list)):
-                    return response
-                try:
-                    return json.loads(response)
-                except Exception:
-                    return {"text": getattr(response, "text", str(response))}
-            else:
-                # text/srt/vtt は文字列または text 属性として取得できる
-                return getattr(response, "text", str(response))
-                
         except Exception as e:
             print(f"Error occurred during transcription: {e}")
+            if raise_errors:
+                raise
+            return f"Error: {str(e)}"
+    
+    def transcribe_samples(self, samples, sample_rate, language=None, response_format="text",
+                           model=None, vocabulary=None, raise_errors=False, priority=PRIORITY_INTERACTIVE):
+        """
+        メモリ上の音声データを文字起こしする
+        
+        ディスクへの書き込みを行わず、メモリ上でWAVにエンコードして送信します。
+        直近の録音を別のモデルや言語で再度文字起こしする場合に使用します。
+        
+        Parameters
+        ----------
+        samples : np.ndarray
+            音声サンプル（int16 または浮動小数点）
+        sample_rate : int
+            サンプルレート
+        language : str, optional
+            文字起こしの言語コード（例："en"、"ja"、"zh"）
+        response_format : str, optional
+            応答フォーマット："text"、"json"、"verbose_json"、または"vtt"
+        model : str, optional
+            今回の呼び出しに限り使用するモデルID。指定がなければ現在のモデルを使用します。
+        vocabulary : list, optional
+            今回の呼び出しに限り使用するカスタム語彙。指定がなければ現在の語彙を使用します。
+        raise_errors : bool, optional
+            Trueの場合、エラー時に文字列を返す代わりに例外を送出します
+        priority : str, optional
+            レート制限での優先度（ホットキーの録音は PRIORITY_INTERACTIVE、再送などは PRIORITY_BACKGROUND）
+            
+        Returns
+        -------
+        str or dict
+            応答フォーマットによって文字列または辞書形式の文字起こし結果
+        """
+        try:
+            buffer = io.BytesIO()
+            sf.write(buffer, samples, sample_rate, format="WAV", subtype="PCM_16")
+            audio = ("audio.wav", buffer.getvalue(), "audio/wav")
+            return self._request(
+                audio, language, response_format, model, vocabulary, len(samples) / sample_rate, priority
+            )
+            
+        except Exception as e:
+            print(f"Error occurred during transcription: {e}")
+            if raise_errors:
+                raise
             return f"Error: {str(e)}"
+    
+    def open_realtime_session(self, language=None, model=None, api_version="2025-04-01-preview", on_interim=None,
+                              connect_timeout=5.0):
+        """
+        リアルタイム文字起こしのセッションを作成する（接続は RealtimeSession.start で開始）
+        
+        Parameters
+        ----------
+        language : str, optional
+            文字起こしの言語コード
+        model : str, optional
+            今回のセッションに限り使用するモデルID。指定がなければ現在のモデルを使用します。
+        api_version : str
+            Realtime API のバージョン
+        on_interim : Callable[[str], None], optional
+            途中の文字起こし結果を受け取るたびに呼ばれる関数
+        connect_timeout : float
+            接続のタイムアウト（秒）
+            
+        Returns
+        -------
+        RealtimeSession or None
+            録音の音声ブロックを put で受け取るセッション。バックエンドが対応していない場合はNone
+        """
+        model = model or self.model
+        connection = self.backend.realtime_connection(api_version, model)
+        if connection is None:
+            return None
+        url, headers = connection
+        return RealtimeSession(
+            url,
+            headers=headers,
+            model=model,
+            language=language,
+            prompt=self._build_prompt(),
+            connect_timeout=connect_timeout,
+            on_interim=on_interim,
+        )
+    
+    def _request(self, audio, language, response_format, model=None, vocabulary=None, audio_seconds=None,
+                 priority=PRIORITY_INTERACTIVE):
+        """
+        文字起こしAPIを呼び出し、応答フォーマットに応じて結果を変換する
+        
+        Parameters
+        ----------
+        audio : file object or tuple
+            送信する音声（ファイルオブジェクト、または (ファイル名, バイト列, MIMEタイプ)）
+        language : str or None
+            文字起こしの言語コード
+        response_format : str
+            応答フォーマット
+        model : str, optional
+            今回の呼び出しに限り使用するモデルID
+        vocabulary : list, optional
+            今回の呼び出しに限り使用するカスタム語彙
+        audio_seconds : float, optional
+            音声の長さ（秒）。メトリクスの実時間比とレート制限に使用します。
+        priority : str, optional
+            レート制限での優先度
+            
+        Returns
+        -------
+        str or dict
+            応答フォーマットによって文字列または辞書形式の文字起こし結果
+        """
+        # API呼び出し用のパラメータを構築
+        params = {
+            # Azure OpenAI では model は deployment 名
+            "model": self.backend.model_name(model or self.model),
+            "response_format": response_format,
+        }
+        
+        # 言語が指定されている場合は追加
+        if language:
+            params["language"] = language
+            
+        # カスタム語彙がある場合はプロンプトを追加
+        prompt = self._build_prompt(vocabulary)
+        if prompt:
+            params["prompt"] = prompt
+        
+        # クォータを超えないよう送信を待ち合わせる（予備の deployment があれば早く送れる方に振り替える）
+        if self.rate_limiter is not None:
+            candidates = [params["model"]] + [d for d in self.fallback_deployments if d != params["model"]]
+            with tracing.current().span("rate_limit"):
+                deployment = self.rate_limiter.acquire(candidates, audio_seconds or 0.0, priority)
+            if deployment is None:
+                raise RateLimitTimeout(f"Client-side rate limit for {params['model']} did not clear in time")
+            params["model"] = deployment
+        
+        # OpenAI APIを呼び出す
+        started = time.perf_counter()
+        try:
+            response, headers = self.backend.create_transcription(audio, params)
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error(params["model"], e)
+            if self.rate_limiter is not None and isinstance(e, getattr(openai, "RateLimitError", ())):
+                self.rate_limiter.reject(params["model"], headers=e.response.headers)
+            raise
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(params["model"], headers)
+        result = self._parse_response(response, response_format)
+        
+        # 応答の受信から変換までを parse として記録（開始は HTTP のフックで記録）
+        tracing.current().end("parse")
+        
+        if self.metrics is not None:
+            if isinstance(audio, tuple):
+                upload_bytes = len(audio[1])
+            else:
+                upload_bytes = os.fstat(audio.fileno()).st_size
+            self.metrics.record_transcription(
+                params["model"], time.perf_counter() - started, upload_bytes, audio_seconds
+            )
+        return result
+    
+    @staticmethod
+    def _parse_response(response, response_format):
+        """
+        APIの応答を要求したフォーマットに応じて変換する
+        
+        Parameters
+        ----------
+        response : object
+            SDK の戻り値（モデルオブジェクト、辞書、または文字列）
+        response_format : str
+            要求した応答フォーマット
+            
+        Returns
+        -------
+        str or dict
+            json/verbose_json の場合は辞書、それ以外は文字列
+        """
+        if response_format == "json" or response_format == "verbose_json":
+            # SDK の戻り値はモデルオブジェクトの場合があるため安全に dict 化
+            if hasattr(response, "model_dump"):
+                return response.model_dump()
+            if isinstance(response, (dict, list)):
+                return response
+            try:
+                return json.loads(response)
+            except Exception:
+                return {"text": getattr(response, "text", str(response))}
+        else:
+            # text/srt/vtt は文字列または text 属性として取得できる
+            return getattr(response, "text", str(response))
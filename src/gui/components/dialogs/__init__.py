@@ -7,4 +7,7 @@
 from src.gui.components.dialogs.api_key_dialog import APIKeyDialog
 from src.gui.components.dialogs.vocabulary_dialog import VocabularyDialog
 from src.gui.components.dialogs.system_instructions_dialog import SystemInstructionsDialog
-from src.gui.components.dialogs.hotkey_dialog import HotkeyDialog 
\ No newline at end of file
+from src.gui.components.dialogs.hotkey_dialog import HotkeyDialog 
+from src.gui.components.dialogs.retranscribe_dialog import RetranscribeDialog
+from src.gui.components.dialogs.performance_dialog import PerformanceDialog
+from src.gui.components.dialogs.audio_device_dialog import AudioDeviceDialog
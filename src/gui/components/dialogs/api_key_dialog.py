@@ -4,15 +4,17 @@ Azure OpenAI 設定用のダイアログ。
 
 従来は OpenAI API キーのみを扱っていましたが、Azure OpenAI では
 `Endpoint` と `api-version`（および必要に応じて `Deployment`）が必要なため、
-それらもまとめて入力できるようにしています。
+それらもまとめて入力できるようにしています。接続先として OpenAI 互換の API
+（自前の Whisper サーバーなど）と同梱のテスト用サーバーも選択できます。
 """
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QPushButton, QLineEdit, QLabel, QMessageBox
+    QPushButton, QLineEdit, QLabel, QMessageBox, QComboBox
 )
 from PyQt6.QtCore import Qt
 
+from src.core.backends import BACKEND_AZURE, BACKEND_OPENAI, BACKEND_LOCAL
 from src.gui.resources.labels import AppLabels
 from src.gui.resources.styles import AppStyles
 
@@ -23,7 +25,8 @@ class APIKeyDialog(QDialog):
     APIキーの入力、保存、表示を管理するダイアログウィンドウ
     """
     
-    def __init__(self, parent=None, api_key=None, endpoint=None, api_version=None, deployment=None):
+    def __init__(self, parent=None, api_key=None, endpoint=None, api_version=None, deployment=None,
+                 backend=BACKEND_AZURE, fallback_deployments=None):
         """
         APIKeyDialogの初期化
         
@@ -39,6 +42,10 @@ class APIKeyDialog(QDialog):
             初期表示する Azure OpenAI API Version
         deployment : str, optional
             初期表示する Deployment 名（任意）
+        backend : str, optional
+            初期表示する接続先（"azure"、"openai"、"local"）
+        fallback_deployments : str, optional
+            初期表示する予備の Deployment 名（カンマ区切り、任意）
         """
         super().__init__(parent)
         self.setWindowTitle(AppLabels.API_KEY_DIALOG_TITLE)
@@ -55,6 +62,13 @@ class APIKeyDialog(QDialog):
         form_layout = QFormLayout()
         form_layout.setSpacing(10)
 
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem(AppLabels.BACKEND_AZURE, BACKEND_AZURE)
+        self.backend_combo.addItem(AppLabels.BACKEND_OPENAI, BACKEND_OPENAI)
+        self.backend_combo.addItem(AppLabels.BACKEND_LOCAL, BACKEND_LOCAL)
+        self.backend_combo.setCurrentIndex(max(0, self.backend_combo.findData(backend)))
+        form_layout.addRow(AppLabels.API_BACKEND_LABEL, self.backend_combo)
+
         self.endpoint_input = QLineEdit()
         if endpoint:
             self.endpoint_input.setText(endpoint)
@@ -73,12 +87,22 @@ class APIKeyDialog(QDialog):
         self.deployment_input.setPlaceholderText("(空でOK) 例: whisper-1")
         form_layout.addRow(AppLabels.API_DEPLOYMENT_LABEL, self.deployment_input)
 
+        self.fallback_deployments_input = QLineEdit()
+        if fallback_deployments:
+            self.fallback_deployments_input.setText(fallback_deployments)
+        self.fallback_deployments_input.setPlaceholderText("(空でOK) 例: whisper-eastus, whisper-westus")
+        form_layout.addRow(AppLabels.API_FALLBACK_DEPLOYMENTS_LABEL, self.fallback_deployments_input)
+
         self.api_key_input = QLineEdit()
         if api_key:
             self.api_key_input.setText(api_key)
         self.api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
         form_layout.addRow(AppLabels.API_KEY_LABEL, self.api_key_input)
         
+        # 接続先に応じて使わない項目を無効にする
+        self.backend_combo.currentIndexChanged.connect(self.update_fields)
+        self.update_fields()
+        
         layout.addLayout(form_layout)
         
         # 情報テキスト
@@ -103,6 +127,25 @@ class APIKeyDialog(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
     
+    def update_fields(self):
+        """
+        選択した接続先で使う項目のみを入力できるようにする
+        """
+        backend = self.get_backend()
+        self.endpoint_input.setEnabled(backend != BACKEND_LOCAL)
+        self.api_key_input.setEnabled(backend != BACKEND_LOCAL)
+        self.api_version_input.setEnabled(backend == BACKEND_AZURE)
+        self.deployment_input.setEnabled(backend == BACKEND_AZURE)
+        self.fallback_deployments_input.setEnabled(backend == BACKEND_AZURE)
+        if backend == BACKEND_OPENAI:
+            self.endpoint_input.setPlaceholderText(AppLabels.API_BASE_URL_PLACEHOLDER)
+        else:
+            self.endpoint_input.setPlaceholderText("https://{resource}.openai.azure.com/")
+    
+    def get_backend(self):
+        """選択された接続先（"azure"、"openai"、"local"）を返す"""
+        return self.backend_combo.currentData()
+    
     def get_api_key(self):
         """
         入力されたAPIキーを返す
@@ -124,4 +167,8 @@ class APIKeyDialog(QDialog):
 
     def get_deployment(self):
         """入力された Deployment 名（任意）を返す"""
-        return self.deployment_input.text().strip()
\ No newline at end of file
+        return self.deployment_input.text().strip()
+
+    def get_fallback_deployments(self):
+        """入力された予備の Deployment 名（カンマ区切り、任意）を返す"""
+        return ", ".join(name.strip() for name in self.fallback_deployments_input.text().split(",") if name.strip())
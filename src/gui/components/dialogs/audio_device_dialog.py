@@ -0,0 +1,336 @@
+"""
+音声入力設定用のダイアログモジュール
+
+入力デバイス、ブロックサイズ、レイテンシを選択し、候補の設定を計測して
+最も良い設定を自動で選ぶためのダイアログを提供します
+"""
+
+import threading
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QCheckBox,
+    QDoubleSpinBox, QSpinBox, QFormLayout, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import pyqtSignal
+
+from src.core.audio_devices import probe_candidates, pick_best
+from src.core.audio_recorder import MAX_NATIVE_CHANNELS
+from src.gui.resources.config import AppConfig
+from src.gui.resources.labels import AppLabels
+from src.gui.resources.styles import AppStyles
+
+class AudioDeviceDialog(QDialog):
+    """
+    音声入力の設定ダイアログ
+
+    「自動調整」を押すと、選択中のデバイスでブロックサイズとレイテンシの候補を
+    バックグラウンドで計測し、結果の表と最も良い設定を表示します。
+    """
+
+    # 計測スレッドからの通知（候補1つの結果、すべての結果）
+    probe_progress = pyqtSignal(object)
+    probe_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None, devices=None, device_name="", blocksize=0, latency=None,
+                 sample_rate=16000, channels=1, native_rate=False, capture_process=False,
+                 auto_stop_silence=AppConfig.DEFAULT_AUTO_STOP_SILENCE_SECONDS,
+                 max_take_seconds=AppConfig.DEFAULT_MAX_TAKE_SECONDS):
+        """
+        AudioDeviceDialogの初期化
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            親ウィジェット
+        devices : list, optional
+            選択できる入力デバイスの情報（list_input_devices の戻り値）
+        device_name : str
+            初期選択するデバイス名（空の場合は既定のデバイス）
+        blocksize : int
+            初期選択するブロックサイズ（0 は自動）
+        latency : str or None
+            初期選択するレイテンシ（"low"、"high"、Noneは既定）
+        sample_rate : int
+            計測に使うサンプルレート
+        channels : int
+            計測に使うチャンネル数
+        native_rate : bool
+            デバイス本来のサンプルレート・チャンネル数で録音するかどうかの初期値
+        capture_process : bool
+            入力ストリームを子プロセスで開くかどうかの初期値
+        auto_stop_silence : float
+            話し終えてから録音を自動停止するまでの無音の秒数の初期値
+        max_take_seconds : int
+            録音の最大の長さ（秒、0 は無制限）の初期値
+        """
+        super().__init__(parent)
+        self.devices = devices or []
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.setWindowTitle(AppLabels.AUDIO_DEVICE_DIALOG_TITLE)
+        self.setMinimumWidth(560)
+        self.setMinimumHeight(420)
+
+        # スタイルシートを設定
+        self.setStyleSheet(AppStyles.AUDIO_DEVICE_DIALOG_STYLE)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # デバイス・ブロックサイズ・レイテンシ
+        form_layout = QFormLayout()
+        form_layout.setHorizontalSpacing(10)
+
+        self.device_combo = QComboBox()
+        self.device_combo.addItem(AppLabels.AUDIO_DEVICE_DEFAULT, "")
+        for device in self.devices:
+            self.device_combo.addItem(AppLabels.AUDIO_DEVICE_FORMAT.format(device["name"], device["hostapi"]),
+                                      device["name"])
+        self._select(self.device_combo, device_name or "")
+
+        self.blocksize_combo = QComboBox()
+        for value in AppConfig.INPUT_BLOCKSIZE_CHOICES:
+            self.blocksize_combo.addItem(str(value) if value else AppLabels.AUDIO_BLOCKSIZE_AUTO, value)
+        self._select(self.blocksize_combo, blocksize)
+
+        self.latency_combo = QComboBox()
+        for name, value in AppLabels.AUDIO_LATENCY_CHOICES:
+            self.latency_combo.addItem(name, value)
+        self._select(self.latency_combo, latency or "")
+
+        form_layout.addRow(QLabel(AppLabels.AUDIO_DEVICE_LABEL), self.device_combo)
+        form_layout.addRow(QLabel(AppLabels.AUDIO_BLOCKSIZE_LABEL), self.blocksize_combo)
+        form_layout.addRow(QLabel(AppLabels.AUDIO_LATENCY_LABEL), self.latency_combo)
+        layout.addLayout(form_layout)
+
+        self.native_rate_checkbox = QCheckBox(AppLabels.AUDIO_NATIVE_RATE)
+        self.native_rate_checkbox.setChecked(native_rate)
+        layout.addWidget(self.native_rate_checkbox)
+
+        self.capture_process_checkbox = QCheckBox(AppLabels.AUDIO_CAPTURE_PROCESS)
+        self.capture_process_checkbox.setChecked(capture_process)
+        layout.addWidget(self.capture_process_checkbox)
+
+        # 録音の自動停止
+        stop_layout = QFormLayout()
+        stop_layout.setHorizontalSpacing(10)
+
+        self.silence_spin = QDoubleSpinBox()
+        self.silence_spin.setRange(0.3, 10.0)
+        self.silence_spin.setSingleStep(0.1)
+        self.silence_spin.setDecimals(1)
+        self.silence_spin.setSuffix(AppLabels.AUDIO_SECONDS_SUFFIX)
+        self.silence_spin.setValue(auto_stop_silence)
+
+        self.max_take_spin = QSpinBox()
+        self.max_take_spin.setRange(0, 3600)
+        self.max_take_spin.setSingleStep(30)
+        self.max_take_spin.setSuffix(AppLabels.AUDIO_SECONDS_SUFFIX)
+        self.max_take_spin.setSpecialValueText(AppLabels.AUDIO_MAX_TAKE_UNLIMITED)
+        self.max_take_spin.setValue(max_take_seconds)
+
+        stop_layout.addRow(QLabel(AppLabels.AUDIO_AUTO_STOP_SILENCE_LABEL), self.silence_spin)
+        stop_layout.addRow(QLabel(AppLabels.AUDIO_MAX_TAKE_LABEL), self.max_take_spin)
+        layout.addLayout(stop_layout)
+
+        # 自動調整の結果
+        probe_title = QLabel(AppLabels.AUDIO_PROBE_TITLE)
+        probe_title.setProperty("class", "sectionTitle")
+        layout.addWidget(probe_title)
+
+        self.result_table = QTableWidget(0, len(AppLabels.AUDIO_PROBE_COLUMNS))
+        self.result_table.setHorizontalHeaderLabels(AppLabels.AUDIO_PROBE_COLUMNS)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.result_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.result_table, 1)
+
+        self.probe_status = QLabel(AppLabels.AUDIO_PROBE_INFO)
+        self.probe_status.setProperty("class", "info")
+        self.probe_status.setWordWrap(True)
+        layout.addWidget(self.probe_status)
+
+        # ダイアログボタン
+        dialog_buttons = QHBoxLayout()
+        dialog_buttons.setSpacing(10)
+
+        self.probe_button = QPushButton(AppLabels.AUDIO_PROBE_BUTTON)
+        self.probe_button.setProperty("class", "secondary")
+        self.probe_button.clicked.connect(self.start_probe)
+
+        self.save_button = QPushButton(AppLabels.SAVE_BUTTON)
+        self.save_button.clicked.connect(self.accept)
+
+        self.cancel_button = QPushButton(AppLabels.CANCEL_BUTTON)
+        self.cancel_button.setProperty("class", "secondary")
+        self.cancel_button.clicked.connect(self.reject)
+
+        dialog_buttons.addWidget(self.probe_button)
+        dialog_buttons.addStretch()
+        dialog_buttons.addWidget(self.cancel_button)
+        dialog_buttons.addWidget(self.save_button)
+        layout.addLayout(dialog_buttons)
+
+        self.setLayout(layout)
+
+        self.probe_progress.connect(self.add_probe_result)
+        self.probe_finished.connect(self.on_probe_finished)
+
+    @staticmethod
+    def _select(combo, value):
+        """値が一致する項目を選択する"""
+        index = combo.findData(value)
+        if index >= 0:
+            combo.setCurrentIndex(index)
+
+    def start_probe(self):
+        """
+        選択中のデバイスで候補の設定の計測をバックグラウンドで開始する
+        """
+        device_name = self.device_combo.currentData()
+        info = next((d for d in self.devices if d["name"] == device_name or (not device_name and d["is_default"])), None)
+        device = info["index"] if info is not None and device_name else None
+
+        # デバイス本来の形式で録音する場合はその形式で計測する
+        sample_rate, channels = self.sample_rate, self.channels
+        if self.native_rate_checkbox.isChecked() and info is not None:
+            sample_rate = int(info["default_samplerate"])
+            channels = max(1, min(info["max_input_channels"], MAX_NATIVE_CHANNELS))
+
+        self.probe_button.setEnabled(False)
+        self.save_button.setEnabled(False)
+        self.result_table.setRowCount(0)
+        self.probe_status.setText(AppLabels.AUDIO_PROBE_RUNNING)
+
+        def run():
+            results = probe_candidates(
+                device, sample_rate, channels,
+                duration=AppConfig.INPUT_PROBE_SECONDS, on_result=self.probe_progress.emit,
+            )
+            self.probe_finished.emit(results)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def add_probe_result(self, result):
+        """
+        計測結果を1行追加する
+
+        Parameters
+        ----------
+        result : dict
+            probe_stream の結果
+        """
+        row = self.result_table.rowCount()
+        self.result_table.insertRow(row)
+        if result["ok"]:
+            values = (
+                str(result["blocksize"] or AppLabels.AUDIO_BLOCKSIZE_AUTO), str(result["latency"]),
+                f"{result['open_ms']:.0f}", f"{result['stream_latency_ms']:.1f}",
+                f"{result['jitter_p95_ms']:.1f}", str(result["overflows"]),
+            )
+        else:
+            values = (str(result["blocksize"] or AppLabels.AUDIO_BLOCKSIZE_AUTO), str(result["latency"]),
+                      AppLabels.AUDIO_PROBE_FAILED, "", "", "")
+        for column, value in enumerate(values):
+            self.result_table.setItem(row, column, QTableWidgetItem(value))
+
+    def on_probe_finished(self, results):
+        """
+        計測が終わったら最も良い設定を選択する
+
+        Parameters
+        ----------
+        results : list of dict
+            すべての候補の probe_stream の結果
+        """
+        self.probe_button.setEnabled(True)
+        self.save_button.setEnabled(True)
+        best = pick_best(results)
+        if best is None:
+            self.probe_status.setText(AppLabels.AUDIO_PROBE_NO_RESULT)
+            return
+        self._select(self.blocksize_combo, best["blocksize"])
+        self._select(self.latency_combo, best["latency"])
+        self.result_table.selectRow(results.index(best))
+        self.probe_status.setText(AppLabels.AUDIO_PROBE_BEST.format(
+            best["blocksize"] or AppLabels.AUDIO_BLOCKSIZE_AUTO, best["latency"],
+            best["open_ms"], best["jitter_p95_ms"],
+        ))
+
+    def get_device_name(self):
+        """
+        選択されたデバイス名を取得する
+
+        Returns
+        -------
+        str
+            デバイス名（空文字列は既定のデバイス）
+        """
+        return self.device_combo.currentData()
+
+    def get_blocksize(self):
+        """
+        選択されたブロックサイズを取得する
+
+        Returns
+        -------
+        int
+            ブロックサイズ（0 は自動）
+        """
+        return self.blocksize_combo.currentData()
+
+    def get_latency(self):
+        """
+        選択されたレイテンシを取得する
+
+        Returns
+        -------
+        str
+            "low"、"high"、または空文字列（既定）
+        """
+        return self.latency_combo.currentData()
+
+    def get_native_rate(self):
+        """
+        デバイス本来のサンプルレート・チャンネル数で録音するかどうかを取得する
+
+        Returns
+        -------
+        bool
+            デバイス本来の形式で録音する場合True
+        """
+        return self.native_rate_checkbox.isChecked()
+
+    def get_capture_process(self):
+        """
+        入力ストリームを子プロセスで開くかどうかを取得する
+
+        Returns
+        -------
+        bool
+            子プロセスで録音する場合True
+        """
+        return self.capture_process_checkbox.isChecked()
+
+    def get_auto_stop_silence(self):
+        """
+        話し終えてから録音を自動停止するまでの無音の秒数を取得する
+
+        Returns
+        -------
+        float
+            無音の秒数
+        """
+        return self.silence_spin.value()
+
+    def get_max_take_seconds(self):
+        """
+        録音の最大の長さを取得する
+
+        Returns
+        -------
+        int
+            最大の長さ（秒、0 は無制限）
+        """
+        return self.max_take_spin.value()
@@ -0,0 +1,243 @@
+"""
+パフォーマンスダイアログモジュール
+
+直近の録音の処理時間（ウォーターフォール）、モデル・エンドポイント別の文字起こしまでの時間、
+待ち行列の長さと上流のエラー率を表示し、診断情報をコピーするためのダイアログを提供します
+"""
+
+import json
+from datetime import datetime
+from urllib.parse import urlparse
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QApplication
+)
+from PyQt6.QtCore import QTimer
+
+from src.gui.resources.config import AppConfig
+from src.gui.resources.labels import AppLabels
+from src.gui.resources.styles import AppStyles
+from src.gui.components.widgets.waterfall_view import WaterfallView
+
+# 文字起こしまでの時間の起点（録音停止の開始）
+TIME_TO_TEXT_SINCE = "stop_recording"
+
+
+def summarize_traces(traces):
+    """
+    完了したトレースをモデル・エンドポイント別に集計する
+
+    Parameters
+    ----------
+    traces : list of TakeTrace
+        完了したトレース（新しい順）
+
+    Returns
+    -------
+    tuple
+        ([{model, endpoint, count, p50_ms, p95_ms}, ...], 文字起こしを行った録音数, エラー数)
+    """
+    groups = {}
+    attempts = errors = 0
+    for trace in traces:
+        if trace.attrs.get("model") is None:
+            continue
+        attempts += 1
+        if trace.attrs.get("error"):
+            errors += 1
+            continue
+        elapsed = trace.elapsed_ms(TIME_TO_TEXT_SINCE)
+        if elapsed is not None:
+            key = (trace.attrs["model"], trace.attrs.get("endpoint") or "")
+            groups.setdefault(key, []).append(elapsed)
+
+    rows = []
+    for (model, endpoint), values in sorted(groups.items()):
+        values.sort()
+        rows.append({
+            "model": model,
+            "endpoint": endpoint,
+            "count": len(values),
+            "p50_ms": values[len(values) // 2],
+            "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+        })
+    return rows, attempts, errors
+
+
+class PerformanceDialog(QDialog):
+    """
+    直近の録音のパフォーマンスを表示するダイアログ
+
+    モードレスで表示し、更新は schedule_refresh で予約します。予約は表示中のみ受け付け、
+    間隔内の複数の予約は1回の更新にまとめます。
+    """
+
+    def __init__(self, parent=None, tracer=None, queue_depth=None, diagnostics=None):
+        """
+        PerformanceDialogの初期化
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            親ウィジェット
+        tracer : Tracer, optional
+            完了したトレースを保持するトレーサー
+        queue_depth : Callable[[], tuple], optional
+            (実行待ちのホットキーの数, 再送待ちの録音の数) を返す関数
+        diagnostics : Callable[[], dict], optional
+            診断情報に含める設定やメトリクスを返す関数
+        """
+        super().__init__(parent)
+        self.tracer = tracer
+        self.queue_depth = queue_depth
+        self.diagnostics = diagnostics
+        self.setWindowTitle(AppLabels.PERFORMANCE_DIALOG_TITLE)
+        self.setMinimumWidth(640)
+        self.setMinimumHeight(480)
+
+        # スタイルシートを設定
+        self.setStyleSheet(AppStyles.PERFORMANCE_DIALOG_STYLE)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # 直近の録音のウォーターフォール
+        self.waterfall_title = QLabel(AppLabels.PERFORMANCE_LAST_TAKE_TITLE)
+        self.waterfall_title.setProperty("class", "sectionTitle")
+        layout.addWidget(self.waterfall_title)
+
+        self.waterfall = WaterfallView()
+        layout.addWidget(self.waterfall)
+
+        # 直近の録音の入力ストリームの状態
+        self.audio_label = QLabel()
+        layout.addWidget(self.audio_label)
+
+        # モデル・エンドポイント別の文字起こしまでの時間
+        models_title = QLabel(AppLabels.PERFORMANCE_MODELS_TITLE.format(AppConfig.TRACE_HISTORY_SIZE))
+        models_title.setProperty("class", "sectionTitle")
+        layout.addWidget(models_title)
+
+        self.model_table = QTableWidget(0, len(AppLabels.PERFORMANCE_MODEL_COLUMNS))
+        self.model_table.setHorizontalHeaderLabels(AppLabels.PERFORMANCE_MODEL_COLUMNS)
+        self.model_table.verticalHeader().setVisible(False)
+        self.model_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.model_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.model_table, 1)
+
+        # 待ち行列とエラー率
+        self.queue_label = QLabel()
+        self.error_label = QLabel()
+        layout.addWidget(self.queue_label)
+        layout.addWidget(self.error_label)
+
+        # ダイアログボタン
+        dialog_buttons = QHBoxLayout()
+        dialog_buttons.setSpacing(10)
+
+        self.copy_button = QPushButton(AppLabels.PERFORMANCE_COPY_DIAGNOSTICS)
+        self.copy_button.clicked.connect(self.copy_diagnostics)
+
+        self.close_button = QPushButton(AppLabels.CLOSE_BUTTON)
+        self.close_button.setProperty("class", "secondary")
+        self.close_button.clicked.connect(self.close)
+
+        dialog_buttons.addWidget(self.close_button)
+        dialog_buttons.addWidget(self.copy_button)
+        layout.addLayout(dialog_buttons)
+
+        self.setLayout(layout)
+
+        # 更新をまとめるタイマー
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(AppConfig.PERFORMANCE_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def schedule_refresh(self):
+        """
+        表示の更新を予約する（非表示の場合や、すでに予約済みの場合は何もしない）
+        """
+        if self.isVisible() and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self):
+        """
+        表示を更新する
+        """
+        traces = self.tracer.recent() if self.tracer is not None else []
+
+        # 直近の録音のウォーターフォール
+        last = traces[0] if traces else None
+        if last is not None:
+            elapsed = last.elapsed_ms(TIME_TO_TEXT_SINCE)
+            self.waterfall_title.setText(AppLabels.PERFORMANCE_LAST_TAKE_FORMAT.format(
+                datetime.fromtimestamp(last.started_at).strftime("%H:%M:%S"),
+                last.attrs.get("model") or "-",
+                elapsed if elapsed is not None else 0.0,
+            ))
+            self.waterfall.set_spans(last.to_dict()["spans"])
+        else:
+            self.waterfall_title.setText(AppLabels.PERFORMANCE_LAST_TAKE_TITLE)
+            self.waterfall.set_spans([])
+
+        audio = last.attrs.get("audio") if last is not None else None
+        if audio:
+            self.audio_label.setText(AppLabels.PERFORMANCE_AUDIO_FORMAT.format(
+                audio["callbacks"], audio["input_overflows"], audio["input_underflows"],
+                audio["jitter_max_ms"], audio["callback_max_ms"],
+            ))
+        self.audio_label.setVisible(bool(audio))
+
+        # モデル・エンドポイント別の文字起こしまでの時間
+        rows, attempts, errors = summarize_traces(traces)
+        self.model_table.setRowCount(len(rows))
+        for index, row in enumerate(rows):
+            values = (
+                row["model"], urlparse(row["endpoint"]).netloc or row["endpoint"], str(row["count"]),
+                f"{row['p50_ms']:.0f}", f"{row['p95_ms']:.0f}",
+            )
+            for column, value in enumerate(values):
+                self.model_table.setItem(index, column, QTableWidgetItem(value))
+
+        # 待ち行列とエラー率
+        hotkeys, spooled = self.queue_depth() if self.queue_depth is not None else (0, 0)
+        self.queue_label.setText(AppLabels.PERFORMANCE_QUEUE_FORMAT.format(hotkeys, spooled))
+        rate = errors / attempts if attempts else 0.0
+        self.error_label.setText(AppLabels.PERFORMANCE_ERROR_RATE_FORMAT.format(rate, errors, attempts))
+
+    def build_diagnostics(self):
+        """
+        診断情報を作成する
+
+        Returns
+        -------
+        dict
+            作成日時、モデル・エンドポイント別の集計、直近のトレースと、diagnostics の戻り値
+        """
+        traces = self.tracer.recent() if self.tracer is not None else []
+        rows, attempts, errors = summarize_traces(traces)
+        bundle = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "time_to_text": rows,
+            "upstream_errors": {"errors": errors, "attempts": attempts},
+            "traces": [trace.to_dict() for trace in traces],
+        }
+        if self.diagnostics is not None:
+            bundle.update(self.diagnostics())
+        return bundle
+
+    def copy_diagnostics(self):
+        """
+        診断情報を JSON でクリップボードにコピーする
+        """
+        text = json.dumps(self.build_diagnostics(), ensure_ascii=False, indent=2, default=str)
+        QApplication.clipboard().setText(text)
+        self.copy_button.setText(AppLabels.PERFORMANCE_DIAGNOSTICS_COPIED)
+        QTimer.singleShot(2000, lambda: self.copy_button.setText(AppLabels.PERFORMANCE_COPY_DIAGNOSTICS))
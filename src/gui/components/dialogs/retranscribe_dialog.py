@@ -0,0 +1,186 @@
+"""
+再文字起こし用のダイアログモジュール
+
+メモリ上に保持している直近の録音を選び、別のモデル・言語・語彙で
+文字起こしし直すためのダイアログを提供します
+"""
+
+from datetime import datetime
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QListWidget, QListWidgetItem, QLineEdit, QComboBox, QFormLayout
+)
+from PyQt6.QtCore import Qt
+
+from src.gui.resources.labels import AppLabels
+from src.gui.resources.styles import AppStyles
+
+class RetranscribeDialog(QDialog):
+    """
+    直近の録音の再文字起こしのためのダイアログ
+
+    録音を1つ選び、使用するモデル（複数選択可）・言語・カスタム語彙を指定するダイアログウィンドウ
+    """
+
+    def __init__(self, parent=None, takes=None, models=None, languages=None,
+                 vocabulary=None, language=None, model=None):
+        """
+        RetranscribeDialogの初期化
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            親ウィジェット
+        takes : list, optional
+            選択できる録音の情報のリスト（新しい順）
+        models : list, optional
+            選択できるモデルの情報（``id``、``name``）のリスト
+        languages : list, optional
+            選択できる言語の (表示名, 言語コード) のリスト
+        vocabulary : list, optional
+            初期表示するカスタム語彙のリスト
+        language : str, optional
+            初期選択する言語コード
+        model : str, optional
+            初期選択するモデルID
+        """
+        super().__init__(parent)
+        self.setWindowTitle(AppLabels.RETRANSCRIBE_DIALOG_TITLE)
+        self.setMinimumWidth(500)
+        self.setMinimumHeight(450)
+
+        # スタイルシートを設定
+        self.setStyleSheet(AppStyles.RETRANSCRIBE_DIALOG_STYLE)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # 録音リスト
+        takes_label = QLabel(AppLabels.RETRANSCRIBE_TAKES_TITLE)
+        takes_label.setProperty("class", "sectionTitle")
+        layout.addWidget(takes_label)
+
+        self.take_list = QListWidget()
+        for take in takes or []:
+            item = QListWidgetItem(self._format_take(take))
+            item.setData(Qt.ItemDataRole.UserRole, take["id"])
+            self.take_list.addItem(item)
+        if self.take_list.count():
+            self.take_list.setCurrentRow(0)
+        layout.addWidget(self.take_list, 1)
+
+        # モデルリスト（チェックしたモデルすべてで文字起こしする）
+        models_label = QLabel(AppLabels.RETRANSCRIBE_MODELS_TITLE)
+        models_label.setProperty("class", "sectionTitle")
+        layout.addWidget(models_label)
+
+        self.model_list = QListWidget()
+        for info in models or []:
+            item = QListWidgetItem(info["name"])
+            item.setData(Qt.ItemDataRole.UserRole, info["id"])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if info["id"] == model else Qt.CheckState.Unchecked)
+            self.model_list.addItem(item)
+        self.model_list.itemChanged.connect(self.update_run_button)
+        layout.addWidget(self.model_list)
+
+        # 言語と語彙
+        form_layout = QFormLayout()
+        form_layout.setHorizontalSpacing(10)
+
+        self.language_combo = QComboBox()
+        for name, code in languages or []:
+            self.language_combo.addItem(name, code)
+        index = self.language_combo.findData(language or "")
+        if index >= 0:
+            self.language_combo.setCurrentIndex(index)
+
+        self.vocabulary_input = QLineEdit(", ".join(vocabulary or []))
+        self.vocabulary_input.setPlaceholderText(AppLabels.RETRANSCRIBE_VOCABULARY_PLACEHOLDER)
+
+        form_layout.addRow(QLabel(AppLabels.LANGUAGE_LABEL), self.language_combo)
+        form_layout.addRow(QLabel(AppLabels.RETRANSCRIBE_VOCABULARY_LABEL), self.vocabulary_input)
+        layout.addLayout(form_layout)
+
+        # ダイアログボタン
+        dialog_buttons = QHBoxLayout()
+        dialog_buttons.setSpacing(10)
+
+        self.run_button = QPushButton(AppLabels.RETRANSCRIBE_BUTTON)
+        self.run_button.clicked.connect(self.accept)
+
+        self.cancel_button = QPushButton(AppLabels.CANCEL_BUTTON)
+        self.cancel_button.setProperty("class", "secondary")
+        self.cancel_button.clicked.connect(self.reject)
+
+        dialog_buttons.addWidget(self.cancel_button)
+        dialog_buttons.addWidget(self.run_button)
+        layout.addLayout(dialog_buttons)
+
+        self.setLayout(layout)
+        self.update_run_button()
+
+    @staticmethod
+    def _format_take(take):
+        """録音リストに表示するラベルを作成する"""
+        timestamp = datetime.fromtimestamp(take["created_at"]).strftime("%H:%M:%S")
+        preview = " ".join((take.get("text") or "").split())
+        return AppLabels.RETRANSCRIBE_TAKE_FORMAT.format(timestamp, take["duration"], preview)
+
+    def update_run_button(self, *args):
+        """
+        録音とモデルが選択されている場合のみ実行ボタンを有効にする
+        """
+        self.run_button.setEnabled(self.take_list.count() > 0 and bool(self.get_models()))
+
+    def get_take_id(self):
+        """
+        選択された録音のIDを取得する
+
+        Returns
+        -------
+        int or None
+            録音のID
+        """
+        item = self.take_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else None
+
+    def get_models(self):
+        """
+        チェックされたモデルを取得する
+
+        Returns
+        -------
+        list
+            (モデルID, 表示名) のリスト
+        """
+        models = []
+        for i in range(self.model_list.count()):
+            item = self.model_list.item(i)
+            if item.checkState() == Qt.CheckState.Checked:
+                models.append((item.data(Qt.ItemDataRole.UserRole), item.text()))
+        return models
+
+    def get_language(self):
+        """
+        選択された言語コードを取得する
+
+        Returns
+        -------
+        str
+            言語コード（空文字列は自動検出）
+        """
+        return self.language_combo.currentData()
+
+    def get_vocabulary(self):
+        """
+        入力されたカスタム語彙を取得する
+
+        Returns
+        -------
+        list
+            カンマ区切りで入力された語彙のリスト
+        """
+        return [term.strip() for term in self.vocabulary_input.text().split(",") if term.strip()]
@@ -4,4 +4,7 @@
 アプリケーションで使用される各種カスタムウィジェットが含まれます。
 """
 
-from src.gui.components.widgets.status_indicator import StatusIndicatorWindow 
\ No newline at end of file
+from src.gui.components.widgets.status_indicator import StatusIndicatorWindow
+from src.gui.components.widgets.history_panel import HistoryPanel, HistoryListModel
+from src.gui.components.widgets.waterfall_view import WaterfallView
+from src.gui.components.widgets.level_meter import LevelMeter
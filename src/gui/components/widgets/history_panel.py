@@ -0,0 +1,347 @@
+"""
+文字起こし履歴パネルモジュール
+
+大量の文字起こし履歴を、表示に必要な分だけページ単位で読み込んで一覧表示するパネルを提供します
+"""
+
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QLineEdit, QTableView, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import (
+    Qt, QTimer, QAbstractListModel, QModelIndex, QDateTime, pyqtSignal
+)
+
+from src.gui.resources.config import AppConfig
+from src.gui.resources.labels import AppLabels
+from src.gui.resources.styles import AppStyles
+
+
+class HistoryListModel(QAbstractListModel):
+    """
+    文字起こし履歴の仮想化リストモデル
+
+    行数には検索条件に一致する全件数を返し、行データはビューが要求した
+    ページだけを履歴ストアから取得します。取得したページは件数を制限した
+    LRUキャッシュに保持するため、履歴の件数に関わらずメモリ使用量は一定です。
+    各行は ID と一覧表示用のラベル（本文の先頭のみ）を保持し、本文全体は選択時に取得します。
+
+    一致件数の計数は件数に比例して時間がかかるため、検索条件の変更時は先頭ページだけを
+    GUIスレッドで読み込んで表示し、全件数は別スレッドで数えてから行を追加します。
+    """
+
+    # 別スレッドで数えた一致件数を (検索の世代, 件数) として通知するシグナル
+    count_ready = pyqtSignal(int, int)
+
+    # 行データのインデックス
+    _ID = 0
+    _LABEL = 1
+
+    def __init__(self, history, page_size=200, preview_chars=120, max_cached_pages=8, parent=None):
+        """
+        HistoryListModelの初期化
+
+        Parameters
+        ----------
+        history : TranscriptionHistory
+            履歴ストア
+        page_size : int
+            1回の読み込みで取得する行数
+        preview_chars : int
+            一覧に表示する本文の最大文字数
+        max_cached_pages : int
+            メモリに保持するページ数の上限
+        parent : QObject, optional
+            親オブジェクト
+        """
+        super().__init__(parent)
+        self.history = history
+        self.page_size = page_size
+        self.preview_chars = preview_chars
+        self.max_cached_pages = max(2, max_cached_pages)
+        self.query = ""
+
+        self._count = 0
+        # 検索条件を変更するたびに増やし、古い検索の件数を無視するために使う
+        self._generation = 0
+        # ページ番号 -> [(id, 表示ラベル), ...]（最近使用した順）
+        self._pages = OrderedDict()
+        self.count_ready.connect(self._apply_count)
+
+    def rowCount(self, parent=QModelIndex()):
+        """検索条件に一致する行数を返す"""
+        if parent.isValid():
+            return 0
+        return self._count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """
+        行のデータを返す（必要に応じてページを読み込む）
+
+        Parameters
+        ----------
+        index : QModelIndex
+            取得する行のインデックス
+        role : Qt.ItemDataRole
+            取得するデータの種類
+        """
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole):
+            return None
+
+        row = self._row(index.row())
+        if row is None:
+            return None
+        return row[self._LABEL] if role == Qt.ItemDataRole.DisplayRole else row[self._ID]
+
+    def set_query(self, query):
+        """
+        検索条件を変更し、一覧を読み込み直す
+
+        先頭ページの行だけで表示を更新し、ページが埋まっている場合は残りの件数を
+        別スレッドで数えます（結果は count_ready で通知され、行が追加されます）。
+
+        Parameters
+        ----------
+        query : str
+            検索文字列（空文字列の場合はすべての履歴）
+        """
+        self.beginResetModel()
+        self.query = (query or "").strip()
+        self._generation += 1
+        self._pages.clear()
+        self._count = len(self._page(0))
+        self.endResetModel()
+
+        if self._count < self.page_size:
+            return
+        generation, query = self._generation, self.query
+        threading.Thread(
+            target=lambda: self.count_ready.emit(generation, self.history.count(query)),
+            name="history-count", daemon=True,
+        ).start()
+
+    def refresh(self):
+        """現在の検索条件で一覧を読み込み直す"""
+        self.set_query(self.query)
+
+    def _apply_count(self, generation, count):
+        """
+        別スレッドで数えた一致件数を行数に反映する
+
+        Parameters
+        ----------
+        generation : int
+            件数を数えたときの検索の世代（現在の検索と異なる場合は無視する）
+        count : int
+            検索条件に一致する件数
+        """
+        if generation != self._generation or count == self._count:
+            return
+        if count > self._count:
+            self.beginInsertRows(QModelIndex(), self._count, count - 1)
+            self._count = count
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(QModelIndex(), count, self._count - 1)
+            self._count = count
+            for number in [number for number in self._pages if number * self.page_size >= count]:
+                del self._pages[number]
+            self.endRemoveRows()
+
+    def entry_id(self, row):
+        """
+        行に対応する履歴IDを返す
+
+        Parameters
+        ----------
+        row : int
+            行番号
+
+        Returns
+        -------
+        int or None
+            履歴ID
+        """
+        data = self._row(row)
+        return data[self._ID] if data else None
+
+    def cached_row_count(self):
+        """
+        メモリに保持している行数を返す
+
+        Returns
+        -------
+        int
+            キャッシュ済みページに含まれる行数の合計
+        """
+        return sum(len(rows) for rows in self._pages.values())
+
+    def _row(self, row):
+        """行番号に対応する (id, ラベル) を返す"""
+        if not 0 <= row < self._count:
+            return None
+        page = self._page(row // self.page_size)
+        offset = row % self.page_size
+        return page[offset] if offset < len(page) else None
+
+    def _page(self, number):
+        """
+        ページを返す（キャッシュにない場合は履歴ストアから取得する）
+
+        直前のページがキャッシュにあればその最後のIDを起点にキーセットで取得し、
+        離れた位置へジャンプした場合のみOFFSETで取得します。
+        """
+        page = self._pages.get(number)
+        if page is not None:
+            self._pages.move_to_end(number)
+            return page
+
+        previous = self._pages.get(number - 1)
+        if previous and len(previous) == self.page_size:
+            entries = self.history.search(
+                self.query, limit=self.page_size,
+                before_id=previous[-1][self._ID], preview_chars=self.preview_chars,
+            )
+        else:
+            entries = self.history.search(
+                self.query, limit=self.page_size,
+                offset=number * self.page_size, preview_chars=self.preview_chars,
+            )
+
+        page = [(entry["id"], self._format_label(entry)) for entry in entries]
+        self._pages[number] = page
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    @staticmethod
+    def _format_label(entry):
+        """一覧に表示するラベルを作成する（改行や連続する空白は1つにまとめる）"""
+        timestamp = QDateTime.fromSecsSinceEpoch(int(entry["created_at"])).toString("MM/dd hh:mm")
+        return f"{timestamp}  {' '.join(entry['text'].split())}"
+
+
+class HistoryPanel(QWidget):
+    """
+    文字起こし履歴の検索・一覧パネル
+
+    モデル/ビュー構成で表示中の行だけを読み込み・描画し、検索は入力が止まってから
+    インクリメンタルに実行します。
+    """
+
+    # 履歴が選択されたときに本文全体を通知するシグナル
+    entry_selected = pyqtSignal(str)
+
+    def __init__(self, history, parent=None):
+        """
+        HistoryPanelの初期化
+
+        Parameters
+        ----------
+        history : TranscriptionHistory
+            履歴ストア
+        parent : QWidget, optional
+            親ウィジェット
+        """
+        super().__init__(parent)
+        self.history = history
+        self.setObjectName("historyPanel")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet(AppStyles.HISTORY_PANEL_STYLE)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        # タイトルラベル
+        title_label = QLabel(AppLabels.HISTORY_TITLE)
+        title_label.setStyleSheet(AppStyles.TRANSCRIPTION_TITLE_STYLE)
+        layout.addWidget(title_label)
+
+        # 検索ボックス（入力が止まってから検索する）
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(AppLabels.HISTORY_SEARCH_PLACEHOLDER)
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet(AppStyles.HISTORY_SEARCH_STYLE)
+        layout.addWidget(self.search_input)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(AppConfig.HISTORY_SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        # 短い語の検索は直近の履歴だけが対象になるため、その間は注記を表示する
+        self.search_note = QLabel(
+            AppLabels.HISTORY_SEARCH_LIMITED.format(history.SHORT_QUERY_SCAN_ROWS)
+        )
+        self.search_note.setStyleSheet(AppStyles.HISTORY_SEARCH_NOTE_STYLE)
+        self.search_note.hide()
+        layout.addWidget(self.search_note)
+
+        # 履歴リスト（表示中の行だけを描画する）
+        # 行の高さを固定したテーブルビューは行数に関係なく一定時間でレイアウトできる
+        self.model = HistoryListModel(
+            history,
+            page_size=AppConfig.HISTORY_PAGE_SIZE,
+            preview_chars=AppConfig.HISTORY_PREVIEW_CHARS,
+            parent=self,
+        )
+        self.list_view = QTableView()
+        self.list_view.setModel(self.model)
+        self.list_view.setShowGrid(False)
+        self.list_view.setWordWrap(False)
+        self.list_view.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.list_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.horizontalHeader().hide()
+        self.list_view.horizontalHeader().setStretchLastSection(True)
+        self.list_view.verticalHeader().hide()
+        self.list_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.list_view.verticalHeader().setDefaultSectionSize(AppConfig.HISTORY_ROW_HEIGHT)
+        self.list_view.setStyleSheet(AppStyles.HISTORY_LIST_STYLE)
+        self.list_view.clicked.connect(self.on_item_clicked)
+        layout.addWidget(self.list_view)
+
+        self.model.set_query("")
+
+    def apply_filter(self):
+        """検索ボックスの内容で一覧を絞り込む"""
+        self.model.set_query(self.search_input.text())
+        self.update_search_note()
+
+    def refresh(self):
+        """
+        一覧を読み込み直す
+
+        新しい履歴が追加されたときに呼び出します。
+        """
+        self.model.refresh()
+        self.update_search_note()
+
+    def update_search_note(self):
+        """検索が直近の履歴に限られる場合に注記を表示する"""
+        self.search_note.setVisible(self.history.is_search_limited(self.model.query))
+
+    def schedule_refresh(self):
+        """入力中の検索と同じ遅延で一覧を読み込み直す"""
+        self.search_timer.start()
+
+    def on_item_clicked(self, index):
+        """
+        履歴の項目がクリックされたときの処理
+
+        Parameters
+        ----------
+        index : QModelIndex
+            クリックされた項目のインデックス
+        """
+        entry_id = self.model.entry_id(index.row())
+        if entry_id is None:
+            return
+        entry = self.history.get(entry_id)
+        if entry:
+            self.entry_selected.emit(entry["text"])
@@ -0,0 +1,145 @@
+"""
+入力レベルメーターモジュール
+
+録音中の入力レベルを、直近のブロックのピークの波形と現在の RMS のバーで表示する
+ウィジェットを提供します
+"""
+
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import QTimer, QRectF
+from PyQt6.QtGui import QPainter, QColor
+
+from src.gui.resources.config import AppConfig
+from src.gui.resources.styles import AppStyles
+
+class LevelMeter(QWidget):
+    """
+    入力レベルメーター
+
+    表示している間だけ一定のフレームレートでレベルを取得して再描画します。
+    1フレームの取得と描画の時間が AppConfig.LEVEL_METER_BUDGET_MS を超える場合は
+    フレームレートを下げます（AppConfig.LEVEL_METER_MIN_FPS まで）。
+    非表示の間はタイマーを止め、レベルの計算も止めます。
+    """
+
+    BAR_WIDTH = 2
+    BAR_GAP = 1
+    VU_HEIGHT = 3
+
+    def __init__(self, parent=None, source=None, on_active=None):
+        """
+        LevelMeterの初期化
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            親ウィジェット
+        source : Callable[[int], tuple], optional
+            直近 n ブロック分の (RMS, ピーク) を返す関数
+        on_active : Callable[[bool], None], optional
+            表示・非表示のたびに呼ばれる関数（レベルの計算を切り替えるため）
+        """
+        super().__init__(parent)
+        self.source = source
+        self.on_active = on_active
+        self.rms = np.zeros(0, dtype=np.float32)
+        self.peak = np.zeros(0, dtype=np.float32)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setFixedHeight(AppConfig.LEVEL_METER_HEIGHT)
+
+        self.frame_interval = 1000 // AppConfig.LEVEL_METER_FPS
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.frame_interval)
+        self.timer.timeout.connect(self.refresh)
+        self._paint_ms = 0.0
+
+    def set_source(self, source, on_active=None):
+        """
+        レベルの取得元を設定する
+
+        Parameters
+        ----------
+        source : Callable[[int], tuple]
+            直近 n ブロック分の (RMS, ピーク) を返す関数
+        on_active : Callable[[bool], None], optional
+            表示・非表示のたびに呼ばれる関数
+        """
+        self.source = source
+        self.on_active = on_active
+        if self.isVisible() and on_active is not None:
+            on_active(True)
+
+    def bar_count(self):
+        """波形の棒の数"""
+        return max(1, self.width() // (self.BAR_WIDTH + self.BAR_GAP))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.rms = self.peak = np.zeros(0, dtype=np.float32)
+        if self.on_active is not None:
+            self.on_active(True)
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        if self.on_active is not None:
+            self.on_active(False)
+
+    def refresh(self):
+        """
+        レベルを取得して再描画する（タイマーから呼ばれる）
+        """
+        if self.source is None:
+            return
+        started = time.perf_counter()
+        self.rms, self.peak = self.source(self.bar_count())
+        fetch_ms = (time.perf_counter() - started) * 1000
+        self.update()
+
+        # 前回の描画と今回の取得の時間が予算を超える場合はフレームレートを下げ、
+        # 予算の半分を下回る場合は元のフレームレートに向けて戻す
+        cost = fetch_ms + self._paint_ms
+        slowest = 1000 // AppConfig.LEVEL_METER_MIN_FPS
+        fastest = 1000 // AppConfig.LEVEL_METER_FPS
+        if cost > AppConfig.LEVEL_METER_BUDGET_MS and self.frame_interval < slowest:
+            self.frame_interval = min(slowest, self.frame_interval * 2)
+            self.timer.setInterval(self.frame_interval)
+        elif cost < AppConfig.LEVEL_METER_BUDGET_MS / 2 and self.frame_interval > fastest:
+            self.frame_interval = max(fastest, self.frame_interval // 2)
+            self.timer.setInterval(self.frame_interval)
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        painter = QPainter(self)
+        height = self.height() - self.VU_HEIGHT - 2
+        middle = height / 2
+
+        # 無音に近い場合は薄い色で描画する（マイクのミュートに気付けるように）
+        silent = not len(self.peak) or float(self.peak.max()) < AppConfig.LEVEL_METER_SILENT_PEAK
+        color = QColor(AppStyles.LEVEL_METER_SILENT_COLOR if silent else AppStyles.LEVEL_METER_COLOR)
+
+        # 直近のブロックのピークの波形（右端が最新、デシベルで目盛る）
+        step = self.BAR_WIDTH + self.BAR_GAP
+        x = self.width() - len(self.peak) * step
+        for value in self._scale(self.peak):
+            half = max(0.5, value * middle)
+            painter.fillRect(QRectF(x, middle - half, self.BAR_WIDTH, half * 2), color)
+            x += step
+
+        # 現在の RMS のバー
+        if len(self.rms):
+            level = self._scale(self.rms[-1:])[0]
+            painter.fillRect(QRectF(0, self.height() - self.VU_HEIGHT, self.width() * level, self.VU_HEIGHT), color)
+        painter.end()
+        self._paint_ms = (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _scale(values):
+        """フルスケールに対する値を、LEVEL_METER_FLOOR_DB を 0、0 dBFS を 1 とする表示の高さに変換する"""
+        floor = AppConfig.LEVEL_METER_FLOOR_DB
+        db = 20 * np.log10(np.maximum(values, 10 ** (floor / 20)))
+        return np.clip((db - floor) / -floor, 0.0, 1.0)
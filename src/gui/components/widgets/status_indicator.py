@@ -12,6 +12,7 @@ from PyQt6.QtCore import Qt, QTimer
 
 from src.gui.resources.labels import AppLabels
 from src.gui.resources.styles import AppStyles
+from src.gui.components.widgets.level_meter import LevelMeter
 
 class StatusIndicatorWindow(QWidget):
     """
@@ -26,6 +27,12 @@ class StatusIndicatorWindow(QWidget):
     MODE_TRANSCRIBING = 1
     MODE_TRANSCRIBED = 2
     
+    # 警告を表示する場合に加える高さ
+    WARNING_HEIGHT = 24
+    
+    # 録音モードの高さ（入力レベルメーターを含む）
+    RECORDING_HEIGHT = 116
+    
     def __init__(self, parent=None):
         """
         StatusIndicatorWindowの初期化
@@ -66,6 +73,19 @@ class StatusIndicatorWindow(QWidget):
         self.timer_label.setObjectName("timerLabel")
         layout.addWidget(self.timer_label)
         
+        # 入力レベルメーター（録音モードのみ表示し、非表示の間はレベルを計算しない）
+        self.level_meter = LevelMeter()
+        self.level_meter.hide()
+        layout.addWidget(self.level_meter)
+        
+        # 警告表示ラベル（音声の欠落など、次の録音開始まで表示）
+        self.warning_label = QLabel()
+        self.warning_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.warning_label.setObjectName("warningLabel")
+        self.warning_label.setWordWrap(True)
+        self.warning_label.hide()
+        layout.addWidget(self.warning_label)
+        
         main_layout.addWidget(self.frame)
         
         # 文字起こし完了時の自動非表示タイマー
@@ -101,27 +121,31 @@ class StatusIndicatorWindow(QWidget):
         
         if mode == self.MODE_RECORDING:
             self.status_label.setText(AppLabels.INDICATOR_RECORDING)
-            self.setFixedSize(150, 90)
+            self.warning_label.hide()
+            self._set_height(self.RECORDING_HEIGHT)
             self.timer_label.setText("00:00")
             self.timer_label.show()
+            self.level_meter.show()
             
             # 録音中のスタイル - 赤系のグラデーション
             self.frame.setStyleSheet(AppStyles.RECORDING_INDICATOR_FRAME_STYLE)
         
         elif mode == self.MODE_TRANSCRIBING:
             self.status_label.setText(AppLabels.INDICATOR_TRANSCRIBING)
-            self.setFixedSize(150, 70)
+            self._set_height(70)
             self.timer_label.setText("")
             self.timer_label.hide()
+            self.level_meter.hide()
             
             # 文字起こし中のスタイル - グレー系のグラデーション
             self.frame.setStyleSheet(AppStyles.TRANSCRIBING_INDICATOR_FRAME_STYLE)
         
         elif mode == self.MODE_TRANSCRIBED:
             self.status_label.setText(AppLabels.INDICATOR_TRANSCRIBED)
-            self.setFixedSize(150, 70)
+            self._set_height(70)
             self.timer_label.setText("")
             self.timer_label.hide()
+            self.level_meter.hide()
             
             # 文字起こし完了のスタイル - 青系のグラデーション
             self.frame.setStyleSheet(AppStyles.TRANSCRIBED_INDICATOR_FRAME_STYLE)
@@ -129,6 +153,39 @@ class StatusIndicatorWindow(QWidget):
             # 3秒後に非表示
             self.auto_hide_timer.start(3000)
     
+    def set_warning(self, text):
+        """
+        警告を表示する（次に録音モードにするまで表示し続ける）
+        
+        Parameters
+        ----------
+        text : str
+            表示する警告
+        """
+        if not self.warning_label.isVisibleTo(self):
+            self.setFixedSize(150, self.height() + self.WARNING_HEIGHT)
+        self.warning_label.setText(text)
+        self.warning_label.show()
+    
+    def set_level_source(self, source, on_active=None):
+        """
+        入力レベルメーターのレベルの取得元を設定する
+        
+        Parameters
+        ----------
+        source : Callable[[int], tuple]
+            直近 n ブロック分の (RMS, ピーク) を返す関数
+        on_active : Callable[[bool], None], optional
+            メーターの表示・非表示のたびに呼ばれる関数
+        """
+        self.level_meter.set_source(source, on_active)
+    
+    def _set_height(self, height):
+        """警告の表示分を加えた高さに設定する"""
+        if self.warning_label.isVisibleTo(self):
+            height += self.WARNING_HEIGHT
+        self.setFixedSize(150, height)
+    
     def position_window(self):
         """
         ウィンドウを画面の右下に配置
@@ -0,0 +1,84 @@
+"""
+ウォーターフォール表示モジュール
+
+1回の録音の各段階（スパン）の開始時刻と所要時間を横棒で並べて表示するウィジェットを提供します
+"""
+
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter, QColor
+
+from src.gui.resources.labels import AppLabels
+from src.gui.resources.styles import AppStyles
+
+class WaterfallView(QWidget):
+    """
+    スパンのウォーターフォール表示
+
+    左にスパン名、右に開始時刻の位置から所要時間の長さの横棒と時間（ミリ秒）を描画します。
+    """
+
+    ROW_HEIGHT = 20
+    NAME_WIDTH = 200
+    VALUE_WIDTH = 80
+
+    def __init__(self, parent=None):
+        """
+        WaterfallViewの初期化
+
+        Parameters
+        ----------
+        parent : QWidget, optional
+            親ウィジェット
+        """
+        super().__init__(parent)
+        self.spans = []
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setMinimumHeight(self.ROW_HEIGHT)
+
+    def set_spans(self, spans):
+        """
+        表示するスパンを設定する
+
+        Parameters
+        ----------
+        spans : list of dict
+            TakeTrace.to_dict の spans（name, start_ms, duration_ms）
+        """
+        self.spans = list(spans or [])
+        self.setFixedHeight(max(1, len(self.spans)) * self.ROW_HEIGHT)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        text_color = QColor(AppStyles.WATERFALL_TEXT_COLOR)
+
+        if not self.spans:
+            painter.setPen(text_color)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, AppLabels.PERFORMANCE_NO_TAKES)
+            return
+
+        # 最初のスパンの開始から最後のスパンの終了までを横幅に合わせる
+        origin = min(span["start_ms"] for span in self.spans)
+        end = max(span["start_ms"] + span["duration_ms"] for span in self.spans)
+        total = max(end - origin, 1e-3)
+        chart_width = max(1, self.width() - self.NAME_WIDTH - self.VALUE_WIDTH)
+
+        for row, span in enumerate(self.spans):
+            top = row * self.ROW_HEIGHT
+            painter.setPen(text_color)
+            painter.drawText(
+                QRectF(0, top, self.NAME_WIDTH - 8, self.ROW_HEIGHT),
+                Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, span["name"],
+            )
+
+            x = self.NAME_WIDTH + (span["start_ms"] - origin) / total * chart_width
+            width = max(1.0, span["duration_ms"] / total * chart_width)
+            painter.fillRect(
+                QRectF(x, top + 4, width, self.ROW_HEIGHT - 8), QColor(AppStyles.WATERFALL_BAR_COLOR)
+            )
+            painter.drawText(
+                QRectF(self.NAME_WIDTH + chart_width + 8, top, self.VALUE_WIDTH - 8, self.ROW_HEIGHT),
+                Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, f"{span['duration_ms']:.1f} ms",
+            )
@@ -14,7 +14,7 @@ def main():
     アプリケーションのエントリーポイント
     
     アプリケーションの初期化、設定、メインウィンドウの表示を行います。
-    コマンドライン引数に応じて、最小化状態で起動することも可能です。
+    コマンドライン引数に応じて、最小化状態で起動することや、メトリクスを公開することも可能です。
     
     Returns
     -------
@@ -58,6 +58,14 @@ def main():
         )
         window.settings.setValue("first_run_done", True)
     
+    # --metrics-port <ポート> の指定があればメトリクスを公開する（設定より優先）
+    if '--metrics-port' in sys.argv:
+        index = sys.argv.index('--metrics-port')
+        try:
+            window.start_metrics_export(int(sys.argv[index + 1]))
+        except (IndexError, ValueError):
+            print("Invalid --metrics-port value; expected a port number")
+    
     # ウィンドウを表示（デフォルトではトレイに最小化して起動）
     if '--minimized' in sys.argv or '-m' in sys.argv:
         # トレイに最小化して起動
@@ -21,14 +21,95 @@ class AppConfig:
     
     # 機能設定
     DEFAULT_HOTKEY = "ctrl+shift+r"
+    HOTKEY_DEBOUNCE_MS = 300  # 同じホットキーを再び受け付けるまでの最小間隔
     DEFAULT_AUTO_COPY = True
+    DEFAULT_PUSH_TO_TALK = False
+    PUSH_TO_TALK_PREROLL_MS = 300  # プッシュトゥトークで録音に含めるキーを押す前の音声
+    PUSH_TO_TALK_LATENCY_TARGET_MS = 20  # キーを離してから送信開始までの目標時間
+    DEFAULT_ENABLE_TRACING = True  # 録音ごとの処理時間の計測
+    TRACE_HISTORY_SIZE = 50  # メモリ上に保持する直近の計測結果の数
+    PERFORMANCE_REFRESH_MS = 500  # パフォーマンスダイアログの表示を更新する最小間隔
+    DEFAULT_METRICS_PORT = 0  # メトリクスを公開するローカルホストのポート（0で無効）
+    METRICS_SNAPSHOT_NAME = "metrics.json"  # メトリクスの JSON スナップショット
+    METRICS_SNAPSHOT_INTERVAL_SECONDS = 60
     DEFAULT_ENABLE_SOUND = True
     DEFAULT_SHOW_INDICATOR = True
+    DEFAULT_WARN_DROPPED_AUDIO = True  # 録音中に音声が欠落した場合にインジケータで警告する
+    
+    # インジケータの入力レベルメーター
+    LEVEL_METER_HEIGHT = 22
+    LEVEL_METER_FPS = 30
+    LEVEL_METER_MIN_FPS = 10  # 1フレームの処理が予算を超える場合に下げる下限
+    LEVEL_METER_BUDGET_MS = 2.0  # 1フレームあたりのレベルの取得と描画の時間の予算
+    LEVEL_METER_FLOOR_DB = -60  # 表示の下限（dBFS）
+    LEVEL_METER_SILENT_PEAK = 0.003  # これより小さいピーク（約 -50 dBFS）は無音として薄く表示する
+    
+    # 音声入力設定
+    DEFAULT_INPUT_DEVICE = ""  # 空の場合は既定のデバイス（番号は変わるため名前で保存）
+    DEFAULT_INPUT_BLOCKSIZE = 0  # 0 は PortAudio に任せる
+    DEFAULT_INPUT_LATENCY = ""  # "low"、"high"、空の場合は sounddevice の既定値
+    INPUT_BLOCKSIZE_CHOICES = [0, 128, 256, 512, 1024, 2048]
+    INPUT_PROBE_SECONDS = 0.5  # 自動調整で候補ごとに音声を受け取る時間
+    DEFAULT_NATIVE_RATE = False  # デバイス本来のサンプルレート・チャンネル数で録音し、アプリ内で変換する
+    DEFAULT_CAPTURE_PROCESS = False  # 入力ストリームを子プロセスで開き、共有メモリで音声を受け取る
+    
+    # 録音の自動停止（発話のあとの無音と最大の長さ）
+    DEFAULT_AUTO_STOP = False  # 話し終えて無音が続いたら録音を停止して送信する（プッシュトゥトークでは無効）
+    DEFAULT_AUTO_STOP_SILENCE_SECONDS = 1.5
+    DEFAULT_MAX_TAKE_SECONDS = 600  # 最大の長さに達したら停止して送信する（0で無制限、プッシュトゥトークでも有効）
+    VAD_THRESHOLD_DB = 12.0  # 背景雑音より何 dB 大きければ発話とみなすか
+    VAD_HANGOVER_MS = 300  # 語の間の短い無音を発話に含める長さ
+    
+    # 発話の区切りでの先行文字起こし
+    DEFAULT_SPECULATIVE_UPLOAD = False  # 録音中の無音で、それまでの音声を先に文字起こししておく
+    DEFAULT_SPECULATIVE_PAUSE_SECONDS = 0.7  # 先行文字起こしを始める無音の長さ（的中率を見て調整する）
+    SPECULATIVE_REUSE_PREFIX = True  # 発話が続いた場合に、先行文字起こしを前半の結果として使う
+    
+    # Realtime API（WebSocket）によるリアルタイム文字起こし
+    DEFAULT_REALTIME = False  # 録音中に音声を送信し、停止時は確定した結果を受け取るだけにする
+    REALTIME_API_VERSION = "2025-04-01-preview"
+    REALTIME_CONNECT_TIMEOUT_SECONDS = 3.0
+    REALTIME_FINAL_TIMEOUT_SECONDS = 3.0  # 停止から最終結果までの待ち時間（超えたら一括送信に切り替える）
+    REALTIME_INTERIM_MAX_CHARS = 60  # ステータスバーに表示する途中の結果の長さ
+    
+    # クライアント側のレート制限（deployment のクォータに合わせて送信を待ち合わせる）
+    RATE_LIMIT_REQUESTS_PER_MINUTE = 0  # 1分あたりのリクエスト数（0 で応答の x-ratelimit-* ヘッダーから推定する）
+    RATE_LIMIT_AUDIO_SECONDS_PER_MINUTE = 0  # 1分あたりの音声の秒数（0 でヘッダーから推定する）
+    RATE_LIMIT_BACKGROUND_RESERVE = 0.2  # 再送・先行・再文字起こしが残しておく容量の割合（録音の結果を優先する）
+    RATE_LIMIT_MAX_WAIT_SECONDS = 30.0  # これ以上待つ場合は送信を諦める（スプールに回る）
+    DEFAULT_FALLBACK_DEPLOYMENTS = ""  # クォータで待つ場合に振り替える deployment 名（カンマ区切り）
     DEFAULT_MODEL = "gpt-4o-transcribe"
+    DEFAULT_BACKEND = "azure"  # "azure"、"openai"（OpenAI 互換の API）、"local"（同梱のテスト用サーバー）
     
     # 言語設定
     DEFAULT_LANGUAGE = ""  # 空文字列は自動検出を意味する
     
+    # オフラインスプール設定
+    SPOOL_DIR_NAME = "spool"
+    SPOOL_MAX_ENTRIES = 200
+    SPOOL_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+    SPOOL_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # 7日
+    SPOOL_MAX_CONCURRENCY = 2
+    SPOOL_RETRY_INTERVAL_SECONDS = 30
+    
+    # 文字起こし履歴
+    HISTORY_DB_NAME = "history.sqlite3"
+    HISTORY_PAGE_SIZE = 100  # 履歴一覧で1回に読み込む行数
+    HISTORY_PREVIEW_CHARS = 120  # 履歴一覧に表示する本文の最大文字数
+    HISTORY_ROW_HEIGHT = 30  # 履歴一覧の行の高さ（ピクセル）
+    HISTORY_SEARCH_DELAY_MS = 150  # 入力が止まってから検索するまでの待ち時間
+    
+    # 録音ファイルの保持ポリシー
+    RECORDINGS_DIR_NAME = "recordings"
+    RECORDINGS_MAX_FILES = 100
+    RECORDINGS_MAX_BYTES = 500 * 1024 * 1024  # 500 MB
+    RECORDINGS_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # 7日
+    RECORDINGS_FLAC_AFTER_SECONDS = 60 * 60  # 1時間より古い録音はFLACで保持
+    
+    # 再文字起こし用にメモリ上に保持する直近の録音
+    RECENT_TAKES_MAX_COUNT = 10
+    RECENT_TAKES_MAX_BYTES = 64 * 1024 * 1024  # 64 MB（16kHzモノラルで約35分）
+    
     # サウンドファイルパス
     START_SOUND_PATH = "assets/start_sound.wav"
     STOP_SOUND_PATH = "assets/stop_sound.wav"
@@ -20,6 +20,9 @@ class AppLabels:
     TRANSCRIPTION_TITLE = "文字起こし結果"
     TRANSCRIPTION_PLACEHOLDER = "ここに文字起こしが表示されます..."
     STATUS_READY = "準備完了"
+    HISTORY_TITLE = "履歴"
+    HISTORY_SEARCH_PLACEHOLDER = "履歴を検索..."
+    HISTORY_SEARCH_LIMITED = "3文字未満の語を含むため、直近 {0:,} 件のみを検索しています"
     
     # ツールバーアイテム
     API_KEY_SETTINGS = "APIキー設定"
@@ -28,9 +31,16 @@ class AppLabels:
     COPY_TO_CLIPBOARD = "クリップボードにコピー"
     HOTKEY_SETTINGS = "ホットキー設定"
     AUTO_COPY = "自動コピー"
+    PUSH_TO_TALK = "プッシュトゥトーク"
+    AUTO_STOP = "無音で自動停止"
+    SPECULATIVE_UPLOAD = "先行文字起こし"
+    REALTIME = "リアルタイム文字起こし"
     SOUND_NOTIFICATION = "通知音"
     STATUS_INDICATOR = "状態インジケータ"
     EXIT_APP = "アプリケーション終了"
+    RETRANSCRIBE = "再文字起こし"
+    PERFORMANCE = "パフォーマンス"
+    AUDIO_DEVICE_SETTINGS = "入力デバイス"
     
     # ステータスメッセージ
     STATUS_RECORDING = "録音中..."
@@ -42,6 +52,18 @@ class AppLabels:
     STATUS_HOTKEY_SET = "ホットキーを {0} に設定しました"
     STATUS_AUTO_COPY_ENABLED = "自動コピーを有効にしました"
     STATUS_AUTO_COPY_DISABLED = "自動コピーを無効にしました"
+    STATUS_PUSH_TO_TALK_ENABLED = "プッシュトゥトークを有効にしました（{0} を押している間だけ録音します）"
+    STATUS_PUSH_TO_TALK_DISABLED = "プッシュトゥトークを無効にしました"
+    STATUS_AUTO_STOP_ENABLED = "無音での自動停止を有効にしました（話し終えて {0:g} 秒で録音を停止します）"
+    STATUS_AUTO_STOP_DISABLED = "無音での自動停止を無効にしました"
+    STATUS_SPECULATIVE_ENABLED = "先行文字起こしを有効にしました（{0:g} 秒の無音でそれまでの音声を送信します）"
+    STATUS_SPECULATIVE_DISABLED = "先行文字起こしを無効にしました"
+    STATUS_REALTIME_ENABLED = "リアルタイム文字起こしを有効にしました（録音中に音声を送信します）"
+    STATUS_REALTIME_DISABLED = "リアルタイム文字起こしを無効にしました"
+    STATUS_REALTIME_FALLBACK = "リアルタイム文字起こしに失敗したため、録音をまとめて送信します..."
+    STATUS_AUTO_STOPPED_SILENCE = "無音を検出したため録音を停止しました"
+    STATUS_AUTO_STOPPED_MAX_LENGTH = "録音が最大の長さに達したため停止しました"
+    STATUS_AUDIO_DEVICE_SET = "音声入力を「{0}」に設定しました"
     STATUS_SOUND_ENABLED = "通知音を有効にしました"
     STATUS_SOUND_DISABLED = "通知音を無効にしました"
     STATUS_INDICATOR_SHOWN = "状態インジケータを表示にしました"
@@ -49,6 +71,9 @@ class AppLabels:
     STATUS_VOCABULARY_ADDED = "{0}個の語彙を追加しました"
     STATUS_INSTRUCTIONS_SET = "{0}個のシステム指示を設定しました"
     STATUS_MODEL_CHANGED = "文字起こしモデルを「{0}」に変更しました"
+    STATUS_SPOOL_DELIVERED = "保留中の録音の文字起こしが完了しました"
+    STATUS_RETRANSCRIBING = "再文字起こし中..."
+    STATUS_RETRANSCRIBED = "再文字起こしが完了しました (使用モデル: {0})"
     
     # APIキーダイアログ
     API_KEY_DIALOG_TITLE = "Azure OpenAI 設定"
@@ -56,12 +81,21 @@ class AppLabels:
     API_ENDPOINT_LABEL = "Endpoint:"
     API_VERSION_LABEL = "API Version:"
     API_DEPLOYMENT_LABEL = "Deployment (任意):"
+    API_FALLBACK_DEPLOYMENTS_LABEL = "予備の Deployment (任意):"
+    API_BACKEND_LABEL = "接続先:"
+    BACKEND_AZURE = "Azure OpenAI"
+    BACKEND_OPENAI = "OpenAI 互換 API（自前の Whisper サーバーなど）"
+    BACKEND_LOCAL = "テスト用サーバー（ローカル）"
+    API_BASE_URL_PLACEHOLDER = "http://whisper.lan:8000/v1"
     API_KEY_INFO = (
         "このアプリケーションを使用するには Azure OpenAI の設定が必要です。\n"
         "- APIキー: Azure OpenAI リソースのキー\n"
         "- Endpoint: https://{resource}.openai.azure.com/\n"
         "- API Version: 利用する api-version\n"
-        "- Deployment: 空の場合は、選択したモデルIDを deployment 名として使用します"
+        "- Deployment: 空の場合は、選択したモデルIDを deployment 名として使用します\n"
+        "- 予備の Deployment: クォータで待つ場合に振り替える deployment 名（カンマ区切り）\n"
+        "接続先が OpenAI 互換 API の場合は Endpoint に base URL を入力します（APIキーは任意）。"
+        "テスト用サーバーは設定なしで動作します。"
     )
     SAVE_BUTTON = "保存"
     CANCEL_BUTTON = "キャンセル"
@@ -84,11 +118,63 @@ class AppLabels:
     INSTRUCTIONS_SECTION_TITLE = "システム指示リスト:"
     INSTRUCTIONS_PLACEHOLDER = "新しい指示を入力..."
     
+    # 再文字起こしダイアログ
+    RETRANSCRIBE_DIALOG_TITLE = "直近の録音を再文字起こし"
+    RETRANSCRIBE_TAKES_TITLE = "録音"
+    RETRANSCRIBE_MODELS_TITLE = "モデル（複数選択可）"
+    RETRANSCRIBE_VOCABULARY_LABEL = "語彙:"
+    RETRANSCRIBE_VOCABULARY_PLACEHOLDER = "カンマ区切りで入力..."
+    RETRANSCRIBE_BUTTON = "再文字起こし"
+    RETRANSCRIBE_TAKE_FORMAT = "{0}  {1:.1f}秒  {2}"
+    RETRANSCRIBE_RESULT_HEADER = "【{0}】"
+    RETRANSCRIBE_DEPLOYMENT_FORMAT = "Deployment: {0}"
+    
+    # パフォーマンスダイアログ
+    PERFORMANCE_DIALOG_TITLE = "パフォーマンス"
+    PERFORMANCE_LAST_TAKE_TITLE = "直近の録音"
+    PERFORMANCE_LAST_TAKE_FORMAT = "直近の録音  {0}  {1}  文字起こしまで {2:.0f} ms"
+    PERFORMANCE_NO_TAKES = "まだ録音がありません"
+    PERFORMANCE_AUDIO_FORMAT = (
+        "音声入力: コールバック {0} 回 / オーバーフロー {1} 回 / アンダーフロー {2} 回 / "
+        "ジッター最大 {3:.1f} ms / 処理時間最大 {4:.2f} ms"
+    )
+    PERFORMANCE_MODELS_TITLE = "文字起こしまでの時間（直近{0}件）"
+    PERFORMANCE_MODEL_COLUMNS = ["モデル", "エンドポイント", "件数", "p50 (ms)", "p95 (ms)"]
+    PERFORMANCE_QUEUE_FORMAT = "待ち行列: ホットキー {0} 件 / 再送待ちの録音 {1} 件"
+    PERFORMANCE_ERROR_RATE_FORMAT = "上流のエラー率: {0:.0%}（{2}件中{1}件）"
+    PERFORMANCE_COPY_DIAGNOSTICS = "診断情報をコピー"
+    PERFORMANCE_DIAGNOSTICS_COPIED = "コピーしました"
+    CLOSE_BUTTON = "閉じる"
+    
+    # 音声入力ダイアログ
+    AUDIO_DEVICE_DIALOG_TITLE = "音声入力設定"
+    AUDIO_DEVICE_LABEL = "入力デバイス:"
+    AUDIO_DEVICE_DEFAULT = "既定のデバイス"
+    AUDIO_DEVICE_FORMAT = "{0} ({1})"
+    AUDIO_BLOCKSIZE_LABEL = "ブロックサイズ:"
+    AUDIO_BLOCKSIZE_AUTO = "自動"
+    AUDIO_LATENCY_LABEL = "レイテンシ:"
+    AUDIO_LATENCY_CHOICES = [("既定", ""), ("低 (low)", "low"), ("高 (high)", "high")]
+    AUDIO_NATIVE_RATE = "デバイス本来のサンプルレートで録音し、アプリ内で 16 kHz モノラルに変換する"
+    AUDIO_CAPTURE_PROCESS = "別プロセスで録音する（アプリの負荷による音声の欠落を防ぎます）"
+    AUDIO_AUTO_STOP_SILENCE_LABEL = "自動停止までの無音:"
+    AUDIO_MAX_TAKE_LABEL = "録音の最大の長さ:"
+    AUDIO_MAX_TAKE_UNLIMITED = "無制限"
+    AUDIO_SECONDS_SUFFIX = " 秒"
+    AUDIO_PROBE_TITLE = "自動調整"
+    AUDIO_PROBE_INFO = "「自動調整」を押すと、選択中のデバイスでブロックサイズとレイテンシの組み合わせを計測し、最も良い設定を選びます。"
+    AUDIO_PROBE_BUTTON = "自動調整"
+    AUDIO_PROBE_RUNNING = "計測中..."
+    AUDIO_PROBE_FAILED = "開けません"
+    AUDIO_PROBE_NO_RESULT = "どの設定でも入力ストリームを開けませんでした"
+    AUDIO_PROBE_BEST = "ブロックサイズ {0} / レイテンシ {1} を選びました（開く時間 {2:.0f} ms、ジッター p95 {3:.1f} ms）"
+    AUDIO_PROBE_COLUMNS = ["ブロックサイズ", "レイテンシ", "開く時間 (ms)", "入力レイテンシ (ms)", "ジッター p95 (ms)", "欠落"]
+    
     # グローバルホットキーダイアログ
     HOTKEY_DIALOG_TITLE = "グローバルホットキー設定"
     HOTKEY_LABEL = "ホットキー:"
     HOTKEY_PLACEHOLDER = "例: ctrl+shift+r"
-    HOTKEY_INFO = "録音を開始/停止するグローバルホットキーを設定します。例: ctrl+shift+r, alt+w など"
+    HOTKEY_INFO = "録音を開始/停止するグローバルホットキーを設定します。例: ctrl+shift+r、alt+w など"
     
     # ホットキー情報ダイアログ
     HOTKEY_INFO_TITLE = "ホットキー情報"
@@ -100,11 +186,15 @@ class AppLabels:
     INDICATOR_RECORDING = "録音中"
     INDICATOR_TRANSCRIBING = "文字起こし中"
     INDICATOR_TRANSCRIBED = "文字起こし完了"
+    INDICATOR_AUDIO_DROPPED = "音声が欠落しました（{0}回）"
     
     # システムトレイメニュー
     TRAY_SHOW = "表示"
     TRAY_RECORD = "録音開始/停止"
     TRAY_EXIT = "終了"
+    TRAY_RETRANSCRIBE = "直近の録音を再文字起こし"
+    TRAY_PERFORMANCE = "パフォーマンス"
+    TRAY_SPOOL_DELIVERED_TITLE = "保留中の文字起こしが完了しました"
     
     # エラーメッセージ
     ERROR_TITLE = "エラー"
@@ -112,6 +202,12 @@ class AppLabels:
     ERROR_SYSTEM_TRAY = "システムトレイがサポートされていません。"
     ERROR_HOTKEY = "ホットキー設定エラー: {0}"
     ERROR_TRANSCRIPTION = "文字起こしエラー: {0}"
+    ERROR_TRANSCRIPTION_SPOOLED = (
+        "文字起こしエラー: {0}\n"
+        "録音は保存されました。接続が回復すると自動的に再送されます。"
+    )
+    ERROR_NO_RECENT_TAKES = "再文字起こしできる録音がありません"
+    ERROR_AUDIO_STREAM = "入力ストリームを開けませんでした。録音のたびに入力デバイスを開きます。"
     ERROR_API_KEY_MISSING = (
         "Azure OpenAI の設定が必要です。\n"
         "APIキーと Endpoint を入力するか、AZURE_OPENAI_API_KEY / AZURE_OPENAI_ENDPOINT 環境変数を設定してください。"
@@ -169,6 +169,70 @@ class AppStyles:
         }
     """
 
+    # 再文字起こしダイアログのスタイル（カスタム語彙ダイアログのスタイルにコンボボックスを追加）
+    RETRANSCRIBE_DIALOG_STYLE = VOCABULARY_DIALOG_STYLE + """
+        QComboBox {
+            border: 1px solid #E2E6EC;
+            border-radius: 4px;
+            padding: 6px 12px;
+            background-color: white;
+            font-size: 13px;
+            min-height: 20px;
+        }
+        
+        QComboBox:focus {
+            border-color: #5B7FDE;
+        }
+    """
+
+    # パフォーマンスダイアログのスタイル（カスタム語彙ダイアログのスタイルに表を追加）
+    PERFORMANCE_DIALOG_STYLE = VOCABULARY_DIALOG_STYLE + """
+        QTableWidget {
+            border: 1px solid #E2E6EC;
+            border-radius: 4px;
+            background-color: white;
+            gridline-color: #F2F4F8;
+            font-size: 13px;
+        }
+        
+        QHeaderView::section {
+            background-color: #F2F4F8;
+            color: #324275;
+            border: none;
+            padding: 6px;
+            font-weight: bold;
+        }
+    """
+    
+    # 音声入力ダイアログのスタイル（パフォーマンスダイアログのスタイルにコンボボックスを追加）
+    AUDIO_DEVICE_DIALOG_STYLE = PERFORMANCE_DIALOG_STYLE + """
+        QComboBox {
+            border: 1px solid #E2E6EC;
+            border-radius: 4px;
+            padding: 6px 12px;
+            background-color: white;
+            font-size: 13px;
+            min-height: 20px;
+        }
+        
+        QComboBox:focus {
+            border-color: #5B7FDE;
+        }
+        
+        QLabel.info {
+            color: #555555;
+            padding-bottom: 10px;
+        }
+    """
+    
+    # ウォーターフォール表示の色
+    WATERFALL_BAR_COLOR = "#5B7FDE"
+    WATERFALL_TEXT_COLOR = "#333333"
+    
+    # インジケータの入力レベルメーターの色
+    LEVEL_METER_COLOR = "#FFFFFF"
+    LEVEL_METER_SILENT_COLOR = "#66FFFFFF"
+
     # システム指示ダイアログのスタイル
     SYSTEM_INSTRUCTIONS_DIALOG_STYLE = """
         QDialog {
@@ -295,6 +359,14 @@ class AppStyles:
             font-weight: 500;
             padding: 2px;
         }
+        
+        #warningLabel {
+            color: #FFE08A;
+            font-size: 11px;
+            font-family: "Segoe UI", Arial, sans-serif;
+            font-weight: bold;
+            padding: 0 2px;
+        }
     """
 
     # 録音モードのインジケーターフレームスタイル
@@ -618,6 +690,46 @@ class AppStyles:
         line-height: 1.5;
     """
 
+    # 履歴パネルのスタイル
+    HISTORY_PANEL_STYLE = """
+        #historyPanel {
+            background-color: white;
+            border-radius: 8px;
+            border: 1px solid #E2E6EC;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
+        }
+    """
+
+    # 履歴検索ボックスのスタイル
+    HISTORY_SEARCH_STYLE = """
+        border: 1px solid #D0D7E2;
+        border-radius: 4px;
+        padding: 6px 8px;
+        font-size: 13px;
+    """
+
+    # 履歴検索の注記のスタイル
+    HISTORY_SEARCH_NOTE_STYLE = "color: #888888; font-size: 12px;"
+
+    # 履歴リストのスタイル
+    HISTORY_LIST_STYLE = """
+        QTableView {
+            border: none;
+            background-color: white;
+            font-size: 13px;
+        }
+
+        QTableView::item {
+            padding: 0px 4px;
+            border-bottom: 1px solid #F0F2F5;
+        }
+
+        QTableView::item:selected {
+            background-color: #EBF0FF;
+            color: #324275;
+        }
+    """
+
     # ステータスバーのスタイル
     STATUS_BAR_STYLE = """
         color: #555555;
@@ -4,4 +4,4 @@
 アプリケーションで使用される各種ヘルパー関数を提供します。
 """
 
-from src.gui.utils.resource_helper import getResourcePath 
\ No newline at end of file
+from src.gui.utils.resource_helper import getResourcePath, getAppDataPath 
\ No newline at end of file
@@ -2,6 +2,10 @@ import os
 import sys
 from pathlib import Path
 
+from PyQt6.QtCore import QStandardPaths
+
+from src.gui.resources.config import AppConfig
+
 def getResourcePath(relative_path):
     """
     PyInstallerでバンドルされている場合や通常実行時のリソースパスを解決する
@@ -35,4 +39,25 @@ def getResourcePath(relative_path):
         return os.path.join(base_path, relative_path)
     except Exception as e:
         print(f"Resource path resolution error: {e}")
-        return relative_path 
\ No newline at end of file
+        return relative_path
+
+
+def getAppDataPath(relative_path=""):
+    """
+    ユーザーごとのアプリケーションデータ保存先のパスを解決する
+    
+    Parameters
+    ----------
+    relative_path : str, optional
+        データディレクトリからの相対パス
+        
+    Returns
+    -------
+    str
+        解決された絶対パス
+    """
+    base_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    if not base_path:
+        base_path = os.path.join(str(Path.home()), ".local", "share")
+    
+    return os.path.join(base_path, AppConfig.APP_NAME, relative_path)
@@ -2,7 +2,9 @@ import os
 import sys
 import threading
 import time
+from collections import deque
 
+import soundfile as sf
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QLabel, QComboBox, QFileDialog,
@@ -15,8 +17,20 @@ from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 
 from src.core.audio_recorder import AudioRecorder
+from src.core.recording_store import RecordingStore
+from src.core.recent_takes import RecentTakes
 from src.core.whisper_api import WhisperTranscriber
 from src.core.hotkeys import HotkeyManager
+from src.core.transcription_spool import TranscriptionSpool
+from src.core.history_store import TranscriptionHistory
+from src.core import tracing
+from src.core.tracing import NULL_TRACE, Tracer
+from src.core.metrics import AppMetrics, MetricsExporter
+from src.core.audio_devices import list_input_devices, find_input_device
+from src.core.vad import EnergyVAD, Endpointer, ENDPOINT_MAX_LENGTH, ENDPOINT_PAUSE
+from src.core.speculation import SpeculativeUpload, join_transcripts
+from src.core.rate_limiter import RateLimiter, PRIORITY_BACKGROUND
+from src.core.backends import BACKEND_AZURE
 from src.gui.resources.config import AppConfig
 from src.gui.resources.labels import AppLabels
 from src.gui.resources.styles import AppStyles
@@ -24,8 +38,12 @@ from src.gui.components.dialogs.api_key_dialog import APIKeyDialog
 from src.gui.components.dialogs.vocabulary_dialog import VocabularyDialog
 from src.gui.components.dialogs.system_instructions_dialog import SystemInstructionsDialog
 from src.gui.components.dialogs.hotkey_dialog import HotkeyDialog
+from src.gui.components.dialogs.retranscribe_dialog import RetranscribeDialog
+from src.gui.components.dialogs.performance_dialog import PerformanceDialog
+from src.gui.components.dialogs.audio_device_dialog import AudioDeviceDialog
 from src.gui.components.widgets.status_indicator import StatusIndicatorWindow
-from src.gui.utils.resource_helper import getResourcePath
+from src.gui.components.widgets.history_panel import HistoryPanel
+from src.gui.utils.resource_helper import getResourcePath, getAppDataPath
 
 class MainWindow(QMainWindow):
     """
@@ -36,8 +54,15 @@ class MainWindow(QMainWindow):
     """
     
     # カスタムシグナルの定義
-    transcription_complete = pyqtSignal(str)
+    transcription_complete = pyqtSignal(str, object)
     recording_status_changed = pyqtSignal(bool)
+    spool_transcription_complete = pyqtSignal(str)
+    retranscription_complete = pyqtSignal(str, str)
+    hotkey_triggered = pyqtSignal()
+    endpoint_detected = pyqtSignal(str)
+    realtime_interim = pyqtSignal(str)
+    models_loaded = pyqtSignal(object)
+    warm_stream_ready = pyqtSignal(bool)
     
     def __init__(self):
         super().__init__()
@@ -48,13 +73,66 @@ class MainWindow(QMainWindow):
         self.azure_endpoint = self.settings.value("azure_endpoint", AppConfig.DEFAULT_AZURE_OPENAI_ENDPOINT)
         self.azure_api_version = self.settings.value("azure_api_version", AppConfig.DEFAULT_AZURE_OPENAI_API_VERSION)
         self.azure_deployment = self.settings.value("azure_deployment", AppConfig.DEFAULT_AZURE_OPENAI_DEPLOYMENT)
+        self.backend = self.settings.value("backend", AppConfig.DEFAULT_BACKEND)
+        self.fallback_deployments = self.settings.value(
+            "fallback_deployments", AppConfig.DEFAULT_FALLBACK_DEPLOYMENTS
+        )
         
         # ホットキーとクリップボード設定
         self.hotkey = self.settings.value("hotkey", AppConfig.DEFAULT_HOTKEY)
         self.auto_copy = self.settings.value("auto_copy", AppConfig.DEFAULT_AUTO_COPY, type=bool)
+        self.push_to_talk = self.settings.value("push_to_talk", AppConfig.DEFAULT_PUSH_TO_TALK, type=bool)
+        
+        # 録音の自動停止（話し終えたあとの無音と最大の長さ）
+        self.auto_stop = self.settings.value("auto_stop", AppConfig.DEFAULT_AUTO_STOP, type=bool)
+        self.auto_stop_silence = self.settings.value(
+            "auto_stop_silence_seconds", AppConfig.DEFAULT_AUTO_STOP_SILENCE_SECONDS, type=float
+        )
+        self.max_take_seconds = self.settings.value("max_take_seconds", AppConfig.DEFAULT_MAX_TAKE_SECONDS, type=int)
+        
+        # 発話の区切りでの先行文字起こし
+        self.speculative_upload = self.settings.value(
+            "speculative_upload", AppConfig.DEFAULT_SPECULATIVE_UPLOAD, type=bool
+        )
+        self.speculative_pause = self.settings.value(
+            "speculative_pause_seconds", AppConfig.DEFAULT_SPECULATIVE_PAUSE_SECONDS, type=float
+        )
+        
+        # Realtime API によるリアルタイム文字起こし（録音中のセッションは realtime_session）
+        self.realtime = self.settings.value("realtime", AppConfig.DEFAULT_REALTIME, type=bool)
+        self.realtime_session = None
+        
+        # プッシュトゥトークでキーを離してから送信開始までの時間（ミリ秒、直近のみ保持）
+        self.push_to_talk_latencies = deque(maxlen=100)
+        
+        # 録音ごとの処理時間の計測（録音中のトレースは current_trace）
+        self.tracer = Tracer(
+            enabled=self.settings.value("enable_tracing", AppConfig.DEFAULT_ENABLE_TRACING, type=bool),
+            capacity=AppConfig.TRACE_HISTORY_SIZE,
+        )
+        self.current_trace = NULL_TRACE
+        
+        # 件数・所要時間のメトリクス（公開は start_metrics_export で開始する）
+        self.metrics = AppMetrics()
+        self.metrics_exporter = None
+        
+        # deployment のクォータに合わせた送信の待ち合わせ（トランスクライバーを作り直しても引き継ぐ）
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=AppConfig.RATE_LIMIT_REQUESTS_PER_MINUTE,
+            audio_seconds_per_minute=AppConfig.RATE_LIMIT_AUDIO_SECONDS_PER_MINUTE,
+            background_reserve=AppConfig.RATE_LIMIT_BACKGROUND_RESERVE,
+            max_wait=AppConfig.RATE_LIMIT_MAX_WAIT_SECONDS,
+            metrics=self.metrics,
+        )
+        
+        # パフォーマンスダイアログ（初めて表示するときに作成する）
+        self.performance_dialog = None
         
         # ホットキーマネージャーの初期化
-        self.hotkey_manager = HotkeyManager()
+        # ホットキーはリスナースレッドからキューに積まれ、GUIスレッドで実行する
+        self.hotkey_manager = HotkeyManager(debounce=AppConfig.HOTKEY_DEBOUNCE_MS / 1000)
+        self.hotkey_triggered.connect(self.hotkey_manager.drain)
+        self.hotkey_manager.set_notifier(self.hotkey_triggered.emit)
         
         # コアコンポーネントの初期化
         self.audio_recorder = None
@@ -68,28 +146,95 @@ class MainWindow(QMainWindow):
         
         # インジケータ表示設定（デフォルトON）
         self.show_indicator = self.settings.value("show_indicator", AppConfig.DEFAULT_SHOW_INDICATOR, type=bool)
+        self.warn_dropped_audio = self.settings.value(
+            "warn_dropped_audio", AppConfig.DEFAULT_WARN_DROPPED_AUDIO, type=bool
+        )
+        
+        # 音声入力設定（デバイスは番号が変わるため名前で保存する）
+        self.input_device = self.settings.value("input_device", AppConfig.DEFAULT_INPUT_DEVICE)
+        self.input_blocksize = self.settings.value("input_blocksize", AppConfig.DEFAULT_INPUT_BLOCKSIZE, type=int)
+        self.input_latency = self.settings.value("input_latency", AppConfig.DEFAULT_INPUT_LATENCY)
+        self.native_rate = self.settings.value("native_rate", AppConfig.DEFAULT_NATIVE_RATE, type=bool)
+        self.capture_process = self.settings.value(
+            "capture_process", AppConfig.DEFAULT_CAPTURE_PROCESS, type=bool
+        )
         
         # サウンドプレーヤーの初期化
         self.setup_sound_players()
         
         # コンポーネントの初期化
-        self.audio_recorder = AudioRecorder()
+        self.recording_store = RecordingStore(
+            getAppDataPath(AppConfig.RECORDINGS_DIR_NAME),
+            max_files=AppConfig.RECORDINGS_MAX_FILES,
+            max_bytes=AppConfig.RECORDINGS_MAX_BYTES,
+            max_age_seconds=AppConfig.RECORDINGS_MAX_AGE_SECONDS,
+            flac_after_seconds=AppConfig.RECORDINGS_FLAC_AFTER_SECONDS,
+        )
+        self.audio_recorder = AudioRecorder(
+            recording_store=self.recording_store,
+            recent_takes=RecentTakes(
+                AppConfig.RECENT_TAKES_MAX_COUNT, AppConfig.RECENT_TAKES_MAX_BYTES, metrics=self.metrics
+            ),
+            preroll_seconds=AppConfig.PUSH_TO_TALK_PREROLL_MS / 1000,
+            metrics=self.metrics,
+            device=find_input_device(self.input_device),
+            blocksize=self.input_blocksize,
+            latency=self.input_latency or None,
+            native_rate=self.native_rate,
+            capture_process=self.capture_process,
+        )
+        
+        # 録音の自動停止はオーディオスレッドで判定され、シグナルでGUIスレッドに移して停止する
+        self.endpoint_detected.connect(self.on_endpoint_detected)
+        self.apply_endpointing()
+        
+        # リアルタイム文字起こしの途中の結果は受信スレッドから届くため、シグナルでGUIスレッドに移す
+        self.realtime_interim.connect(self.on_realtime_interim)
+        
+        # 子プロセスの起動には時間がかかるため、別プロセスでの録音は起動時に開始しておく
+        # （起動は別スレッドで行い、結果はシグナルでGUIスレッドに移す）
+        self.warm_stream_ready.connect(self.on_warm_stream_ready)
+        if self.capture_process:
+            self.start_audio_stream(self.audio_recorder.start_warm_stream)
+        
+        # 再文字起こしで複数のモデルの結果を並べて表示しているか
+        self.retranscribe_multiple = False
         
         # 状態表示ウィンドウ
         self.status_indicator_window = StatusIndicatorWindow()
         # 初期モードを録音中に設定
         self.status_indicator_window.set_mode(StatusIndicatorWindow.MODE_RECORDING)
+        # 入力レベルメーターは表示している間だけ録音のコールバックでレベルを計算させる
+        self.status_indicator_window.set_level_source(
+            self.audio_recorder.get_levels, self.audio_recorder.set_level_metering
+        )
         # 初期状態では表示しない - 録音開始時に表示する
         
-        try:
-            self.whisper_transcriber = WhisperTranscriber(
-                api_key=self.api_key,
-                azure_endpoint=self.azure_endpoint,
-                api_version=self.azure_api_version,
-                azure_deployment=self.azure_deployment,
-            )
-        except ValueError:
-            self.whisper_transcriber = None
+        self.whisper_transcriber = self.create_transcriber()
+        
+        # モデルの一覧は接続先から取得するまで既定の一覧を表示する
+        self.available_models = WhisperTranscriber.get_available_models()
+        
+        # 文字起こし履歴
+        self.history = TranscriptionHistory(getAppDataPath(AppConfig.HISTORY_DB_NAME))
+        
+        # 文字起こしに失敗した録音のスプール（読み込みはバックグラウンドで行う）
+        self.transcription_spool = TranscriptionSpool(
+            getAppDataPath(AppConfig.SPOOL_DIR_NAME),
+            self.transcribe_spooled,
+            on_result=self.on_spool_result,
+            is_retryable=self.is_spool_error_retryable,
+            max_entries=AppConfig.SPOOL_MAX_ENTRIES,
+            max_bytes=AppConfig.SPOOL_MAX_BYTES,
+            max_age_seconds=AppConfig.SPOOL_MAX_AGE_SECONDS,
+            max_workers=AppConfig.SPOOL_MAX_CONCURRENCY,
+            retry_interval=AppConfig.SPOOL_RETRY_INTERVAL_SECONDS,
+        )
+        
+        # 発話の区切りでの先行文字起こし（録音の停止時に結果を使うかどうかを決める）
+        self.speculation = SpeculativeUpload(
+            self.transcribe_speculatively, metrics=self.metrics, reuse_prefix=AppConfig.SPECULATIVE_REUSE_PREFIX
+        )
         
         # UIの設定
         self.init_ui()
@@ -97,10 +242,15 @@ class MainWindow(QMainWindow):
         # シグナルの接続
         self.transcription_complete.connect(self.on_transcription_complete)
         self.recording_status_changed.connect(self.update_recording_status)
+        self.spool_transcription_complete.connect(self.on_spool_transcription_complete)
+        self.retranscription_complete.connect(self.on_retranscription_complete)
+        self.models_loaded.connect(self.populate_models)
         
-        # Azure OpenAI 設定の確認
-        if not self.api_key or not self.azure_endpoint:
+        # 接続先の設定の確認（設定済みであればモデルの一覧を取得する）
+        if self.whisper_transcriber is None:
             self.show_api_key_dialog()
+        else:
+            self.refresh_models()
             
         # 追加の接続設定
         self.setup_connections()
@@ -110,6 +260,14 @@ class MainWindow(QMainWindow):
         
         # システムトレイの設定
         self.setup_system_tray()
+        
+        # スプールの再送処理を開始
+        self.transcription_spool.start()
+        
+        # メトリクスの公開（設定でポートを指定した場合のみ）
+        metrics_port = self.settings.value("metrics_port", AppConfig.DEFAULT_METRICS_PORT, type=int)
+        if metrics_port:
+            self.start_metrics_export(metrics_port)
     
     def init_ui(self):
         """
@@ -190,21 +348,8 @@ class MainWindow(QMainWindow):
         self.model_combo = QComboBox()
         self.model_combo.setObjectName("modelCombo")
         
-        # モデルリストを取得してコンボボックスに追加
-        for model in WhisperTranscriber.get_available_models():
-            self.model_combo.addItem(model["name"], model["id"])
-            # ツールチップを追加
-            self.model_combo.setItemData(
-                self.model_combo.count() - 1, 
-                model["description"], 
-                Qt.ItemDataRole.ToolTipRole
-            )
-        
-        # 前回選択したモデルを設定
-        last_model = self.settings.value("model", AppConfig.DEFAULT_MODEL)
-        index = self.model_combo.findData(last_model)
-        if index >= 0:
-            self.model_combo.setCurrentIndex(index)
+        # モデルリストをコンボボックスに追加し、前回選択したモデルを設定
+        self.populate_models(self.available_models)
             
         # フォームにフィールドを追加
         language_label = QLabel(AppLabels.LANGUAGE_LABEL)
@@ -247,7 +392,16 @@ class MainWindow(QMainWindow):
         self.transcription_text.setStyleSheet(AppStyles.TRANSCRIPTION_TEXT_STYLE)
         
         transcription_layout.addWidget(self.transcription_text)
-        main_layout.addWidget(transcription_panel, 1)
+        
+        # 履歴パネル
+        self.history_panel = HistoryPanel(self.history)
+        self.history_panel.entry_selected.connect(self.transcription_text.setPlainText)
+        
+        content_layout = QHBoxLayout()
+        content_layout.setSpacing(10)
+        content_layout.addWidget(transcription_panel, 3)
+        content_layout.addWidget(self.history_panel, 2)
+        main_layout.addLayout(content_layout, 1)
         
         # ステータスバー
         self.status_bar = self.statusBar()
@@ -275,6 +429,45 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
     
+    def record_history(self, text, audio_file, language=None, model_id=None, latency=None, created_at=None,
+                       duration=None):
+        """
+        文字起こし結果を履歴に追加する（ワーカースレッドから呼び出し可能）
+        
+        Parameters
+        ----------
+        text : str
+            文字起こし結果のテキスト
+        audio_file : str or None
+            録音ファイルのパス（長さの取得に使用、ファイルがない場合はNone）
+        language : str, optional
+            文字起こしの言語コード
+        model_id : str, optional
+            使用したモデルID
+        latency : float, optional
+            文字起こしに要した時間（秒）
+        created_at : float, optional
+            録音日時（UNIX時間）
+        duration : float, optional
+            録音の長さ（秒）。指定がなければ録音ファイルから取得します。
+        """
+        if not text:
+            return
+        if duration is None:
+            try:
+                duration = sf.info(audio_file).duration
+            except Exception:
+                duration = None
+        self.history.add(
+            text,
+            model=model_id,
+            language=language,
+            duration=duration,
+            latency=latency,
+            audio_path=audio_file,
+            created_at=created_at,
+        )
+    
     def create_toolbar(self):
         """
         アクション付きツールバーを作成する
@@ -304,14 +497,57 @@ class MainWindow(QMainWindow):
         copy_action.triggered.connect(self.copy_to_clipboard)
         toolbar.addAction(copy_action)
         
+        # 再文字起こしアクション
+        retranscribe_action = QAction(AppLabels.RETRANSCRIBE, self)
+        retranscribe_action.triggered.connect(self.show_retranscribe_dialog)
+        toolbar.addAction(retranscribe_action)
+        
+        # パフォーマンスアクション
+        performance_action = QAction(AppLabels.PERFORMANCE, self)
+        performance_action.triggered.connect(self.show_performance_dialog)
+        toolbar.addAction(performance_action)
+        
         # セパレーター追加
         toolbar.addSeparator()
         
+        # 音声入力設定
+        audio_device_action = QAction(AppLabels.AUDIO_DEVICE_SETTINGS, self)
+        audio_device_action.triggered.connect(self.show_audio_device_dialog)
+        toolbar.addAction(audio_device_action)
+        
         # グローバルホットキー設定
         hotkey_action = QAction(AppLabels.HOTKEY_SETTINGS, self)
         hotkey_action.triggered.connect(self.show_hotkey_dialog)
         toolbar.addAction(hotkey_action)
         
+        # プッシュトゥトークオプション
+        self.push_to_talk_action = QAction(AppLabels.PUSH_TO_TALK, self)
+        self.push_to_talk_action.setCheckable(True)
+        self.push_to_talk_action.setChecked(self.push_to_talk)
+        self.push_to_talk_action.triggered.connect(self.toggle_push_to_talk)
+        toolbar.addAction(self.push_to_talk_action)
+        
+        # 無音での自動停止オプション
+        self.auto_stop_action = QAction(AppLabels.AUTO_STOP, self)
+        self.auto_stop_action.setCheckable(True)
+        self.auto_stop_action.setChecked(self.auto_stop)
+        self.auto_stop_action.triggered.connect(self.toggle_auto_stop)
+        toolbar.addAction(self.auto_stop_action)
+        
+        # 先行文字起こしオプション
+        self.speculative_action = QAction(AppLabels.SPECULATIVE_UPLOAD, self)
+        self.speculative_action.setCheckable(True)
+        self.speculative_action.setChecked(self.speculative_upload)
+        self.speculative_action.triggered.connect(self.toggle_speculative_upload)
+        toolbar.addAction(self.speculative_action)
+        
+        # リアルタイム文字起こしオプション
+        self.realtime_action = QAction(AppLabels.REALTIME, self)
+        self.realtime_action.setCheckable(True)
+        self.realtime_action.setChecked(self.realtime)
+        self.realtime_action.triggered.connect(self.toggle_realtime)
+        toolbar.addAction(self.realtime_action)
+        
         # 自動コピーオプション
         self.auto_copy_action = QAction(AppLabels.AUTO_COPY, self)
         self.auto_copy_action.setCheckable(True)
@@ -354,30 +590,105 @@ class MainWindow(QMainWindow):
             endpoint=self.azure_endpoint,
             api_version=self.azure_api_version,
             deployment=self.azure_deployment,
+            backend=self.backend,
+            fallback_deployments=self.fallback_deployments,
         )
         if dialog.exec():
             self.api_key = dialog.get_api_key()
             self.azure_endpoint = dialog.get_endpoint()
             self.azure_api_version = dialog.get_api_version()
             self.azure_deployment = dialog.get_deployment()
+            self.backend = dialog.get_backend()
+            self.fallback_deployments = dialog.get_fallback_deployments()
             self.settings.setValue("api_key", self.api_key)
             self.settings.setValue("azure_endpoint", self.azure_endpoint)
             self.settings.setValue("azure_api_version", self.azure_api_version)
             self.settings.setValue("azure_deployment", self.azure_deployment)
+            self.settings.setValue("backend", self.backend)
+            self.settings.setValue("fallback_deployments", self.fallback_deployments)
             
-            # 新しいAPIキーでトランスクライバーを再初期化
-            try:
-                self.whisper_transcriber = WhisperTranscriber(
-                    api_key=self.api_key,
-                    azure_endpoint=self.azure_endpoint,
-                    api_version=self.azure_api_version,
-                    azure_deployment=self.azure_deployment,
-                )
+            # 新しい設定でトランスクライバーを再初期化（語彙とシステム指示は引き継ぐ）
+            previous = self.whisper_transcriber
+            self.whisper_transcriber = self.create_transcriber()
+            if previous is not None:
+                if self.whisper_transcriber is not None:
+                    self.whisper_transcriber.add_custom_vocabulary(previous.get_custom_vocabulary())
+                    self.whisper_transcriber.add_system_instruction(previous.get_system_instructions())
+                previous.close()
+            if self.whisper_transcriber is not None:
                 self.status_bar.showMessage(AppLabels.STATUS_API_KEY_SAVED, 3000)
-            except ValueError as e:
-                self.whisper_transcriber = None
+                self.refresh_models()
+            else:
                 QMessageBox.warning(self, AppLabels.ERROR_TITLE, AppLabels.ERROR_API_KEY_MISSING)
     
+    def create_transcriber(self):
+        """
+        現在の接続先の設定でトランスクライバーを作成する
+        
+        Returns
+        -------
+        WhisperTranscriber or None
+            トランスクライバー。設定が不足している場合はNone
+        """
+        # 予備の deployment は Azure OpenAI のみ（他の接続先ではモデル名になってしまうため）
+        fallback_deployments = []
+        if self.backend == BACKEND_AZURE:
+            fallback_deployments = [name.strip() for name in self.fallback_deployments.split(",") if name.strip()]
+        try:
+            return WhisperTranscriber(
+                api_key=self.api_key,
+                azure_endpoint=self.azure_endpoint,
+                api_version=self.azure_api_version,
+                azure_deployment=self.azure_deployment,
+                metrics=self.metrics,
+                backend=self.backend,
+                rate_limiter=self.rate_limiter,
+                fallback_deployments=fallback_deployments,
+            )
+        except ValueError as e:
+            print(f"Transcription backend is not configured: {e}")
+            return None
+    
+    def refresh_models(self):
+        """
+        接続先から利用可能なモデルの一覧をバックグラウンドで取得し、モデル選択に反映する
+        
+        取得には通信を伴う場合があるため別スレッドで行い、結果はシグナルでGUIスレッドに渡します。
+        """
+        transcriber = self.whisper_transcriber
+        if transcriber is None:
+            return
+        threading.Thread(
+            target=lambda: self.models_loaded.emit(transcriber.list_models()), name="list-models", daemon=True
+        ).start()
+    
+    def populate_models(self, models):
+        """
+        モデル選択の項目を置き換える
+        
+        Parameters
+        ----------
+        models : list of dict
+            id, name, description を含むモデルの一覧
+        
+        選択中（起動時は前回選択した）モデルが一覧にあれば選択を維持します。
+        一覧の置き換えでは選択したモデルの設定を保存しません。
+        """
+        current = self.model_combo.currentData() or self.settings.value("model", AppConfig.DEFAULT_MODEL)
+        self.available_models = models
+        self.model_combo.blockSignals(True)
+        self.model_combo.clear()
+        for model in models:
+            self.model_combo.addItem(model["name"], model["id"])
+            # ツールチップを追加
+            self.model_combo.setItemData(
+                self.model_combo.count() - 1,
+                model["description"],
+                Qt.ItemDataRole.ToolTipRole
+            )
+        self.model_combo.setCurrentIndex(max(0, self.model_combo.findData(current)))
+        self.model_combo.blockSignals(False)
+    
     def show_vocabulary_dialog(self):
         """
         カスタム語彙管理ダイアログを表示する
@@ -412,6 +723,212 @@ class MainWindow(QMainWindow):
             self.whisper_transcriber.add_system_instruction(new_instructions)
             self.status_bar.showMessage(AppLabels.STATUS_INSTRUCTIONS_SET.format(len(new_instructions)), 3000)
     
+    def show_retranscribe_dialog(self):
+        """
+        直近の録音の再文字起こしダイアログを表示する
+        
+        メモリ上に保持している録音を選び、別のモデル・言語・語彙で文字起こしし直します。
+        """
+        if not self.whisper_transcriber:
+            QMessageBox.warning(self, AppLabels.ERROR_TITLE, AppLabels.ERROR_API_KEY_REQUIRED)
+            return
+        
+        takes = self.audio_recorder.recent_takes.list()
+        if not takes:
+            QMessageBox.information(self, AppLabels.INFO_TITLE, AppLabels.ERROR_NO_RECENT_TAKES)
+            return
+        
+        languages = [
+            (self.language_combo.itemText(i), self.language_combo.itemData(i))
+            for i in range(self.language_combo.count())
+        ]
+        
+        # Deployment を指定している場合は、どのモデルを選んでもその deployment に送信されるため、
+        # 選択肢を deployment の1つにする（結果の見出しと履歴のモデルも deployment 名になる）
+        models = self.available_models
+        model = self.model_combo.currentData()
+        deployment = self.whisper_transcriber.azure_deployment
+        if deployment:
+            models = [{"id": deployment, "name": AppLabels.RETRANSCRIBE_DEPLOYMENT_FORMAT.format(deployment)}]
+            model = deployment
+        
+        dialog = RetranscribeDialog(
+            self,
+            takes=takes,
+            models=models,
+            languages=languages,
+            vocabulary=self.whisper_transcriber.get_custom_vocabulary(),
+            language=self.language_combo.currentData(),
+            model=model,
+        )
+        
+        if dialog.exec():
+            self.start_retranscription(
+                dialog.get_take_id(),
+                dialog.get_models(),
+                dialog.get_language(),
+                dialog.get_vocabulary(),
+            )
+    
+    def show_audio_device_dialog(self):
+        """
+        音声入力設定ダイアログを表示する
+        
+        入力デバイス・ブロックサイズ・レイテンシを選択（または自動調整）し、
+        設定を保存して録音に反映します。
+        """
+        dialog = AudioDeviceDialog(
+            self,
+            devices=list_input_devices(),
+            device_name=self.input_device,
+            blocksize=self.input_blocksize,
+            latency=self.input_latency,
+            native_rate=self.native_rate,
+            capture_process=self.capture_process,
+            auto_stop_silence=self.auto_stop_silence,
+            max_take_seconds=self.max_take_seconds,
+            sample_rate=self.audio_recorder.sample_rate,
+            channels=self.audio_recorder.channels,
+        )
+        
+        if dialog.exec():
+            self.input_device = dialog.get_device_name()
+            self.input_blocksize = dialog.get_blocksize()
+            self.input_latency = dialog.get_latency()
+            self.native_rate = dialog.get_native_rate()
+            self.capture_process = dialog.get_capture_process()
+            self.auto_stop_silence = dialog.get_auto_stop_silence()
+            self.max_take_seconds = dialog.get_max_take_seconds()
+            self.settings.setValue("input_device", self.input_device)
+            self.settings.setValue("input_blocksize", self.input_blocksize)
+            self.settings.setValue("input_latency", self.input_latency)
+            self.settings.setValue("native_rate", self.native_rate)
+            self.settings.setValue("capture_process", self.capture_process)
+            self.settings.setValue("auto_stop_silence_seconds", self.auto_stop_silence)
+            self.settings.setValue("max_take_seconds", self.max_take_seconds)
+            self.apply_endpointing()
+            self.start_audio_stream(
+                self.audio_recorder.configure_stream,
+                find_input_device(self.input_device), self.input_blocksize, self.input_latency or None,
+                native_rate=self.native_rate, capture_process=self.capture_process,
+            )
+            self.status_bar.showMessage(
+                AppLabels.STATUS_AUDIO_DEVICE_SET.format(self.input_device or AppLabels.AUDIO_DEVICE_DEFAULT), 3000
+            )
+    
+    def start_audio_stream(self, start, *args, **kwargs):
+        """
+        入力ストリームを開始する関数を呼び出し、結果を warm_stream_ready で通知する
+        
+        子プロセスで録音する場合は入力ストリームを開くまで最大 START_TIMEOUT 秒かかるため、
+        GUIスレッドでは待たずに別スレッドで呼び出します。起動中に録音を開始した場合、
+        その録音はこのプロセスの入力ストリームで行われます。
+        
+        Parameters
+        ----------
+        start : Callable[..., bool]
+            入力ストリームを開始する関数（start_warm_stream、configure_stream）
+        *args, **kwargs
+            start に渡す引数
+        """
+        if not (self.capture_process or self.audio_recorder.capture_process):
+            self.on_warm_stream_ready(start(*args, **kwargs))
+            return
+        threading.Thread(
+            target=lambda: self.warm_stream_ready.emit(bool(start(*args, **kwargs))),
+            name="warm-stream", daemon=True,
+        ).start()
+    
+    def on_warm_stream_ready(self, started):
+        """
+        入力ストリームの開始が完了したときの処理
+        
+        Parameters
+        ----------
+        started : bool
+            入力ストリームを開始できたかどうか
+        """
+        if not started:
+            self.status_bar.showMessage(AppLabels.ERROR_AUDIO_STREAM, 5000)
+    
+    def show_performance_dialog(self):
+        """
+        パフォーマンスダイアログを表示する
+        
+        直近の録音の処理時間、モデル・エンドポイント別の文字起こしまでの時間、
+        待ち行列の長さと上流のエラー率を表示します。表示中も録音・文字起こしを続けられます。
+        """
+        if self.performance_dialog is None:
+            self.performance_dialog = PerformanceDialog(
+                self,
+                tracer=self.tracer,
+                queue_depth=self.get_queue_depth,
+                diagnostics=self.get_diagnostics,
+            )
+        self.performance_dialog.show()
+        self.performance_dialog.raise_()
+        self.performance_dialog.activateWindow()
+    
+    def get_queue_depth(self):
+        """
+        待ち行列の長さを返す
+        
+        Returns
+        -------
+        tuple
+            (実行待ちのホットキーの数, 再送待ちの録音の数)
+        """
+        return self.hotkey_manager.pending_count(), self.transcription_spool.pending_count()
+    
+    def get_diagnostics(self):
+        """
+        診断情報に含める環境・設定・統計を返す（APIキーは含めない）
+        
+        Returns
+        -------
+        dict
+            environment, settings, queue_depth, hotkey_latency, push_to_talk_latency_ms,
+            audio_health, speculative_upload, rate_limits, metrics
+        """
+        hotkeys, spooled = self.get_queue_depth()
+        return {
+            "environment": {
+                "platform": sys.platform,
+                "python": sys.version.split()[0],
+            },
+            "settings": {
+                "model": self.model_combo.currentData(),
+                "language": self.language_combo.currentData(),
+                "azure_endpoint": self.azure_endpoint,
+                "azure_api_version": self.azure_api_version,
+                "azure_deployment": self.azure_deployment,
+                "backend": self.backend,
+                "fallback_deployments": self.fallback_deployments,
+                "hotkey": self.hotkey,
+                "push_to_talk": self.push_to_talk,
+                "tracing": self.tracer.enabled,
+                "input_device": self.input_device,
+                "input_blocksize": self.input_blocksize,
+                "input_latency": self.input_latency,
+                "native_rate": self.native_rate,
+                "capture_process": self.capture_process,
+                "auto_stop": self.auto_stop,
+                "auto_stop_silence_seconds": self.auto_stop_silence,
+                "max_take_seconds": self.max_take_seconds,
+                "speculative_upload": self.speculative_upload,
+                "speculative_pause_seconds": self.speculative_pause,
+                "realtime": self.realtime,
+                "capture_format": [self.audio_recorder.capture_rate, self.audio_recorder.capture_channels],
+            },
+            "queue_depth": {"hotkeys": hotkeys, "spooled": spooled},
+            "hotkey_latency": self.hotkey_manager.get_latency_stats(),
+            "push_to_talk_latency_ms": list(self.push_to_talk_latencies),
+            "audio_health": self.audio_recorder.get_health().to_dict(),
+            "speculative_upload": self.speculation.stats(),
+            "rate_limits": self.rate_limiter.stats(),
+            "metrics": self.metrics.registry.to_dict(),
+        }
+    
     def toggle_recording(self):
         """
         録音の開始/停止を切り替える
@@ -432,6 +949,20 @@ class MainWindow(QMainWindow):
         else:
             self.start_recording()
     
+    def on_push_to_talk_pressed(self):
+        """
+        プッシュトゥトークのホットキーが押されたときに録音を開始する
+        """
+        if not self.audio_recorder.is_recording():
+            self.start_recording()
+    
+    def on_push_to_talk_released(self):
+        """
+        プッシュトゥトークのホットキーが離されたときに録音を停止して送信する
+        """
+        if self.audio_recorder.is_recording():
+            self.stop_recording(released_ns=self.hotkey_manager.current_event_ns)
+    
     def start_recording(self):
         """
         音声録音を開始する
@@ -442,9 +973,32 @@ class MainWindow(QMainWindow):
         if not self.whisper_transcriber:
             QMessageBox.warning(self, AppLabels.ERROR_TITLE, AppLabels.ERROR_API_KEY_REQUIRED)
             return
+        
+        # この録音のトレースを開始（無効の場合は何も記録しない）
+        trace = self.current_trace = self.tracer.begin()
+        trace.start("start_recording")
+        
+        # 前の録音の先行文字起こしが残っていれば捨てる
+        self.speculation.cancel()
+        
+        # リアルタイム文字起こしでは、録音の最初のブロックからセッションに渡す（接続は別スレッドで行う）
+        session = None
+        if self.realtime:
+            session = self.whisper_transcriber.open_realtime_session(
+                self.language_combo.currentData(),
+                self.model_combo.currentData(),
+                api_version=AppConfig.REALTIME_API_VERSION,
+                on_interim=self.realtime_interim.emit,
+                connect_timeout=AppConfig.REALTIME_CONNECT_TIMEOUT_SECONDS,
+            )
+        self.audio_recorder.set_stream_sink(session)
             
         self.record_button.setText(AppLabels.RECORD_STOP_BUTTON)
         self.audio_recorder.start_recording()
+        trace.start("capture")
+        if session is not None:
+            session.start(self.audio_recorder.capture_rate, self.audio_recorder.capture_channels)
+        self.realtime_session = session
         self.recording_status_changed.emit(True)
         
         # 録音タイマー開始
@@ -462,31 +1016,84 @@ class MainWindow(QMainWindow):
         
         # 開始音を再生
         self.play_start_sound()
+        trace.end("start_recording")
     
-    def stop_recording(self):
+    def stop_recording(self, released_ns=None):
         """
         録音を停止し文字起こしを開始する
         
+        Parameters
+        ----------
+        released_ns : int, optional
+            プッシュトゥトークのキーを離した時刻（time.perf_counter_ns、送信開始までの時間の計測用）
+        
         録音を停止して一時ファイルを保存し、文字起こし処理を開始します。
         UIの状態も適切に更新します。
         """
+        trace, self.current_trace = self.current_trace, NULL_TRACE
+        trace.end("capture")
+        with trace.span("stop_recording"):
+            audio_file = self.audio_recorder.stop_recording(trace)
+        
+        # リアルタイム文字起こしのセッションには、停止までの音声がすべて渡っている
+        realtime, self.realtime_session = self.realtime_session, None
+        self.audio_recorder.set_stream_sink(None)
+        if realtime is not None and not audio_file:
+            realtime.close()
+            realtime = None
+        
+        # 最後の発話の区切りのあとに発話が再開していなければ、先行文字起こしの結果を使う
+        endpointer = self.audio_recorder.endpointer
+        speculation = self.speculation.finish(resumed=endpointer is None or not endpointer.paused)
+        
+        # 送信開始を遅らせないよう、UIの更新より先に文字起こしを開始する
+        if audio_file:
+            self.start_transcription(
+                audio_file, self.audio_recorder.last_take_id, released_ns, trace, speculation, realtime
+            )
+        
         self.record_button.setText(AppLabels.RECORD_START_BUTTON)
-        audio_file = self.audio_recorder.stop_recording()
         self.recording_status_changed.emit(False)
         
         # 録音タイマー停止
         self.recording_timer.stop()
         
-        if audio_file:
-            self.status_bar.showMessage(AppLabels.STATUS_TRANSCRIBING)
-            self.start_transcription(audio_file)
-        else:
+        # 入力ストリームの状態を記録し、音声が欠落していれば警告する
+        self.report_audio_health(trace)
+        
+        if not audio_file:
             # 録音ファイルが作成されなかった場合は状態表示を非表示
             self.status_indicator_window.hide()
         
         # 停止音を再生
         self.play_stop_sound()
     
+    def report_audio_health(self, trace=NULL_TRACE):
+        """
+        直前の録音のオーディオコールバックの集計を記録し、音声の欠落を警告する
+        
+        Parameters
+        ----------
+        trace : TakeTrace, optional
+            集計を付加するトレース
+        
+        集計は録音（メモリ上に保持している場合）とトレースに付加します。入力のオーバーフローが
+        あった場合は、設定に応じて状態インジケーターに警告を表示します。
+        """
+        health = self.audio_recorder.last_take_health
+        summary = health.to_dict()
+        trace.annotate(audio=summary)
+        if self.audio_recorder.last_take_id is not None:
+            self.audio_recorder.recent_takes.annotate(self.audio_recorder.last_take_id, audio_health=summary)
+        
+        if not health.dropped_audio:
+            return
+        print(f"Audio input overflowed {health.input_overflows} times during the take; audio was dropped")
+        if self.warn_dropped_audio and self.show_indicator:
+            self.status_indicator_window.set_warning(
+                AppLabels.INDICATOR_AUDIO_DROPPED.format(health.input_overflows)
+            )
+    
     def update_recording_status(self, is_recording):
         """
         録音インジケーターの状態を更新する
@@ -526,7 +1133,8 @@ class MainWindow(QMainWindow):
             # 録音インジケーターウィンドウのタイマーも更新
             self.status_indicator_window.update_timer(time_str)
     
-    def start_transcription(self, audio_file=None):
+    def start_transcription(self, audio_file=None, take_id=None, released_ns=None, trace=NULL_TRACE,
+                            speculation=None, realtime=None):
         """
         文字起こしを開始する
         
@@ -534,31 +1142,44 @@ class MainWindow(QMainWindow):
         ----------
         audio_file : str, optional
             文字起こしを行う音声ファイルのパス
+        take_id : int, optional
+            メモリ上に保持している録音のID（結果を再文字起こしダイアログに表示するため）
+        released_ns : int, optional
+            プッシュトゥトークのキーを離した時刻（time.perf_counter_ns）
+        trace : TakeTrace, optional
+            この録音のトレース
+        speculation : Speculation, optional
+            この録音の結果（または前半の結果）として使う先行文字起こし
+        realtime : RealtimeSession, optional
+            この録音のリアルタイム文字起こしのセッション
         
         録音した音声ファイルの文字起こしを開始し、UIの状態を更新します。
         """
-        self.status_bar.showMessage(AppLabels.STATUS_TRANSCRIBING)
-        
-        # 文字起こし中状態の表示
-        if self.show_indicator:
-            # 念のため、一度ウィンドウを隠してリセット
-            self.status_indicator_window.hide()
-            self.status_indicator_window.set_mode(StatusIndicatorWindow.MODE_TRANSCRIBING)
-            self.status_indicator_window.show()
-        
-        # 言語の選択
+        # 言語とモデルの選択
         selected_language = self.language_combo.currentData()
+        selected_model = self.model_combo.currentData()
         
-        # バックグラウンドスレッドで文字起こし処理を実行
+        # バックグラウンドスレッドで文字起こし処理を実行（UIの更新を待たずに送信を始める）
         if audio_file:
             transcription_thread = threading.Thread(
                 target=self.perform_transcription,
-                args=(audio_file, selected_language)
+                args=(audio_file, selected_language, selected_model, take_id, released_ns, trace, speculation,
+                      realtime)
             )
             transcription_thread.daemon = True
             transcription_thread.start()
+        
+        self.status_bar.showMessage(AppLabels.STATUS_TRANSCRIBING)
+        
+        # 文字起こし中状態の表示
+        if self.show_indicator:
+            # 念のため、一度ウィンドウを隠してリセット
+            self.status_indicator_window.hide()
+            self.status_indicator_window.set_mode(StatusIndicatorWindow.MODE_TRANSCRIBING)
+            self.status_indicator_window.show()
     
-    def perform_transcription(self, audio_file, language=None):
+    def perform_transcription(self, audio_file, language=None, model_id=None, take_id=None, released_ns=None,
+                              trace=NULL_TRACE, speculation=None, realtime=None):
         """
         バックグラウンドスレッドで文字起こし処理を実行する
         
@@ -568,22 +1189,368 @@ class MainWindow(QMainWindow):
             文字起こしを行う音声ファイルのパス
         language : str, optional
             文字起こしの言語コード
-        
+        model_id : str, optional
+            文字起こしに使用するモデルID
+        take_id : int, optional
+            メモリ上に保持している録音のID
+        released_ns : int, optional
+            プッシュトゥトークのキーを離した時刻（time.perf_counter_ns）
+        trace : TakeTrace, optional
+            この録音のトレース（送信・応答待ち・応答の変換の時間を記録）
+        speculation : Speculation, optional
+            この録音の結果（または前半の結果）として使う先行文字起こし
+        realtime : RealtimeSession, optional
+            この録音のリアルタイム文字起こしのセッション
+        
+        リアルタイム文字起こしがあればその最終結果を、先行文字起こしがあればその結果を待って使い、
+        失敗した場合は通常どおり送信します。
         WhisperTranscriberを使用して実際の文字起こし処理を行い、結果を
-        シグナルで通知します。エラー発生時も適切にハンドリングします。
+        シグナルで通知します。ネットワーク障害の場合は録音をスプールして後で再送します。
         """
         try:
+            # キーを離してから送信開始までの時間を記録
+            if released_ns:
+                self.record_push_to_talk_latency(released_ns)
+            
             # 音声を文字起こし
-            result = self.whisper_transcriber.transcribe(audio_file, language)
+            transcriber = self.whisper_transcriber
+            trace.annotate(
+                take_id=take_id,
+                model=transcriber.azure_deployment or model_id or transcriber.model,
+                endpoint=transcriber.azure_endpoint,
+                language=language,
+            )
+            started = time.perf_counter()
+            result = self.use_realtime(realtime, trace)
+            if result is None:
+                result = self.use_speculation(speculation, take_id, language, model_id, trace)
+            if result is None:
+                with tracing.activate(trace):
+                    result = transcriber.transcribe(audio_file, language, model=model_id, raise_errors=True)
+            latency = time.perf_counter() - started
             
-            # 結果でシグナルを発信
-            self.transcription_complete.emit(result)
+            # 履歴に保存してから結果でシグナルを発信
+            self.record_history(result, audio_file, language, model_id, latency)
+            if take_id is not None:
+                self.audio_recorder.recent_takes.annotate(take_id, text=result)
+            self.transcription_complete.emit(result, trace)
+            
+            # 接続が有効なので保留中の録音の再送を促す
+            self.transcription_spool.wake()
             
         except Exception as e:
+            trace.annotate(error=type(e).__name__)
+            
+            # ネットワーク障害などの場合は録音をスプールして後で再送する
+            if WhisperTranscriber.is_retryable_error(e) and self.transcription_spool.enqueue(
+                audio_file, language, model_id, error=str(e)
+            ):
+                self.transcription_complete.emit(AppLabels.ERROR_TRANSCRIPTION_SPOOLED.format(str(e)), trace)
+                return
+            
             # エラー処理
-            self.transcription_complete.emit(AppLabels.ERROR_TRANSCRIPTION.format(str(e)))
+            self.transcription_complete.emit(AppLabels.ERROR_TRANSCRIPTION.format(str(e)), trace)
     
-    def on_transcription_complete(self, text):
+    def transcribe_speculatively(self, samples, sample_rate, language=None, model_id=None):
+        """
+        録音中の音声を先行して文字起こしする（先行文字起こしのスレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        samples : np.ndarray
+            録音の先頭からの音声
+        sample_rate : int
+            サンプルレート
+        language : str, optional
+            文字起こしの言語コード
+        model_id : str, optional
+            文字起こしに使用するモデルID
+        
+        Returns
+        -------
+        str
+            文字起こし結果（失敗時は例外を送出します）
+        """
+        return self.whisper_transcriber.transcribe_samples(
+            samples, sample_rate, language, model=model_id, raise_errors=True, priority=PRIORITY_BACKGROUND
+        )
+    
+    def use_realtime(self, session, trace=NULL_TRACE):
+        """
+        リアルタイム文字起こしの最終結果を待って返す（文字起こしのスレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        session : RealtimeSession or None
+            この録音のリアルタイム文字起こしのセッション
+        trace : TakeTrace, optional
+            この録音のトレース
+        
+        Returns
+        -------
+        str or None
+            最終結果。セッションがない場合、または失敗した場合はNone（通常どおり送信する）
+        """
+        if session is None:
+            return None
+        with trace.span("realtime_final"):
+            text = session.finish(AppConfig.REALTIME_FINAL_TIMEOUT_SECONDS)
+        if text is None:
+            self.metrics.realtime_sessions.labels("fallback").inc()
+            trace.annotate(realtime="fallback", realtime_error=session.error)
+            self.realtime_interim.emit(AppLabels.STATUS_REALTIME_FALLBACK)
+            return None
+        self.metrics.realtime_sessions.labels("final").inc()
+        trace.annotate(realtime="final")
+        return text
+    
+    def use_speculation(self, speculation, take_id, language=None, model_id=None, trace=NULL_TRACE):
+        """
+        先行文字起こしの結果からこの録音の結果を作る（文字起こしのスレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        speculation : Speculation or None
+            この録音の先行文字起こし
+        take_id : int or None
+            メモリ上に保持している録音のID（前半として使う場合に後半の音声を取り出すため）
+        language : str, optional
+            文字起こしの言語コード
+        model_id : str, optional
+            文字起こしに使用するモデルID
+        trace : TakeTrace, optional
+            この録音のトレース
+        
+        Returns
+        -------
+        str or None
+            この録音の結果。先行文字起こしを使えない場合はNone（通常どおり送信する）
+        """
+        if speculation is None:
+            return None
+        
+        # 前半として使う場合は、後半の音声をメモリ上の録音から取り出して送信する
+        take = None
+        if speculation.prefix:
+            take = self.audio_recorder.recent_takes.get(take_id) if take_id is not None else None
+            if take is None or take["sample_rate"] != speculation.sample_rate:
+                return None
+        
+        with trace.span("speculative_wait"):
+            text = speculation.result()
+        if text is None:
+            return None
+        trace.annotate(speculative="prefix" if speculation.prefix else "hit")
+        if take is None:
+            return text
+        
+        rest = take["samples"][speculation.frames:]
+        with tracing.activate(trace):
+            tail = self.whisper_transcriber.transcribe_samples(
+                rest, take["sample_rate"], language, model=model_id, raise_errors=True
+            )
+        return join_transcripts(text, tail)
+    
+    def record_push_to_talk_latency(self, released_ns):
+        """
+        プッシュトゥトークのキーを離してから送信開始までの時間を記録する
+        
+        Parameters
+        ----------
+        released_ns : int
+            キーを離した時刻（time.perf_counter_ns）
+        """
+        latency_ms = (time.perf_counter_ns() - released_ns) / 1e6
+        self.push_to_talk_latencies.append(latency_ms)
+        if latency_ms > AppConfig.PUSH_TO_TALK_LATENCY_TARGET_MS:
+            print(f"Push-to-talk upload started {latency_ms:.1f} ms after key release "
+                  f"(target {AppConfig.PUSH_TO_TALK_LATENCY_TARGET_MS} ms)")
+    
+    def start_retranscription(self, take_id, models, language=None, vocabulary=None):
+        """
+        メモリ上の録音の再文字起こしを開始する
+        
+        Parameters
+        ----------
+        take_id : int
+            再文字起こしする録音のID
+        models : list
+            使用するモデルの (モデルID, 表示名) のリスト。複数指定した場合は並行して文字起こしします。
+        language : str, optional
+            文字起こしの言語コード
+        vocabulary : list, optional
+            今回の文字起こしに使用するカスタム語彙
+        """
+        take = self.audio_recorder.recent_takes.get(take_id)
+        if take is None or not models:
+            self.status_bar.showMessage(AppLabels.ERROR_NO_RECENT_TAKES, 3000)
+            return
+        
+        # 複数のモデルの結果は見出しを付けて並べて表示する
+        self.retranscribe_multiple = len(models) > 1
+        if self.retranscribe_multiple:
+            self.transcription_text.clear()
+        
+        self.status_bar.showMessage(AppLabels.STATUS_RETRANSCRIBING)
+        if self.show_indicator:
+            self.status_indicator_window.hide()
+            self.status_indicator_window.set_mode(StatusIndicatorWindow.MODE_TRANSCRIBING)
+            self.status_indicator_window.show()
+        
+        for model_id, model_name in models:
+            retranscription_thread = threading.Thread(
+                target=self.perform_retranscription,
+                args=(take, model_id, model_name, language, vocabulary)
+            )
+            retranscription_thread.daemon = True
+            retranscription_thread.start()
+    
+    def perform_retranscription(self, take, model_id, model_name, language=None, vocabulary=None):
+        """
+        バックグラウンドスレッドでメモリ上の録音を文字起こしする
+        
+        Parameters
+        ----------
+        take : dict
+            再文字起こしする録音（``samples`` に音声データを含む）
+        model_id : str
+            使用するモデルID
+        model_name : str
+            結果の表示に使用するモデル名
+        language : str, optional
+            文字起こしの言語コード
+        vocabulary : list, optional
+            今回の文字起こしに使用するカスタム語彙
+        """
+        try:
+            started = time.perf_counter()
+            result = self.whisper_transcriber.transcribe_samples(
+                take["samples"], take["sample_rate"], language,
+                model=model_id, vocabulary=vocabulary, raise_errors=True, priority=PRIORITY_BACKGROUND,
+            )
+            latency = time.perf_counter() - started
+            
+            self.record_history(
+                result, take["path"], language, model_id, latency, duration=take["duration"]
+            )
+            self.retranscription_complete.emit(model_name, result)
+            
+        except Exception as e:
+            self.retranscription_complete.emit(model_name, AppLabels.ERROR_TRANSCRIPTION.format(str(e)))
+    
+    def on_retranscription_complete(self, model_name, text):
+        """
+        再文字起こし完了時の処理
+        
+        Parameters
+        ----------
+        model_name : str
+            使用したモデル名
+        text : str
+            文字起こし結果のテキスト
+        
+        複数のモデルで再文字起こししている場合は、モデル名の見出しを付けて結果を追記します。
+        """
+        if self.retranscribe_multiple:
+            self.transcription_text.append(AppLabels.RETRANSCRIBE_RESULT_HEADER.format(model_name))
+            self.transcription_text.append(text + "\n")
+        else:
+            self.transcription_text.setPlainText(text)
+            if self.auto_copy and text:
+                QApplication.clipboard().setText(text)
+        
+        self.history_panel.schedule_refresh()
+        
+        if self.show_indicator:
+            self.status_indicator_window.set_mode(StatusIndicatorWindow.MODE_TRANSCRIBED)
+            self.status_indicator_window.show()
+        
+        self.status_bar.showMessage(AppLabels.STATUS_RETRANSCRIBED.format(model_name), 3000)
+        self.play_complete_sound()
+    
+    def transcribe_spooled(self, audio_file, language=None, model=None):
+        """
+        スプールされた録音を文字起こしする（スプールのワーカースレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        audio_file : str
+            文字起こしを行う音声ファイルのパス
+        language : str, optional
+            文字起こしの言語コード
+        model : str, optional
+            録音時に選択されていたモデルID
+        
+        Returns
+        -------
+        str
+            文字起こし結果のテキスト
+        """
+        if not self.whisper_transcriber:
+            raise ValueError(AppLabels.ERROR_API_KEY_REQUIRED)
+        return self.whisper_transcriber.transcribe(
+            audio_file, language, model=model, raise_errors=True, priority=PRIORITY_BACKGROUND
+        )
+    
+    def is_spool_error_retryable(self, error):
+        """
+        スプールされた録音の再送に失敗したとき、あとで再送するかどうかを判定する（ワーカースレッドから呼ばれる）
+        
+        Parameters
+        ----------
+        error : Exception
+            再送で発生した例外
+        
+        Returns
+        -------
+        bool
+            接続先が未設定の場合と、再送で成功が見込めるエラーの場合True
+        """
+        return self.whisper_transcriber is None or WhisperTranscriber.is_retryable_error(error)
+    
+    def on_spool_result(self, entry, text):
+        """
+        スプールされた録音の再送が成功したときの処理（ワーカースレッドから呼ばれる）
+        
+        スプール内のコピーは再送後に削除されるため、履歴には録音の保存先のファイル
+        （FLAC に再エンコードされた場合はそのパス、保持期間を過ぎて削除された場合はなし）を記録します。
+        
+        Parameters
+        ----------
+        entry : dict
+            再送したスプールのエントリ
+        text : str
+            文字起こし結果のテキスト
+        """
+        self.record_history(
+            text,
+            self.recording_store.resolve(entry.get("source_path")),
+            entry.get("language"),
+            entry.get("model"),
+            created_at=entry.get("created_at"),
+        )
+        self.spool_transcription_complete.emit(text)
+    
+    def on_spool_transcription_complete(self, text):
+        """
+        スプールされた録音の文字起こし結果を通知する
+        
+        Parameters
+        ----------
+        text : str
+            文字起こし結果のテキスト
+        
+        現在表示中の文字起こし結果を上書きしないよう、トレイ通知で結果を知らせます。
+        結果は履歴に保存済みのため、履歴リストも更新します。
+        """
+        self.history_panel.schedule_refresh()
+        if self.performance_dialog is not None:
+            self.performance_dialog.schedule_refresh()
+        self.status_bar.showMessage(AppLabels.STATUS_SPOOL_DELIVERED, 3000)
+        if hasattr(self, 'tray_icon') and self.tray_icon.isVisible():
+            self.tray_icon.showMessage(AppLabels.TRAY_SPOOL_DELIVERED_TITLE, text)
+    
+    def on_transcription_complete(self, text, trace=NULL_TRACE):
         """
         文字起こし完了時の処理
         
@@ -591,13 +1558,20 @@ class MainWindow(QMainWindow):
         ----------
         text : str
             文字起こし結果のテキスト
+        trace : TakeTrace, optional
+            この録音のトレース（完了後に保持し、録音の結果にも付加する）
         
         文字起こし結果をテキストウィジェットに表示し、設定に応じて
         クリップボードにコピーします。また、完了サウンドを再生します。
         """
+        trace.start("on_transcription_complete")
+        
         # 文字起こし結果でテキストウィジェットを更新
         self.transcription_text.setPlainText(text)
         
+        # 履歴リストを更新（書き込みの反映を待つため少し遅らせる）
+        self.history_panel.schedule_refresh()
+        
         # 使用したモデル名を取得
         model_id = self.model_combo.currentData()
         model_name = self.model_combo.currentText()
@@ -609,7 +1583,8 @@ class MainWindow(QMainWindow):
         
         # 有効な場合は自動でクリップボードにコピー
         if self.auto_copy and text:
-            QApplication.clipboard().setText(text)
+            with trace.span("clipboard"):
+                QApplication.clipboard().setText(text)
             self.status_bar.showMessage(AppLabels.STATUS_TRANSCRIBED_COPIED + f" (使用モデル: {model_name})", 3000)
         else:
             # 自動コピーが無効の場合でもモデル情報でステータスを更新
@@ -617,6 +1592,15 @@ class MainWindow(QMainWindow):
         
         # 完了音を再生
         self.play_complete_sound()
+        
+        # トレースを完了して保持し、録音の結果に各段階の時間を付加する
+        trace.end("on_transcription_complete")
+        self.tracer.finish(trace)
+        self.metrics.record_trace(trace)
+        if self.performance_dialog is not None:
+            self.performance_dialog.schedule_refresh()
+        if trace and trace.attrs.get("take_id") is not None:
+            self.audio_recorder.recent_takes.annotate(trace.attrs["take_id"], trace=trace.durations())
     
     def copy_to_clipboard(self):
         """
@@ -658,7 +1642,17 @@ class MainWindow(QMainWindow):
         エラーが発生しても、アプリケーションは引き続き動作します。
         """
         try:
-            result = self.hotkey_manager.register_hotkey(self.hotkey, self.toggle_recording)
+            # コールバックはGUIスレッドで実行されるため直接切り替える
+            if self.push_to_talk:
+                # 押している間だけ録音する。入力ストリームを開いたままにして、
+                # 押した直前の音声から録音し、離したらすぐに送信する
+                result = self.hotkey_manager.register_push_to_talk(
+                    self.hotkey, self.on_push_to_talk_pressed, self.on_push_to_talk_released
+                )
+                self.start_audio_stream(self.audio_recorder.start_warm_stream)
+            else:
+                result = self.hotkey_manager.register_hotkey(self.hotkey, self._toggle_recording_impl)
+                self.audio_recorder.stop_warm_stream()
             
             if result:
                 print(f"Hotkey '{self.hotkey}' has been set successfully")
@@ -680,8 +1674,8 @@ class MainWindow(QMainWindow):
         ホットキーの設定を変更するためのダイアログを表示します。
         ダイアログ表示中は現在のホットキーを一時的に解除します。
         """
-        # 現在のリスナーを一時的に停止
-        self.hotkey_manager.stop_listener()
+        # 現在のホットキーを一時的に解除（リスナーは動作したまま）
+        self.hotkey_manager.unregister_hotkey(self.hotkey)
         
         dialog = HotkeyDialog(self, self.hotkey)
         if dialog.exec():
@@ -709,14 +1703,188 @@ class MainWindow(QMainWindow):
         else:
             self.status_bar.showMessage(AppLabels.STATUS_AUTO_COPY_DISABLED, 2000)
     
+    def toggle_push_to_talk(self):
+        """
+        プッシュトゥトークのオン/オフを切り替える
+        
+        オンの場合はグローバルホットキーを押している間だけ録音し、オフの場合は
+        ホットキーを押すたびに録音の開始/停止を切り替えます。設定を保存します。
+        """
+        self.hotkey_manager.unregister_hotkey(self.hotkey)
+        self.push_to_talk = self.push_to_talk_action.isChecked()
+        self.settings.setValue("push_to_talk", self.push_to_talk)
+        self.setup_global_hotkey()
+        self.apply_endpointing()
+        if self.push_to_talk:
+            self.status_bar.showMessage(AppLabels.STATUS_PUSH_TO_TALK_ENABLED.format(self.hotkey), 3000)
+        else:
+            self.status_bar.showMessage(AppLabels.STATUS_PUSH_TO_TALK_DISABLED, 2000)
+    
+    def toggle_auto_stop(self):
+        """
+        無音での自動停止のオン/オフを切り替える
+        
+        オンの場合は、話し終えて無音が続いたら録音を停止して文字起こしを開始します
+        （プッシュトゥトークでは無効）。設定を保存します。
+        """
+        self.auto_stop = self.auto_stop_action.isChecked()
+        self.settings.setValue("auto_stop", self.auto_stop)
+        self.apply_endpointing()
+        if self.auto_stop:
+            self.status_bar.showMessage(AppLabels.STATUS_AUTO_STOP_ENABLED.format(self.auto_stop_silence), 3000)
+        else:
+            self.status_bar.showMessage(AppLabels.STATUS_AUTO_STOP_DISABLED, 2000)
+    
+    def toggle_speculative_upload(self):
+        """
+        先行文字起こしのオン/オフを切り替える
+        
+        オンの場合は、録音中に発話が途切れるたびにそれまでの音声を先に文字起こしし、
+        そのまま録音が停止されたらその結果を使います。設定を保存します。
+        """
+        self.speculative_upload = self.speculative_action.isChecked()
+        self.settings.setValue("speculative_upload", self.speculative_upload)
+        self.apply_endpointing()
+        if self.speculative_upload:
+            self.status_bar.showMessage(
+                AppLabels.STATUS_SPECULATIVE_ENABLED.format(self.speculative_pause), 3000
+            )
+        else:
+            self.speculation.cancel()
+            self.status_bar.showMessage(AppLabels.STATUS_SPECULATIVE_DISABLED, 2000)
+    
+    def toggle_realtime(self):
+        """
+        リアルタイム文字起こしのオン/オフを切り替える
+        
+        オンの場合は、録音中に音声を Realtime API に送信し、停止時は確定した結果を受け取ります
+        （失敗した場合は録音をまとめて送信します）。設定を保存します。
+        """
+        self.realtime = self.realtime_action.isChecked()
+        self.settings.setValue("realtime", self.realtime)
+        if self.realtime:
+            self.status_bar.showMessage(AppLabels.STATUS_REALTIME_ENABLED, 3000)
+        else:
+            self.status_bar.showMessage(AppLabels.STATUS_REALTIME_DISABLED, 2000)
+    
+    def on_realtime_interim(self, text):
+        """
+        リアルタイム文字起こしの途中の結果をステータスバーに表示する
+        
+        Parameters
+        ----------
+        text : str
+            ここまでの途中の結果（長い場合は末尾のみ表示します）
+        """
+        if len(text) > AppConfig.REALTIME_INTERIM_MAX_CHARS:
+            text = "…" + text[-AppConfig.REALTIME_INTERIM_MAX_CHARS:]
+        self.status_bar.showMessage(text)
+    
+    def apply_endpointing(self):
+        """
+        録音の自動停止の設定を録音に反映する
+        
+        無音での停止は自動停止がオンでプッシュトゥトークでない場合のみ、最大の長さでの停止は
+        常に（0 以外の場合）、発話の区切りは先行文字起こしがオンの場合のみ判定します。
+        いずれも無効の場合は判定しません。
+        """
+        silence = self.auto_stop_silence if self.auto_stop and not self.push_to_talk else 0
+        pause = self.speculative_pause if self.speculative_upload else 0
+        if not silence and not self.max_take_seconds and not pause:
+            self.audio_recorder.set_endpointing(None)
+            return
+        vad = EnergyVAD(threshold_db=AppConfig.VAD_THRESHOLD_DB, hangover_ms=AppConfig.VAD_HANGOVER_MS)
+        self.audio_recorder.set_endpointing(
+            Endpointer(silence, self.max_take_seconds, vad, pause_seconds=pause), self.endpoint_detected.emit
+        )
+    
+    def on_endpoint_detected(self, reason):
+        """
+        録音の自動停止が判定されたら、ホットキーと同じ流れで録音を停止して文字起こしを開始する
+        
+        Parameters
+        ----------
+        reason : str
+            停止の理由（ENDPOINT_SILENCE または ENDPOINT_MAX_LENGTH）、発話の区切りの場合は ENDPOINT_PAUSE
+        
+        発話の区切りでは録音を続け、それまでの音声の先行文字起こしを開始します。
+        """
+        if not self.audio_recorder.is_recording():
+            return
+        if reason == ENDPOINT_PAUSE:
+            samples = self.audio_recorder.snapshot()
+            # リアルタイム文字起こし中は停止時に最終結果が届くため、先行して送信しない
+            if (self.speculative_upload and self.whisper_transcriber and samples is not None
+                    and self.realtime_session is None):
+                self.speculation.submit(
+                    samples, self.audio_recorder.sample_rate,
+                    self.language_combo.currentData(), self.model_combo.currentData(),
+                )
+            return
+        self.metrics.auto_stops.labels(reason).inc()
+        self.stop_recording()
+        if reason == ENDPOINT_MAX_LENGTH:
+            self.status_bar.showMessage(AppLabels.STATUS_AUTO_STOPPED_MAX_LENGTH, 3000)
+        else:
+            self.status_bar.showMessage(AppLabels.STATUS_AUTO_STOPPED_SILENCE, 3000)
+    
+    def start_metrics_export(self, port):
+        """
+        メトリクスの公開を開始する
+        
+        ローカルホストの指定したポートで Prometheus 形式のエンドポイント（/metrics）を開始し、
+        アプリケーションデータフォルダに JSON スナップショットを定期的に書き込みます。
+        
+        Parameters
+        ----------
+        port : int
+            待ち受けるポート
+            
+        Returns
+        -------
+        bool
+            開始の成功・失敗
+        """
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        exporter = MetricsExporter(
+            self.metrics.registry,
+            port=port,
+            snapshot_path=getAppDataPath(AppConfig.METRICS_SNAPSHOT_NAME),
+            interval=AppConfig.METRICS_SNAPSHOT_INTERVAL_SECONDS,
+        )
+        if not exporter.start():
+            self.metrics_exporter = None
+            return False
+        self.metrics_exporter = exporter
+        print(f"Metrics endpoint: http://127.0.0.1:{port}/metrics")
+        return True
+    
     def quit_application(self):
         """
         アプリケーションを完全に終了する
         
         トレイアイコンを非表示にし、設定を保存してからアプリケーションを終了します。
         """
-        # キーボードリスナーを停止
+        # キーボードリスナーと開いたままの入力ストリーム（子プロセスを含む）を停止
         self.hotkey_manager.stop_listener()
+        self.audio_recorder.close()
+        
+        # メトリクスの公開を停止（最後のスナップショットを書き込む）
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        
+        # スプールの再送処理と録音ファイルの整理を停止
+        self.transcription_spool.stop()
+        self.recording_store.stop()
+        self.speculation.shutdown()
+        if self.realtime_session is not None:
+            self.realtime_session.close()
+        if self.whisper_transcriber is not None:
+            self.whisper_transcriber.close()
+        
+        # 未反映の履歴を書き込む
+        self.history.close()
             
         # トレイアイコンを非表示にする
         if hasattr(self, 'tray_icon'):
@@ -855,6 +2023,16 @@ class MainWindow(QMainWindow):
         record_action.triggered.connect(self.toggle_recording)
         menu.addAction(record_action)
         
+        # 再文字起こしアクションを追加
+        retranscribe_action = QAction(AppLabels.TRAY_RETRANSCRIBE, self)
+        retranscribe_action.triggered.connect(self.show_retranscribe_dialog)
+        menu.addAction(retranscribe_action)
+        
+        # パフォーマンスアクションを追加
+        performance_action = QAction(AppLabels.TRAY_PERFORMANCE, self)
+        performance_action.triggered.connect(self.show_performance_dialog)
+        menu.addAction(performance_action)
+        
         # セパレーターを追加
         menu.addSeparator()
         